@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Standard Python libraries
+import argparse
+from pathlib import Path
+import timeit
+
+# https://github.com/usnistgov/atomman
+from atomman.tools import filltemplate as atomman_filltemplate
+
+import iprPy
+from iprPy.tools import compile_template
+
+def benchmark_templates(number: int = 1000):
+    """
+    Micro-benchmark comparing atomman's filltemplate with iprPy's compiled
+    templates for all LAMMPS templates bundled with the iprPy calculations.
+    Each template is filled with dummy values for all of its variables and
+    the outputs of the two methods are checked to be identical.
+
+    Parameters
+    ----------
+    number : int, optional
+        The number of times each template is filled for the timings.
+        Default value is 1000.
+    """
+    calc_dir = Path(iprPy.__file__).parent / 'calculation'
+
+    total_old = total_new = 0.0
+    print(f"{'template':60} {'slots':>5} {'atomman (us)':>12} {'compiled (us)':>13} {'speedup':>7}")
+    for path in sorted(calc_dir.glob('*/*.template')):
+        template = path.read_text(encoding='UTF-8')
+        try:
+            compiled = compile_template(template, '<', '>')
+        except ValueError:
+            continue
+        variable = {key: f'value_{i}' for i, key in enumerate(compiled.keys)}
+
+        assert atomman_filltemplate(template, variable, '<', '>') == compiled.render(variable)
+
+        old = timeit.timeit(lambda: atomman_filltemplate(template, variable, '<', '>'),
+                            number=number) / number
+        new = timeit.timeit(lambda: compile_template(template, '<', '>').render(variable),
+                            number=number) / number
+        total_old += old
+        total_new += new
+
+        name = path.relative_to(calc_dir).as_posix()
+        print(f'{name:60} {len(compiled.keys):5d} {old*1e6:12.2f} {new*1e6:13.2f} {old/new:7.1f}')
+
+    print(f"{'total':60} {'':5} {total_old*1e6:12.2f} {total_new*1e6:13.2f} {total_old/total_new:7.1f}")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='benchmark filling the bundled calculation templates')
+    parser.add_argument('-n', '--number', default=1000, type=int,
+                        help='number of fills to time for each template')
+    args = parser.parse_args()
+
+    benchmark_templates(number=args.number)
@@ -1,7 +1,7 @@
 # coding: utf-8
 
 # Standard Python libraries
-from importlib import resources
+from importlib import import_module, resources
 
 # Read version from VERSION file
 if hasattr(resources, 'files'):
@@ -27,14 +27,16 @@ from .calculation import load_calculation, calculationmanager
 
 from .database import load_database, databasemanager, reset_orphans
 
-from . import workflow
-
 from .check_modules import check_modules
 from .command_line import command_line
 
-from . import analysis
+# Submodules that import heavy dependencies are loaded when first accessed
+lazymodules = ['analysis', 'workflow', 'quickcheck']
 
-from . import quickcheck
+def __getattr__(name):
+    if name in lazymodules:
+        return import_module(f'.{name}', __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 __all__ = ['__version__', 'tools', 'settings', 'input',
            'load_run_directory', 'fix_lammps_versions',
@@ -1,4 +1,6 @@
 import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
 from typing import Optional, Union
 
 # http://www.numpy.org/
@@ -13,6 +15,59 @@ from DataModelDict import DataModelDict as DM
 from .. import load_database
 from ..database import IprPyDatabase
 
+def mep_relax_job(gamma_model: DM,
+                  pos: np.ndarray,
+                  direction: str,
+                  npoints: int = 31,
+                  ipoints: int = 1001,
+                  relaxsteps: int = 500000,
+                  climbsteps: int = 500000,
+                  climbpoints: int = 1,
+                  timestep: Optional[float] = None,
+                  tolerance: Optional[float] = None) -> str:
+    """
+    Process pool worker function for evaluating a single MEP.  The gamma
+    surface is passed in as a data model and the results are returned as
+    JSON so that only simple content is transferred between processes.
+
+    Parameters
+    ----------
+    gamma_model : DataModelDict.DataModelDict
+        The data model representation of the gamma surface.
+    pos : numpy.ndarray
+        The list of end/junction points along the ideal initial path guess.
+    direction : str
+        The path descriptor/label.
+    npoints : int, optional
+        The number of discrete points to use for the path during relaxation.
+    ipoints : int, optional
+        The number of discrete points to use for the path when evaluating the
+        ideal shear stress.
+    relaxsteps : int, optional
+        The maximum number of relaxation phase steps.
+    climbsteps : int, optional
+        The maximum number of climbing phase steps.
+    climbpoints : int, optional
+        The expected number of maxima along the energy path.
+    timestep : float or None, optional
+        The path relaxation timestep.  If None, the path's default is used.
+    tolerance : float or None, optional
+        The max displacement per step tolerance for stopping the relaxation
+        early.  If None, the path's default is used.
+
+    Returns
+    -------
+    str
+        The JSON representation of the slip path results under a root
+        'slip-path' element.
+    """
+    gamma = am.defect.GammaSurface(model=gamma_model)
+    results = StackingFaultMEPCommander.mep_relax(
+        gamma, pos, direction, npoints=npoints, ipoints=ipoints,
+        relaxsteps=relaxsteps, climbsteps=climbsteps, climbpoints=climbpoints,
+        timestep=timestep, tolerance=tolerance, verbose=False)
+    return DM([('slip-path', results)]).json()
+
 class StackingFaultMEPCommander():
 
     def __init__(self,
@@ -263,16 +318,21 @@ class StackingFaultMEPCommander():
         elif sfid == 'A3--Mg--hcp--0001sf':
             calc['intrinsic-fault-energy'] = uc.model(gamma.E_gsf(a1=1/3, a2=1/3), 'mJ/m^2')
 
-    def mep_relax(self, 
-                  gamma: am.defect.GammaSurface,
+    @staticmethod
+    def mep_relax(gamma: am.defect.GammaSurface,
                   pos: np.ndarray,
                   direction: str,
                   npoints: int = 31,
                   ipoints: int = 1001,
                   relaxsteps: int = 500000,
                   climbsteps: int = 500000,
-                  climbpoints: int = 1):
+                  climbpoints: int = 1,
+                  timestep: Optional[float] = None,
+                  tolerance: Optional[float] = None,
+                  verbose: bool = True):
         """
+        Relaxes a single slip path on a gamma surface to find the MEP.
+
         Parameters
         ----------
         gamma : atomman.defect.GammaSurface
@@ -296,6 +356,18 @@ class StackingFaultMEPCommander():
         climbpoints : int, optional
             The expected number of maxima along the energy path.  Default value
             is 1.
+        timestep : float or None, optional
+            The timestep to use for the path relaxation.  If None (default),
+            the path's default timestep will be used.
+        tolerance : float or None, optional
+            The convergence tolerance for the path relaxation.  Both the relax
+            and climb phases stop early once the max coordinate displacement
+            per step drops below this value, so relaxsteps and climbsteps are
+            only upper limits.  If None (default), the path's default
+            tolerance will be used.
+        verbose : bool, optional
+            If True (default), the path relaxation will print informative
+            statements.
 
         Returns
         -------
@@ -310,7 +382,9 @@ class StackingFaultMEPCommander():
         idealpath = gamma.build_path(pos, ipoints)
         
         # Relax path and create fine interpolation
-        path = path.relax(relaxsteps, climbsteps, climbpoints=climbpoints)
+        path = path.relax(relaxsteps, climbsteps, climbpoints=climbpoints,
+                          timestep=timestep, tolerance=tolerance,
+                          verbose=verbose)
         ipath = path.interpolate_path(np.linspace(0.0, path.arccoord[-1], ipoints))
         
         # Create results DM
@@ -325,12 +399,137 @@ class StackingFaultMEPCommander():
         return results
 
 
+    def needs_mep(self, record) -> bool:
+        """
+        Checks if a record is missing MEP results that can be evaluated.
+
+        Parameters
+        ----------
+        record : iprPy.calculation.StackingFaultMap2D
+            A finished stacking fault record to check.
+
+        Returns
+        -------
+        bool
+            True if the record lacks slip-path results and has path settings
+            defined for its fault type.
+        """
+        calc = record.model['calculation-stacking-fault-map-2D']
+        if 'slip-path' in calc:
+            return False
+        return len(self.get_path_settings(record)) > 0
+
+    def checkpoint_file(self,
+                        checkpoint_directory: Union[str, Path],
+                        record,
+                        index: int) -> Path:
+        """
+        Gives the checkpoint file path for one of a record's slip paths.
+
+        Parameters
+        ----------
+        checkpoint_directory : str or Path
+            The directory where finished path results are saved.
+        record : iprPy.calculation.StackingFaultMap2D
+            The stacking fault record.
+        index : int
+            The index of the path in the record's path settings.
+
+        Returns
+        -------
+        pathlib.Path
+            The checkpoint file path.
+        """
+        return Path(checkpoint_directory, f'{record.name}-path-{index}.json')
+
+    def load_checkpoint(self,
+                        checkpoint_directory: Union[str, Path, None],
+                        record,
+                        index: int) -> Optional[DM]:
+        """
+        Loads a finished slip path result from a checkpoint file, if it exists.
+
+        Parameters
+        ----------
+        checkpoint_directory : str, Path or None
+            The directory where finished path results are saved.  If None, no
+            checkpoint will be loaded.
+        record : iprPy.calculation.StackingFaultMap2D
+            The stacking fault record.
+        index : int
+            The index of the path in the record's path settings.
+
+        Returns
+        -------
+        DataModelDict.DataModelDict or None
+            The saved slip path results, or None if not found.
+        """
+        if checkpoint_directory is None:
+            return None
+        checkpoint = self.checkpoint_file(checkpoint_directory, record, index)
+        if checkpoint.is_file():
+            return DM(checkpoint)['slip-path']
+        return None
+
+    def save_checkpoint(self,
+                        checkpoint_directory: Union[str, Path, None],
+                        record,
+                        index: int,
+                        slippath: DM):
+        """
+        Saves a finished slip path result to a checkpoint file.
+
+        Parameters
+        ----------
+        checkpoint_directory : str, Path or None
+            The directory where finished path results are saved.  If None,
+            nothing is saved.
+        record : iprPy.calculation.StackingFaultMap2D
+            The stacking fault record.
+        index : int
+            The index of the path in the record's path settings.
+        slippath : DataModelDict.DataModelDict
+            The slip path results to save.
+        """
+        if checkpoint_directory is None:
+            return
+        Path(checkpoint_directory).mkdir(parents=True, exist_ok=True)
+        checkpoint = self.checkpoint_file(checkpoint_directory, record, index)
+
+        # Write to a temp file first so partial files are never read back
+        tempfile = checkpoint.with_suffix('.json.tmp')
+        with open(tempfile, 'w', encoding='UTF-8') as f:
+            DM([('slip-path', slippath)]).json(fp=f)
+        tempfile.replace(checkpoint)
+
+    def clear_checkpoints(self,
+                          checkpoint_directory: Union[str, Path, None],
+                          record):
+        """
+        Deletes all checkpoint files associated with a record.
+
+        Parameters
+        ----------
+        checkpoint_directory : str, Path or None
+            The directory where finished path results are saved.  If None,
+            nothing is done.
+        record : iprPy.calculation.StackingFaultMap2D
+            The stacking fault record.
+        """
+        if checkpoint_directory is None:
+            return
+        for checkpoint in Path(checkpoint_directory).glob(f'{record.name}-path-*.json'):
+            checkpoint.unlink()
+
     def run_mep(self,
                 record,
                 npoints: int = 31,
                 ipoints: int = 1001,
                 relaxsteps: int = 500000,
-                climbsteps: int = 500000):
+                climbsteps: int = 500000,
+                timestep: Optional[float] = None,
+                tolerance: Optional[float] = None,
+                checkpoint_directory: Union[str, Path, None] = None):
         """
         Performs any needed MEP analyses and extracts any intrinsic stacking
         fault energies for a given calculation record.
@@ -351,6 +550,17 @@ class StackingFaultMEPCommander():
         climbsteps : int, optional
             The maximum number of steps to perform during the climbing phase of
             the mep evaluation.  Default value is 500000.
+        timestep : float or None, optional
+            The timestep to use for the path relaxation.  If None (default),
+            the path's default timestep will be used.
+        tolerance : float or None, optional
+            The convergence tolerance used to stop the relax and climb phases
+            early.  If None (default), the path's default tolerance will be
+            used.
+        checkpoint_directory : str, Path or None, optional
+            If given, each finished slip path will be saved to this directory
+            and any previously saved slip paths for the record will be reused
+            rather than recomputed.
 
         Returns
         -------
@@ -361,35 +571,79 @@ class StackingFaultMEPCommander():
             were found for the fault type therefore no MEPs were evaluated.
         """
         # Check if content already exists
-        calc = record.model['calculation-stacking-fault-map-2D']
-        if 'slip-path' in calc:
+        if not self.needs_mep(record):
             return False
         
         # Fetch path settings for the record
         path_settings = self.get_path_settings(record)
-        if len(path_settings) == 0:
-            return False
 
         print(record.name, flush=True)
 
-        self.add_intrinsic_fault_energy(record)
-
         gamma = record.gamma
-        for settings in path_settings:
-            slippath = self.mep_relax(gamma, settings['pos'], settings['direction'],
-                                      npoints=npoints, ipoints=ipoints,
-                                      relaxsteps=relaxsteps, climbsteps=climbsteps, 
-                                      climbpoints=settings['climbpoints'])
-            calc.append('slip-path', slippath)
+        slippaths = []
+        for i, settings in enumerate(path_settings):
+            slippath = self.load_checkpoint(checkpoint_directory, record, i)
+            if slippath is None:
+                slippath = self.mep_relax(gamma, settings['pos'], settings['direction'],
+                                          npoints=npoints, ipoints=ipoints,
+                                          relaxsteps=relaxsteps, climbsteps=climbsteps, 
+                                          climbpoints=settings['climbpoints'],
+                                          timestep=timestep, tolerance=tolerance)
+                self.save_checkpoint(checkpoint_directory, record, i, slippath)
+            slippaths.append(slippath)
+
+        self.add_mep_results(record, slippaths)
 
         return True
-    
+
+    def add_mep_results(self, record, slippaths: list):
+        """
+        Adds the intrinsic stacking fault energy and the evaluated slip paths
+        to a record's model contents.
+
+        Parameters
+        ----------
+        record : iprPy.calculation.StackingFaultMap2D
+            The stacking fault record to add the results to.
+        slippaths : list of DataModelDict.DataModelDict
+            The slip path results, ordered to match the record's path settings.
+        """
+        calc = record.model['calculation-stacking-fault-map-2D']
+        self.add_intrinsic_fault_energy(record)
+        for slippath in slippaths:
+            calc.append('slip-path', slippath)
+
+    def upload_records(self,
+                       records: list,
+                       checkpoint_directory: Union[str, Path, None] = None):
+        """
+        Updates a batch of modified records in the database and removes their
+        associated checkpoint files.
+
+        Parameters
+        ----------
+        records : list
+            The records with MEP results to update.
+        checkpoint_directory : str, Path or None, optional
+            The directory where finished path results are saved.  If given,
+            the checkpoint files for the records are deleted once uploaded.
+        """
+        for record in records:
+            self.database.update_record(record=record)
+            self.clear_checkpoints(checkpoint_directory, record)
+        records.clear()
+
     def runall_mep(self,
                    npoints: int = 31,
                    ipoints: int = 1001,
                    relaxsteps: int = 500000,
                    climbsteps: int = 500000,
-                   upload: bool = True):
+                   timestep: Optional[float] = None,
+                   tolerance: Optional[float] = None,
+                   upload: bool = True,
+                   upload_batch: int = 1,
+                   nprocs: int = 1,
+                   checkpoint_directory: Union[str, Path, None] = None):
         """
         Performs any needed MEP analyses and extracts any intrinsic stacking
         fault energies for all records identified when this commander object
@@ -409,12 +663,96 @@ class StackingFaultMEPCommander():
         climbsteps : int, optional
             The maximum number of steps to perform during the climbing phase of
             the mep evaluation.  Default value is 500000.
+        timestep : float or None, optional
+            The timestep to use for the path relaxation.  If None (default),
+            the path's default timestep will be used.
+        tolerance : float or None, optional
+            The convergence tolerance used to stop the relax and climb phases
+            early.  If None (default), the path's default tolerance will be
+            used.
         upload : bool, optional
             If True (default), the modified records will be automatically
             updated in the database as the calculations finish.
+        upload_batch : int, optional
+            The number of finished records to collect before updating them in
+            the database.  Default value is 1, i.e. each record is uploaded as
+            soon as it is finished.  Any remaining records are uploaded at the
+            end.
+        nprocs : int, optional
+            The number of processes to use.  If greater than 1, the individual
+            slip paths of all records are evaluated in parallel by a process
+            pool.  Default value is 1 (serial).
+        checkpoint_directory : str, Path or None, optional
+            If given, each finished slip path will be saved to this directory
+            so that an interrupted run can be restarted without recomputing
+            the finished paths.  Checkpoint files are deleted after the
+            associated record is uploaded.
         """
+        finished = []
+        
+        if nprocs <= 1:
+            for record in self.records:
+                updated = self.run_mep(record, npoints=npoints, ipoints=ipoints,
+                                       relaxsteps=relaxsteps, climbsteps=climbsteps,
+                                       timestep=timestep, tolerance=tolerance,
+                                       checkpoint_directory=checkpoint_directory)
+                if upload and updated:
+                    finished.append(record)
+                    if len(finished) >= upload_batch:
+                        self.upload_records(finished, checkpoint_directory)
+            if upload:
+                self.upload_records(finished, checkpoint_directory)
+            return
+
+        # Collect checkpointed paths and list the paths still to compute
+        slippaths = {}
+        jobs = []
         for record in self.records:
-            updated = self.run_mep(record, npoints=npoints, ipoints=ipoints,
-                                   relaxsteps=relaxsteps, climbsteps=climbsteps)
-            if upload and updated:
-                self.database.update_record(record=record)
\ No newline at end of file
+            if not self.needs_mep(record):
+                continue
+            path_settings = self.get_path_settings(record)
+            slippaths[record.name] = [None] * len(path_settings)
+            gamma_model = None
+            for i, settings in enumerate(path_settings):
+                slippath = self.load_checkpoint(checkpoint_directory, record, i)
+                if slippath is not None:
+                    slippaths[record.name][i] = slippath
+                    continue
+                if gamma_model is None:
+                    gamma_model = record.gamma.model()
+                jobs.append((record, i, (gamma_model, settings['pos'],
+                                         settings['direction'], npoints, ipoints,
+                                         relaxsteps, climbsteps,
+                                         settings['climbpoints'], timestep,
+                                         tolerance)))
+        
+        def finish(record):
+            """Adds results to a record once all of its paths are done"""
+            self.add_mep_results(record, slippaths.pop(record.name))
+            print(record.name, flush=True)
+            if upload:
+                finished.append(record)
+                if len(finished) >= upload_batch:
+                    self.upload_records(finished, checkpoint_directory)
+
+        # Handle records that were completely checkpointed
+        for record in self.records:
+            if record.name in slippaths and None not in slippaths[record.name]:
+                finish(record)
+
+        # Evaluate the remaining paths in parallel
+        with ProcessPoolExecutor(max_workers=nprocs) as executor:
+            futures = {executor.submit(mep_relax_job, *args): (record, i)
+                       for record, i, args in jobs}
+            
+            for future in as_completed(futures):
+                record, i = futures[future]
+                slippath = DM(future.result())['slip-path']
+                self.save_checkpoint(checkpoint_directory, record, i, slippath)
+                slippaths[record.name][i] = slippath
+
+                if None not in slippaths[record.name]:
+                    finish(record)
+        
+        if upload:
+            self.upload_records(finished, checkpoint_directory)
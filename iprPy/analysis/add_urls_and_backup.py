@@ -1,5 +1,8 @@
 # Standard Python libraries
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+import json
+from pathlib import Path
+from typing import Optional, Union
 import time
 
 from tqdm import tqdm
@@ -7,7 +10,7 @@ from tqdm import tqdm
 import requests
 
 from .. import load_calculation, load_database
-from ..tools import dict_insert
+from ..tools import dict_insert, record_digest
 
 def add_urls_and_backup(database,
                         calc_style: str,
@@ -16,6 +19,9 @@ def add_urls_and_backup(database,
                         copytar: bool = True,
                         dryrun: bool = False,
                         workspace: str = 'Global Public Workspace',
+                        batch_size: int = 100,
+                        max_workers: int = 4,
+                        manifest: Union[str, Path, None] = None,
                         ):
     """
     Adds the URL fields (and parent key fields) to finished/error calculations
@@ -49,6 +55,17 @@ def add_urls_and_backup(database,
     workspace : str, optional
         If any alt_databases are given that are of the cdcs style, then they
         will be assigned to this workspace.
+    batch_size : int, optional
+        The number of records to compare and save together.  Default value
+        is 100.
+    max_workers : int, optional
+        The number of threads to use for concurrently copying records and tars
+        to the alt_databases.  Default value is 4.
+    manifest : str, Path or None, optional
+        If given, the names and content digests of the records saved to each
+        database are recorded in this JSON file after each batch.  Rerunning
+        with the same manifest skips any records already saved with the same
+        content, allowing interrupted backups to be resumed.
     """
     
     # Set record_style and load calc object
@@ -76,7 +93,8 @@ def add_urls_and_backup(database,
         return changed_records
     
     save_records(changed_records, database, alt_databases=alt_databases,
-                 copytar=copytar, workspace=workspace)
+                 copytar=copytar, workspace=workspace, batch_size=batch_size,
+                 max_workers=max_workers, manifest=manifest)
 
 
 
@@ -176,9 +194,16 @@ def save_records(records,
                  database,
                  alt_databases: Optional[list] = None,
                  copytar: bool = True,
-                 workspace: str = 'Global Public Workspace'):
+                 workspace: str = 'Global Public Workspace',
+                 batch_size: int = 100,
+                 max_workers: int = 4,
+                 manifest: Union[str, Path, None] = None):
     """
-    Saves the changed records to one or more databases.
+    Saves the changed records to one or more databases.  Records are handled
+    in batches: for each alt_database, the batch's records are compared by
+    content digest to the versions already there and only the different ones
+    are copied concurrently.  The primary database is updated last for each
+    batch so that records are only marked as finished once backed up.
     """
 
     if alt_databases is None:
@@ -192,19 +217,107 @@ def save_records(records,
         else:
             workspaces.append(None)
 
-    for record in tqdm(records):
-        
-        # Copy to alt_databases first in case script crashes
-        for alt_database, workspace in zip(alt_databases, workspaces):
-            
-            if alt_database.style == 'cdcs':
-                copy_record_cdcs(alt_database, record, workspace)
-            else:
-                copy_record(database, alt_database, record, copytar)
+    # Load previously saved content from the manifest
+    saved = load_manifest(manifest)
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for i in tqdm(range(0, len(records), batch_size)):
+            batch = records[i:i + batch_size]
+            digests = {record.name: record_digest(record) for record in batch}
+
+            # Copy to alt_databases first in case script crashes
+            for alt_database, workspace in zip(alt_databases, workspaces):
+                dest_saved = saved.setdefault(str(alt_database), {})
                 
-        # Update in the primary database
-        database.update_record(record=record)
+                # Skip records already saved with the same content
+                pending = [record for record in batch
+                           if dest_saved.get(record.name) != digests[record.name]]
+                to_copy = diff_records(pending, alt_database, digests)
 
+                if alt_database.style == 'cdcs':
+                    futures = [executor.submit(copy_record_cdcs, alt_database, record, workspace)
+                               for record in to_copy]
+                else:
+                    futures = [executor.submit(copy_record, database, alt_database, record, copytar)
+                               for record in to_copy]
+                for future in futures:
+                    future.result()
+                
+                for record in pending:
+                    dest_saved[record.name] = digests[record.name]
+                save_manifest(manifest, saved)
+                    
+            # Update in the primary database
+            dest_saved = saved.setdefault(str(database), {})
+            for record in batch:
+                if dest_saved.get(record.name) != digests[record.name]:
+                    database.update_record(record=record)
+                    dest_saved[record.name] = digests[record.name]
+            save_manifest(manifest, saved)
+
+def diff_records(records: list,
+                 database,
+                 digests: Optional[dict] = None) -> list:
+    """
+    Identifies which records are missing from a database or have different
+    content there.  The existing versions are retrieved with a single query
+    per record style.
+
+    Parameters
+    ----------
+    records : list
+        The records to check.
+    database : iprPy.database.Database
+        The database to compare against.
+    digests : dict, optional
+        Precomputed content digests of the records keyed by record name.
+
+    Returns
+    -------
+    list
+        The records from the given list that are missing or different.
+    """
+    if len(records) == 0:
+        return []
+    if digests is None:
+        digests = {record.name: record_digest(record) for record in records}
+
+    # Group names by record style to limit queries
+    names = {}
+    for record in records:
+        names.setdefault(record.style, []).append(record.name)
+
+    dest_digests = {}
+    for style, stylenames in names.items():
+        for dest_record in database.get_records(style, name=stylenames):
+            dest_digests[dest_record.name] = record_digest(dest_record)
+    
+    return [record for record in records
+            if dest_digests.get(record.name) != digests[record.name]]
+
+def load_manifest(manifest: Union[str, Path, None]) -> dict:
+    """
+    Loads the names and digests of saved records from a manifest file.
+    Returns an empty dict if manifest is None or the file does not exist.
+    """
+    if manifest is None or not Path(manifest).is_file():
+        return {}
+    with open(manifest, encoding='UTF-8') as f:
+        return json.load(f)
+
+def save_manifest(manifest: Union[str, Path, None],
+                  saved: dict):
+    """
+    Saves the names and digests of saved records to a manifest file.  Does
+    nothing if manifest is None.
+    """
+    if manifest is None:
+        return
+    manifest = Path(manifest)
+    tempfile = manifest.with_name(manifest.name + '.tmp')
+    with open(tempfile, 'w', encoding='UTF-8') as f:
+        json.dump(saved, f)
+    tempfile.replace(manifest)
 
 def copy_record(database, alt_database, record, copytar):
     """
@@ -1,6 +1,8 @@
 # coding: utf-8
 
 # Standard Python libraries
+from pathlib import Path
+from typing import Union
 
 # http://www.numpy.org/
 import numpy as np
@@ -10,7 +12,12 @@ import pandas as pd
 
 from ..database.IprPyDatabase import IprPyDatabase
 
+potkeys = ['potential_LAMMPS_key', 'potential_key',
+           'potential_LAMMPS_id', 'potential_id']
+
 def get_isolated_atom_energies(database: IprPyDatabase,
+                               iso_energy_csv: Union[str, Path, None] = None,
+                               refresh: bool = False,
                                verbose: bool = False
                                ) -> pd.DataFrame:
     """
@@ -18,7 +25,7 @@ def get_isolated_atom_energies(database: IprPyDatabase,
     LAMMPS potential and symbol model, which can then be used to convert
     measured potential energies into cohesive energies.  This uses finished
     results from both isolated_atom and diatom_scan calculations.
-    
+
     Details:
     - The isolated_atom calculation directly computes the energy of
       non-interacting particles for each symbol.
@@ -34,6 +41,13 @@ def get_isolated_atom_energies(database: IprPyDatabase,
     ----------
     database : IprPyDatabase
         The database to search for isolated_atom and diatom_scan results.
+    iso_energy_csv : str, Path or None, optional
+        If given, the table will be loaded from this csv file if it exists
+        rather than being recomputed.  Newly computed tables are saved to the
+        file.
+    refresh : bool, optional
+        If True, the table will be recomputed and saved to iso_energy_csv
+        even if the file already exists.  Default value is False.
     verbose : bool, optional
         Setting this to True will print informative messages.
 
@@ -43,82 +57,112 @@ def get_isolated_atom_energies(database: IprPyDatabase,
         The table of isolated atom energies for each LAMMPS potential and
         symbol model.
     """
+    # Load cached table
+    if iso_energy_csv is not None and not refresh and Path(iso_energy_csv).exists():
+        results_df = pd.read_csv(iso_energy_csv)
+        if verbose:
+            print(len(results_df), 'isolated atom energies loaded from', iso_energy_csv)
+        return results_df
+
     # Get isolated atom results
-    records = database.get_records('calculation_isolated_atom', status='finished')
-    if len(records) == 0:
+    records_df = database.get_records_df('calculation_isolated_atom', status='finished')
+    if len(records_df) == 0:
         raise ValueError('No finished isolated atom results found!')
 
     if verbose:
-        print(len(records), 'finished isolated atom results loaded')
-    
-    results1_df = []
-    for record in records:
-
-        # Extract values by symbol
-        for symbol, energy in record.isolated_atom_energy.items():
-            data = {}
-            data['potential_LAMMPS_id'] = record.potential.potential_LAMMPS_id
-            data['potential_LAMMPS_key'] = record.potential.potential_LAMMPS_key
-            data['potential_id'] = record.potential.potential_id
-            data['potential_key'] = record.potential.potential_key
-            data['symbol'] = symbol
-            data['isolated_atom_energy'] = energy
-            results1_df.append(data)
-
-    results1_df = pd.DataFrame(results1_df)
+        print(len(records_df), 'finished isolated atom results loaded')
+
+    # Extract values by symbol
+    energies = records_df.isolated_atom_energy.apply(lambda x: list(x.items())).explode().dropna()
+    results1_df = records_df.loc[energies.index, potkeys]
+    results1_df['symbol'] = energies.str[0].values
+    results1_df['isolated_atom_energy'] = energies.str[1].astype(float).values
 
     # Get diatom_scan results
-    records = database.get_records('calculation_diatom_scan', status='finished')
-    if len(records) == 0:
+    records_df = database.get_records_df('calculation_diatom_scan', status='finished')
+    if len(records_df) == 0:
         raise ValueError('No finished diatom scan results found!')
-    
+
     if verbose:
-        print(len(records), 'finished  diatom scan results loaded')
-    
-    results2_df = []
-    for record in records:
-
-        # Skip cross interaction results
-        if record.symbols[0] != record.symbols[1]:
-            continue
-
-        data = {}
-        data['potential_LAMMPS_id'] = record.potential.potential_LAMMPS_id
-        data['potential_LAMMPS_key'] = record.potential.potential_LAMMPS_key
-        data['potential_id'] = record.potential.potential_id
-        data['potential_key'] = record.potential.potential_key
-        data['symbol'] = record.symbols[0]
-
-        # Search for common cutoff energy
-        try:
-            e = record.energy_values[record.r_values > 2.0]
-            ii = np.where(e[1:] - e[:-1] == 0)[0][0]
-        except:
-            data['diatom_cutoff_energy'] = np.nan
-        else:
-            data['diatom_cutoff_energy'] = e[ii] / 2
-        results2_df.append(data)
-
-    results2_df = pd.DataFrame(results2_df)
+        print(len(records_df), 'finished  diatom scan results loaded')
+
+    # Skip cross interaction results
+    symbols = records_df.symbols.str.split()
+    records_df = records_df[symbols.str[0] == symbols.str[1]]
+
+    results2_df = records_df[potkeys].copy()
+    results2_df['symbol'] = symbols[records_df.index].str[0]
+    results2_df['diatom_cutoff_energy'] = diatom_cutoff_energies(
+        records_df.r_values.tolist(), records_df.energy_values.tolist())
 
     # Merge into a single dataframe
-    mergekeys = ['potential_LAMMPS_key', 'potential_key',
-                 'potential_LAMMPS_id', 'potential_id', 'symbol']
+    mergekeys = potkeys + ['symbol']
     results_df = pd.merge(results1_df, results2_df, on=mergekeys)
-    
-    # Relace values where where diatom cutoff is reached and is different 
-    usediatom = (~pd.isna(results_df.diatom_cutoff_energy) & 
+
+    # Relace values where where diatom cutoff is reached and is different
+    usediatom = (~pd.isna(results_df.diatom_cutoff_energy) &
                  ~np.isclose(results_df.isolated_atom_energy,
                              results_df.diatom_cutoff_energy,
                              atol=0.0, rtol=1e-8))
-    
+
     if verbose:
         print('different energies found for:')
         for potential_LAMMPS_id in results_df[usediatom].potential_LAMMPS_id:
             print(potential_LAMMPS_id)
         print('using diatom_cutoff values for those implementations')
-    
+
     results_df.loc[usediatom, 'isolated_atom_energy'] = results_df.loc[usediatom, 'diatom_cutoff_energy']
     del results_df['diatom_cutoff_energy']
 
-    return results_df.sort_values(['potential_LAMMPS_id', 'symbol']).reset_index(drop=True)
\ No newline at end of file
+    results_df = results_df.sort_values(['potential_LAMMPS_id', 'symbol']).reset_index(drop=True)
+
+    # Save cached table
+    if iso_energy_csv is not None:
+        results_df.to_csv(iso_energy_csv, index=False)
+
+    return results_df
+
+def diatom_cutoff_energies(r_values: list,
+                           energy_values: list,
+                           rmin: float = 2.0) -> np.ndarray:
+    """
+    Searches multiple diatom_scan energy curves at once for the cutoff energy
+    plateau, i.e. the first pair of neighboring values at r > rmin that have
+    identical energies.
+
+    Parameters
+    ----------
+    r_values : list of array-like
+        The r values for each diatom_scan.  Scans can have different lengths.
+    energy_values : list of array-like
+        The energy values for each diatom_scan.
+    rmin : float, optional
+        Only r values larger than this are searched.  Default value is 2.0.
+
+    Returns
+    -------
+    numpy.ndarray
+        The per-atom cutoff energy, i.e. half the plateau energy, for each
+        scan.  Values are NaN where no plateau was found.
+    """
+    if len(energy_values) == 0:
+        return np.empty(0)
+
+    # Stack the curves into NaN-padded 2D arrays
+    lengths = np.array([len(e) for e in energy_values])
+    ncols = max(lengths.max(), 2)
+    mask = np.arange(ncols) < lengths[:, np.newaxis]
+    r = np.full(mask.shape, np.nan)
+    e = np.full(mask.shape, np.nan)
+    r[mask] = np.concatenate(r_values)
+    e[mask] = np.concatenate(energy_values)
+
+    # Identify neighboring equal energies where both points are above rmin
+    with np.errstate(invalid='ignore'):
+        plateau = (r[:, :-1] > rmin) & (e[:, 1:] - e[:, :-1] == 0)
+    found = plateau.any(axis=1)
+    index = np.argmax(plateau, axis=1)
+
+    energy = np.full(len(energy_values), np.nan)
+    energy[found] = e[found, index[found]] / 2
+    return energy
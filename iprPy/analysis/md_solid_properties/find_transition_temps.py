@@ -1,7 +1,7 @@
 from typing import Union
 from pathlib import Path
+import warnings
 
-from tqdm import tqdm
 import numpy as np
 import matplotlib.pyplot as plt
 import pandas as pd
@@ -59,35 +59,17 @@ def find_transition_temps(database,
     keys = np.unique(results_df[results_df['T (K)'] == search_temp].relaxed_crystal_key.values)
 
     # Filter out the crystals that already have a transition temp value
-    relaxed_crystal_keys = []
-    for key in keys:
-        if transition_temp[key] == noval:
-            relaxed_crystal_keys.append(key)
+    relaxed_crystal_keys = [key for key in keys if transition_temp[key] == noval]
     print(len(relaxed_crystal_keys), 'crystals to investigate')
 
-    # Iterate over the crystals
-    num_temps_found = 0
-    for relaxed_crystal_key in tqdm(relaxed_crystal_keys):
-        crystal_results_df = results_df[results_df.relaxed_crystal_key == relaxed_crystal_key].sort_values('T (K)')
-        T = crystal_results_df['T (K)'].values
-        H = crystal_results_df['H (eV/atom)'].values
-        a = crystal_results_df['a'].values
-        b = crystal_results_df['b'].values
-        c = crystal_results_df['c'].values
-        
-        # Guess the transition temp based on the different properties
-        indices = [
-            guess_transition_index(H, threshold=threshold),
-            guess_transition_index(a, threshold=threshold),
-            guess_transition_index(b, threshold=threshold),
-            guess_transition_index(c, threshold=threshold)
-        ]
-        
-        # Update the transition temp if a transition is found
-        if not np.all(np.isnan(indices)):
-            T_trans = T[int(np.nanmin(indices))]
-            transition_temp[relaxed_crystal_key] = T_trans
-            num_temps_found += 1
+    # Guess the transition temps for all crystals at once
+    crystal_results_df = results_df[results_df.relaxed_crystal_key.isin(relaxed_crystal_keys)]
+    T_trans = guess_transition_temps(crystal_results_df, threshold=threshold)
+    T_trans = T_trans[T_trans.notna()]
+
+    # Update the transition temps that were found
+    transition_temp.update(T_trans.to_dict())
+    num_temps_found = len(T_trans)
 
     print(num_temps_found, 'transition temperatures identified')
 
@@ -214,6 +196,104 @@ def guess_transition_index(v, threshold=0.01, method='forward'):
     return index
 
 
+def guess_transition_indices(v, threshold=0.01):
+    """
+    Vectorized version of guess_transition_index(method='forward') that
+    operates on multiple property series at once.
+
+    Parameters
+    ----------
+    v : numpy.ndarray
+        2D array where each row is a property series ordered by temperature.
+        Series shorter than the number of columns should be padded at the end
+        with NaN.
+    threshold : float, optional
+        The error threshold to use for identifying likely transition points.
+
+    Returns
+    -------
+    index : numpy.ndarray
+        The guessed transition index for each row, with NaN for rows where
+        no transition was found.
+    """
+    v = np.asarray(v, dtype=float)
+    nrows, ncols = v.shape
+
+    error = np.zeros_like(v)
+    if ncols > 2:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pred = 2 * v[:, 1:-1] - v[:, :-2]
+            error[:, 2:] = np.abs( (v[:, 2:] - pred) / v[:, 2:] )
+    
+    # NaN errors compare False so padded values are never flagged
+    flagged = error > threshold
+    found = flagged.any(axis=1)
+    index = np.argmax(flagged, axis=1).astype(float)
+
+    # One peak at lowest index implies transition already occured
+    if ncols > 3:
+        early = (index == 2) & ~flagged[:, 3]
+    else:
+        early = index == 2
+    index[early] = 1
+
+    index[~found] = np.nan
+    return index
+
+def guess_transition_temps(results_df, threshold=0.01,
+                           properties=('H (eV/atom)', 'a', 'b', 'c')):
+    """
+    Guesses the transition temperatures for all relaxed crystals in a
+    md_solid_properties dataframe in one pass.  The dataframe is sorted once
+    and the values are arranged into 2D crystal x temperature arrays so that
+    the extrapolation errors for all crystals and properties are computed
+    together.
+
+    Parameters
+    ----------
+    results_df : pandas.DataFrame
+        The md_solid_properties records dataframe.
+    threshold : float, optional
+        The error threshold to use for identifying likely transition points.
+    properties : tuple, optional
+        The property columns to check for transitions.
+    
+    Returns
+    -------
+    pandas.Series
+        The guessed transition temperatures indexed by relaxed_crystal_key.
+        Values are NaN for crystals where no transition was found.
+    """
+    if len(results_df) == 0:
+        return pd.Series(dtype=float, name='T_trans')
+    
+    df = results_df.sort_values(['relaxed_crystal_key', 'T (K)'])
+
+    # Map each record to a (crystal, temperature step) position
+    keys, row = np.unique(df.relaxed_crystal_key.values, return_inverse=True)
+    col = df.groupby('relaxed_crystal_key', sort=False).cumcount().values
+    shape = (len(keys), col.max() + 1)
+
+    T = np.full(shape, np.nan)
+    T[row, col] = df['T (K)'].values
+
+    indices = np.empty((len(properties),) + shape[:1])
+    for i, prop in enumerate(properties):
+        v = np.full(shape, np.nan)
+        v[row, col] = df[prop].values
+        indices[i] = guess_transition_indices(v, threshold=threshold)
+    
+    # Transition is the lowest index found by any property
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', category=RuntimeWarning)
+        index = np.nanmin(indices, axis=0)
+    
+    T_trans = np.full(len(keys), np.nan)
+    found = ~np.isnan(index)
+    T_trans[found] = T[found, index[found].astype(int)]
+
+    return pd.Series(T_trans, index=keys, name='T_trans')
+
 def plot_H(df, relaxed_crystal_key, T_trans):
 
     T = df['T (K)'].values
@@ -74,6 +74,11 @@ def process_at_temp(database,
                                                potential_LAMMPS_id=potential_LAMMPS_id)
     if verbose:
         print(len(results), 'md_solid_properties records found', flush=True)
+
+    # Every new record needs a 0K md_solid_properties parent
+    if len(results_df) == 0:
+        return 0, 0
+    if verbose:
         print(len(results[results_df.method.isin(['at_temp', 'at_temp_50K'])]), 'are at_temp(_50K)')
 
     # Fetch finished relax_dynamic:at_temp(_50K) results 
@@ -83,6 +88,8 @@ def process_at_temp(database,
                                                 potential_LAMMPS_id=potential_LAMMPS_id)
     if verbose:
         print(len(relaxes), 'relax_dynamic:at_temp(_50K) records found', flush=True)
+    if len(relaxes_df) == 0:
+        return 0, 0
 
     # Fetch finished free_energy results 
     free_energies, free_energies_df = database.get_records('calculation_free_energy', return_df=True, 
@@ -101,6 +108,15 @@ def process_at_temp(database,
 
 
 
+    # Build lookup tables once rather than filtering the dataframes per record
+    zeroK_df = results_df[results_df.method == '0K']
+    zeroK_counts = zeroK_df.relaxed_crystal_key.value_counts()
+    zeroK_natoms = zeroK_df.drop_duplicates('relaxed_crystal_key').set_index('relaxed_crystal_key').natoms
+    result_index = group_index(results_df, 'relax_dynamic_key')
+    cij_index = group_index(cijs_df, 'parent_key')
+    free_energy_index = group_index(free_energies_df, 'parent_key')
+    child_index = group_index(relaxes_df, 'parent_key')
+
     count_add = 0
     count_update = 0
 
@@ -117,13 +133,13 @@ def process_at_temp(database,
         relaxed_crystal_key = relaxes_df.loc[index, 'parent_key']
         
         # Find the associated 0K md_solid_properties to get the correct natoms
-        parent_df = results_df[(results_df.relaxed_crystal_key == relaxed_crystal_key) & (results_df.method == '0K')]
-        if len(parent_df) == 0:
+        num_parents = zeroK_counts.get(relaxed_crystal_key, 0)
+        if num_parents == 0:
             print(f'No 0K md_solid_results found for relaxed_crystal key {relaxed_crystal_key}, relax_dynamic key {relax.key}!')
             continue
-        elif len(parent_df) > 1:
+        elif num_parents > 1:
             raise ValueError(f'Multiple 0K results with relaxed_crystal key {relaxed_crystal_key}!')
-        natoms = results_df.loc[parent_df.index[0], 'natoms']
+        natoms = zeroK_natoms[relaxed_crystal_key]
         
         
         
@@ -133,10 +149,7 @@ def process_at_temp(database,
             updated = False
 
             # Search for an existing md_solid_properties record
-            match = results_df[
-                #(results_df.potential_LAMMPS_key == relax.potential.potential_LAMMPS_key) &
-                #(results_df.potential_key == relax.potential.potential_key) &
-                (results_df.relax_dynamic_key == relax.key)]
+            match = result_index.get(relax.key, [])
 
             if len(match) == 0:
                 # Create a new md_solid_properties record and add crystal info
@@ -147,17 +160,17 @@ def process_at_temp(database,
 
             elif len(match) == 1:
                 # Get an existing md_solid_properties record
-                solid = results[match.index[0]]
+                solid = results[match[0]]
 
             else:
                 raise ValueError('Multiple matches!!!')
 
             # Add Cij values if they exist and are not already in the md_solid_properties
             if solid.C is None:
-                match = cijs_df[cijs_df.parent_key == relax.key]
+                match = cij_index.get(relax.key, [])
 
                 if len(match) == 1:
-                    cij = cijs[match.index[0]]
+                    cij = cijs[match[0]]
                     solid.extract_elastic_constants(cij)
                     updated = True
                 elif len(match) > 1:
@@ -165,10 +178,10 @@ def process_at_temp(database,
 
             # Add free energy values if they exist and are not already in the md_solid_properties
             if solid.gibbs is None:
-                match = free_energies_df[free_energies_df.parent_key == relax.key]
+                match = free_energy_index.get(relax.key, [])
 
                 if len(match) == 1:
-                    free_energy = free_energies[match.index[0]]
+                    free_energy = free_energies[match[0]]
                     solid.extract_free_energy(free_energy)
                     updated = True
                 elif len(match) > 1:
@@ -186,17 +199,38 @@ def process_at_temp(database,
             
             
             # Find the next relaxation calculation in line
-            child_df = relaxes_df[relaxes_df.parent_key == relax.key]
-            if len(child_df) == 0:
+            children = child_index.get(relax.key, [])
+            if len(children) == 0:
                 relax = None
-            elif len(child_df) > 1:
+            elif len(children) > 1:
                 raise ValueError(f'Multiple children of {relax.key}!!!')
             else:
-                relax = relaxes[child_df.index[0]]
+                relax = relaxes[children[0]]
                 
 
     if verbose:
         print(count_add, 'records added')
         print(count_update, 'records updated')
 
-    return count_add, count_update
\ No newline at end of file
+    return count_add, count_update
+
+def group_index(df: pd.DataFrame, key: str) -> dict:
+    """
+    Builds a dict that maps each unique value of a dataframe column to the
+    list of dataframe indices where it appears.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        The dataframe to index.
+    key : str
+        The column name to group by.
+
+    Returns
+    -------
+    dict
+        The lists of indices keyed by the column values.
+    """
+    if len(df) == 0 or key not in df:
+        return {}
+    return {k: list(v) for k, v in df.groupby(key, sort=False).groups.items()}
\ No newline at end of file
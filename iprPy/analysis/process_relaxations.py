@@ -29,6 +29,7 @@ from . import match_reference_prototype, get_isolated_atom_energies
 
 def process_all_relaxations(database: IprPyDatabase,
                             csv_root_dir: Optional[Path] = None,
+                            iso_energy_csv: Optional[Path] = None,
                             verbose: bool = False):
     """
     Process relaxation and crystal space group results for all potentials
@@ -38,6 +39,12 @@ def process_all_relaxations(database: IprPyDatabase,
     ----------
     database : iprPy.database.IprPyDatabase
         The database to access (if needed).
+    csv_root_dir : path, optional
+        Gives the root directory path where csv files of the collected structure
+        data is saved to.
+    iso_energy_csv : path, optional
+        A csv file where the isolated atom energies table is cached.  If the
+        file exists, the table is loaded from it rather than recomputed.
     verbose : bool, optional
         Additional informative print statements will be generated if verbose is
         set to True.
@@ -71,7 +78,7 @@ def process_all_relaxations(database: IprPyDatabase,
     ref_proto_df = match_reference_prototype(database, all_spg_df=all_spg_df)
     print(len(ref_proto_df), 'reference-prototype relations found')
     
-    iso_energy_df = get_isolated_atom_energies(database)
+    iso_energy_df = get_isolated_atom_energies(database, iso_energy_csv=iso_energy_csv)
     print(len(iso_energy_df), 'isolated atom energies compiled')
     
     ############# identify all unique potentials in the results ###############
@@ -142,6 +149,7 @@ def process_relaxations(database: IprPyDatabase,
                         all_dynamic_df: Optional[pd.DataFrame] = None,
                         all_spg_df: Optional[pd.DataFrame] = None,
                         csv_root_dir: Optional[Path] = None,
+                        iso_energy_csv: Optional[Path] = None,
                         verbose: bool = False):
     """
     Checks and processes relaxation calculations for a given interatomic
@@ -182,6 +190,12 @@ def process_relaxations(database: IprPyDatabase,
     all_spg_df : pandas.DataFrame, optional
         The metadata for all crystal_space_group calculation records.  If not
         given, a fresh query to the database will be performed.
+    csv_root_dir : path, optional
+        Gives the root directory path where csv files of the collected structure
+        data is saved to.
+    iso_energy_csv : path, optional
+        A csv file where the isolated atom energies table is cached.  Only
+        used if iso_energy_df is not given.
     verbose : bool, optional
         Additional informative print statements will be generated if verbose is
         set to True.
@@ -194,6 +208,10 @@ def process_relaxations(database: IprPyDatabase,
     """
 
 
+    # Get isolated atom energies if needed
+    if iso_energy_df is None:
+        iso_energy_df = get_isolated_atom_energies(database, iso_energy_csv=iso_energy_csv)
+
     # Extract values from potential
     potential_LAMMPS_key = potential.key
     potential_key = potential.potkey
@@ -1014,20 +1032,24 @@ def calculate_cohesive_energy(database: IprPyDatabase,
         iso_energy_df = get_isolated_atom_energies(database)
 
 
-    def ecoh(series, iso_energy_df):
+    # Index energies by potential_LAMMPS_key and symbol
+    iso_energy = iso_energy_df.drop_duplicates(['potential_LAMMPS_key', 'symbol'])
+    iso_energy = dict(zip(zip(iso_energy.potential_LAMMPS_key, iso_energy.symbol),
+                          iso_energy.isolated_atom_energy))
+
+    def ecoh(series, iso_energy):
 
         # Compute base_energy
         counts = np.unique(series.ucell.atoms.atype, return_counts=True)[1]
         base_energy = 0
         for symbol, count in zip(series.ucell.symbols, counts):
-            E = iso_energy_df[(iso_energy_df.potential_LAMMPS_key == series.potential_LAMMPS_key) &
-                            (iso_energy_df.symbol == symbol)].isolated_atom_energy.values[0]
+            E = iso_energy[(series.potential_LAMMPS_key, symbol)]
             base_energy += E * count
         base_energy = base_energy / series.ucell.natoms
         
         return series.E_pot - base_energy
 
-    relax_df['E_coh'] = relax_df.apply(ecoh, axis=1, args=[iso_energy_df])
+    relax_df['E_coh'] = relax_df.apply(ecoh, axis=1, args=[iso_energy])
 
 def save_csv(potential,
              relax_df: pd.DataFrame,
@@ -81,6 +81,7 @@ class Calculation(Record):
         self.__status = 'not calculated'
         self.__error = None
         self.__url = None
+        self.__reference_cache = None
 
         # Link to database
         self.database = database
@@ -191,6 +192,23 @@ class Calculation(Record):
         """str or None : Any error message generated by the calculation"""
         return self.__error
 
+    @property
+    def reference_cache(self) -> Optional[str]:
+        """
+        str or None : The directory of the shared reference cache that the
+        calculation uses for reference results.  If None, the
+        IPRPY_REFERENCE_CACHE environment variable is used if set.  An empty
+        string disables the cache.
+        """
+        return self.__reference_cache
+
+    @reference_cache.setter
+    def reference_cache(self, value: Union[str, Path, None]):
+        if value is None:
+            self.__reference_cache = None
+        else:
+            self.__reference_cache = str(value)
+
     @property
     def parent_module(self) -> str:
         """str : Name of the module where the calculation's code is located"""
@@ -787,7 +805,8 @@ class Calculation(Record):
             newkey: bool = False,
             results_json: bool = False,
             raise_error: bool = False,
-            verbose: bool = False):
+            verbose: bool = False,
+            reference_cache: Union[str, Path, None] = None):
         """
         Runs the calculation using the current object attribute values or
         supplied parameters. Status after running will be either "finished"
@@ -814,6 +833,9 @@ class Calculation(Record):
         verbose : bool, optional
             If True, a message relating to the calculation's status will be
             printed upon completion.  Default value is False.
+        reference_cache : str or Path, optional
+            The directory of the shared reference cache for calculations that
+            use one.  If not given, the current reference_cache value is kept.
         """
         # Clean record back to not calculated state
         self.clean()
@@ -830,6 +852,9 @@ class Calculation(Record):
         if params is not None:
             self.load_parameters(params)
 
+        if reference_cache is not None:
+            self.reference_cache = reference_cache
+
         # Build calculation inputs
         input_dict = self.calc_inputs()
 
@@ -0,0 +1,122 @@
+# coding: utf-8
+
+# Standard Python libraries
+from importlib import import_module
+import sys
+import time
+from typing import Optional
+
+class LazyStyle():
+    """
+    Placeholder for a modular class that is registered with one or more
+    ModuleManagers but only imported when first used.  Calling the
+    placeholder or accessing its attributes imports the class, replaces the
+    placeholder in the managers' loaded_styles with the class, and forwards
+    the call/attribute to it.  Import failures are moved to the managers'
+    failed_styles.
+    """
+
+    def __init__(self,
+                 modulename: str,
+                 package: Optional[str] = None,
+                 classname: Optional[str] = None,
+                 managers: Optional[list] = None):
+        """
+        Creates a LazyStyle object.
+
+        Parameters
+        ----------
+        modulename : str
+            The name of the module containing the class.
+        package : str, optional
+            The name of the package which is to act as the anchor for resolving
+            relative package names.
+        classname : str, optional
+            The name of the class in the imported module.  If not given, the
+            first name in the module's __all__ is used.
+        managers : list, optional
+            (manager, style) pairs for each ModuleManager and associated style
+            name that the class is registered with.
+        """
+        self.modulename = modulename
+        self.package = package
+        self.classname = classname
+        self.managers = []
+        self.obj = None
+        self.import_time = None
+        self.error = None
+
+        if managers is not None:
+            for manager, style in managers:
+                self.register(manager, style)
+
+    def __repr__(self) -> str:
+        modulename = self.modulename
+        if self.package is not None and modulename.startswith('.'):
+            modulename = self.package + modulename
+        return f'<LazyStyle {modulename} (not imported)>'
+
+    def register(self, manager, style: str):
+        """
+        Adds the placeholder to a ModuleManager's loaded_styles.
+
+        Parameters
+        ----------
+        manager : yabadaba.tools.ModuleManager
+            The manager to register with.
+        style : str
+            The style name to register as.
+        """
+        self.managers.append((manager, style))
+        manager.loaded_styles[style] = self
+
+    def load(self):
+        """
+        Imports the class, if not already done, and updates the managers.
+
+        Returns
+        -------
+        class
+            The imported class.
+
+        Raises
+        ------
+        ImportError
+            If the class failed to import.
+        """
+        if self.obj is not None:
+            return self.obj
+        if self.error is not None:
+            raise ImportError(self.error)
+
+        start = time.perf_counter()
+        try:
+            module = import_module(self.modulename, package=self.package)
+            classname = self.classname
+            if classname is None:
+                classname = module.__all__[0]
+            obj = getattr(module, classname)
+        
+        except Exception:
+            self.import_time = time.perf_counter() - start
+            self.error = '%s: %s' % sys.exc_info()[:2]
+            for manager, style in self.managers:
+                del manager.loaded_styles[style]
+                manager.failed_styles[style] = self.error
+            raise ImportError(self.error)
+        
+        self.import_time = time.perf_counter() - start
+        self.obj = obj
+        for manager, style in self.managers:
+            manager.loaded_styles[style] = obj
+
+        return obj
+
+    def __call__(self, *args, **kwargs):
+        return self.load()(*args, **kwargs)
+
+    def __getattr__(self, name: str):
+        # Do not forward special names, e.g. during copying/unpickling
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return getattr(self.load(), name)
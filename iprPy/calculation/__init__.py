@@ -1,7 +1,7 @@
 from io import IOBase
-import sys
+import json
 from pathlib import Path
-from importlib import import_module, resources
+from importlib import resources
 from typing import Optional, Union
 
 from yabadaba.tools import ModuleManager, is_uuid
@@ -10,36 +10,59 @@ calculationmanager = ModuleManager('Calculation')
 from .. import recordmanager
 
 from .Calculation import Calculation
-
-__all__ = ['Calculation', 'calculationmanager', 'load_calculation']
-
-# Define subfolders to ignore
-ignorelist = ['__pycache__', 'subsets']
-
-# Dynamically import calculation styles
-for style in resources.contents(__name__):
-
-    # Only import subfolders not in ignorelist
-    if '.' not in style and style not in ignorelist:
+from .LazyStyle import LazyStyle
+
+__all__ = ['Calculation', 'calculationmanager', 'load_calculation',
+           'load_all_calculations', 'import_times']
+
+# Read the static manifest of calculation styles
+if hasattr(resources, 'files'):
+    manifest = resources.files(__name__).joinpath('calculation_styles.json').read_text(encoding='UTF-8')
+else:
+    manifest = resources.read_text(__name__, 'calculation_styles.json', encoding='UTF-8')
+manifest = json.loads(manifest)
+
+# Register calculation styles to be imported when first used.  Styles known
+# to be unavailable are registered as failed without importing them
+lazystyles = {}
+for style, info in manifest.items():
+    if info.get('error', None) is not None:
+        calculationmanager.failed_styles[style] = info['error']
+        recordmanager.failed_styles[f'calculation_{style}'] = info['error']
+        continue
+    lazystyles[style] = LazyStyle(info['module'], package=__name__,
+                                  classname=info['classname'],
+                                  managers=[(calculationmanager, style),
+                                            (recordmanager, f'calculation_{style}')])
+
+def load_all_calculations():
+    """
+    Imports all registered calculation styles that have not yet been
+    imported.  Styles that fail to import are moved to the managers'
+    failed_styles.
+    """
+    for lazystyle in lazystyles.values():
         try:
-            # Try importing calculation
-            module = import_module(f'.{style}', __name__)
-            classname = module.__all__[0]
-            classmodule = getattr(module, classname)
-            
-        except Exception as e:
-            # Add failed imports to managers
-            recordmanager.failed_styles[f'calculation_{style}'] = '%s: %s' % sys.exc_info()[:2]
-            calculationmanager.failed_styles[style] = '%s: %s' % sys.exc_info()[:2]
+            lazystyle.load()
+        except ImportError:
+            pass
 
-        else:
-            # Add successful imports to managers
-            recordmanager.loaded_styles[f'calculation_{style}'] = classmodule
-            calculationmanager.loaded_styles[style] = classmodule
+def import_times() -> dict:
+    """
+    Gives the time spent importing each calculation style.
+
+    Returns
+    -------
+    dict
+        The import times in seconds keyed by style name.  Styles that have
+        not been imported yet have values of None.
+    """
+    return {style: lazystyle.import_time for style, lazystyle in lazystyles.items()}
 
 def load_calculation(style, **kwargs):
     """
-    Loads a Calculation subclass associated with a given calculation style
+    Loads a Calculation subclass associated with a given calculation style.
+    The style's module is imported the first time it is loaded.
 
     Parameters
     ----------
@@ -89,7 +89,7 @@ def baintransformation(lammps_command, a_bcc, a_fcc, symbol, sizemults, potentia
     lammps_units = lmp.style.unit(potential.units)
     
     # Get lammps version date
-    lammps_date = lmp.checkversion(lammps_command)['date']
+    lammps_date = iprPy.tools.checkversion(lammps_command)['date']
     
     # Get lammps template
     template_file = 'min.template'
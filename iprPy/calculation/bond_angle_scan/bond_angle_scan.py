@@ -15,7 +15,7 @@ from DataModelDict import DataModelDict as DM
 import atomman as am
 import atomman.lammps as lmp
 import atomman.unitconvert as uc
-from atomman.tools import filltemplate
+from ...tools import filltemplate
 
 # iprPy imports
 from ...tools import read_calc_file
@@ -12,7 +12,7 @@ import numpy as np
 import atomman as am
 import atomman.lammps as lmp
 import atomman.unitconvert as uc
-from atomman.tools import filltemplate, aslist
+from ...tools import filltemplate, aslist
 
 # iprPy imports
 from ...tools import read_calc_file
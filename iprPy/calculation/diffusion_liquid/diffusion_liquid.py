@@ -4,7 +4,7 @@ from typing import Optional
 import atomman as am
 import atomman.lammps as lmp
 import atomman.unitconvert as uc
-from atomman.tools import filltemplate
+from ...tools import filltemplate
 
 import numpy as np 
 
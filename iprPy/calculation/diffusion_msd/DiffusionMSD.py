@@ -22,7 +22,7 @@ from .. import Calculation
 from .diffusion_msd import diffusion_msd
 from ...calculation_subset import (LammpsPotential, LammpsCommands, Units,
                                    AtommanSystemLoad)
-from ...input import value
+from ...input import value, boolean
 
 class DiffusionMSD(Calculation):
     """Class for managing dynamic relaxations"""
@@ -79,6 +79,9 @@ class DiffusionMSD(Calculation):
         self.eq_thermosteps = None
         self.eq_runsteps = None
         self.timestep = .001
+        self.multiorigin = False
+        self.corrsteps = None
+        self.nblocks = 5
         self.__measured_temperature = None
         self.__measured_temperature_stderr = None
  
@@ -267,6 +270,46 @@ class DiffusionMSD(Calculation):
         else: 
             self.__eq_equilibrium = val
 
+    @property
+    def multiorigin(self) -> bool:
+        """bool: Compute the MSD from all time origins of a position trajectory"""
+        return self.__multiorigin
+
+    @multiorigin.setter
+    def multiorigin(self, val: bool):
+        if val is None:
+            self.__multiorigin = False
+        else:
+            self.__multiorigin = bool(val)
+
+    @property
+    def corrsteps(self) -> Optional[int]:
+        """int or None: Length of the multiorigin MSD window in timesteps"""
+        return self.__corrsteps
+
+    @corrsteps.setter
+    def corrsteps(self, val: Optional[int]):
+        if val is None:
+            self.__corrsteps = None
+        else:
+            val = int(val)
+            assert val > 0
+            self.__corrsteps = val
+
+    @property
+    def nblocks(self) -> int:
+        """int: Number of blocks used for the multiorigin error estimates"""
+        return self.__nblocks
+
+    @nblocks.setter
+    def nblocks(self, val: int):
+        if val is None:
+            self.__nblocks = 5
+        else:
+            val = int(val)
+            assert val > 0
+            self.__nblocks = val
+
 
 ###################################################################################################################
     ################# Calculated results #########################
@@ -371,6 +414,15 @@ class DiffusionMSD(Calculation):
         randomseed : int or None, optional
             Random number seed used by LAMMPS in creating velocities and with
             the Langevin thermostat.
+        multiorigin : bool or None, optional
+            If True, the unwrapped positions are dumped every nsample steps
+            and the MSD is computed from all time origins of the trajectory.
+        corrsteps : int or None, optional
+            The length of the MSD correlation window in timesteps when
+            multiorigin is True.
+        nblocks : int or None, optional
+            The number of trajectory blocks used to estimate the standard
+            errors when multiorigin is True.
         **kwargs : any, optional
             Any keyword parameters supported by the set_values() methods of
             the parent Calculation class and the subset classes.
@@ -395,6 +447,12 @@ class DiffusionMSD(Calculation):
             self.eq_runsteps = kwargs['eq_runsteps']
         if 'eq_equilbirium' in kwargs:
             self.eq_equilibrium = kwargs['eq_equilibrium']
+        if 'multiorigin' in kwargs:
+            self.multiorigin = kwargs['multiorigin']
+        if 'corrsteps' in kwargs:
+            self.corrsteps = kwargs['corrsteps']
+        if 'nblocks' in kwargs:
+            self.nblocks = kwargs['nblocks']
 
 ####################### Parameter file interactions ###########################
 
@@ -426,6 +484,7 @@ class DiffusionMSD(Calculation):
 
         # Load calculation-specific booleans
         self.eq_equilibrium = bool(input_dict.get('eq_equilibrium',False))
+        self.multiorigin = boolean(input_dict.get('multiorigin', False))
 
         # Load calculation-specific its
         self.runsteps = int(input_dict.get('runsteps', 50000))
@@ -434,6 +493,8 @@ class DiffusionMSD(Calculation):
         self.nmax = int(input_dict.get('nmax',100))
         self.eq_thermosteps = int(input_dict.get('eq_termosteps',0))
         self.eq_runsteps = int(input_dict.get('eq_runsteps',0))
+        self.corrsteps = input_dict.get('corrsteps', None)
+        self.nblocks = int(input_dict.get('nblocks', 5))
 
 
         # Load calculation-specific unitless floats
@@ -532,7 +593,14 @@ class DiffusionMSD(Calculation):
                                      "run - Default value is 0"]),
             'eq_equilibrium':' '.join(["Specifies whether or not to do an equilibration default is false",
                                        "Set to yet if the input is not a relaxed liquid already"]),
-            'randomseed':' '.join(["If doing an equilibrium run this is the seed for the random velocity assignment"])
+            'randomseed':' '.join(["If doing an equilibrium run this is the seed for the random velocity assignment"]),
+            'multiorigin':' '.join(["If True, the unwrapped positions are dumped every nsample steps and the",
+                                    "MSD is computed from all time origins using FFTs, with errors from block",
+                                    "averaging. Default value is False"]),
+            'corrsteps':' '.join(["The length of the MSD correlation window in timesteps when multiorigin",
+                                  "is True. Must be a multiple of nsample - Default value is a tenth of runsteps"]),
+            'nblocks':' '.join(["The number of blocks the trajectory is divided into for estimating",
+                                "standard errors when multiorigin is True - Default value is 5"]),
         }
 
     @property
@@ -581,7 +649,10 @@ class DiffusionMSD(Calculation):
                     'eq_thermosteps',
                     'eq_runsteps',
                     'eq_equilibrium',
-                    'randomseed'
+                    'randomseed',
+                    'multiorigin',
+                    'corrsteps',
+                    'nblocks',
                 ]
             ]
         )
@@ -629,6 +700,11 @@ class DiffusionMSD(Calculation):
         run_params['eq_thermosteps'] = self.eq_thermosteps
         run_params['eq_runsteps'] = self.eq_runsteps
         run_params['eq_equilibrium'] = self.eq_equilibrium
+        run_params['multiorigin'] = self.multiorigin
+        if self.multiorigin:
+            if self.corrsteps is not None:
+                run_params['corrsteps'] = self.corrsteps
+            run_params['nblocks'] = self.nblocks
 
         # Build results
         if self.status == 'finished':
@@ -680,6 +756,9 @@ class DiffusionMSD(Calculation):
         self.eq_thermosteps = run_params['eq_thermosteps']
         self.eq_runsteps = run_params['eq_runsteps']
         self.eq_equilibrium = run_params['eq_equilibrium']
+        self.multiorigin = run_params.get('multiorigin', False)
+        self.corrsteps = run_params.get('corrsteps', None)
+        self.nblocks = run_params.get('nblocks', 5)
 
         # Load results
         if self.status == 'finished':
@@ -787,6 +866,9 @@ class DiffusionMSD(Calculation):
         input_dict['eq_thermosteps'] = self.eq_thermosteps
         input_dict['eq_runsteps'] = self.eq_runsteps
         input_dict['eq_equilibrium'] = self.eq_equilibrium
+        input_dict['multiorigin'] = self.multiorigin
+        input_dict['corrsteps'] = self.corrsteps
+        input_dict['nblocks'] = self.nblocks
 
         # Return input_dict
         return input_dict
@@ -5,11 +5,12 @@ from typing import Optional
 import atomman as am
 import atomman.lammps as lmp
 import atomman.unitconvert as uc
-from atomman.tools import filltemplate
+from ...tools import filltemplate
 
 import numpy as np 
 
-from ...tools import read_calc_file
+from ...tools import (read_calc_file, mean_squared_displacement, block_split,
+                      block_stderr, read_dump_series)
 
 # Note - the system fed in needs to be relaxed to a liquid phase 
 # otherwise the calculation doesn't make much sense and it needs to run for 
@@ -28,6 +29,9 @@ def diffusion_msd(lammps_command: str,
                   eq_runsteps: int = 0,
                   eq_equilibrium: bool = False,
                   randomseed: Optional[int] = None,  
+                  multiorigin: bool = False,
+                  corrsteps: Optional[int] = None,
+                  nblocks: int = 5,
                   ) -> dict:
     
     """
@@ -73,7 +77,21 @@ def diffusion_msd(lammps_command: str,
         The randomseed for velocity assignment in an equilibration run. Default 
         value of None will result in a number being chosen at random from the 
         python random package.  
-    
+    multiorigin : bool, optional
+        If False (default), the diffusion is taken from the running slope of
+        the MSD computed by LAMMPS from a single time origin.  If True, the
+        unwrapped positions are dumped every nsample steps and the MSD is
+        computed from all time origins of the trajectory using FFTs.  The
+        diffusion is then fit to the second half of the MSD correlation
+        window.
+    corrsteps : int, optional
+        The length of the MSD correlation window in timesteps when
+        multiorigin is True.  Must be a multiple of nsample.  Default value
+        is a tenth of runsteps rounded down to a multiple of nsample.
+    nblocks : int, optional
+        The number of blocks that the trajectory is divided into for
+        estimating the standard errors when multiorigin is True.  Default
+        value is 5.
     
     Returns
     -------
@@ -101,6 +119,15 @@ def diffusion_msd(lammps_command: str,
         -**'lammps_output'** - The lammps output log
     """
 
+    if multiorigin:
+        if corrsteps is None:
+            corrsteps = max(runsteps // 10 // nsample, 2) * nsample
+        if corrsteps % nsample != 0 or corrsteps < 2 * nsample:
+            raise ValueError('corrsteps must be a multiple of nsample and at least 2*nsample')
+        # Each block must hold a full correlation window of dumped frames
+        if (runsteps // nsample + 1) // nblocks < corrsteps // nsample + 1:
+            raise ValueError('too few dumped frames for nblocks blocks of corrsteps')
+
     # Get the Units from Potential
     lammps_units = lmp.style.unit(potential.units)
 
@@ -124,7 +151,14 @@ def diffusion_msd(lammps_command: str,
     lammps_variables['Temperature'] = temperature
     lammps_variables['Time_Step'] = uc.get_in_units(timestep,lammps_units['time'])
     lammps_variables['Run_length'] = runsteps
-    lammps_variables['Thermo_Steps'] = nsample*nmax
+    if multiorigin:
+        lammps_variables['Thermo_Steps'] = nsample
+        lammps_variables['Dump_instructions'] = '\n'.join([
+            f"dump pos all custom {nsample} positions.dump id xu yu zu",
+            "dump_modify pos format float %.13e"])
+    else:
+        lammps_variables['Thermo_Steps'] = nsample*nmax
+        lammps_variables['Dump_instructions'] = ""
     lammps_variables['nsample'] = nsample
     lammps_variables['nmax'] = nmax
     lammps_variables['Degrees_freedom'] = 3 #Fixed value 
@@ -165,18 +199,35 @@ def diffusion_msd(lammps_command: str,
 
     results = {}
 
-    runningDiffusion = thermo['v_fitslope']
-    runningTemperature = thermo['Temp']
-    runningMSD = thermo['c_msd[4]']
+    if multiorigin:
+        masses = np.array(potential.masses(system.symbols))[system.atoms.atype - 1]
+        msd = multiorigin_msd('positions.dump', thermo,
+                              lammps_variables['Time_Step'] * nsample,
+                              corrsteps // nsample + 1, nblocks, masses)
+        runningMSD_x = msd['msd'][:, 0]
+        runningMSD_y = msd['msd'][:, 1]
+        runningMSD_z = msd['msd'][:, 2]
+        MSD_unitless = msd['msd'].sum(axis=1)
+        Diffusion_coeff = msd['diffusion']
+        Diffusion_coeff_err = msd['diffusion_stderr']
+        AveTemp = msd['temperature']
+        AveTemp_err = msd['temperature_stderr']
+
+    else:
+        runningDiffusion = thermo['v_fitslope']
+        runningTemperature = thermo['Temp']
+        runningMSD = thermo['c_msd[4]']
 
-    runningMSD_x = thermo['c_msd[1]']
-    runningMSD_y = thermo['c_msd[2]']
-    runningMSD_z = thermo['c_msd[3]']
+        runningMSD_x = thermo['c_msd[1]']
+        runningMSD_y = thermo['c_msd[2]']
+        runningMSD_z = thermo['c_msd[3]']
 
-    Diffusion_coeff = np.average(runningDiffusion[1:])
+        Diffusion_coeff = np.average(runningDiffusion[1:])
+        Diffusion_coeff_err = np.std(runningDiffusion[1:])/((len(runningDiffusion[1:]))**0.5)
 
-    AveTemp = np.average(runningTemperature[1:])
-    MSD_unitless = (runningMSD[1:])
+        AveTemp = np.average(runningTemperature[1:])
+        AveTemp_err = np.std(runningTemperature[1:])/((len(runningTemperature[1:]))**0.5)
+        MSD_unitless = (runningMSD[1:])
     
     # unit conversions 
     length2_per_time_unit = f"({lammps_units['length']}^2)/({lammps_units['time']})"
@@ -187,10 +238,84 @@ def diffusion_msd(lammps_command: str,
     results['msd_z_values'] = uc.set_in_units(runningMSD_z,length2_unit)
     results['msd_values'] = uc.set_in_units(MSD_unitless,length2_unit) 
     results['measured_temperature'] = uc.set_in_units(AveTemp,'K')
-    results['measured_temperature_stderr'] = uc.set_in_units(np.std(runningTemperature[1:])/((len(runningTemperature[1:]))**0.5),'K')
+    results['measured_temperature_stderr'] = uc.set_in_units(AveTemp_err,'K')
     results['diffusion'] = uc.set_in_units(Diffusion_coeff, length2_per_time_unit)
-    results['diffusion_stderr'] = uc.set_in_units(np.std(runningDiffusion[1:])/((len(runningDiffusion[1:]))**0.5),length2_per_time_unit)
+    results['diffusion_stderr'] = uc.set_in_units(Diffusion_coeff_err,length2_per_time_unit)
     results['lammps_output'] = output 
 
     return results
-    
\ No newline at end of file
+
+def multiorigin_msd(dumpfile: str,
+                    thermo,
+                    dt: float,
+                    nlags: int,
+                    nblocks: int,
+                    masses: np.ndarray,
+                    chunksize: int = 256) -> dict:
+    """
+    Computes the MSD and diffusion coefficient from an unwrapped position
+    trajectory using all time origins, with standard errors from block
+    averaging.  The diffusion coefficient is fit to the second half of the
+    correlation window where the MSD is expected to be linear.
+
+    Parameters
+    ----------
+    dumpfile : str
+        The LAMMPS dump file containing the id, xu, yu and zu of all atoms.
+    thermo : pandas.DataFrame
+        The thermo data of the trajectory's simulation.
+    dt : float
+        The time between dumped frames in LAMMPS units.
+    nlags : int
+        The number of frames in the correlation window, including lag 0.
+    nblocks : int
+        The number of blocks to divide the trajectory into for the error
+        estimates.
+    masses : numpy.ndarray
+        The per-atom masses ordered by atom id.  Used to remove the drift of
+        the center of mass as done by LAMMPS compute msd com yes.
+    chunksize : int, optional
+        The number of atoms to correlate at once.  Limits the memory used by
+        the FFTs.
+
+    Returns
+    -------
+    dict
+        Contains 'msd', the x, y, z MSD components for each lag, 'diffusion'
+        and 'diffusion_stderr', and 'temperature' and 'temperature_stderr'.
+    """
+    timesteps, positions = read_dump_series(dumpfile, ['xu', 'yu', 'zu'])
+    natoms = positions.shape[1]
+
+    # Remove center of mass drift
+    com = np.einsum('i,tij->tj', masses, positions) / masses.sum()
+    positions -= com[:, np.newaxis, :]
+
+    def mean_msd(frames):
+        msd = np.zeros((nlags, 3))
+        for i in range(0, natoms, chunksize):
+            msd += mean_squared_displacement(positions[frames, i:i+chunksize], nlags).sum(axis=1)
+        return msd / natoms
+
+    fit = slice(nlags // 2, nlags)
+    time = dt * np.arange(nlags)
+    def diffusion(msd):
+        return np.polyfit(time[fit], msd[fit].sum(axis=1), 1)[0] / 6
+
+    # Full trajectory values
+    msd = mean_msd(slice(None))
+    results = {}
+    results['msd'] = msd
+    results['diffusion'] = diffusion(msd)
+
+    # Block estimates of the errors
+    blocks = block_split(len(timesteps), nblocks, nlags)
+    D = [diffusion(mean_msd(block)) for block in blocks]
+    results['diffusion_stderr'] = block_stderr(D)[1]
+
+    temps = thermo['Temp'].values
+    T = [temps[block].mean() for block in block_split(len(temps), nblocks)]
+    results['temperature'] = temps.mean()
+    results['temperature_stderr'] = block_stderr(T)[1]
+
+    return results
@@ -22,7 +22,7 @@ from .. import Calculation
 from .diffusion_vacf import diffusion_vacf
 from ...calculation_subset import (LammpsPotential, LammpsCommands, Units,
                                    AtommanSystemLoad, AtommanSystemManipulate)
-from ...input import value
+from ...input import value, boolean
 
 class DiffusionVACF(Calculation):
     """Class for managing dynamic relaxations"""
@@ -79,6 +79,11 @@ class DiffusionVACF(Calculation):
         self.eq_runsteps = 0
         self.eq_equilibrium = False
 
+        self.multiorigin = False
+        self.dumpsteps = 10
+        self.corrsteps = None
+        self.nblocks = 5
+
         self.__measured_temperature = None
         self.__measured_temperature_stderr = None
         self.__diffusion_value = None
@@ -245,6 +250,60 @@ class DiffusionVACF(Calculation):
         else:
             self.__simruns = int(val)
 
+    @property
+    def multiorigin(self) -> bool:
+        """bool: Compute the VACF from all time origins of one trajectory"""
+        return self.__multiorigin
+
+    @multiorigin.setter
+    def multiorigin(self, val: bool):
+        if val is None:
+            self.__multiorigin = False
+        else:
+            self.__multiorigin = bool(val)
+
+    @property
+    def dumpsteps(self) -> int:
+        """int: How often velocities are dumped for the multiorigin VACF"""
+        return self.__dumpsteps
+
+    @dumpsteps.setter
+    def dumpsteps(self, val: int):
+        if val is None:
+            self.__dumpsteps = 10
+        else:
+            val = int(val)
+            assert val > 0
+            self.__dumpsteps = val
+
+    @property
+    def corrsteps(self) -> Optional[int]:
+        """int or None: Length of the multiorigin VACF window in timesteps"""
+        return self.__corrsteps
+
+    @corrsteps.setter
+    def corrsteps(self, val: Optional[int]):
+        if val is None:
+            self.__corrsteps = None
+        else:
+            val = int(val)
+            assert val > 0
+            self.__corrsteps = val
+
+    @property
+    def nblocks(self) -> int:
+        """int: Number of blocks used for the multiorigin error estimates"""
+        return self.__nblocks
+
+    @nblocks.setter
+    def nblocks(self, val: int):
+        if val is None:
+            self.__nblocks = 5
+        else:
+            val = int(val)
+            assert val > 0
+            self.__nblocks = val
+
 ###################################################################################################################
     ################# Calculated results #########################
 
@@ -347,6 +406,19 @@ class DiffusionVACF(Calculation):
         randomseed : int or None, optional
             Random number seed used by LAMMPS in creating velocities and with
             the Langevin thermostat.
+        multiorigin : bool or None, optional
+            If True, a single simulation is performed and the VACF is computed
+            from all time origins of its velocity trajectory.
+        dumpsteps : int or None, optional
+            How often velocities are dumped when multiorigin is True.  The
+            dumped trajectory is loaded into memory at 24 bytes per atom per
+            frame.
+        corrsteps : int or None, optional
+            The length of the VACF correlation window in timesteps when
+            multiorigin is True.
+        nblocks : int or None, optional
+            The number of trajectory blocks used to estimate the standard
+            errors when multiorigin is True.
         **kwargs : any, optional
             Any keyword parameters supported by the set_values() methods of
             the parent Calculation class and the subset classes.
@@ -369,6 +441,14 @@ class DiffusionVACF(Calculation):
             self.eq_runsteps = kwargs['eq_runsteps']
         if 'eq_equilbirium' in kwargs:
             self.eq_equilibrium = kwargs['eq_equilibrium']
+        if 'multiorigin' in kwargs:
+            self.multiorigin = kwargs['multiorigin']
+        if 'dumpsteps' in kwargs:
+            self.dumpsteps = kwargs['dumpsteps']
+        if 'corrsteps' in kwargs:
+            self.corrsteps = kwargs['corrsteps']
+        if 'nblocks' in kwargs:
+            self.nblocks = kwargs['nblocks']
 
 ####################### Parameter file interactions ###########################
 
@@ -400,6 +480,7 @@ class DiffusionVACF(Calculation):
 
         # Load calculation-specific booleans
         self.eq_equilibrium = bool(input_dict.get('eq_equilibrium',False))
+        self.multiorigin = boolean(input_dict.get('multiorigin', False))
 
         # Load calculation-specific its
         self.runsteps = int(input_dict.get('runsteps', 50000))
@@ -407,6 +488,9 @@ class DiffusionVACF(Calculation):
         self.simruns = int(input_dict.get('simruns',5))
         self.eq_thermosteps = int(input_dict.get('eq_termosteps',0))
         self.eq_runsteps = int(input_dict.get('eq_runsteps',0))
+        self.dumpsteps = int(input_dict.get('dumpsteps', 10))
+        self.corrsteps = input_dict.get('corrsteps', None)
+        self.nblocks = int(input_dict.get('nblocks', 5))
 
         # Load calculation-specific unitless floats
 
@@ -504,6 +588,16 @@ class DiffusionVACF(Calculation):
                                      "run - Default value is 0"]),
             'eq_equilibrium':' '.join(["Specifies whether or not to do an equilibration default is false",
                                        "Set to yet if the input is not a relaxed liquid already"]),
+            'multiorigin':' '.join(["If True, a single simulation is performed and the VACF is computed",
+                                    "from all time origins of the dumped velocities using FFTs, with",
+                                    "errors from block averaging. simruns is ignored. Default value is False"]),
+            'dumpsteps':' '.join(["How often to dump velocities when multiorigin is True. The dumped",
+                                  "trajectory is loaded into memory at 24 bytes per atom per frame, so",
+                                  "keep runsteps/dumpsteps times the atom count modest - Default value is 10"]),
+            'corrsteps':' '.join(["The length of the VACF correlation window in timesteps when multiorigin",
+                                  "is True. Must be a multiple of dumpsteps - Default value is a tenth of runsteps"]),
+            'nblocks':' '.join(["The number of blocks the trajectory is divided into for estimating",
+                                "standard errors when multiorigin is True - Default value is 5"]),
         }
 
     @property
@@ -552,6 +646,10 @@ class DiffusionVACF(Calculation):
                     'eq_runsteps',
                     'eq_equilibrium',
                     'randomseed',
+                    'multiorigin',
+                    'dumpsteps',
+                    'corrsteps',
+                    'nblocks',
                 ]
             ]
         )
@@ -596,6 +694,12 @@ class DiffusionVACF(Calculation):
         run_params['eq_thermosteps'] = self.eq_thermosteps
         run_params['eq_runsteps'] = self.eq_runsteps
         run_params['eq_equilibrium'] = self.eq_equilibrium
+        run_params['multiorigin'] = self.multiorigin
+        if self.multiorigin:
+            run_params['dumpsteps'] = self.dumpsteps
+            if self.corrsteps is not None:
+                run_params['corrsteps'] = self.corrsteps
+            run_params['nblocks'] = self.nblocks
         # Build results
         if self.status == 'finished':
 
@@ -640,6 +744,10 @@ class DiffusionVACF(Calculation):
         self.eq_thermosteps = run_params['eq_thermosteps']
         self.eq_runsteps = run_params['eq_runsteps']
         self.eq_equilibrium = run_params['eq_equilibrium']
+        self.multiorigin = run_params.get('multiorigin', False)
+        self.dumpsteps = run_params.get('dumpsteps', 10)
+        self.corrsteps = run_params.get('corrsteps', None)
+        self.nblocks = run_params.get('nblocks', 5)
 
         # Load results
         if self.status == 'finished':
@@ -745,6 +853,10 @@ class DiffusionVACF(Calculation):
         input_dict['eq_thermosteps'] = self.eq_thermosteps
         input_dict['eq_runsteps'] = self.eq_runsteps
         input_dict['eq_equilibrium'] = self.eq_equilibrium
+        input_dict['multiorigin'] = self.multiorigin
+        input_dict['dumpsteps'] = self.dumpsteps
+        input_dict['corrsteps'] = self.corrsteps
+        input_dict['nblocks'] = self.nblocks
         # Return input_dict
         return input_dict
 
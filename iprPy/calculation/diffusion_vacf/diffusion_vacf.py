@@ -7,11 +7,12 @@ from typing import Optional
 import atomman as am
 import atomman.lammps as lmp
 import atomman.unitconvert as uc
-from atomman.tools import filltemplate
+from ...tools import filltemplate
 
 import numpy as np 
 
-from ...tools import read_calc_file
+from ...tools import (read_calc_file, autocorrelation, block_split,
+                      block_stderr, read_dump_series)
 
 # Note - the system fed in needs to be relaxed to a liquid phase 
 # otherwise the calculation doesn't make much sense and it needs to run for 
@@ -28,7 +29,11 @@ def diffusion_vacf(lammps_command:str,
               eq_thermosteps: int = 0,
               eq_runsteps: int = 0,
               eq_equilibrium: bool = False,
-              randomseed: Optional[int] = None
+              randomseed: Optional[int] = None,
+              multiorigin: bool = False,
+              dumpsteps: int = 10,
+              corrsteps: Optional[int] = None,
+              nblocks: int = 5,
               ) -> dict:
     """
     Calculates the diffusion constant for a liquid system using
@@ -70,7 +75,25 @@ def diffusion_vacf(lammps_command:str,
         The randomseed for velocity assignment in an equilibration run. Default 
         value of None will result in a number being chosen at random from the 
         python random package.  
-    
+    multiorigin : bool, optional
+        If False (default), simruns independent simulations are performed and
+        the VACF of each is computed by LAMMPS from a single time origin.  If
+        True, a single simulation is performed that dumps the atomic
+        velocities and the VACF is computed from all time origins of the
+        trajectory using FFTs.
+    dumpsteps : int, optional
+        How often the velocities are dumped when multiorigin is True.  The
+        full velocity trajectory is held in memory during processing, which
+        takes 24 bytes per atom per dumped frame, i.e. about 2.4 GB for 10,000
+        atoms dumped 10,000 times.  Default value is 10.
+    corrsteps : int, optional
+        The length of the VACF correlation window in timesteps when
+        multiorigin is True.  Must be a multiple of dumpsteps.  Default value
+        is a tenth of runsteps rounded down to a multiple of dumpsteps.
+    nblocks : int, optional
+        The number of blocks that the trajectory is divided into for
+        estimating the standard errors when multiorigin is True.  Default
+        value is 5.
     
     Returns
     -------
@@ -97,6 +120,15 @@ def diffusion_vacf(lammps_command:str,
         of the diffusion coeffecient
         -**'lammps_output'** - The lammps output log
     """
+    if multiorigin:
+        if corrsteps is None:
+            corrsteps = max(runsteps // 10 // dumpsteps, 1) * dumpsteps
+        if corrsteps % dumpsteps != 0:
+            raise ValueError('corrsteps must be a multiple of dumpsteps')
+        # Each block must hold a full correlation window of dumped frames
+        if (runsteps // dumpsteps + 1) // nblocks < corrsteps // dumpsteps + 1:
+            raise ValueError('too few dumped frames for nblocks blocks of corrsteps')
+
     #Get the Units from Potential
     lammps_units = lmp.style.unit(potential.units)
 
@@ -120,7 +152,16 @@ def diffusion_vacf(lammps_command:str,
     lammps_variables['Run_length'] = runsteps
     lammps_variables['Equilibration_thermo'] = eq_thermosteps
     lammps_variables['Equilibration_steps'] = eq_runsteps
-    lammps_variables['num_simulations'] = simruns
+    if multiorigin:
+        lammps_variables['num_simulations'] = 1
+        lammps_variables['Thermo_steps'] = dumpsteps
+        lammps_variables['Dump_instructions'] = '\n'.join([
+            f"dump vel all custom {dumpsteps} velocities.dump id vx vy vz",
+            "dump_modify vel format float %.13e"])
+    else:
+        lammps_variables['num_simulations'] = simruns
+        lammps_variables['Thermo_steps'] = 1
+        lammps_variables['Dump_instructions'] = ""
     lammps_variables['Degrees_freedom'] = 3
 
     #Set up the seed
@@ -158,45 +199,122 @@ def diffusion_vacf(lammps_command:str,
     if eq_equilibrium: 
         indexOffset += 1
 
-    log = lmp.Log('diffusion_vacf.log.lammps')
-    D = np.ndarray((simruns,))
-    T = np.ndarray((simruns,runsteps+1))
-    v1 = np.ndarray((simruns,runsteps+1))
-    v2 = np.ndarray((simruns,runsteps+1))
-    v3 = np.ndarray((simruns,runsteps+1))
-    v = np.ndarray((simruns,runsteps+1))
-    for i in range(indexOffset,simruns+indexOffset):
-        D[i-indexOffset] = log.simulations[i].thermo['v_eta'][len(log.simulations[i].thermo['v_eta'])-1]
-        T[i-indexOffset] = log.simulations[i].thermo['Temp']
-        v1[i-indexOffset] = log.simulations[i].thermo['c_vacf[1]']
-        v2[i-indexOffset] = log.simulations[i].thermo['c_vacf[2]']
-        v3[i-indexOffset] = log.simulations[i].thermo['c_vacf[3]']
-        v[i-indexOffset] = log.simulations[i].thermo['c_vacf[4]']
-
-    runningDiffusion = D
-    runningTemperature = np.average(T,axis=0)
-    runningv1 = np.average(v1,axis=0)
-    runningv2 = np.average(v2,axis=0)
-    runningv3 = np.average(v3,axis=0)
-    runningv = np.average(v,axis=0)
-
-    Diffusion_coeff = np.average(runningDiffusion)
-    Diffusion_coeff_err = np.std(runningDiffusion)
-    AveTemp = np.average(runningTemperature)
-    AveTemp_err = np.std(runningTemperature)
-
-    diffusionUnitString = f'{lammps_units['velocity']}^2*{lammps_units['time']}'
-    vacfUnitString = f'{lammps_units['velocity']}^2'
+    if multiorigin:
+        vacf = multiorigin_vacf('velocities.dump',
+                                output.simulations[indexOffset].thermo,
+                                lammps_variables['Time_Step'] * dumpsteps,
+                                corrsteps // dumpsteps + 1, nblocks)
+        runningv1 = vacf['vacf'][:, 0]
+        runningv2 = vacf['vacf'][:, 1]
+        runningv3 = vacf['vacf'][:, 2]
+        runningv = vacf['vacf'].sum(axis=1)
+        Diffusion_coeff = vacf['diffusion']
+        Diffusion_coeff_err = vacf['diffusion_stderr']
+        AveTemp = vacf['temperature']
+        AveTemp_err = vacf['temperature_stderr']
+    else:
+        log = lmp.Log('diffusion_vacf.log.lammps')
+        D = np.ndarray((simruns,))
+        T = np.ndarray((simruns,runsteps+1))
+        v1 = np.ndarray((simruns,runsteps+1))
+        v2 = np.ndarray((simruns,runsteps+1))
+        v3 = np.ndarray((simruns,runsteps+1))
+        v = np.ndarray((simruns,runsteps+1))
+        for i in range(indexOffset,simruns+indexOffset):
+            D[i-indexOffset] = log.simulations[i].thermo['v_eta'][len(log.simulations[i].thermo['v_eta'])-1]
+            T[i-indexOffset] = log.simulations[i].thermo['Temp']
+            v1[i-indexOffset] = log.simulations[i].thermo['c_vacf[1]']
+            v2[i-indexOffset] = log.simulations[i].thermo['c_vacf[2]']
+            v3[i-indexOffset] = log.simulations[i].thermo['c_vacf[3]']
+            v[i-indexOffset] = log.simulations[i].thermo['c_vacf[4]']
+
+        runningDiffusion = D
+        runningTemperature = np.average(T,axis=0)
+        runningv1 = np.average(v1,axis=0)
+        runningv2 = np.average(v2,axis=0)
+        runningv3 = np.average(v3,axis=0)
+        runningv = np.average(v,axis=0)
+
+        Diffusion_coeff = np.average(runningDiffusion)
+        Diffusion_coeff_err = np.std(runningDiffusion) / simruns**0.5
+        AveTemp = np.average(runningTemperature)
+        AveTemp_err = np.std(runningTemperature) / (len(runningTemperature) * simruns)**0.5
+
+    diffusionUnitString = f"{lammps_units['velocity']}^2*{lammps_units['time']}"
+    vacfUnitString = f"{lammps_units['velocity']}^2"
 
     results['vacf_x_values'] = uc.set_in_units(runningv1,vacfUnitString)
     results['vacf_y_values'] = uc.set_in_units(runningv2,vacfUnitString)
     results['vacf_z_values'] = uc.set_in_units(runningv3,vacfUnitString)
     results['vacf_values'] = uc.set_in_units(runningv,vacfUnitString)
     results['diffusion'] = uc.set_in_units(Diffusion_coeff,diffusionUnitString)
-    results['diffusion_stderr'] = uc.set_in_units(Diffusion_coeff_err/(simruns**(.5)),diffusionUnitString)
+    results['diffusion_stderr'] = uc.set_in_units(Diffusion_coeff_err,diffusionUnitString)
     results['measured_temperature'] = uc.set_in_units(AveTemp,'K')
-    results['measured_temperature_stderr'] = uc.set_in_units(AveTemp_err/((len(runningTemperature)*simruns)**(0.5)),'K')
+    results['measured_temperature_stderr'] = uc.set_in_units(AveTemp_err,'K')
     results['lammps_output'] = output 
     return results
-    
-    
\ No newline at end of file
+
+def multiorigin_vacf(dumpfile: str,
+                     thermo,
+                     dt: float,
+                     nlags: int,
+                     nblocks: int,
+                     chunksize: int = 256) -> dict:
+    """
+    Computes the VACF and diffusion coefficient from a velocity trajectory
+    using all time origins, with standard errors from block averaging.
+
+    Parameters
+    ----------
+    dumpfile : str
+        The LAMMPS dump file containing the id, vx, vy and vz of all atoms.
+    thermo : pandas.DataFrame
+        The thermo data of the trajectory's simulation.
+    dt : float
+        The time between dumped frames in LAMMPS units.
+    nlags : int
+        The number of frames in the correlation window, including lag 0.
+    nblocks : int
+        The number of blocks to divide the trajectory into for the error
+        estimates.
+    chunksize : int, optional
+        The number of atoms to correlate at once.  Limits the memory used by
+        the FFTs.
+
+    Returns
+    -------
+    dict
+        Contains 'vacf', the x, y, z VACF components for each lag, 'diffusion'
+        and 'diffusion_stderr', and 'temperature' and 'temperature_stderr'.
+    """
+    timesteps, velocities = read_dump_series(dumpfile, ['vx', 'vy', 'vz'])
+    natoms = velocities.shape[1]
+
+    def mean_vacf(frames):
+        vacf = np.zeros((nlags, 3))
+        for i in range(0, natoms, chunksize):
+            vacf += autocorrelation(velocities[frames, i:i+chunksize], nlags).sum(axis=1)
+        return vacf / natoms
+
+    def diffusion(vacf):
+        # Trapezoidal integral of the total VACF
+        total = vacf.sum(axis=1)
+        return dt * (total.sum() - 0.5 * (total[0] + total[-1])) / 3
+
+    # Full trajectory values
+    vacf = mean_vacf(slice(None))
+    results = {}
+    results['vacf'] = vacf
+    results['diffusion'] = diffusion(vacf)
+
+    # Block estimates of the errors
+    blocks = block_split(len(timesteps), nblocks, nlags)
+    D = [diffusion(mean_vacf(block)) for block in blocks]
+    results['diffusion_stderr'] = block_stderr(D)[1]
+
+    temps = thermo['Temp'].values
+    T = [temps[block].mean() for block in block_split(len(temps), nblocks)]
+    results['temperature'] = temps.mean()
+    results['temperature_stderr'] = block_stderr(T)[1]
+
+    return results
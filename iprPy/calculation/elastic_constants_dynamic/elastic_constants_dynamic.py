@@ -12,7 +12,7 @@ import numpy as np
 import atomman as am
 import atomman.lammps as lmp
 import atomman.unitconvert as uc
-from atomman.tools import filltemplate
+from ...tools import checkversion, filltemplate
 
 # iprPy imports
 from ...tools import read_calc_file
@@ -97,7 +97,7 @@ def elastic_constants_dynamic(lammps_command: str,
     lammps_units = lmp.style.unit(potential.units)
     
     # Get lammps version date
-    lammps_date = lmp.checkversion(lammps_command)['date']
+    lammps_date = checkversion(lammps_command)['date']
 
     # Check for compatibility
     if lammps_date < datetime.date(2022, 5, 4):
@@ -13,7 +13,7 @@ import numpy as np
 import atomman as am
 import atomman.lammps as lmp
 import atomman.unitconvert as uc
-from atomman.tools import filltemplate
+from ...tools import checkversion, filltemplate
 
 # iprPy imports
 from ...tools import read_calc_file
@@ -83,7 +83,7 @@ def elastic_constants_static(lammps_command: str,
     lammps_units = lmp.style.unit(potential.units)
     
     # Get lammps version date
-    lammps_date = lmp.checkversion(lammps_command)['date']
+    lammps_date = checkversion(lammps_command)['date']
     
     # Define lammps variables
     lammps_variables = {}
@@ -10,7 +10,7 @@ from typing import Optional, Union
 import atomman as am
 import atomman.lammps as lmp
 import atomman.unitconvert as uc
-from atomman.tools import filltemplate, aslist
+from ...tools import filltemplate, aslist
 
 # http://www.numpy.org/
 import numpy as np
@@ -16,7 +16,7 @@ import numpy.typing as npt
 import atomman as am
 import atomman.unitconvert as uc
 import atomman.lammps as lmp
-from atomman.tools import filltemplate
+from ...tools import checkversion, filltemplate
 from atomman.defect import GrainBoundary, GRIP
 
 # iprPy imports
@@ -280,7 +280,7 @@ def relax(lammps_command: str,
     lammps_units = lmp.style.unit(potential.units)
     
     # Get lammps version date
-    lammps_date = lmp.checkversion(lammps_command)['date']
+    lammps_date = checkversion(lammps_command)['date']
 
     # Random seed settings
     if randomseed is None: 
@@ -15,7 +15,7 @@ import numpy.typing as npt
 import atomman as am
 import atomman.unitconvert as uc
 import atomman.lammps as lmp
-from atomman.tools import filltemplate
+from ...tools import checkversion, filltemplate
 
 # iprPy imports
 from ...tools import read_calc_file
@@ -153,7 +153,7 @@ def grain_boundary_static(lammps_command: str,
         For invalid cutboxvectors
     """
 
-    lammps_date = lmp.checkversion(lammps_command)['date']
+    lammps_date = checkversion(lammps_command)['date']
 
     gb = am.defect.GrainBoundary(ucell, uvws1, uvws2,
                        conventional_setting=conventional_setting,
@@ -301,7 +301,7 @@ def grain_boundary_relax(lammps_command: str,
     
     #Get lammps version date
     if lammps_date is None:
-        lammps_date = lmp.checkversion(lammps_command)['date']
+        lammps_date = checkversion(lammps_command)['date']
         
     lammps_variables = {}
     
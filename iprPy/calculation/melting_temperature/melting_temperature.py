@@ -11,7 +11,7 @@ import random
 import atomman as am
 import atomman.lammps as lmp
 import atomman.unitconvert as uc
-from atomman.tools import filltemplate
+from ...tools import checkversion, filltemplate
 
 import numpy as np
 
@@ -95,7 +95,7 @@ def melting_temperature(lammps_command: str,
     lammps_units = lmp.style.unit(potential.units)
     
     #Get lammps version date
-    lammps_date = lmp.checkversion(lammps_command)['date']
+    lammps_date = checkversion(lammps_command)['date']
     
     # Handle default values
     if dumpsteps is None:
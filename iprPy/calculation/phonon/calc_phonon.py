@@ -27,7 +27,7 @@ from DataModelDict import DataModelDict as DM
 import atomman as am
 import atomman.lammps as lmp
 import atomman.unitconvert as uc
-from atomman.tools import filltemplate
+from ...tools import checkversion, filltemplate
 
 # iprPy imports
 from ...tools import read_calc_file
@@ -85,7 +85,7 @@ def phonon_quasiharmonic(lammps_command: str,
     lammps_units = lmp.style.unit(potential.units)
     
     # Get lammps version date
-    lammps_date = lmp.checkversion(lammps_command)['date']
+    lammps_date = checkversion(lammps_command)['date']
     
     # Convert ucell to a primitive cell
     ucell = ucell.dump('primitive_cell', symprec=symprec)
@@ -331,7 +331,7 @@ def phononcalc(lammps_command: str,
     
     # Get lammps version date
     if lammps_date is None:
-        lammps_date = lmp.checkversion(lammps_command)['date']
+        lammps_date = checkversion(lammps_command)['date']
     
    # Convert ucell to a primitive cell
     ucell = ucell.dump('primitive_cell', symprec=symprec)
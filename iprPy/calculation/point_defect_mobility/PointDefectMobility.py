@@ -76,6 +76,7 @@ class PointDefectMobility(Calculation):
         self.__neb_positions = None
         self.__forward_barrier = None
         self.__reverse_barrier = None        
+        self.warmstart_positions = None
 
         # Define calc shortcut
         self.calc = point_defect_mobility
@@ -183,6 +184,21 @@ class PointDefectMobility(Calculation):
     #    else:
     #        self.__neb_symbol = list(val)
 
+    @property
+    def warmstart_positions(self) -> Optional[np.ndarray]:
+        """numpy.ndarray or None: Prior NEB atom positions to build the initial path from"""
+        return self.__warmstart_positions
+
+    @warmstart_positions.setter
+    def warmstart_positions(self, val: Optional[npt.ArrayLike]):
+        if val is None:
+            self.__warmstart_positions = None
+        else:
+            val = np.asarray(val, dtype=float)
+            if val.ndim != 3 or val.shape[2] != 3:
+                raise ValueError('warmstart_positions must be of shape (number of NEB atoms, number of replicas, 3)')
+            self.__warmstart_positions = val
+
     @property
     def neb_coordinates(self) -> np.ndarray:
         """numpy.ndarray: Reaction coordinates for the final NEB step"""
@@ -230,6 +246,9 @@ class PointDefectMobility(Calculation):
         name : str, optional
             The name to assign to the calculation.  By default, this is set as
             the calculation's key.
+        warmstart_positions : array-like or None, optional
+            The final NEB atom positions of a previous calculation to build
+            the initial NEB path from.
         **kwargs : any, optional
             Any keyword parameters supported by the set_values() methods of
             the parent Calculation class and the subset classes.
@@ -238,6 +257,8 @@ class PointDefectMobility(Calculation):
         super().set_values(name=name, **kwargs)
 
         # Set calculation-specific values
+        if 'warmstart_positions' in kwargs:
+            self.warmstart_positions = kwargs['warmstart_positions']
         #if 'neb_pos1' in kwargs:
         #    self.neb_pos1 = kwargs['neb_pos1']
         #if 'neb_pos2' in kwargs:
@@ -274,6 +295,7 @@ class PointDefectMobility(Calculation):
                                                   '1.0e-6 eV/angstrom')
         
         # Load calculation-specific strings
+        neb_warmstart_file = input_dict.get('neb_warmstart_file', None)
         #self.neb_pos1 = input_dict['neb_pos1']
         #self.neb_pos2 = input_dict['neb_pos2']
         #self.neb_symbol = input_dict.get('neb_symbol', None)
@@ -305,6 +327,12 @@ class PointDefectMobility(Calculation):
         # Manipulate system
         self.system_mods.load_parameters(input_dict)
         
+        # Load the warm start path from a finished record
+        if neb_warmstart_file is not None:
+            self.load_warmstart(neb_warmstart_file)
+        else:
+            self.warmstart_positions = None
+
         # Scale atom positions relative to ucell
         #if neb_scale:
         #    self.neb_pos1 = self.system.ucell.box.position_relative_to_cartesian(self.neb_pos1)
@@ -376,6 +404,12 @@ class PointDefectMobility(Calculation):
         """dict : The calculation-specific input keys and their descriptions."""
 
         return {
+            'neb_warmstart_file': ' '.join([
+                'The path to a finished calculation_point_defect_mobility record',
+                'for a similar defect pathway.  If given, its final NEB path is',
+                'mapped onto the NEB endpoints and used as the initial path',
+                'rather than a linear interpolation.'
+            ]),
             #'neb_pos1': ' '.join([
             #    'The position(s) for the NEB-controlled atoms in the first replica.',
             #    'Specify this as space-delimited float values where every three',
@@ -414,6 +448,7 @@ class PointDefectMobility(Calculation):
 
             # Calculation-specific keys
             + [
+                'neb_warmstart_file',
                 #'maxiterations',
                 #'maxevaluations',
                 #'defectmobility_allowable_impurity_numbers',
@@ -497,10 +532,38 @@ class PointDefectMobility(Calculation):
             for pos in self.neb_positions:
                 atom = DM()
                 atom['pos'] = uc.model(pos, self.units.length_unit)
-            calc['results']['final-neb'].append('atom', atom)
+                calc['results']['final-neb'].append('atom', atom)
 
         self._set_model(model)
         return model
+
+    def load_model(self,
+                   model: Union[str, DM],
+                   name: Optional[str] = None):
+        """
+        Loads record contents from a given model.
+
+        Parameters
+        ----------
+        model : str or DataModelDict
+            The model contents of the record to load.
+        name : str, optional
+            The name to assign to the record.  Often inferred from other
+            attributes if not given.
+        """
+        # Load universal and subset content
+        super().load_model(model, name=name)
+        calc = self.model[self.modelroot]
+
+        # Load results
+        if self.status == 'finished':
+            self.__forward_barrier = uc.value_unit(calc['results']['forward-barrier'])
+            self.__reverse_barrier = uc.value_unit(calc['results']['reverse-barrier'])
+            final_neb = calc['results']['final-neb']
+            self.__neb_coordinates = uc.value_unit(final_neb['coordinates'])
+            self.__neb_energies = uc.value_unit(final_neb['energy'])
+            self.__neb_positions = np.array([uc.value_unit(atom['pos'])
+                                             for atom in final_neb.aslist('atom')])
     
 ########################## Metadata interactions ##############################
 
@@ -526,6 +589,8 @@ class PointDefectMobility(Calculation):
             meta['neb_coordinates'] = self.neb_coordinates
             meta['neb_energies'] = self.neb_energies
             meta['neb_positions'] = self.neb_positions
+
+        return meta
         
     @property
     def compare_terms(self) -> list:
@@ -556,7 +621,27 @@ class PointDefectMobility(Calculation):
     
     def isvalid(self) -> bool:
         return self.system.family == self.defect.family
-    
+
+    def load_warmstart(self, record: Union[str, Path, IOBase, DM]):
+        """
+        Sets warmstart_positions to the final NEB atom positions of a finished
+        point defect mobility calculation.
+
+        Parameters
+        ----------
+        record : str, Path, file-like object or DataModelDict
+            The record content or file.
+        """
+        if isinstance(record, Path):
+            record = str(record)
+        model = DM(record).find(self.modelroot)
+        if 'results' not in model:
+            raise ValueError('warm start record has no results')
+        positions = []
+        for atom in model['results']['final-neb'].aslist('atom'):
+            positions.append(uc.value_unit(atom['pos']))
+        self.warmstart_positions = np.array(positions)
+
 ########################### Calculation interactions ##########################
 
     def calc_inputs(self) -> dict:
@@ -574,6 +659,9 @@ class PointDefectMobility(Calculation):
         #if self.neb_symbol is not None:
         #    input_dict['neb_symbol'] = self.neb_symbol
 
+        if self.warmstart_positions is not None:
+            input_dict['warmstart_positions'] = self.warmstart_positions
+
         # Add subset inputs
         for subset in self.subsets:
             subset.calc_inputs(input_dict)
@@ -595,7 +683,10 @@ class PointDefectMobility(Calculation):
             'final.dat',
             'init.dat',
             'tmp.lammps.variable',
-            'neb_lammps.in',            
+            'neb_lammps.in',
+            'neb-*-log.lammps*',
+            'neb_checkpoint.json',
+            '*.replica-*.dat',
         ]
     
     def process_results(self, results_dict: dict):
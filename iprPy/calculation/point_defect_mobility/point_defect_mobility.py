@@ -4,6 +4,11 @@
 
 # Standard library imports
 import datetime
+import hashlib
+import json
+import os
+from pathlib import Path
+import re
 from typing import Optional, Union
 from copy import deepcopy
 
@@ -15,7 +20,7 @@ import numpy.typing as npt
 import atomman as am
 import atomman.lammps as lmp
 import atomman.unitconvert as uc
-from atomman.tools import filltemplate
+from ...tools import checkversion, filltemplate
 
 # iprPy imports
 from ...tools import read_calc_file
@@ -38,7 +43,8 @@ def point_defect_mobility(lammps_command: str,
                           dumpsteps: Optional[int] = None,
                           timestep: float = uc.set_in_units(0.01, 'ps'),
                           minsteps: int = 10000,
-                          climbsteps: int = 10000):
+                          climbsteps: int = 10000,
+                          warmstart_positions: Optional[npt.ArrayLike] = None):
     """
     Evaluates the mobility of point defects using NEB.
 
@@ -69,8 +75,8 @@ def point_defect_mobility(lammps_command: str,
     partition: str or None, optional
         The value for the LAMMPS command line partition option that should be
         of the form 'MxN' where M is the number of partitions (replicas) and
-        N is the number of cores per replica.  If not given, this will default
-        to M=numreplicas and N=1. 
+        N is the number of cores per replica.  If not given, M=numreplicas and
+        N is the number of MPI processes divided evenly between the replicas.
     point_kwargs : dict, list of dict, or None, optional
         Any dictionaries containing the keyword arguments for the
         atomman.defect.point() function to modify the system with to alter the
@@ -105,6 +111,12 @@ def point_defect_mobility(lammps_command: str,
     climbsteps : int, optional
         The maximum number of steps to perform during the NEB climbing
         operation.  Default value is 10000.
+    warmstart_positions : array-like or None, optional
+        The final NEB atom positions, 'neb_positions', of a previous
+        calculation for a similar pathway to use as the initial path.  The
+        path's deviations from a straight line are mapped onto the new
+        endpoints and resampled to numreplicas.  If not given (default), the
+        initial path is a linear interpolation between the endpoints.
 
     Returns
     -------
@@ -181,6 +193,13 @@ def point_defect_mobility(lammps_command: str,
     # Modify/build systems
     firstsystem = firstsystem.atoms_extend(atoms1, symbols=symbols)
     lastsystem = am.System(atoms=atoms2, box=firstsystem.box)
+
+    # Build the initial path from a previous calculation
+    if warmstart_positions is not None:
+        initial_path = warmstart_path(neb_pos1, neb_pos2, warmstart_positions,
+                                      numreplicas)
+    else:
+        initial_path = None
             
     # Run NEB
     neblog = neb(lammps_command, firstsystem, lastsystem, potential,
@@ -189,7 +208,7 @@ def point_defect_mobility(lammps_command: str,
                  etol=etol, ftol=ftol, dmax=dmax, numreplicas=numreplicas,
                  springconst=springconst, thermosteps=thermosteps,
                  dumpsteps=dumpsteps, timestep=timestep, minsteps=minsteps,
-                 climbsteps=climbsteps)
+                 climbsteps=climbsteps, initial_path=initial_path)
 
     # Get final step and NEB path values at that step
     finalstep = neblog.climbrun.Step.values[-1]
@@ -214,6 +233,64 @@ def point_defect_mobility(lammps_command: str,
 
     return results
 
+def warmstart_path(neb_pos1: npt.ArrayLike,
+                   neb_pos2: npt.ArrayLike,
+                   prior_positions: npt.ArrayLike,
+                   numreplicas: int) -> np.ndarray:
+    """
+    Maps a converged NEB path from a previous calculation onto new endpoints.
+    For each NEB atom, the deviation of the prior path from the straight line
+    between its endpoints is scaled by the ratio of the new and prior endpoint
+    separations, resampled to the new number of replicas, and added to the
+    straight line between the new endpoints.
+
+    Parameters
+    ----------
+    neb_pos1: array-like
+        The new initial position(s) of the NEB atom(s).
+    neb_pos2: array-like
+        The new final position(s) of the NEB atom(s).
+    prior_positions : array-like
+        The prior path as the NEB atom positions in each replica, with shape
+        (number of NEB atoms, number of prior replicas, 3).
+    numreplicas : int
+        The number of NEB replicas in the new path.
+
+    Returns
+    -------
+    numpy.ndarray
+        The NEB atom positions in each new replica, with shape
+        (numreplicas, number of NEB atoms, 3).
+    """
+    neb_pos1 = np.asarray(neb_pos1).reshape(-1, 3)
+    neb_pos2 = np.asarray(neb_pos2).reshape(-1, 3)
+    prior_positions = np.asarray(prior_positions)
+    if prior_positions.ndim != 3 or prior_positions.shape[0] != neb_pos1.shape[0] or prior_positions.shape[2] != 3:
+        raise ValueError('warmstart positions must be of shape (number of NEB atoms, number of replicas, 3)')
+
+    t_prior = np.linspace(0.0, 1.0, prior_positions.shape[1])
+    t_new = np.linspace(0.0, 1.0, numreplicas)
+
+    # Deviations of the prior path from its straight line
+    start = prior_positions[:, :1]
+    end = prior_positions[:, -1:]
+    deviation = prior_positions - (start + t_prior[np.newaxis, :, np.newaxis] * (end - start))
+
+    # Scale to the new endpoint separations
+    prior_length = np.linalg.norm(end - start, axis=2)
+    new_length = np.linalg.norm(neb_pos2 - neb_pos1, axis=1)[:, np.newaxis]
+    scale = np.divide(new_length, prior_length, out=np.ones_like(prior_length),
+                      where=prior_length > 0)
+    deviation *= scale[:, :, np.newaxis]
+
+    # Resample to the new replicas
+    path = np.empty((numreplicas, neb_pos1.shape[0], 3))
+    for i in range(neb_pos1.shape[0]):
+        for j in range(3):
+            path[:, i, j] = (neb_pos1[i, j] + t_new * (neb_pos2[i, j] - neb_pos1[i, j])
+                             + np.interp(t_new, t_prior, deviation[i, :, j]))
+    return path
+
 def neb(lammps_command: str,
         firstsystem: am.System,
         lastsystem: am.System,
@@ -231,10 +308,14 @@ def neb(lammps_command: str,
         dumpsteps: Optional[int] = None, 
         timestep: float = uc.set_in_units(0.01, 'ps'),
         minsteps: int = 10000,
-        climbsteps: int = 10000) -> dict:
+        climbsteps: int = 10000,
+        initial_path: Optional[npt.ArrayLike] = None) -> dict:
     """
     Sets up and runs the neb.template LAMMPS script for performing an NEB
-    calculation between two configurations.
+    calculation between two configurations.  The minimization and climbing
+    operations are run as separate LAMMPS runs, with the progress recorded in
+    neb_checkpoint.json.  Calling again in the same directory resumes an
+    interrupted calculation from the last complete set of replica dump files.
     
     Parameters
     ----------
@@ -257,8 +338,8 @@ def neb(lammps_command: str,
     partition: str or None, optional
         The value for the LAMMPS command line partition option that should be
         of the form 'MxN' where M is the number of partitions (replicas) and
-        N is the number of cores per replica.  If not given, this will default
-        to M=numreplicas and N=1. 
+        N is the number of cores per replica.  If not given, M=numreplicas and
+        N is the number of MPI processes divided evenly between the replicas.
     id_key : str or None, optional
         The name of the atoms property of lastsystem to match the contained
         NEB atoms to those in firstsystem.  A default value of None will use
@@ -299,12 +380,17 @@ def neb(lammps_command: str,
     climbsteps : int, optional
         The maximum number of steps to perform during the NEB climbing
         operation.  Default value is 10000.
+    initial_path : array-like or None, optional
+        The positions of the lastsystem atoms in each replica to start the
+        NEB from, with shape (numreplicas, lastsystem.natoms, 3).  If not given
+        (default), the replicas are linearly interpolated between firstsystem
+        and lastsystem.
 
     Returns
     -------
     atomman.lammps.NEBLog
-        The collection of all thermo and NEB data from within all of the
-        log.lammps values for both individual replicas and the overall NEB
+        The collection of all thermo and NEB data from within the log files of
+        the climbing run for both individual replicas and the overall NEB
         run.
     """
     
@@ -319,12 +405,16 @@ def neb(lammps_command: str,
     force_per_length = f"{lammps_units['force']}/{lammps_units['length']}"
     
     # Get lammps version date
-    lammps_date = lmp.checkversion(lammps_command)['date']
+    lammps_date = checkversion(lammps_command)['date']
     
     # Set default dumpsteps
     if dumpsteps is None:
         dumpsteps = max(minsteps, climbsteps)
 
+    # LAMMPS requires the neb step counts to be multiples of thermosteps
+    if minsteps % thermosteps != 0 or climbsteps % thermosteps != 0:
+        raise ValueError('minsteps and climbsteps must be multiples of thermosteps')
+
     # Define lammps variables
     lammps_variables = {}
     
@@ -334,18 +424,140 @@ def neb(lammps_command: str,
     lammps_variables['thermosteps'] = thermosteps
     lammps_variables['dumpsteps'] = dumpsteps
     lammps_variables['timestep'] = uc.get_in_units(timestep, lammps_units['time'])
-    lammps_variables['minsteps'] = minsteps
-    lammps_variables['climbsteps'] = climbsteps
     lammps_variables['dmax'] = uc.get_in_units(dmax, lammps_units['length'])
     lammps_variables['etol'] = etol
     lammps_variables['ftol'] = uc.get_in_units(ftol, lammps_units['force'])
-    lammps_variables['final_system'] = 'final.dat'
     
     # Set dump_modify_format based on lammps_date
     if lammps_date < datetime.date(2016, 8, 3):
         lammps_variables['dump_modify_format'] = '"%d %d %.13e %.13e %.13e %.13e %.13e %.13e %.13e"'
+        lammps_variables['end_dump_format'] = '"%d %d %.13e %.13e %.13e"'
     else:
         lammps_variables['dump_modify_format'] = 'float %.13e'
+        lammps_variables['end_dump_format'] = 'float %.13e'
+    
+    # Set the partition option for the LAMMPS command
+    if partition is None:
+        partition, mpi_command = neb_partition(numreplicas, mpi_command)
+
+    # Write the warm start replica files
+    if initial_path is not None:
+        initial_path = np.asarray(initial_path)
+        if initial_path.shape != (numreplicas, lastsystem.natoms, 3):
+            raise ValueError('initial_path must be of shape (numreplicas, lastsystem.natoms, 3)')
+        replica = deepcopy(lastsystem)
+        for r in range(numreplicas):
+            replica.atoms.pos = initial_path[r]
+            replica.dump('neb_replica', f=f'warmstart.replica-{r+1}.dat',
+                         id_key=id_key, id_start0=id_start0)
+    
+    # Load the checkpoint of any earlier runs with the same inputs
+    inputs = neb_inputs_digest(lammps_variables, numreplicas, minsteps,
+                               climbsteps, partition, initial_path is not None)
+    checkpoint = load_neb_checkpoint(inputs)
+    
+    # Perform the NEB minimization stage
+    if checkpoint['stage'] == 'min':
+        
+        # Resume from the last complete set of replica dumps
+        step = last_replica_step(numreplicas, firstsystem.natoms, maxstep=minsteps)
+        if step is not None and step > 0:
+            write_replica_files(numreplicas, step, 'resume')
+            neb_start = 'each resume.replica-${i}.dat'
+        elif initial_path is not None:
+            step = 0
+            neb_start = 'each warmstart.replica-${i}.dat'
+        else:
+            step = 0
+            neb_start = 'final final.dat'
+        
+        nsteps = minsteps - step
+        nsteps -= nsteps % thermosteps
+        if nsteps > 0:
+            run_neb_stage(lammps_command, lammps_variables, 'min', step, nsteps, 0,
+                          neb_start, partition, mpi_command)
+        
+        # Checkpoint the replica coordinates written at the end of the stage
+        if nsteps > 0:
+            step = replica_dump_step('min-end.replica-1.dump')
+            write_replica_files(numreplicas, step, 'checkpoint', dumpprefix='min-end')
+            climb_start = 'each checkpoint.replica-${i}.dat'
+        else:
+            climb_start = neb_start
+        checkpoint = {'stage': 'climb', 'step': step, 'start': climb_start,
+                      'inputs': inputs}
+        save_neb_checkpoint(checkpoint)
+    
+    # Perform the NEB climbing stage
+    if checkpoint['stage'] == 'climb':
+        
+        # Resume from the last complete set of replica dumps past the checkpoint
+        minstep = checkpoint['step']
+        step = last_replica_step(numreplicas, firstsystem.natoms,
+                                 maxstep=minstep + climbsteps)
+        if step is not None and step > minstep:
+            write_replica_files(numreplicas, step, 'resume')
+            neb_start = 'each resume.replica-${i}.dat'
+        else:
+            step = minstep
+            neb_start = checkpoint.get('start', 'each checkpoint.replica-${i}.dat')
+        
+        nsteps = climbsteps - (step - minstep)
+        nsteps -= nsteps % thermosteps
+        if nsteps <= 0:
+            # Run at least one output interval so the climb stage is logged
+            nsteps = thermosteps
+        run_neb_stage(lammps_command, lammps_variables, 'climb', step, 0, nsteps,
+                      neb_start, partition, mpi_command)
+        
+        checkpoint = {'stage': 'done', 'step': minstep, 'inputs': inputs}
+        save_neb_checkpoint(checkpoint)
+    
+    neblog = lmp.NEBLog(neblog='neb-climb-log.lammps',
+                        replicalogs='neb-climb-log.lammps.*')
+
+    return neblog
+
+def run_neb_stage(lammps_command: str,
+                  lammps_variables: dict,
+                  stage: str,
+                  timestep_start: int,
+                  minsteps: int,
+                  climbsteps: int,
+                  neb_start: str,
+                  partition: str,
+                  mpi_command: Optional[str] = None):
+    """
+    Writes the neb_lammps.in script for one NEB stage and runs it.
+    
+    Parameters
+    ----------
+    lammps_command :str
+        Command for running LAMMPS.
+    lammps_variables : dict
+        The template variables common to all stages.
+    stage : str
+        The stage name, 'min' or 'climb', used to name the log files.
+    timestep_start : int
+        The step number to start the stage at.
+    minsteps : int
+        The number of NEB minimization steps to perform.
+    climbsteps : int
+        The number of NEB climbing steps to perform.
+    neb_start : str
+        The file options for the LAMMPS neb command that set the initial
+        replica coordinates.
+    partition : str
+        The LAMMPS partition command line option value.
+    mpi_command : str, optional
+        The MPI command for running LAMMPS in parallel.
+    """
+    lammps_variables = dict(lammps_variables)
+    lammps_variables['timestep_start'] = timestep_start
+    lammps_variables['minsteps'] = minsteps
+    lammps_variables['climbsteps'] = climbsteps
+    lammps_variables['neb_start'] = neb_start
+    lammps_variables['stage_end'] = f'{stage}-end'
     
     # Write lammps input script
     lammps_script = 'neb_lammps.in'
@@ -354,13 +566,289 @@ def neb(lammps_command: str,
     with open(lammps_script, 'w') as f:
         f.write(filltemplate(template, lammps_variables, '<', '>'))
     
-    # Add the partition option to the LAMMPS command
-    if partition is None:
-        partition = f'{numreplicas}x1'
+    # Run the NEB stage
+    logfile = f'neb-{stage}-log.lammps'
+    lmp.run(lammps_command, script_name=lammps_script, partition=partition,
+            mpi_command=mpi_command, logfile=logfile, screen=False)
+    
+    check_neb_stage(logfile, stage, timestep_start, max(minsteps, climbsteps))
 
-    # Run the calc_neb
-    output = lmp.run(lammps_command, script_name=lammps_script,
-                     partition=partition, mpi_command=mpi_command, screen=False)
-    neblog = lmp.NEBLog()
+def check_neb_stage(logfile: str,
+                    stage: str,
+                    timestep_start: int,
+                    nsteps: int):
+    """
+    Checks that LAMMPS performed a NEB stage as requested.  The stages are run
+    as separate neb commands with N2=0 for the minimization stage and N1=0 for
+    the climbing stage, which relies on LAMMPS skipping the other stage.
+    
+    Parameters
+    ----------
+    logfile : str
+        The NEB master log file of the stage.
+    stage : str
+        The stage name, 'min' or 'climb'.
+    timestep_start : int
+        The step number that the stage started at.
+    nsteps : int
+        The maximum number of steps of the stage.
+    
+    Raises
+    ------
+    RuntimeError
+        If the log shows no steps, too many steps, climbing during the
+        minimization stage or no climbing during the climbing stage.
+    """
+    steps = []
+    climbed = False
+    with open(logfile, encoding='UTF-8') as f:
+        for line in f:
+            terms = line.split()
+            if len(terms) == 0:
+                continue
+            if line.startswith('Climbing replica'):
+                climbed = True
+            elif len(terms) > 1:
+                try:
+                    steps.append(int(terms[0]))
+                    float(terms[1])
+                except ValueError:
+                    pass
+    
+    if len(steps) == 0:
+        raise RuntimeError(f'No NEB steps found in {logfile}')
+    if stage == 'min' and climbed:
+        raise RuntimeError('LAMMPS performed barrier climbing during the min stage: neb with N2=0 is not supported by this LAMMPS')
+    if stage == 'climb' and not climbed:
+        raise RuntimeError('LAMMPS did not perform barrier climbing during the climb stage: neb with N1=0 is not supported by this LAMMPS')
+    if max(steps) > timestep_start + nsteps:
+        raise RuntimeError(f'NEB {stage} stage ran past step {timestep_start + nsteps}')
 
-    return neblog
\ No newline at end of file
+def neb_partition(numreplicas: int,
+                  mpi_command: Optional[str] = None) -> tuple:
+    """
+    Determines the LAMMPS partition option that splits the MPI processes
+    evenly across the NEB replicas.  The number of processes is taken from
+    the process count option of mpi_command (-n, -np, --np, --ntasks, or -c
+    for launchers other than srun where -c is the cpus per task) so that the
+    partition always matches the processes that are launched.
+    
+    Parameters
+    ----------
+    numreplicas : int
+        The number of NEB replicas.
+    mpi_command : str, optional
+        The MPI command for running LAMMPS in parallel.
+    
+    Returns
+    -------
+    partition : str
+        The partition option of the form 'MxN' with M=numreplicas and N the
+        number of cores per replica.
+    mpi_command : str or None
+        The MPI command with its process count reduced to M*N if the cores
+        were not evenly divisible across the replicas.
+    
+    Raises
+    ------
+    ValueError
+        If mpi_command does not give a process count or gives fewer
+        processes than replicas.
+    """
+    if mpi_command is None:
+        return f'{numreplicas}x1', mpi_command
+    
+    options = ['-n', '-np', '--np', '--ntasks']
+    if Path(mpi_command.split()[0]).name != 'srun':
+        options.append('-c')
+    match = re.search(r'(?<!\S)(' + '|'.join(options) + r')(\s+|=)(\d+)(?!\S)', mpi_command)
+    if match is None:
+        raise ValueError('mpi_command does not give a process count for setting the NEB partition: add one or give partition')
+    ncores = int(match[3])
+    
+    ncores_per_replica = ncores // numreplicas
+    if ncores_per_replica < 1:
+        raise ValueError(f'{numreplicas} NEB replicas need at least {numreplicas} cores, only {ncores} available')
+    
+    # Reduce the process count to use only full replicas
+    if ncores_per_replica * numreplicas != ncores:
+        mpi_command = (mpi_command[:match.start(3)]
+                       + str(ncores_per_replica * numreplicas)
+                       + mpi_command[match.end(3):])
+
+    return f'{numreplicas}x{ncores_per_replica}', mpi_command
+
+def last_replica_step(numreplicas: int,
+                      natoms: int,
+                      maxstep: Optional[int] = None) -> Optional[int]:
+    """
+    Finds the last step for which a complete set of replica dump files
+    exists.
+    
+    Parameters
+    ----------
+    numreplicas : int
+        The number of NEB replicas.
+    natoms : int
+        The number of atoms that each dump file should contain.
+    maxstep : int, optional
+        If given, steps after maxstep are ignored.
+    
+    Returns
+    -------
+    int or None
+        The step, or None if no complete set is found.
+    """
+    steps = []
+    for dumpfile in Path().glob('step-*.replica-1.dump'):
+        steps.append(int(dumpfile.name.split('.')[0][5:]))
+    
+    for step in sorted(steps, reverse=True):
+        if maxstep is not None and step > maxstep:
+            continue
+        for r in range(numreplicas):
+            try:
+                replica = am.load('atom_dump', f'step-{step}.replica-{r+1}.dump')
+            except Exception:
+                break
+            if replica.natoms != natoms:
+                break
+        else:
+            return step
+    return None
+
+def replica_dump_step(dumpfile: str) -> int:
+    """
+    Reads the timestep of a LAMMPS dump file.
+    
+    Parameters
+    ----------
+    dumpfile : str
+        The dump file.
+    
+    Returns
+    -------
+    int
+        The timestep that the dump was written at.
+    """
+    with open(dumpfile, encoding='UTF-8') as f:
+        for line in f:
+            if line.startswith('ITEM: TIMESTEP'):
+                return int(f.readline().split()[0])
+    raise ValueError(f'No timestep found in {dumpfile}')
+
+def write_replica_files(numreplicas: int,
+                        step: int,
+                        prefix: str,
+                        dumpprefix: Optional[str] = None):
+    """
+    Converts the replica dump files for a step into coordinate files that the
+    LAMMPS neb command can read with the each option.
+    
+    Parameters
+    ----------
+    numreplicas : int
+        The number of NEB replicas.
+    step : int
+        The step of the dump files to convert.
+    prefix : str
+        The coordinate files are named <prefix>.replica-<r>.dat.
+    dumpprefix : str, optional
+        The dump files read are named <dumpprefix>.replica-<r>.dump.  Default
+        value is step-<step>.
+    """
+    if dumpprefix is None:
+        dumpprefix = f'step-{step}'
+    for r in range(numreplicas):
+        replica = am.load('atom_dump', f'{dumpprefix}.replica-{r+1}.dump')
+        replica.dump('neb_replica', f=f'{prefix}.replica-{r+1}.dat',
+                     id_key='atom_id', id_start0=False)
+
+def neb_inputs_digest(lammps_variables: dict,
+                      numreplicas: int,
+                      minsteps: int,
+                      climbsteps: int,
+                      partition: str,
+                      warmstart: bool) -> str:
+    """
+    Computes a digest of the inputs that determine an NEB calculation so that
+    checkpoints of runs with different inputs are not resumed.
+    
+    Parameters
+    ----------
+    lammps_variables : dict
+        The LAMMPS template variables shared by the stages.
+    numreplicas : int
+        The number of NEB replicas.
+    minsteps : int
+        The maximum number of NEB minimization steps.
+    climbsteps : int
+        The maximum number of NEB climbing steps.
+    partition : str
+        The LAMMPS partition option.
+    warmstart : bool
+        Indicates if the warmstart replica files are used.
+    
+    Returns
+    -------
+    str
+        The hex SHA-256 digest.
+    """
+    h = hashlib.sha256()
+    h.update(json.dumps([lammps_variables, numreplicas, minsteps, climbsteps,
+                         partition], sort_keys=True, default=str).encode('UTF-8'))
+    files = ['init.dat', 'final.dat']
+    if warmstart:
+        files += [f'warmstart.replica-{r+1}.dat' for r in range(numreplicas)]
+    for fname in files:
+        with open(fname, 'rb') as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+def load_neb_checkpoint(inputs: str) -> dict:
+    """
+    Loads the NEB stage checkpoint saved by earlier runs in the current
+    directory.  If the checkpoint was saved for different inputs, the files
+    of the earlier runs are removed and the calculation starts over.
+    
+    Parameters
+    ----------
+    inputs : str
+        The digest of the current inputs from neb_inputs_digest().
+    
+    Returns
+    -------
+    dict
+        The 'stage' to run next, 'min', 'climb' or 'done', the 'step' that
+        the minimization stage ended at, and the 'inputs' digest.
+    """
+    try:
+        with open('neb_checkpoint.json', encoding='UTF-8') as f:
+            checkpoint = json.load(f)
+    except FileNotFoundError:
+        checkpoint = None
+    
+    if checkpoint is not None and checkpoint.get('inputs') == inputs:
+        return checkpoint
+    
+    # Remove files from runs with other inputs so they are not resumed
+    for pattern in ['step-*.replica-*.dump', '*-end.replica-*.dump',
+                    'resume.replica-*.dat', 'checkpoint.replica-*.dat',
+                    'neb_checkpoint.json']:
+        for oldfile in Path().glob(pattern):
+            oldfile.unlink()
+    return {'stage': 'min', 'step': 0, 'inputs': inputs}
+
+def save_neb_checkpoint(checkpoint: dict):
+    """
+    Atomically saves the NEB stage checkpoint.
+    
+    Parameters
+    ----------
+    checkpoint : dict
+        The 'stage' to run next, the 'step' that the minimization stage
+        ended at, and the 'inputs' digest.
+    """
+    with open('neb_checkpoint.json.tmp', 'w', encoding='UTF-8') as f:
+        json.dump(checkpoint, f)
+    os.replace('neb_checkpoint.json.tmp', 'neb_checkpoint.json')
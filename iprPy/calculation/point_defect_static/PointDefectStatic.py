@@ -652,6 +652,7 @@ class PointDefectStatic(Calculation):
         input_dict['cutoff'] = 1.05 * input_dict['ucell'].box.a
         del input_dict['ucell']
         del input_dict['transform']
+        input_dict['reference_cache'] = self.reference_cache
 
         # Return input_dict
         return input_dict
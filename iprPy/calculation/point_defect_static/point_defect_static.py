@@ -16,10 +16,11 @@ import numpy as np
 import atomman as am
 import atomman.lammps as lmp
 import atomman.unitconvert as uc
-from atomman.tools import filltemplate
+from ...tools import checkversion, filltemplate
 
 # iprPy imports
-from ...tools import read_calc_file
+from ...tools import (read_calc_file, load_reference_cache, reference_key,
+                      system_digest)
 
 def calc(lammps_command: str,
          system: am.System,
@@ -32,7 +33,8 @@ def calc(lammps_command: str,
          maxiter: int = 10000,
          maxeval: int = 100000,
          dmax: float = uc.set_in_units(0.01, 'angstrom'),
-         tol: float = uc.set_in_units(1e-5, 'angstrom')) -> dict:
+         tol: float = uc.set_in_units(1e-5, 'angstrom'),
+         reference_cache: Optional[str] = None) -> dict:
     """
     Adds one or more point defects to a system and evaluates the defect 
     formation energy. Evaluates a relaxed system containing a point defect
@@ -78,6 +80,10 @@ def calc(lammps_command: str,
     tol : float, optional
         Absolute tolerance to use for identifying if a defect has
         reconfigured (default is 1e-5 Angstoms).
+    reference_cache : str, optional
+        The directory of the shared reference cache to use.  If not given,
+        the IPRPY_REFERENCE_CACHE environment variable is used if set.  An
+        empty string disables the cache.
     
     Returns
     -------
@@ -120,7 +126,8 @@ def calc(lammps_command: str,
                                ftol = ftol,
                                maxiter = maxiter,
                                maxeval = maxeval,
-                               dmax = dmax)
+                               dmax = dmax,
+                               reference_cache = reference_cache)
     
     # Run check_ptd_config
     results_dict2 = check_ptd_config(results_dict['system_ptd'],
@@ -139,7 +146,8 @@ def pointdefect(lammps_command: str,
                 ftol: float = 0.0,
                 maxiter: int = 10000,
                 maxeval: int = 100000,
-                dmax: float = uc.set_in_units(0.01, 'angstrom')) -> dict:
+                dmax: float = uc.set_in_units(0.01, 'angstrom'),
+                reference_cache: Optional[str] = None) -> dict:
     """
     Adds one or more point defects to a system and evaluates the defect 
     formation energy.
@@ -178,6 +186,10 @@ def pointdefect(lammps_command: str,
         The maximum distance in length units that any atom is allowed to relax
         in any direction during a single minimization iteration (default is
         0.01 Angstroms).
+    reference_cache : str, optional
+        The directory of the shared reference cache to use.  If not given,
+        the IPRPY_REFERENCE_CACHE environment variable is used if set.  An
+        empty string disables the cache.
     
     Returns
     -------
@@ -203,7 +215,8 @@ def pointdefect(lammps_command: str,
     lammps_units = lmp.style.unit(potential.units)
     
     #Get lammps version date
-    lammps_date = lmp.checkversion(lammps_command)['date']
+    version_info = checkversion(lammps_command)
+    lammps_date = version_info['date']
     
     # Define lammps variables
     lammps_variables = {}
@@ -226,37 +239,39 @@ def pointdefect(lammps_command: str,
     lammps_script = 'min.in'
     template = read_calc_file('iprPy.calculation.point_defect_static',
                               'min.template')
-    with open(lammps_script, 'w') as f:
-        f.write(filltemplate(template, lammps_variables, '<', '>'))
 
-    # Run lammps to relax perfect.dat
-    output = lmp.run(lammps_command, script_name=lammps_script,
-                     mpi_command=mpi_command)
-    
-    # Extract LAMMPS thermo data.
-    thermo = output.simulations[0]['thermo']
-    E_total_base = uc.set_in_units(thermo.PotEng.values[-1],
-                                   lammps_units['energy'])
+    # Relax perfect.dat or reuse a shared reference of it
+    cache = load_reference_cache(reference_cache)
+    if cache is None:
+        E_total_base, pressure_base, system_base = relax_perfect(
+            lammps_command, system, lammps_variables, template,
+            lammps_units, mpi_command=mpi_command)
+    else:
+        key = reference_key(reference='point_defect_static perfect',
+                            lammps_command=lammps_command,
+                            lammps_version=version_info['version'],
+                            potential=potential.key,
+                            system=system_digest(system),
+                            etol=etol, ftol=ftol, maxiter=maxiter,
+                            maxeval=maxeval, dmax=dmax)
+        files = {'perfect.dump': 'perfect.dump',
+                 'min-perfect-log.lammps': 'min-perfect-log.lammps'}
+        with cache.lock(key):
+            reference = cache.get(key, files=files)
+            if reference is None:
+                E_total_base, pressure_base, system_base = relax_perfect(
+                    lammps_command, system, lammps_variables, template,
+                    lammps_units, mpi_command=mpi_command)
+                cache.put(key, {'E_total_base': E_total_base,
+                                'pressure_base': pressure_base}, files=files)
+            else:
+                E_total_base = reference['E_total_base']
+                pressure_base = np.array(reference['pressure_base'])
+                system_base = am.load('atom_dump', 'perfect.dump',
+                                      symbols=system.symbols)
+                system_base.box_set(vects=system.box.vects)
     E_pot = E_total_base / system.natoms
     
-    pxx = uc.set_in_units(thermo.Pxx.values[-1], lammps_units['pressure'])
-    pyy = uc.set_in_units(thermo.Pyy.values[-1], lammps_units['pressure'])
-    pzz = uc.set_in_units(thermo.Pzz.values[-1], lammps_units['pressure'])
-    pxy = uc.set_in_units(thermo.Pxy.values[-1], lammps_units['pressure'])
-    pxz = uc.set_in_units(thermo.Pxz.values[-1], lammps_units['pressure'])
-    pyz = uc.set_in_units(thermo.Pyz.values[-1], lammps_units['pressure'])
-    pressure_base = np.array([[pxx, pxy, pxz], [pxy, pyy, pyz], [pxz, pyz, pzz]])
-    
-    # Rename log file
-    shutil.move('log.lammps', 'min-perfect-log.lammps')
-    
-    # Load relaxed system from dump file and copy old box vectors because 
-    # dump files crop the values.
-    last_dump_file = 'atom.' + str(thermo.Step.values[-1])
-    system_base = am.load('atom_dump', last_dump_file, symbols=system.symbols)
-    system_base.box_set(vects=system.box.vects)
-    system_base.dump('atom_dump', f='perfect.dump')
-    
     # Add defect(s)
     system_ptd = deepcopy(system_base)
     if not isinstance(point_kwargs, (list, tuple)):
@@ -325,6 +340,75 @@ def pointdefect(lammps_command: str,
     
     return results_dict
 
+def relax_perfect(lammps_command: str,
+                  system: am.System,
+                  lammps_variables: dict,
+                  template: str,
+                  lammps_units: dict,
+                  mpi_command: Optional[str] = None) -> tuple:
+    """
+    Relaxes the defect-free system saved to perfect.dat.  The relaxed system
+    is saved to perfect.dump and the LAMMPS log to min-perfect-log.lammps.
+
+    Parameters
+    ----------
+    lammps_command :str
+        Command for running LAMMPS.
+    system : atomman.System
+        The defect-free system that was saved to perfect.dat.
+    lammps_variables : dict
+        The LAMMPS input template variables for perfect.dat.
+    template : str
+        The min.template contents.
+    lammps_units : dict
+        The LAMMPS units of the potential.
+    mpi_command : str, optional
+        The MPI command for running LAMMPS in parallel.  If not given, LAMMPS
+        will run serially.
+
+    Returns
+    -------
+    E_total_base : float
+        The total potential energy of the relaxed system.
+    pressure_base : numpy.ndarray
+        The 3x3 pressure tensor of the relaxed system.
+    system_base : atomman.System
+        The relaxed system.
+    """
+    # Write lammps input script
+    lammps_script = 'min.in'
+    with open(lammps_script, 'w') as f:
+        f.write(filltemplate(template, lammps_variables, '<', '>'))
+
+    # Run lammps to relax perfect.dat
+    output = lmp.run(lammps_command, script_name=lammps_script,
+                     mpi_command=mpi_command)
+    
+    # Extract LAMMPS thermo data.
+    thermo = output.simulations[0]['thermo']
+    E_total_base = uc.set_in_units(thermo.PotEng.values[-1],
+                                   lammps_units['energy'])
+    
+    pxx = uc.set_in_units(thermo.Pxx.values[-1], lammps_units['pressure'])
+    pyy = uc.set_in_units(thermo.Pyy.values[-1], lammps_units['pressure'])
+    pzz = uc.set_in_units(thermo.Pzz.values[-1], lammps_units['pressure'])
+    pxy = uc.set_in_units(thermo.Pxy.values[-1], lammps_units['pressure'])
+    pxz = uc.set_in_units(thermo.Pxz.values[-1], lammps_units['pressure'])
+    pyz = uc.set_in_units(thermo.Pyz.values[-1], lammps_units['pressure'])
+    pressure_base = np.array([[pxx, pxy, pxz], [pxy, pyy, pyz], [pxz, pyz, pzz]])
+    
+    # Rename log file
+    shutil.move('log.lammps', 'min-perfect-log.lammps')
+    
+    # Load relaxed system from dump file and copy old box vectors because 
+    # dump files crop the values.
+    last_dump_file = 'atom.' + str(thermo.Step.values[-1])
+    system_base = am.load('atom_dump', last_dump_file, symbols=system.symbols)
+    system_base.box_set(vects=system.box.vects)
+    system_base.dump('atom_dump', f='perfect.dump')
+
+    return E_total_base, pressure_base, system_base
+
 def check_ptd_config(system: am.System,
                      point_kwargs: Union[list, dict],
                      cutoff: float,
@@ -70,6 +70,7 @@ class RelaxBox(Calculation):
         self.pressure_xz = 0.0
         self.pressure_yz = 0.0
         self.strainrange = 1e-6
+        self.update_method = 'newton'
         self.__initial_dump = None
         self.__final_dump = None
         self.__final_box = None
@@ -80,6 +81,8 @@ class RelaxBox(Calculation):
         self.__measured_pressure_xy = None
         self.__measured_pressure_xz = None
         self.__measured_pressure_yz = None
+        self.__cij_evaluations = None
+        self.__pressure_evaluations = None
 
         # Define calc shortcut
         self.calc = relax_box
@@ -93,7 +96,8 @@ class RelaxBox(Calculation):
         """list: the names of each file used by the calculation."""
         return [
             'relax_box.py',
-            'cij.template'
+            'cij_run0.template',
+            'pressure_run0.template'
         ]
 
 ############################## Class attributes ################################
@@ -188,6 +192,18 @@ class RelaxBox(Calculation):
         assert val >= 0.0
         self.__strainrange = val
 
+    @property
+    def update_method(self) -> str:
+        """str: Method used to update the box between cycles: 'newton' or 'bfgs'"""
+        return self.__update_method
+
+    @update_method.setter
+    def update_method(self, val: str):
+        val = str(val).lower()
+        if val not in ['newton', 'bfgs']:
+            raise ValueError("update_method must be 'newton' or 'bfgs'")
+        self.__update_method = val
+
     @property
     def initial_dump(self) -> dict:
         """dict: Info about the initial dump file"""
@@ -258,6 +274,20 @@ class RelaxBox(Calculation):
             raise ValueError('No results yet!')
         return self.__measured_pressure_yz
 
+    @property
+    def cij_evaluations(self) -> int:
+        """int: Number of elastic constant evaluations performed by the relaxation"""
+        if self.__cij_evaluations is None:
+            raise ValueError('No results yet!')
+        return self.__cij_evaluations
+
+    @property
+    def pressure_evaluations(self) -> int:
+        """int: Number of pressure-only evaluations performed by the relaxation"""
+        if self.__pressure_evaluations is None:
+            raise ValueError('No results yet!')
+        return self.__pressure_evaluations
+
     def set_values(self,
                    name: Optional[str] = None,
                    **kwargs: any):
@@ -285,6 +315,10 @@ class RelaxBox(Calculation):
         strainrange : float, optional
             The magnitide of the strain to use for evaluating the elastic
             constants, which are then used to relax the box dimensions.
+        update_method : str, optional
+            How the box is updated between cycles.  'newton' reevaluates the
+            elastic constants every cycle while 'bfgs' evaluates them once and
+            updates them from the pressures of successive cycles.
         **kwargs : any, optional
             Any keyword parameters supported by the set_values() methods of
             the parent Calculation class and the subset classes.
@@ -307,6 +341,8 @@ class RelaxBox(Calculation):
             self.pressure_yz = kwargs['pressure_yz']
         if 'strainrange' in kwargs:
             self.strainrange = kwargs['strainrange']
+        if 'update_method' in kwargs:
+            self.update_method = kwargs['update_method']
 
 ####################### Parameter file interactions ###########################
 
@@ -335,6 +371,7 @@ class RelaxBox(Calculation):
         input_dict['sizemults'] = input_dict.get('sizemults', '1 1 1')
 
         # Load calculation-specific strings
+        self.update_method = input_dict.get('update_method', 'newton')
 
         # Load calculation-specific booleans
 
@@ -463,6 +500,13 @@ class RelaxBox(Calculation):
             'strainrange': ' '.join([
                 "The strain range to use when estimating the elastic constants",
                 "used to relax the box dimensions.  Default value is 1e-6."]),
+            'update_method': ' '.join([
+                "How the box dimensions are updated between cycles. 'newton'",
+                "reevaluates the elastic constants for every cycle.  'bfgs'",
+                "evaluates the elastic constants once and refines them using",
+                "quasi-Newton updates from the pressure of each cycle, which",
+                "typically requires far fewer LAMMPS evaluations.  Default",
+                "value is 'newton'."]),
         }
 
     @property
@@ -516,6 +560,7 @@ class RelaxBox(Calculation):
             [
                 [
                     'strainrange',
+                    'update_method',
                 ]
             ]
         )
@@ -549,6 +594,7 @@ class RelaxBox(Calculation):
             calc['calculation']['run-parameter'] = DM()
         run_params = calc['calculation']['run-parameter']
         run_params['strain-range'] = self.strainrange
+        run_params['update-method'] = self.update_method
 
         # Save phase-state info
         calc['phase-state'] = DM()
@@ -611,6 +657,12 @@ class RelaxBox(Calculation):
                                                self.units.energy_unit,
                                                None)
 
+            # Save the number of LAMMPS evaluations performed
+            if self.__cij_evaluations is not None:
+                calc['number-of-evaluations'] = noe = DM()
+                noe['elastic-constants'] = self.cij_evaluations
+                noe['pressure'] = self.pressure_evaluations
+
         self._set_model(model)
         return model
 
@@ -635,6 +687,7 @@ class RelaxBox(Calculation):
         # Load calculation-specific content
         run_params = calc['calculation']['run-parameter']
         self.strainrange = run_params['strain-range']
+        self.update_method = run_params.get('update-method', 'newton')
 
         # Load phase-state info
         self.pressure_xx = uc.value_unit(calc['phase-state']['pressure-xx'])
@@ -671,6 +724,11 @@ class RelaxBox(Calculation):
             self.__measured_pressure_xz = uc.value_unit(mps['pressure-xz'])
             self.__measured_pressure_yz = uc.value_unit(mps['pressure-yz'])
 
+            if 'number-of-evaluations' in calc:
+                noe = calc['number-of-evaluations']
+                self.__cij_evaluations = noe['elastic-constants']
+                self.__pressure_evaluations = noe['pressure']
+
 ########################## Metadata interactions ##############################
 
     def metadata(self) -> dict:
@@ -708,6 +766,9 @@ class RelaxBox(Calculation):
             meta['measured_pressure_xy'] = self.measured_pressure_xy
             meta['measured_pressure_xz'] = self.measured_pressure_xz
             meta['measured_pressure_yz'] = self.measured_pressure_yz
+            if self.__cij_evaluations is not None:
+                meta['cij_evaluations'] = self.cij_evaluations
+                meta['pressure_evaluations'] = self.pressure_evaluations
 
         return meta
 
@@ -756,6 +817,7 @@ class RelaxBox(Calculation):
 
         # Add calculation-specific inputs
         input_dict['strainrange'] = self.strainrange
+        input_dict['update_method'] = self.update_method
         input_dict['p_xx'] = self.pressure_xx
         input_dict['p_yy'] = self.pressure_yy
         input_dict['p_zz'] = self.pressure_zz
@@ -776,6 +838,8 @@ class RelaxBox(Calculation):
             'final.dump',
             'cij-*-log.lammps',
             'cij_run0.in',
+            'pressure-*-log.lammps',
+            'pressure_run0.in',
         ]
 
     def process_results(self, results_dict: dict):
@@ -810,3 +874,5 @@ class RelaxBox(Calculation):
         self.__measured_pressure_xy = results_dict['measured_pxy']
         self.__measured_pressure_xz = results_dict['measured_pxz']
         self.__measured_pressure_yz = results_dict['measured_pyz']
+        self.__cij_evaluations = results_dict['cij_evaluations']
+        self.__pressure_evaluations = results_dict['pressure_evaluations']
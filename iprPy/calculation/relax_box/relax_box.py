@@ -13,7 +13,7 @@ import numpy as np
 import atomman as am
 import atomman.lammps as lmp
 import atomman.unitconvert as uc
-from atomman.tools import filltemplate
+from ...tools import filltemplate
 
 # iprPy imports
 from ...tools import read_calc_file
@@ -30,7 +30,8 @@ def relax_box(lammps_command: str,
               p_xz: float = 0.0,
               p_yz: float = 0.0,
               tol: float = 1e-10,
-              diverge_scale: float = 3.0)  -> dict:
+              diverge_scale: float = 3.0,
+              update_method: str = 'newton')  -> dict:
     """
     Quickly refines static orthorhombic system by evaluating the elastic
     constants and the virial pressure.
@@ -76,6 +77,14 @@ def relax_box(lammps_command: str,
         original dimension multiplied by diverge_scale, or if any current box
         dimension is less than the original dimension divided by diverge_scale.
         (Default is 3.0).
+    update_method : str, optional
+        Specifies how the box is updated between cycles.  'newton' (default)
+        evaluates the elastic constants for every cycle and takes a Newton
+        step.  'bfgs' evaluates the elastic constants only for the initial
+        system and refines them using BFGS updates from the pressures of
+        successive cycles, which only require single pressure evaluations.
+        Steps that do not reduce the pressure residual are backtracked, and
+        the elastic constants are reevaluated if backtracking fails.
     
     Returns
     -------
@@ -110,12 +119,20 @@ def relax_box(lammps_command: str,
           relaxed system.
         - **'measured_pyz'** (*float*) - The measured yz shear pressure of the
           relaxed system.
+        - **'cij_evaluations'** (*int*) - The number of elastic constant
+          evaluations performed.
+        - **'pressure_evaluations'** (*int*) - The number of pressure-only
+          evaluations performed.
     
     Raises
     ------
     RuntimeError
         If system diverges or no convergence reached after 100 cycles.
+    ValueError
+        If update_method is not supported.
     """
+    if update_method not in ['newton', 'bfgs']:
+        raise ValueError(f'unsupported update_method {update_method}')
     
     # Flag for if values have converged
     converged = False
@@ -126,63 +143,75 @@ def relax_box(lammps_command: str,
     
     system.dump('atom_dump', f='initial.dump')
     
-    for cycle in range(100):
-        
-        # Run LAMMPS and evaluate results based on system_old
-        results = cij_run0(lammps_command, system_current, potential,
-                           mpi_command=mpi_command, strainrange=strainrange,
-                           cycle=cycle)
-        pij = results['pij']
-        Cij = results['C'].Cij
-        system_new = update_box(system_current, results['C'], results['pij'],
-                                p_xx, p_yy, p_zz, p_xy, p_xz, p_yz, tol)
-        
-        # Compare new and current to test for convergence
-        if np.allclose(system_new.box.vects,
-                       system_current.box.vects,
-                       rtol=tol, atol=0):
-            converged = True
-            break
+    if update_method == 'bfgs':
+        converged, system_new, results, cij_evaluations, pressure_evaluations = quasi_newton_cycles(
+            lammps_command, system, potential, mpi_command=mpi_command,
+            strainrange=strainrange, p_xx=p_xx, p_yy=p_yy, p_zz=p_zz,
+            p_xy=p_xy, p_xz=p_xz, p_yz=p_yz, tol=tol,
+            diverge_scale=diverge_scale)
+    else:
+        cij_evaluations = 0
+        pressure_evaluations = 0
         
-        # Compare old and new to test for double-value convergence
-        elif system_old is not None and np.allclose(system_new.box.vects,
-                                                    system_old.box.vects,
-                                                    rtol=tol, atol=0):
-            
-            # Update current to average of old and new
-            system_current.box_set(a = (system_new.box.a+system_old.box.a) / 2.,
-                                   b = (system_new.box.b+system_old.box.b) / 2.,
-                                   c = (system_new.box.c+system_old.box.c) / 2.,
-                                   scale=True)
+        for cycle in range(100):
             
-            # Calculate Cij for the averaged system
+            # Run LAMMPS and evaluate results based on system_old
             results = cij_run0(lammps_command, system_current, potential,
                                mpi_command=mpi_command, strainrange=strainrange,
                                cycle=cycle)
+            cij_evaluations += 1
+            pij = results['pij']
+            Cij = results['C'].Cij
             system_new = update_box(system_current, results['C'], results['pij'],
                                     p_xx, p_yy, p_zz, p_xy, p_xz, p_yz, tol)
-            converged = True
-            break
-        
-        # Test for divergence
-        elif system_new.box.a < system.box.a / diverge_scale:
-            raise RuntimeError('Divergence of box dimensions')
-        elif system_new.box.a > system.box.a * diverge_scale:
-            raise RuntimeError('Divergence of box dimensions')
-        elif system_new.box.b < system.box.b / diverge_scale:
-            raise RuntimeError('Divergence of box dimensions')
-        elif system_new.box.b > system.box.b * diverge_scale:
-            raise RuntimeError('Divergence of box dimensions')
-        elif system_new.box.c < system.box.c / diverge_scale:
-            raise RuntimeError('Divergence of box dimensions')
-        elif system_new.box.c > system.box.c * diverge_scale:
-            raise RuntimeError('Divergence of box dimensions')
-        elif results['E_pot'] == 0.0:
-            raise RuntimeError('Divergence: potential energy is 0')
-        
-        # If not converged or diverged, current -> old and new -> current
-        else:
-            system_old, system_current = system_current, system_new
+            
+            # Compare new and current to test for convergence
+            if np.allclose(system_new.box.vects,
+                           system_current.box.vects,
+                           rtol=tol, atol=0):
+                converged = True
+                break
+            
+            # Compare old and new to test for double-value convergence
+            elif system_old is not None and np.allclose(system_new.box.vects,
+                                                        system_old.box.vects,
+                                                        rtol=tol, atol=0):
+            
+                # Update current to average of old and new
+                system_current.box_set(a = (system_new.box.a+system_old.box.a) / 2.,
+                                       b = (system_new.box.b+system_old.box.b) / 2.,
+                                       c = (system_new.box.c+system_old.box.c) / 2.,
+                                       scale=True)
+            
+                # Calculate Cij for the averaged system
+                results = cij_run0(lammps_command, system_current, potential,
+                                   mpi_command=mpi_command, strainrange=strainrange,
+                                   cycle=cycle)
+                cij_evaluations += 1
+                system_new = update_box(system_current, results['C'], results['pij'],
+                                        p_xx, p_yy, p_zz, p_xy, p_xz, p_yz, tol)
+                converged = True
+                break
+            
+            # Test for divergence
+            elif system_new.box.a < system.box.a / diverge_scale:
+                raise RuntimeError('Divergence of box dimensions')
+            elif system_new.box.a > system.box.a * diverge_scale:
+                raise RuntimeError('Divergence of box dimensions')
+            elif system_new.box.b < system.box.b / diverge_scale:
+                raise RuntimeError('Divergence of box dimensions')
+            elif system_new.box.b > system.box.b * diverge_scale:
+                raise RuntimeError('Divergence of box dimensions')
+            elif system_new.box.c < system.box.c / diverge_scale:
+                raise RuntimeError('Divergence of box dimensions')
+            elif system_new.box.c > system.box.c * diverge_scale:
+                raise RuntimeError('Divergence of box dimensions')
+            elif results['E_pot'] == 0.0:
+                raise RuntimeError('Divergence: potential energy is 0')
+            
+            # If not converged or diverged, current -> old and new -> current
+            else:
+                system_old, system_current = system_current, system_new
     
     # Return values when converged
     if converged:
@@ -210,6 +239,9 @@ def relax_box(lammps_command: str,
         results_dict['measured_pxz'] = results['pij'][0,2]
         results_dict['measured_pyz'] = results['pij'][1,2]
         
+        results_dict['cij_evaluations'] = cij_evaluations
+        results_dict['pressure_evaluations'] = pressure_evaluations
+        
         return results_dict
     else:
         raise RuntimeError('Failed to converge after 100 cycles')
@@ -334,6 +366,267 @@ def cij_run0(lammps_command: str,
     results['C'] = C
     
     return results
+
+def pressure_run0(lammps_command: str,
+                  system: am.System,
+                  potential: lmp.Potential,
+                  mpi_command: Optional[str] = None,
+                  evaluation: int = 0) -> dict:
+    """
+    Runs pressure_run0.in LAMMPS script to evaluate only the pressure and
+    potential energy of the current system.
+    
+    Parameters
+    ----------
+    lammps_command :str
+        Command for running LAMMPS.
+    system : atomman.System
+        The system to perform the calculation on.
+    potential : atomman.lammps.Potential
+        The LAMMPS implemented potential to use.
+    mpi_command : str, optional
+        The MPI command for running LAMMPS in parallel.  If not given, LAMMPS
+        will run serially.
+    evaluation : int, optional
+        Counter used to uniquely save the LAMMPS log files.
+    
+    Returns
+    -------
+    dict
+        Dictionary of results consisting of keys:
+        
+        - **'E_pot'** (*float*) - The potential energy per atom for the
+          supplied system.
+        - **'pij'** (*numpy.array*) - The measured pressure state of the
+          supplied system.
+    """
+    # Get lammps units
+    lammps_units = lmp.style.unit(potential.units)
+    
+    # Define lammps variables
+    lammps_variables = {}
+    system_info = system.dump('atom_data', f='init.dat',
+                              potential=potential)
+    lammps_variables['pair_data_info'] = system_info
+    
+    # Write lammps input script
+    lammps_script = 'pressure_run0.in'
+    template = read_calc_file('iprPy.calculation.relax_box', 'pressure_run0.template')
+    with open(lammps_script, 'w') as f:
+        f.write(filltemplate(template, lammps_variables, '<', '>'))
+    
+    # Run lammps
+    output = lmp.run(lammps_command, script_name=lammps_script,
+                     mpi_command=mpi_command,
+                     logfile=f'pressure-{evaluation}-log.lammps')
+    thermo = output.simulations[-1]['thermo']
+    
+    pxx = uc.set_in_units(thermo.Pxx.values[-1], lammps_units['pressure'])
+    pyy = uc.set_in_units(thermo.Pyy.values[-1], lammps_units['pressure'])
+    pzz = uc.set_in_units(thermo.Pzz.values[-1], lammps_units['pressure'])
+    pxy = uc.set_in_units(thermo.Pxy.values[-1], lammps_units['pressure'])
+    pxz = uc.set_in_units(thermo.Pxz.values[-1], lammps_units['pressure'])
+    pyz = uc.set_in_units(thermo.Pyz.values[-1], lammps_units['pressure'])
+    
+    results = {}
+    results['E_pot'] = uc.set_in_units(thermo.PotEng.values[-1] / system.natoms,
+                                       lammps_units['energy'])
+    results['pij'] = np.array([[pxx, pxy, pxz],
+                               [pxy, pyy, pyz],
+                               [pxz, pyz, pzz]])
+    
+    return results
+
+def quasi_newton_cycles(lammps_command: str,
+                        system: am.System,
+                        potential: lmp.Potential,
+                        mpi_command: Optional[str] = None,
+                        strainrange: float = 1e-6,
+                        p_xx: float = 0.0,
+                        p_yy: float = 0.0,
+                        p_zz: float = 0.0,
+                        p_xy: float = 0.0,
+                        p_xz: float = 0.0,
+                        p_yz: float = 0.0,
+                        tol: float = 1e-10,
+                        diverge_scale: float = 3.0,
+                        maxcycles: int = 100,
+                        max_backtracks: int = 3) -> tuple:
+    """
+    Relaxes the box using BFGS updates of the compliance matrix.  The
+    compliances are initially taken from a full elastic constants evaluation.
+    Each cycle then steps the box by the strain that the current compliances
+    predict will remove the pressure residual, and only the pressure of the
+    new box is evaluated.  The compliances are updated using the change in
+    stress and strain of the step.  If the step does not reduce the pressure
+    residual it is halved up to max_backtracks times, after which the elastic
+    constants are reevaluated for the current box and the resulting Newton
+    step is accepted without a line search.
+    
+    Parameters
+    ----------
+    lammps_command :str
+        Command for running LAMMPS.
+    system : atomman.System
+        The system to relax.
+    potential : atomman.lammps.Potential
+        The LAMMPS implemented potential to use.
+    mpi_command : str, optional
+        The MPI command for running LAMMPS in parallel.
+    strainrange : float, optional
+        The small strain value to apply when calculating the elastic
+        constants (default is 1e-6).
+    p_xx, p_yy, p_zz, p_xy, p_xz, p_yz : float, optional
+        The target pressure components (default is 0.0).
+    tol : float, optional
+        The relative tolerance used to determine if the box has converged
+        (default is 1e-10).
+    diverge_scale : float, optional
+        Factor to identify if the system's dimensions have diverged (default
+        is 3.0).
+    maxcycles : int, optional
+        The maximum number of box updates (default is 100).
+    max_backtracks : int, optional
+        The maximum number of times a step is halved before the elastic
+        constants are reevaluated (default is 3).
+    
+    Returns
+    -------
+    converged : bool
+        True if the box converged within maxcycles.
+    system_new : atomman.System
+        The final system.
+    results : dict
+        The E_pot and pij values of the final system.
+    cij_evaluations : int
+        The number of elastic constant evaluations performed.
+    pressure_evaluations : int
+        The number of pressure-only evaluations performed.
+    """
+    # Voigt target pressure: xx, yy, zz, yz, xz, xy
+    target = np.array([p_xx, p_yy, p_zz, p_yz, p_xz, p_xy])
+    
+    def residual(pij):
+        return np.array([pij[0,0], pij[1,1], pij[2,2],
+                         pij[1,2], pij[0,2], pij[0,1]]) - target
+    
+    # Evaluate the initial elastic constants and pressure
+    system_current = deepcopy(system)
+    results = cij_run0(lammps_command, system_current, potential,
+                       mpi_command=mpi_command, strainrange=strainrange,
+                       cycle=0)
+    cij_evaluations = 1
+    pressure_evaluations = 0
+    compliance = results['C'].Sij
+    fresh = True
+    f = residual(results['pij'])
+    
+    converged = False
+    system_new = system_current
+    for cycle in range(maxcycles):
+        
+        # Strain predicted to remove the pressure residual
+        step = compliance.dot(f)
+        step[np.abs(step) <= tol] = 0.0
+        system_new = strain_box(system_current, step)
+        
+        # Test for convergence
+        if np.allclose(system_new.box.vects, system_current.box.vects,
+                       rtol=tol, atol=0):
+            converged = True
+            break
+        
+        # Evaluate the step, backtracking if the residual does not decrease
+        alpha = 1.0
+        for backtrack in range(max_backtracks + 1):
+            check_divergence(system, system_new, diverge_scale)
+            trial = pressure_run0(lammps_command, system_new, potential,
+                                  mpi_command=mpi_command,
+                                  evaluation=pressure_evaluations)
+            pressure_evaluations += 1
+            f_new = residual(trial['pij'])
+            if fresh or np.linalg.norm(f_new) < np.linalg.norm(f):
+                break
+            alpha /= 2
+            system_new = strain_box(system_current, alpha * step)
+        else:
+            # Reevaluate the elastic constants at the current box
+            results = cij_run0(lammps_command, system_current, potential,
+                               mpi_command=mpi_command, strainrange=strainrange,
+                               cycle=cij_evaluations)
+            cij_evaluations += 1
+            compliance = results['C'].Sij
+            fresh = True
+            f = residual(results['pij'])
+            continue
+        
+        if trial['E_pot'] == 0.0:
+            raise RuntimeError('Divergence: potential energy is 0')
+        
+        # BFGS update of the compliances, which approximate the inverse of
+        # the Hessian of the enthalpy with respect to strain
+        s = alpha * step
+        y = f - f_new
+        sy = s.dot(y)
+        if sy > 1e-12 * np.linalg.norm(s) * np.linalg.norm(y):
+            rho = 1.0 / sy
+            I = np.eye(6)
+            compliance = ((I - rho * np.outer(s, y)).dot(compliance).dot(I - rho * np.outer(y, s))
+                          + rho * np.outer(s, s))
+        fresh = False
+        
+        system_current = system_new
+        results = trial
+        f = f_new
+    
+    return converged, system_new, results, cij_evaluations, pressure_evaluations
+
+def strain_box(system: am.System,
+               strain: np.ndarray) -> am.System:
+    """
+    Generates a new system with the box strained relative to the given system.
+    
+    Parameters
+    ----------
+    system : atomman.System
+        The system to strain.
+    strain : numpy.NDArray
+        The six Voigt engineering strain components xx, yy, zz, yz, xz, xy to
+        apply.
+        
+    Returns
+    -------
+    atomman.System
+        The System with updated box dimensions.
+    """
+    lx = system.box.lx + strain[0] * system.box.lx
+    ly = system.box.ly + strain[1] * system.box.ly
+    lz = system.box.lz + strain[2] * system.box.lz
+    yz = system.box.yz + strain[3] * system.box.lz
+    xz = system.box.xz + strain[4] * system.box.lz
+    xy = system.box.xy + strain[5] * system.box.ly
+
+    if lx <= 0.0 or ly <= 0.0 or lz <= 0.0:
+        raise RuntimeError('Divergence of box dimensions to <= 0')
+    
+    # Duplicate system and change dimensions
+    system_new = deepcopy(system)
+    system_new.box_set(lx=lx, ly=ly, lz=lz, yz=yz, xz=xz, xy=xy, scale=True)
+    system_new.wrap()
+    return system_new
+
+def check_divergence(system: am.System,
+                     system_new: am.System,
+                     diverge_scale: float = 3.0):
+    """
+    Raises a RuntimeError if any box vector length of system_new differs from
+    the original system by more than a factor of diverge_scale.
+    """
+    for vect in ['a', 'b', 'c']:
+        original = getattr(system.box, vect)
+        current = getattr(system_new.box, vect)
+        if current < original / diverge_scale or current > original * diverge_scale:
+            raise RuntimeError('Divergence of box dimensions')
     
 def update_box(system: am.System,
                C: am.ElasticConstants,
@@ -103,6 +103,10 @@ class RelaxLiquid(Calculation):
         self.__msd_y_values = None
         self.__msd_z_values = None
         self.__msd_values = None
+        self.__rdf_r_values = None
+        self.__rdf_g_values = None
+        self.__rdf_coord_values = None
+        self.__rdf_samples = None
         self.__lammps_output = None
 
         # Define calc shortcut
@@ -449,6 +453,26 @@ class RelaxLiquid(Calculation):
             raise ValueError('No results yet!')
         return self.__msd_values
 
+    @property
+    def rdf_r_values(self) -> Optional[np.ndarray]:
+        """numpy.array or None: Radial distances of the RDF bins"""
+        return self.__rdf_r_values
+
+    @property
+    def rdf_g_values(self) -> Optional[np.ndarray]:
+        """numpy.array or None: Mean radial distribution function values"""
+        return self.__rdf_g_values
+
+    @property
+    def rdf_coord_values(self) -> Optional[np.ndarray]:
+        """numpy.array or None: Mean cumulative coordination numbers"""
+        return self.__rdf_coord_values
+
+    @property
+    def rdf_samples(self) -> Optional[int]:
+        """int or None: Number of samples averaged for the RDF values"""
+        return self.__rdf_samples
+
     @property
     def lammps_output(self) -> am.lammps.Log:
         """atomman.lammps.Log: The simulation output"""
@@ -967,6 +991,14 @@ class RelaxLiquid(Calculation):
             scan['msd_z'] = uc.model(self.msd_z_values, f'{self.units.length_unit}^2')
             scan['msd'] = uc.model(self.msd_values, f'{self.units.length_unit}^2')
 
+            # Save radial distribution function if it was sampled
+            if self.rdf_r_values is not None:
+                calc['radial-distribution-function'] = rdf = DM()
+                rdf['samples'] = self.rdf_samples
+                rdf['r'] = uc.model(self.rdf_r_values, self.units.length_unit)
+                rdf['g'] = uc.model(self.rdf_g_values)
+                rdf['coordination'] = uc.model(self.rdf_coord_values)
+
         self._set_model(model)
         return model
 
@@ -1035,6 +1067,13 @@ class RelaxLiquid(Calculation):
             self.__msd_z_values = uc.value_unit(scan['msd_z'])
             self.__msd_values = uc.value_unit(scan['msd'])
 
+            if 'radial-distribution-function' in calc:
+                rdf = calc['radial-distribution-function']
+                self.__rdf_samples = rdf['samples']
+                self.__rdf_r_values = uc.value_unit(rdf['r'])
+                self.__rdf_g_values = uc.value_unit(rdf['g'])
+                self.__rdf_coord_values = uc.value_unit(rdf['coordination'])
+
     @property
     def queries(self) -> dict:
         queries = deepcopy(super().queries)
@@ -1181,4 +1220,8 @@ class RelaxLiquid(Calculation):
         self.__msd_y_values = results_dict['msd_y_values']
         self.__msd_z_values = results_dict['msd_z_values']
         self.__msd_values = results_dict['msd_values']
+        self.__rdf_r_values = results_dict.get('rdf_r', None)
+        self.__rdf_g_values = results_dict.get('rdf_g', None)
+        self.__rdf_coord_values = results_dict.get('rdf_coord', None)
+        self.__rdf_samples = results_dict.get('rdf_samples', None)
         self.__lammps_output = results_dict['lammps_output']
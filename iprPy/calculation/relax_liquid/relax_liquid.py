@@ -12,9 +12,10 @@ from typing import Optional
 import atomman as am
 import atomman.lammps as lmp
 import atomman.unitconvert as uc
-from atomman.tools import filltemplate
+from ...tools import checkversion, filltemplate
 
 import numpy as np
+import pandas as pd
 
 # iprPy imports
 from ...tools import read_calc_file
@@ -158,6 +159,14 @@ def relax_liquid(lammps_command: str,
           values only in the z direction.
         - **'msd_values'** (*numpy.array of float*) - The total mean squared
           displacement values.
+        - **'rdf_r'** (*numpy.array of float*) - The RDF bin distances.
+        - **'rdf_g'** (*numpy.array of float*) - The RDF values averaged over
+          all samples of the nve stage, including those before restarts.
+        - **'rdf_coord'** (*numpy.array of float*) - The averaged cumulative
+          coordination numbers.
+        - **'rdf_samples'** (*int*) - The number of RDF samples averaged.
+        - **'seriesfile'** (*str*) - The compressed numpy file where the RDF
+          and thermo series of the analysis stages are saved.
         - **'lammps_output'** (*atomman.lammps.Log*) - The LAMMPS logfile output.
           Can be useful for checking the thermo data at each simulation stage.
     
@@ -170,7 +179,7 @@ def relax_liquid(lammps_command: str,
     lammps_units = lmp.style.unit(potential.units)
 
     #Get lammps version date
-    lammps_date = lmp.checkversion(lammps_command)['date']
+    lammps_date = checkversion(lammps_command)['date']
     
     # Handle default values
     if dumpsteps is None:
@@ -290,26 +299,36 @@ def relax_liquid(lammps_command: str,
                      restart_script_name=restart_script,
                      mpi_command=mpi_command, screen=False)
 
-    # Extract LAMMPS thermo data.
+    # Extract LAMMPS thermo data by stage
     run1steps = meltsteps
     run2steps = run1steps + coolsteps
     run3steps = run2steps + equilvolumesteps
     run4steps = run3steps + equilenergysteps
-    thermo = output.flatten()['thermo']
-    #thermo_melt = thermo[thermo.Step < run1steps]
-    #thermo_cool = thermo[(thermo.Step < run2steps) & (thermo.Step >= run1steps)]
-    thermo_vol_equil = thermo[(thermo.Step < run3steps) & (thermo.Step >= run2steps)]
-    thermo_temp_equil = thermo[(thermo.Step < run4steps) & (thermo.Step >= run3steps)]
-    thermo_nve = thermo[thermo.Step >= run4steps]
+    run5steps = run4steps + runsteps
+    stages = {
+        'vol_equil': (run2steps, run3steps, ['Volume']),
+        'temp_equil': (run3steps, run4steps, ['Volume', 'PotEng', 'TotEng']),
+        'nve': (run4steps, None, ['Temp', 'TotEng', 'Pxx', 'Pyy', 'Pzz', 'c_msd[1]',
+                                  'c_msd[2]', 'c_msd[3]', 'c_msd[4]']),
+    }
+    thermo = read_thermo_stages(restart_files('log', '.lammps'), stages)
+    thermo_vol_equil = thermo['vol_equil']
+    thermo_temp_equil = thermo['temp_equil']
+    thermo_nve = thermo['nve']
+
+    # Merge the RDF values from all restarts
+    rdf = merge_rdf(restart_files('rdf', '.txt'))
 
     results = {}
 
     # Set final dumpfile info
-    last_dump_number = 0
-    for dump_file in Path('.').glob('*.dump'):
-        dump_number = int(dump_file.name[:-5])
-        if dump_number > last_dump_number:
-            last_dump_number = dump_number
+    last_dump_number = run5steps // dumpsteps * dumpsteps
+    if last_dump_number < run4steps or not Path(f'{last_dump_number}.dump').exists():
+        last_dump_number = 0
+        for dump_file in Path('.').glob('*.dump'):
+            dump_number = int(dump_file.name[:-5])
+            if dump_number > last_dump_number:
+                last_dump_number = dump_number
     last_dump_file = f'{last_dump_number}.dump'
     results['dumpfile_final'] = last_dump_file
     results['symbols_final'] = system.symbols
@@ -346,6 +365,199 @@ def relax_liquid(lammps_command: str,
     results['msd_z_values'] = uc.set_in_units(thermo_nve['c_msd[3]'].values, msd_unit)
     results['msd_values'] = uc.set_in_units(thermo_nve['c_msd[4]'].values, msd_unit)
 
+    # Get RDF values if any were sampled
+    if rdf is not None:
+        results['rdf_r'] = uc.set_in_units(rdf['r'], lammps_units['length'])
+        results['rdf_g'] = rdf['g']
+        results['rdf_coord'] = rdf['coord']
+        results['rdf_samples'] = rdf['samples']
+
+    # Save the analysis series in compressed binary form instead of text
+    series = {}
+    if rdf is not None:
+        for key in ['r', 'g', 'coord', 'timesteps']:
+            series[f'rdf_{key}'] = rdf[key]
+    for stage, stage_thermo in thermo.items():
+        for column in stage_thermo:
+            series[f'{stage}_{column}'] = stage_thermo[column].values
+    results['seriesfile'] = 'relax_liquid.npz'
+    np.savez_compressed(results['seriesfile'], **series)
+    for rdffile in restart_files('rdf', '.txt'):
+        Path(rdffile).unlink()
+
     results['lammps_output'] = output
 
     return results
+
+def restart_files(name: str, ext: str) -> list:
+    """
+    Lists the files written by a run and any previous runs that it was
+    restarted from, in the order that they were written.  Previous runs are
+    identified as <name>-<N><ext> and the current run as <name><ext>.
+
+    Parameters
+    ----------
+    name : str
+        The file name without extension.
+    ext : str
+        The file extension, including the period.
+
+    Returns
+    -------
+    list of str
+        The existing file names.
+    """
+    numbers = []
+    for oldfile in Path('.').glob(f'{name}-*{ext}'):
+        try:
+            numbers.append(int(oldfile.name[len(name)+1:-len(ext)]))
+        except ValueError:
+            pass
+    files = [f'{name}-{number}{ext}' for number in sorted(numbers)]
+    if Path(f'{name}{ext}').exists():
+        files.append(f'{name}{ext}')
+    return files
+
+def read_thermo_stages(logfiles: list,
+                       stages: dict) -> dict:
+    """
+    Reads thermo data from LAMMPS log files one line at a time, keeping only
+    the requested columns for the rows that fall within each stage's step
+    range.  Rows repeated by a restarted run replace the rows of the
+    earlier run.
+
+    Parameters
+    ----------
+    logfiles : list
+        The log files in the order that they were written.
+    stages : dict
+        Maps each stage name to a tuple of the first step, the step after the
+        last step (None for no limit) and the list of thermo column names to
+        keep.
+
+    Returns
+    -------
+    dict
+        Maps each stage name to a pandas.DataFrame of Step and the stage's
+        columns.
+    """
+    rows = {stage: [] for stage in stages}
+
+    # Read newest first so that rows from earlier runs can be cut off at the
+    # first step of the later runs
+    cutoff = None
+    for logfile in reversed(logfiles):
+        filerows = {stage: [] for stage in stages}
+        firststep = None
+        with open(logfile, encoding='UTF-8') as f:
+            columns = None
+            for line in f:
+                terms = line.split()
+                if columns is None:
+                    if len(terms) > 0 and terms[0] == 'Step':
+                        columns = terms
+                        indices = {}
+                        for stage, (start, end, names) in stages.items():
+                            if all(name in columns for name in names):
+                                indices[stage] = [columns.index(name) for name in names]
+                    continue
+                if line.startswith('Loop time'):
+                    columns = None
+                    continue
+                if len(terms) != len(columns):
+                    continue
+                try:
+                    values = [float(term) for term in terms]
+                except ValueError:
+                    continue
+                step = values[0]
+                if cutoff is not None and step >= cutoff:
+                    continue
+                if firststep is None:
+                    firststep = step
+                for stage, index in indices.items():
+                    start, end = stages[stage][:2]
+                    if step >= start and (end is None or step < end):
+                        row = [step] + [values[i] for i in index]
+
+                        # Consecutive runs both list the step between them
+                        if len(filerows[stage]) > 0 and filerows[stage][-1][0] == step:
+                            filerows[stage][-1] = row
+                        else:
+                            filerows[stage].append(row)
+        for stage in stages:
+            rows[stage] = filerows[stage] + rows[stage]
+        if firststep is not None:
+            cutoff = firststep
+
+    thermo = {}
+    for stage, (start, end, names) in stages.items():
+        thermo[stage] = pd.DataFrame(rows[stage], columns=['Step'] + names)
+    return thermo
+
+def merge_rdf(rdffiles: list) -> dict:
+    """
+    Computes the running average of the RDF values written by fix ave/time
+    across a run and any runs restarted from it.  Samples repeated by a
+    restarted run replace the samples of the earlier run.
+
+    Parameters
+    ----------
+    rdffiles : list
+        The fix ave/time output files in the order that they were written.
+
+    Returns
+    -------
+    dict or None
+        Contains 'r', the bin distances, 'g', the mean RDF values, 'coord', the
+        mean cumulative coordination numbers, 'samples', the number of samples
+        averaged, and 'timesteps', the sampled timesteps.  None is returned if
+        the files contain no RDF samples.
+    """
+    rdfsum = None
+    timesteps = []
+
+    # Read newest first so that samples from earlier runs can be cut off
+    cutoff = None
+    for rdffile in reversed(rdffiles):
+        filesteps = []
+        with open(rdffile, encoding='UTF-8') as f:
+            nrows = 0
+            for line in f:
+                if line.startswith('#'):
+                    continue
+                terms = line.split()
+                if nrows == 0:
+                    # Block header: timestep and number of rows
+                    if len(terms) != 2:
+                        continue
+                    timestep = int(terms[0])
+                    nrows = int(terms[1])
+                    block = np.empty((nrows, 3))
+                    row = 0
+                    continue
+                block[row] = [float(term) for term in terms[1:4]]
+                row += 1
+                if row == nrows:
+                    nrows = 0
+                    if cutoff is not None and timestep >= cutoff:
+                        continue
+                    filesteps.append(timestep)
+                    if rdfsum is None:
+                        r = block[:, 0].copy()
+                        rdfsum = np.zeros((len(r), 2))
+                    rdfsum += block[:, 1:]
+        timesteps = filesteps + timesteps
+        if len(filesteps) > 0:
+            cutoff = filesteps[0]
+
+    if rdfsum is None:
+        return None
+    samples = len(timesteps)
+    return {
+        'r': r,
+        'g': rdfsum[:, 0] / samples,
+        'coord': rdfsum[:, 1] / samples,
+        'samples': samples,
+        'timesteps': np.array(timesteps),
+    }
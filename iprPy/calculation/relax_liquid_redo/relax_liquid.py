@@ -12,7 +12,7 @@ from typing import Optional
 import atomman as am
 import atomman.lammps as lmp
 import atomman.unitconvert as uc
-from atomman.tools import filltemplate
+from ...tools import checkversion, filltemplate
 
 from DataModelDict import DataModelDict as DM
 
@@ -149,7 +149,7 @@ def relax_liquid(lammps_command: str,
     lammps_units = lmp.style.unit(potential.units)
 
     # Get lammps version date
-    lammps_date = lmp.checkversion(lammps_command)['date']
+    lammps_date = checkversion(lammps_command)['date']
     
     # Handle default values
     if dumpsteps is None:
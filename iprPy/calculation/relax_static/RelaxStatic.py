@@ -74,6 +74,7 @@ class RelaxStatic(Calculation):
         self.displacementkick = 0.0
         self.maxcycles = 100
         self.cycletolerance = 1e-10
+        self.cycle_in_lammps = False
 
         self.__initial_dump = None
         self.__final_dump = None
@@ -98,7 +99,8 @@ class RelaxStatic(Calculation):
         """list: the names of each file used by the calculation."""
         return [
             'relax_static.py',
-            'minbox.template'
+            'minbox.template',
+            'minbox_loop.template'
         ]
 
 ############################## Class attributes ###############################
@@ -226,6 +228,15 @@ class RelaxStatic(Calculation):
     def raise_at_maxcycles(self, val: bool):
         self.__raise_at_maxcycles = bool(val)
 
+    @property
+    def cycle_in_lammps(self) -> bool:
+        """bool: Indicates if the relaxation cycles are performed by a single LAMMPS run"""
+        return self.__cycle_in_lammps
+
+    @cycle_in_lammps.setter
+    def cycle_in_lammps(self, val: bool):
+        self.__cycle_in_lammps = bool(val)
+
     @property
     def initial_dump(self) -> dict:
         """dict: Info about the initial dump file"""
@@ -330,6 +341,9 @@ class RelaxStatic(Calculation):
         raise_at_maxcycles : bool, optional
             Indicates if an error is to be thrown if maxcycles is reached
             before cycletolerance convergence is achieved.
+        cycle_in_lammps : bool, optional
+            Indicates if all minimization cycles are to be performed by a
+            single LAMMPS run rather than a LAMMPS run for each cycle.
         **kwargs : any, optional
             Any keyword parameters supported by the set_values() methods of
             the parent Calculation class and the subset classes.
@@ -358,6 +372,8 @@ class RelaxStatic(Calculation):
             self.cycletolerance = kwargs['cycletolerance']
         if 'raise_at_maxcycles' in kwargs:
             self.raise_at_maxcycles = kwargs['raise_at_maxcycles']
+        if 'cycle_in_lammps' in kwargs:
+            self.cycle_in_lammps = kwargs['cycle_in_lammps']
 
 ####################### Parameter file interactions ###########################
 
@@ -391,6 +407,7 @@ class RelaxStatic(Calculation):
 
         # Load calculation-specific booleans
         self.raise_at_maxcycles = boolean(input_dict.get('raise_at_maxcycles', False))
+        self.cycle_in_lammps = boolean(input_dict.get('cycle_in_lammps', False))
 
         # Load calculation-specific integers
         self.maxcycles = int(input_dict.get('maxcycles', 100))
@@ -579,6 +596,12 @@ class RelaxStatic(Calculation):
                 "prior to cycletolerance convergence is achieved.  Default value",
                 "is False, but old versions of this calculation are consistent",
                 "with a True setting."]),
+            'cycle_in_lammps': ' '.join([
+                "Indicates that all minimization cycles are to be performed",
+                "within a single LAMMPS run that checks for convergence itself",
+                "rather than launching LAMMPS once per cycle.  This avoids the",
+                "per-cycle startup costs and gives equivalent results.  Default",
+                "value is False."]),
         }
 
     @property
@@ -594,6 +617,7 @@ class RelaxStatic(Calculation):
             + self.units.keyset
 
             # Calculation-specific keys
+            + ['cycle_in_lammps']
         )
         return keys
 
@@ -876,6 +900,7 @@ class RelaxStatic(Calculation):
         input_dict['maxcycles'] = self.maxcycles
         input_dict['ctol'] = self.cycletolerance
         input_dict['raise_at_maxcycles'] = self.raise_at_maxcycles
+        input_dict['cycle_in_lammps'] = self.cycle_in_lammps
 
         # Return input_dict
         return input_dict
@@ -15,7 +15,7 @@ import numpy as np
 import atomman as am
 import atomman.lammps as lmp
 import atomman.unitconvert as uc
-from atomman.tools import filltemplate
+from ...tools import checkversion, filltemplate
 
 # iprPy imports
 from ...tools import read_calc_file
@@ -38,7 +38,8 @@ def relax_static(lammps_command: str,
                  dmax: float = uc.set_in_units(0.01, 'angstrom'),
                  maxcycles: int = 100,
                  ctol: float = 1e-10,
-                 raise_at_maxcycles: bool = False) -> dict:
+                 raise_at_maxcycles: bool = False,
+                 cycle_in_lammps: bool = False) -> dict:
     """
     Repeatedly runs the ELASTIC example distributed with LAMMPS until box
     dimensions converge within a tolerance.
@@ -103,6 +104,12 @@ def relax_static(lammps_command: str,
         Setting this to True will raise an error if maxcycles is reached before
         achieving convergence within ctol.  When False, the final relaxed
         configuration is retained even without achieving the ctol.
+    cycle_in_lammps : bool, optional
+        If False (default), each cycle is a separate LAMMPS run with the box
+        convergence checked in Python.  If True, all cycles are performed by a
+        single LAMMPS run that loops over minimizations and checks the box
+        convergence itself using the same ctol criterion.  The relaxed dump
+        file of each cycle is kept in both cases.
     
     Returns
     -------
@@ -143,7 +150,7 @@ def relax_static(lammps_command: str,
     lammps_units = lmp.style.unit(potential.units)
     
     # Get lammps version date
-    lammps_date = lmp.checkversion(lammps_command)['date']
+    lammps_date = checkversion(lammps_command)['date']
     
     # Save initial configuration as a dump file
     system.dump('atom_dump', f='initial.dump')
@@ -151,74 +158,109 @@ def relax_static(lammps_command: str,
     # Apply small random distortions to atoms
     system.atoms.pos += dispmult * np.random.rand(*system.atoms.pos.shape) - dispmult / 2
     
-    # Initialize parameters
-    old_vects = system.box.vects
-    converged = False
+    # Define lammps variables
+    lammps_variables = {}
+    lammps_variables['p_xx'] = uc.get_in_units(p_xx, lammps_units['pressure'])
+    lammps_variables['p_yy'] = uc.get_in_units(p_yy, lammps_units['pressure'])
+    lammps_variables['p_zz'] = uc.get_in_units(p_zz, lammps_units['pressure'])
+    lammps_variables['p_xy'] = uc.get_in_units(p_xy, lammps_units['pressure'])
+    lammps_variables['p_xz'] = uc.get_in_units(p_xz, lammps_units['pressure'])
+    lammps_variables['p_yz'] = uc.get_in_units(p_yz, lammps_units['pressure'])
+    lammps_variables['etol'] = etol
+    lammps_variables['ftol'] = uc.get_in_units(ftol, lammps_units['force'])
+    lammps_variables['maxiter'] = maxiter
+    lammps_variables['maxeval'] = maxeval
+    lammps_variables['dmax'] = uc.get_in_units(dmax, lammps_units['length'])
     
-    # Run minimizations up to maxcycles times
-    for cycle in range(maxcycles):
+    # Set dump_keys based on atom_style
+    if potential.atom_style in ['charge']:
+        lammps_variables['dump_keys'] = 'id type q x y z c_peatom'
+    else:
+        lammps_variables['dump_keys'] = 'id type x y z c_peatom'
+    
+    # Set dump_modify_format based on lammps_date
+    if lammps_date < datetime.date(2016, 8, 3):
+        if potential.atom_style in ['charge']:
+            lammps_variables['dump_modify_format'] = '"%d %d %.13e %.13e %.13e %.13e %.13e"'
+        else:
+            lammps_variables['dump_modify_format'] = '"%d %d %.13e %.13e %.13e %.13e"'
+    else:
+        lammps_variables['dump_modify_format'] = 'float %.13e'
+    
+    if cycle_in_lammps:
         
-        # Define lammps variables
-        lammps_variables = {}
+        # Run all cycles in a single LAMMPS run
         system_info = system.dump('atom_data', f='init.dat',
                                   potential=potential)
         lammps_variables['atomman_system_pair_info'] = system_info
-        
-        lammps_variables['p_xx'] = uc.get_in_units(p_xx, lammps_units['pressure'])
-        lammps_variables['p_yy'] = uc.get_in_units(p_yy, lammps_units['pressure'])
-        lammps_variables['p_zz'] = uc.get_in_units(p_zz, lammps_units['pressure'])
-        lammps_variables['p_xy'] = uc.get_in_units(p_xy, lammps_units['pressure'])
-        lammps_variables['p_xz'] = uc.get_in_units(p_xz, lammps_units['pressure'])
-        lammps_variables['p_yz'] = uc.get_in_units(p_yz, lammps_units['pressure'])
-        lammps_variables['etol'] = etol
-        lammps_variables['ftol'] = uc.get_in_units(ftol, lammps_units['force'])
-        lammps_variables['maxiter'] = maxiter
-        lammps_variables['maxeval'] = maxeval
-        lammps_variables['dmax'] = uc.get_in_units(dmax, lammps_units['length'])
-        
-        # Set dump_keys based on atom_style
-        if potential.atom_style in ['charge']:
-            lammps_variables['dump_keys'] = 'id type q x y z c_peatom'
-        else:
-            lammps_variables['dump_keys'] = 'id type x y z c_peatom'
-        
-        # Set dump_modify_format based on lammps_date
-        if lammps_date < datetime.date(2016, 8, 3):
-            if potential.atom_style in ['charge']:
-                lammps_variables['dump_modify_format'] = '"%d %d %.13e %.13e %.13e %.13e %.13e"'
-            else:
-                lammps_variables['dump_modify_format'] = '"%d %d %.13e %.13e %.13e %.13e"'
-        else:
-            lammps_variables['dump_modify_format'] = 'float %.13e'
+        lammps_variables['maxcycles'] = maxcycles
+        lammps_variables['converged_test'] = converged_test(ctol)
         
         # Write lammps input script
         lammps_script = 'minbox.in'
         template = read_calc_file('iprPy.calculation.relax_static',
-                                  'minbox.template')
+                                  'minbox_loop.template')
         with open(lammps_script, 'w') as f:
             f.write(filltemplate(template, lammps_variables, '<', '>'))
         
-        # Run LAMMPS and extract thermo data
-        logfile = 'log-' + str(cycle) + '.lammps'
+        # Run LAMMPS and extract thermo data of the final cycle, which has a
+        # minimize and a run 0 simulation per cycle
+        logfile = 'log-loop.lammps'
         output = lmp.run(lammps_command, script_name=lammps_script,
                          mpi_command=mpi_command, logfile=logfile)
-        thermo = output.simulations[0]['thermo']
-        
-        # Clean up dump files
-        Path('0.dump').unlink()
-        last_dump_file = str(thermo.Step.values[-1]) + '.dump'
-        renamed_dump_file = 'relax_static-' + str(cycle) + '.dump'
-        shutil.move(last_dump_file, renamed_dump_file)
+        cycle = len(output.simulations) // 2 - 1
+        thermo = output.simulations[-1]['thermo']
+        converged = False
+        with open(logfile) as f:
+            for line in f:
+                if line.startswith('relax_static converged after'):
+                    converged = True
         
         # Load relaxed system
+        renamed_dump_file = 'relax_static-' + str(cycle) + '.dump'
         system = am.load('atom_dump', renamed_dump_file, symbols=system.symbols)
+    
+    else:
         
-        # Test if box dimensions have converged
-        if np.allclose(old_vects, system.box.vects, rtol=ctol, atol=0):
-            converged = True
-            break
-        else:
-            old_vects = system.box.vects
+        # Initialize parameters
+        old_vects = system.box.vects
+        converged = False
+        
+        # Run minimizations up to maxcycles times
+        for cycle in range(maxcycles):
+            
+            system_info = system.dump('atom_data', f='init.dat',
+                                      potential=potential)
+            lammps_variables['atomman_system_pair_info'] = system_info
+            
+            # Write lammps input script
+            lammps_script = 'minbox.in'
+            template = read_calc_file('iprPy.calculation.relax_static',
+                                      'minbox.template')
+            with open(lammps_script, 'w') as f:
+                f.write(filltemplate(template, lammps_variables, '<', '>'))
+            
+            # Run LAMMPS and extract thermo data
+            logfile = 'log-' + str(cycle) + '.lammps'
+            output = lmp.run(lammps_command, script_name=lammps_script,
+                             mpi_command=mpi_command, logfile=logfile)
+            thermo = output.simulations[0]['thermo']
+            
+            # Clean up dump files
+            Path('0.dump').unlink()
+            last_dump_file = str(thermo.Step.values[-1]) + '.dump'
+            renamed_dump_file = 'relax_static-' + str(cycle) + '.dump'
+            shutil.move(last_dump_file, renamed_dump_file)
+            
+            # Load relaxed system
+            system = am.load('atom_dump', renamed_dump_file, symbols=system.symbols)
+            
+            # Test if box dimensions have converged
+            if np.allclose(old_vects, system.box.vects, rtol=ctol, atol=0):
+                converged = True
+                break
+            else:
+                old_vects = system.box.vects
     
     # Check for convergence
     if converged is False and raise_at_maxcycles is True:
@@ -270,3 +312,25 @@ def relax_static(lammps_command: str,
                                                    lammps_units['pressure'])
     
     return results_dict
+
+def converged_test(ctol: float) -> str:
+    """
+    Builds a LAMMPS equal-style expression that evaluates to 1 if the box
+    dimensions have converged relative to the saved old_* variables.  This
+    matches the numpy.allclose(old_vects, vects, rtol=ctol, atol=0) test that
+    is used when cycling in Python.
+
+    Parameters
+    ----------
+    ctol : float
+        The relative tolerance.
+
+    Returns
+    -------
+    str
+        The expression.
+    """
+    terms = []
+    for term in ['lx', 'ly', 'lz', 'xy', 'xz', 'yz']:
+        terms.append(f'abs({term}-v_old_{term})<={ctol!r}*abs({term})')
+    return ' && '.join(terms)
@@ -14,7 +14,7 @@ import numpy as np
 import atomman as am
 import atomman.lammps as lmp
 import atomman.unitconvert as uc
-from atomman.tools import filltemplate
+from ...tools import checkversion, filltemplate
 
 # iprPy imports
 from ...tools import read_calc_file
@@ -115,7 +115,7 @@ def stackingfaultrelax(lammps_command: str,
     
     #Get lammps version date
     if lammps_date is None:
-        lammps_date = lmp.checkversion(lammps_command)['date']
+        lammps_date = checkversion(lammps_command)['date']
     
     # Define lammps variables
     lammps_variables = {}
@@ -310,7 +310,7 @@ def stackingfaultmap(lammps_command: str,
     A_fault = gsf_gen.surfacearea
 
     # Identify lammps_date version
-    lammps_date = lmp.checkversion(lammps_command)['date']
+    lammps_date = checkversion(lammps_command)['date']
     
     # Define lists
     a1vals = []
@@ -512,6 +512,7 @@ class StackingFaultStatic(Calculation):
         # Add calculation-specific inputs
         input_dict['a1'] = self.a1
         input_dict['a2'] = self.a2
+        input_dict['reference_cache'] = self.reference_cache
 
         # Return input_dict
         return input_dict
@@ -15,10 +15,11 @@ import numpy as np
 import atomman as am
 import atomman.lammps as lmp
 import atomman.unitconvert as uc
-from atomman.tools import filltemplate
+from ...tools import checkversion, filltemplate
 
 # iprPy imports
-from ...tools import read_calc_file
+from ...tools import (read_calc_file, load_reference_cache, reference_key,
+                      system_digest)
 
 def stackingfaultrelax(lammps_command: str,
                        system: am.System,
@@ -115,7 +116,7 @@ def stackingfaultrelax(lammps_command: str,
     
     #Get lammps version date
     if lammps_date is None:
-        lammps_date = lmp.checkversion(lammps_command)['date']
+        lammps_date = checkversion(lammps_command)['date']
     
     # Define lammps variables
     lammps_variables = {}
@@ -168,6 +169,41 @@ def stackingfaultrelax(lammps_command: str,
     
     return results_dict
 
+def zeroshiftrelax(lammps_command: str,
+                   system: am.System,
+                   potential: lmp.Potential,
+                   mpi_command: Optional[str] = None,
+                   cutboxvector: str = 'c',
+                   etol: float = 0.0,
+                   ftol: float = 0.0,
+                   maxiter: int = 10000,
+                   maxeval: int = 100000,
+                   dmax: float = uc.set_in_units(0.01, 'angstrom'),
+                   lammps_date: Optional[datetime.date] = None) -> tuple:
+    """
+    Relaxes the zero shift configuration, saving the relaxed configuration
+    to zeroshift.dump and the LAMMPS log to zeroshift-log.lammps.  Parameters
+    are the same as for stackingfaultrelax().
+
+    Returns
+    -------
+    E_total_0 : float
+        The total potential energy of the relaxed zero shift configuration.
+    pos_0 : numpy.ndarray
+        The relaxed atomic positions.
+    """
+    zeroshift = stackingfaultrelax(lammps_command, system, potential,
+                                   mpi_command=mpi_command,
+                                   cutboxvector=cutboxvector,
+                                   etol=etol, ftol=ftol, maxiter=maxiter,
+                                   maxeval=maxeval, dmax=dmax,
+                                   lammps_date=lammps_date)
+    
+    # Extract terms
+    shutil.move('log.lammps', 'zeroshift-log.lammps')
+    shutil.move(zeroshift['dumpfile'], 'zeroshift.dump')
+    return zeroshift['E_total'], zeroshift['system'].atoms.pos
+
 def stackingfault(lammps_command: str,
                   ucell: am.System,
                   potential: lmp.Potential,
@@ -190,7 +226,8 @@ def stackingfault(lammps_command: str,
                   ftol: float = 0.0,
                   maxiter: int = 10000,
                   maxeval: int = 100000,
-                  dmax: float = uc.set_in_units(0.01, 'angstrom')) -> dict:
+                  dmax: float = uc.set_in_units(0.01, 'angstrom'),
+                  reference_cache: Optional[str] = None) -> dict:
     """
     Computes the generalized stacking fault value for a single faultshift.
     
@@ -277,6 +314,10 @@ def stackingfault(lammps_command: str,
         The maximum distance in length units that any atom is allowed to relax
         in any direction during a single minimization iteration (default is
         0.01 Angstroms).
+    reference_cache : str, optional
+        The directory of the shared reference cache to use.  If not given,
+        the IPRPY_REFERENCE_CACHE environment variable is used if set.  An
+        empty string disables the cache.
     
     Returns
     -------
@@ -325,22 +366,44 @@ def stackingfault(lammps_command: str,
     A_fault = gsf_gen.surfacearea
 
     # Identify lammps_date version
-    lammps_date = lmp.checkversion(lammps_command)['date']
+    version_info = checkversion(lammps_command)
+    lammps_date = version_info['date']
     
 
-    # Evaluate the zero shift configuration
-    zeroshift = stackingfaultrelax(lammps_command, sfsystem, potential,
-                                   mpi_command=mpi_command,
-                                   cutboxvector=cutboxvector,
-                                   etol=etol, ftol=ftol, maxiter=maxiter,
-                                   maxeval=maxeval, dmax=dmax,
-                                   lammps_date=lammps_date)
-    
-    # Extract terms
-    E_total_0 = zeroshift['E_total']
-    pos_0 = zeroshift['system'].atoms.pos
-    shutil.move('log.lammps', 'zeroshift-log.lammps')
-    shutil.move(zeroshift['dumpfile'], 'zeroshift.dump')
+    # Evaluate the zero shift configuration or reuse a shared reference of it
+    cache = load_reference_cache(reference_cache)
+    if cache is None:
+        E_total_0, pos_0 = zeroshiftrelax(lammps_command, sfsystem, potential,
+                                          mpi_command=mpi_command,
+                                          cutboxvector=cutboxvector,
+                                          etol=etol, ftol=ftol, maxiter=maxiter,
+                                          maxeval=maxeval, dmax=dmax,
+                                          lammps_date=lammps_date)
+    else:
+        key = reference_key(reference='stacking_fault_static zeroshift',
+                            lammps_command=lammps_command,
+                            lammps_version=version_info['version'],
+                            potential=potential.key,
+                            system=system_digest(sfsystem),
+                            cutboxvector=cutboxvector, etol=etol, ftol=ftol,
+                            maxiter=maxiter, maxeval=maxeval, dmax=dmax)
+        files = {'zeroshift.dump': 'zeroshift.dump',
+                 'zeroshift-log.lammps': 'zeroshift-log.lammps'}
+        with cache.lock(key):
+            reference = cache.get(key, files=files)
+            if reference is None:
+                E_total_0, pos_0 = zeroshiftrelax(lammps_command, sfsystem, potential,
+                                                  mpi_command=mpi_command,
+                                                  cutboxvector=cutboxvector,
+                                                  etol=etol, ftol=ftol,
+                                                  maxiter=maxiter,
+                                                  maxeval=maxeval, dmax=dmax,
+                                                  lammps_date=lammps_date)
+                cache.put(key, {'E_total_0': E_total_0}, files=files)
+            else:
+                E_total_0 = reference['E_total_0']
+                pos_0 = am.load('atom_dump', 'zeroshift.dump',
+                                symbols=sfsystem.symbols).atoms.pos
 
     # Evaluate the system after shifting along the fault plane
     sfsystem = gsf_gen.fault(a1=a1, a2=a2)
@@ -478,6 +478,7 @@ class SurfaceEnergyStatic(Calculation):
             subset.calc_inputs(input_dict)
 
         # Add calculation-specific inputs
+        input_dict['reference_cache'] = self.reference_cache
 
         # Return input_dict
         return input_dict
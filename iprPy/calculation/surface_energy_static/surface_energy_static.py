@@ -14,10 +14,11 @@ import numpy as np
 import atomman as am
 import atomman.lammps as lmp
 import atomman.unitconvert as uc
-from atomman.tools import filltemplate
+from ...tools import checkversion, filltemplate
 
 # iprPy imports
-from ...tools import read_calc_file
+from ...tools import (read_calc_file, load_reference_cache, reference_key,
+                      system_digest)
 
 def surface_energy_static(lammps_command: str,
                           ucell: am.System,
@@ -35,7 +36,8 @@ def surface_energy_static(lammps_command: str,
                           ftol: float = 0.0,
                           maxiter: int = 10000,
                           maxeval: int = 100000,
-                          dmax: float = uc.set_in_units(0.01, 'angstrom')) -> dict:
+                          dmax: float = uc.set_in_units(0.01, 'angstrom'),
+                          reference_cache: Optional[str] = None) -> dict:
     """
     Evaluates surface formation energies by slicing along one periodic
     boundary of a bulk system.
@@ -101,6 +103,10 @@ def surface_energy_static(lammps_command: str,
         The maximum distance in length units that any atom is allowed to relax
         in any direction during a single minimization iteration (default is
         0.01 Angstroms).
+    reference_cache : str, optional
+        The directory of the shared reference cache to use.  If not given,
+        the IPRPY_REFERENCE_CACHE environment variable is used if set.  An
+        empty string disables the cache.
     
     Returns
     -------
@@ -142,7 +148,8 @@ def surface_energy_static(lammps_command: str,
     A_surf= surf_gen.surfacearea
 
     # Identify lammps_date version
-    lammps_date = lmp.checkversion(lammps_command)['date']
+    version_info = checkversion(lammps_command)
+    lammps_date = version_info['date']
 
     # Evaluate system with free surface
     surf_results = relax_system(lammps_command, system, potential,
@@ -158,16 +165,37 @@ def surface_energy_static(lammps_command: str,
 
     # Evaluate perfect system (all pbc removes cut)
     system.pbc = [True, True, True]
-    perf_results = relax_system(lammps_command, system, potential,
-                                mpi_command=mpi_command, etol=etol, ftol=ftol,
-                                maxiter=maxiter, maxeval=maxeval, dmax=dmax,
-                                lammps_date=lammps_date)
-    
-    # Extract results from perfect system
     dumpfile_base = 'perfect.dump'
-    shutil.move(perf_results['finaldumpfile'], dumpfile_base)
-    shutil.move('log.lammps', 'perfect-log.lammps')
-    E_total_base = perf_results['potentialenergy']
+    cache = load_reference_cache(reference_cache)
+    if cache is None:
+        E_total_base = relax_perfect(lammps_command, system, potential,
+                                     mpi_command=mpi_command, etol=etol,
+                                     ftol=ftol, maxiter=maxiter,
+                                     maxeval=maxeval, dmax=dmax,
+                                     lammps_date=lammps_date)
+    else:
+        # The exact system is used as the cached dump is specific to the
+        # shift's placement of the atoms
+        key = reference_key(reference='surface_energy_static perfect',
+                            lammps_command=lammps_command,
+                            lammps_version=version_info['version'],
+                            potential=potential.key,
+                            system=system_digest(system),
+                            etol=etol, ftol=ftol, maxiter=maxiter,
+                            maxeval=maxeval, dmax=dmax)
+        files = {dumpfile_base: dumpfile_base,
+                 'perfect-log.lammps': 'perfect-log.lammps'}
+        with cache.lock(key):
+            reference = cache.get(key, files=files)
+            if reference is None:
+                E_total_base = relax_perfect(lammps_command, system, potential,
+                                             mpi_command=mpi_command, etol=etol,
+                                             ftol=ftol, maxiter=maxiter,
+                                             maxeval=maxeval, dmax=dmax,
+                                             lammps_date=lammps_date)
+                cache.put(key, {'E_total_base': E_total_base}, files=files)
+            else:
+                E_total_base = reference['E_total_base']
     
     # Compute the free surface formation energy
     E_surf_f = (E_total_surf - E_total_base) / (2 * A_surf)
@@ -185,6 +213,36 @@ def surface_energy_static(lammps_command: str,
     
     return results_dict
 
+def relax_perfect(lammps_command: str,
+                  system: am.System,
+                  potential: lmp.Potential,
+                  mpi_command: Optional[str] = None,
+                  etol: float = 0.0,
+                  ftol: float = 0.0,
+                  maxiter: int = 10000,
+                  maxeval: int = 100000,
+                  dmax: float = uc.set_in_units(0.01, 'angstrom'),
+                  lammps_date: Optional[datetime.date] = None) -> float:
+    """
+    Relaxes the fully periodic perfect system, saving the relaxed
+    configuration to perfect.dump and the LAMMPS log to perfect-log.lammps.
+    Parameters are the same as for relax_system().
+
+    Returns
+    -------
+    float
+        The total potential energy of the relaxed perfect system.
+    """
+    perf_results = relax_system(lammps_command, system, potential,
+                                mpi_command=mpi_command, etol=etol, ftol=ftol,
+                                maxiter=maxiter, maxeval=maxeval, dmax=dmax,
+                                lammps_date=lammps_date)
+    
+    # Extract results from perfect system
+    shutil.move(perf_results['finaldumpfile'], 'perfect.dump')
+    shutil.move('log.lammps', 'perfect-log.lammps')
+    return perf_results['potentialenergy']
+
 def relax_system(lammps_command: str,
                  system: am.System,
                  potential: lmp.Potential,
@@ -254,7 +312,7 @@ def relax_system(lammps_command: str,
       
     #Get lammps version date
     if lammps_date is None:
-        lammps_date = lmp.checkversion(lammps_command)['date']
+        lammps_date = checkversion(lammps_command)['date']
     
     # Define lammps variables
     lammps_variables = {}
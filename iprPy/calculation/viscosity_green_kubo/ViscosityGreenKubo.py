@@ -77,6 +77,10 @@ class ViscosityGreenKubo(Calculation):
         self.equilsteps = 0
         self.resetvelocities = False
         self.randomseed = None
+        self.nblocks = 10
+        self.nbootstrap = 1000
+        self.maxruns = 1
+        self.plateau_rtol = 0.05
 
 ########################################################
 
@@ -92,6 +96,8 @@ class ViscosityGreenKubo(Calculation):
         self.__measured_temperature_stderr = None
         self.__viscosity = None
         self.__viscosity_stderr = None
+        self.__viscosity_cutoff = None
+        self.__runs = None
         self.__lammps_output = None
 
         # Define calc shortcut
@@ -106,7 +112,8 @@ class ViscosityGreenKubo(Calculation):
         """list: the names of each file used by the calculation."""
         return [
             'viscosity_green_kubo.py',
-            'in.viscosity_green_kubo.template'
+            'viscosity_green_kubo.template',
+            'viscosity_green_kubo_extend.template'
         ]
 
 ############################## Class attributes ################################
@@ -259,6 +266,50 @@ class ViscosityGreenKubo(Calculation):
     def resetvelocities(self, val: bool):
         self.__resetvelocities = boolean(val)
 
+    @property
+    def nblocks(self) -> int:
+        """int: Number of blocks bootstrapped for the viscosity error"""
+        return self.__nblocks
+
+    @nblocks.setter
+    def nblocks(self, val: int):
+        val = int(val)
+        assert val > 0
+        self.__nblocks = val
+
+    @property
+    def nbootstrap(self) -> int:
+        """int: Number of bootstrap samples for the viscosity error"""
+        return self.__nbootstrap
+
+    @nbootstrap.setter
+    def nbootstrap(self, val: int):
+        val = int(val)
+        assert val > 1
+        self.__nbootstrap = val
+
+    @property
+    def maxruns(self) -> int:
+        """int: Maximum number of runsteps length runs to perform"""
+        return self.__maxruns
+
+    @maxruns.setter
+    def maxruns(self, val: int):
+        val = int(val)
+        assert val > 0
+        self.__maxruns = val
+
+    @property
+    def plateau_rtol(self) -> float:
+        """float: Relative viscosity error at which runs stop being extended"""
+        return self.__plateau_rtol
+
+    @plateau_rtol.setter
+    def plateau_rtol(self, val: float):
+        val = float(val)
+        assert val >= 0.0
+        self.__plateau_rtol = val
+
 ###################################################################################################################
     ################# Calculated results #########################
 
@@ -339,6 +390,16 @@ class ViscosityGreenKubo(Calculation):
         if self.__viscosity_stderr is None:
             raise ValueError("No results! Does not get loaded from records")
         return self.__viscosity_stderr
+
+    @property
+    def viscosity_cutoff(self) -> Optional[float]:
+        """float or None: Correlation time where the Green-Kubo integral was evaluated"""
+        return self.__viscosity_cutoff
+
+    @property
+    def runs(self) -> Optional[int]:
+        """int or None: Number of runsteps length runs performed"""
+        return self.__runs
     
     def set_values(self,
                    name: Optional[str] = None,
@@ -367,6 +428,15 @@ class ViscosityGreenKubo(Calculation):
         equilsteps: int or None
             If doing an equilibrium run this is the number of simulation
             timesteps 
+        nblocks : int, optional
+            The number of blocks bootstrapped for the viscosity error.
+        nbootstrap : int, optional
+            The number of bootstrap samples for the viscosity error.
+        maxruns : int, optional
+            The maximum number of runsteps length runs to perform.
+        plateau_rtol : float, optional
+            The relative viscosity error at which no further runs are
+            performed.
         **kwargs : any, optional
             Any keyword parameters supported by the set_values() methods of
             the parent Calculation class and the subset classes.
@@ -393,6 +463,14 @@ class ViscosityGreenKubo(Calculation):
             self.resetvelocities = kwargs['resetvelocities']
         if 'randomseed' in kwargs:
             self.randomseed = kwargs['randomseed']
+        if 'nblocks' in kwargs:
+            self.nblocks = kwargs['nblocks']
+        if 'nbootstrap' in kwargs:
+            self.nbootstrap = kwargs['nbootstrap']
+        if 'maxruns' in kwargs:
+            self.maxruns = kwargs['maxruns']
+        if 'plateau_rtol' in kwargs:
+            self.plateau_rtol = kwargs['plateau_rtol']
 
 ####################### Parameter file interactions ###########################
 
@@ -433,10 +511,14 @@ class ViscosityGreenKubo(Calculation):
         self.sampleinterval = int(input_dict.get('sampleinterval', 5))
         self.correlationlength = int(input_dict.get('correlationlength', 200))
         self.randomseed = input_dict.get('randomseed', None)
+        self.nblocks = int(input_dict.get('nblocks', 10))
+        self.nbootstrap = int(input_dict.get('nbootstrap', 1000))
+        self.maxruns = int(input_dict.get('maxruns', 1))
 
         # Load calculation-specific unitless floats
         self.temperature = float(input_dict['temperature'])
         self.dragcoeff = float(input_dict.get('dragcoeff', .2))
+        self.plateau_rtol = float(input_dict.get('plateau_rtol', 0.05))
 
         # Load calculation-specific floats with units
         if 'timestep' in input_dict:
@@ -553,6 +635,20 @@ class ViscosityGreenKubo(Calculation):
             'randomseed': ' '.join([
                 "An int random number seed to use for generating initial velocities.",
                 "A random int will be selected if not given."]),
+            'nblocks': ' '.join([
+                "The number of blocks that the pressure tensor series is divided into",
+                "for bootstrapping the viscosity error.  Each block must contain at",
+                "least correlationlength samples.  Default value is 10."]),
+            'nbootstrap': ' '.join([
+                "The number of bootstrap samples used for the viscosity error.",
+                "Default value is 1000."]),
+            'maxruns': ' '.join([
+                "The maximum number of runsteps length runs to perform.  The run is",
+                "extended from a restart file until the viscosity's relative error",
+                "is at most plateau_rtol.  Default value is 1 (no extensions)."]),
+            'plateau_rtol': ' '.join([
+                "The relative standard error of the viscosity at which the run is",
+                "no longer extended.  Default value is 0.05."]),
         }
 
     @property
@@ -600,7 +696,11 @@ class ViscosityGreenKubo(Calculation):
                     'outputsteps',
                     'equilsteps',
                     'sampleinterval',
-                    'correlationlength'
+                    'correlationlength',
+                    'nblocks',
+                    'nbootstrap',
+                    'maxruns',
+                    'plateau_rtol'
                 ],
                 [
                     'resetvelocities',
@@ -646,6 +746,10 @@ class ViscosityGreenKubo(Calculation):
         run_params['equilsteps'] = self.equilsteps
         run_params['sampleinterval'] = self.sampleinterval
         run_params['correlationlength'] = self.correlationlength
+        run_params['nblocks'] = self.nblocks
+        run_params['nbootstrap'] = self.nbootstrap
+        run_params['maxruns'] = self.maxruns
+        run_params['plateau_rtol'] = self.plateau_rtol
         if self.resetvelocities:
             run_params['resetvelocities'] = self.resetvelocities
             run_params['randomseed'] = self.randomseed
@@ -667,6 +771,10 @@ class ViscosityGreenKubo(Calculation):
             calc['measured_temperature_stderr'] = uc.model(self.measured_temperature_stderr, 'K')
             calc['viscosity'] = uc.model(self.viscosity, f'{self.units.pressure_unit}*ps')
             calc['viscosity_stderr'] = uc.model(self.viscosity_stderror, f'{self.units.pressure_unit}*ps')
+            if self.viscosity_cutoff is not None:
+                calc['viscosity_cutoff'] = uc.model(self.viscosity_cutoff, 'ps')
+            if self.runs is not None:
+                calc['runs'] = self.runs
 
         self._set_model(model)
         return model
@@ -698,6 +806,10 @@ class ViscosityGreenKubo(Calculation):
         self.dragcoeff = run_params['dragcoeff']
         self.sampleinterval = run_params['sampleinterval']
         self.correlationlength = run_params['correlationlength']
+        self.nblocks = run_params.get('nblocks', 10)
+        self.nbootstrap = run_params.get('nbootstrap', 1000)
+        self.maxruns = run_params.get('maxruns', 1)
+        self.plateau_rtol = run_params.get('plateau_rtol', 0.05)
         self.resetvelocities = run_params.get('resetvelocities', False)
         self.randomseed = run_params.get('randomseed', 900000000)
 
@@ -715,6 +827,9 @@ class ViscosityGreenKubo(Calculation):
 
             self.__viscosity = uc.value_unit(calc['viscosity'])
             self.__viscosity_stderr = uc.value_unit(calc['viscosity_stderr'])
+            if 'viscosity_cutoff' in calc:
+                self.__viscosity_cutoff = uc.value_unit(calc['viscosity_cutoff'])
+            self.__runs = calc.get('runs', None)
             self.__measured_temperature = uc.value_unit(calc['measured_temperature'])
             self.__measured_temperature_stderr = uc.value_unit(calc['measured_temperature_stderr'])
 
@@ -753,6 +868,7 @@ class ViscosityGreenKubo(Calculation):
             meta['measured_temperature_stderr'] = self.measured_temperature_stderr
             meta['measured_viscosity'] = self.viscosity
             meta['measured_viscosity_stderr'] = self.viscosity_stderror
+            meta['viscosity_cutoff'] = self.viscosity_cutoff
 
             meta['pxy_values'] = self.pxy_values
             meta['pxz_values'] = self.pxz_values
@@ -814,6 +930,10 @@ class ViscosityGreenKubo(Calculation):
         input_dict['correlationlength'] = self.correlationlength
         input_dict['resetvelocities'] = self.resetvelocities
         input_dict['randomseed'] = self.randomseed
+        input_dict['nblocks'] = self.nblocks
+        input_dict['nbootstrap'] = self.nbootstrap
+        input_dict['maxruns'] = self.maxruns
+        input_dict['plateau_rtol'] = self.plateau_rtol
 
         # Return input_dict
         return input_dict
@@ -825,7 +945,11 @@ class ViscosityGreenKubo(Calculation):
             'init.dat',
             'log.lammps',
             'viscosity_green_kubo.in',
-            'S0St.dat'
+            'S0St.dat',
+            'pressure_tensor*.txt',
+            'viscosity_green_kubo.restart',
+            'viscosity_green_kubo_extend-*.in',
+            'extend-*.log.lammps',
         ]
     
     def process_results(self, results_dict: dict):
@@ -842,6 +966,8 @@ class ViscosityGreenKubo(Calculation):
         self.__measured_temperature_stderr = results_dict['measured_temperature_stderr']
         self.__viscosity = results_dict["viscosity"]
         self.__viscosity_stderr = results_dict["viscosity_stderr"] 
+        self.__viscosity_cutoff = results_dict['viscosity_cutoff']
+        self.__runs = results_dict['runs']
         
         self.__pxy_values = results_dict['pxy_values']
         self.__pxz_values = results_dict['pxz_values']
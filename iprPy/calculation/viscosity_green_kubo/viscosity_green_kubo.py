@@ -4,11 +4,11 @@ import random
 import atomman as am
 import atomman.lammps as lmp
 import atomman.unitconvert as uc
-from atomman.tools import filltemplate
+from ...tools import filltemplate
 
 import numpy as np 
 
-from ...tools import read_calc_file
+from ...tools import read_calc_file, autocorrelation, block_split, block_stderr
 # Note - the system fed in needs to be relaxed to a liquid phase 
 # otherwise the calculation doesn't make much sense and it needs to run for 
 # significantly longer 
@@ -27,6 +27,10 @@ def viscosity_green_kubo(lammps_command:str,
                          dragcoeff: float = 0.2,
                          resetvelocities: bool = False,
                          randomseed: Optional[int] = None,
+                         nblocks: int = 10,
+                         nbootstrap: int = 1000,
+                         maxruns: int = 1,
+                         plateau_rtol: float = 0.05,
                          ) -> dict:
     """
     Calculates the diffusion constant for a liquid system using
@@ -73,6 +77,20 @@ def viscosity_green_kubo(lammps_command:str,
         Random number seed used by LAMMPS in creating velocities.  Only used
         if resetvelocities is True.  Default is None which will select a
         random int between 1 and 900000000.
+    nblocks : int, optional
+        The number of blocks that the pressure tensor series is divided into
+        for bootstrapping the viscosity error.  Default value is 10.
+    nbootstrap : int, optional
+        The number of bootstrap samples.  Default value is 1000.
+    maxruns : int, optional
+        The maximum number of runsteps length runs to perform.  After each
+        run, the viscosity is evaluated from all pressure tensor values so far
+        and the simulation is continued from a restart file until the
+        viscosity's relative standard error is at most plateau_rtol.  Default
+        value is 1, i.e. no extensions.
+    plateau_rtol : float, optional
+        The relative standard error of the viscosity at which no further runs
+        are performed.  Default value is 0.05.
     
     Returns
     -------
@@ -86,8 +104,11 @@ def viscosity_green_kubo(lammps_command:str,
         deviation measured temperature of the system ignore initial 
         data according to the data offset.
         -**'viscosity'** (*float*) - The calculated viscosity 
-        -**'viscosity_stderr'** (*float*) - The standard deviation
-        of the viscosity
+        -**'viscosity_stderr'** (*float*) - The bootstrapped standard
+        error of the viscosity
+        -**'viscosity_cutoff'** (*float*) - The correlation time where the
+        Green-Kubo integral was evaluated
+        -**'runs'** (*int*) - The number of runsteps length runs performed
         -**'lammps_output'** - The lammps output log
     """
     # Get the units from Potential
@@ -127,6 +148,10 @@ def viscosity_green_kubo(lammps_command:str,
     # Raise Error if the values don't commute
     if (runsteps % (outputsteps) != 0):
         raise ValueError('thermosteps must divide runsteps')
+
+    # Each bootstrap block must hold a full correlation window of samples
+    if (runsteps // sampleinterval + 1) // nblocks < correlationlength:
+        raise ValueError('too few pressure samples for nblocks blocks of correlationlength')
     
     # Build the set velocities command if needed
     if resetvelocities:
@@ -162,34 +187,58 @@ def viscosity_green_kubo(lammps_command:str,
     
     thermo = output.simulations[-1].thermo
 
-    # Compute mean and stderr of mean for temp
-    measured_temps = thermo["Temp"].values
-    measured_temp = np.average(measured_temps)
-    measured_temp_stderr = np.std(measured_temps) / ((len(measured_temps) / 100) ** .5)
+    # Analyze the pressure tensor series
+    volume = uc.get_in_units(system.box.volume, f"{lammps_units['length']}^3")
+    factor = scale * volume / (kB_lammps * temperature)
+    dt = lammps_variables['timestep'] * sampleinterval
+    rng = np.random.default_rng(randomseed)
+    pressurefiles = ['pressure_tensor.txt']
+    gk = green_kubo_fft(pressurefiles, factor, dt, correlationlength,
+                        nblocks, nbootstrap, rng)
+
+    # Extend the run until the viscosity error is small enough
+    runs = 1
+    if maxruns > 1:
+        lammps_variables['atomman_pair_restart_info'] = potential.pair_restart_info(
+            'viscosity_green_kubo.restart', system.symbols)
+        template = read_calc_file('iprPy.calculation.viscosity_green_kubo',
+                                  'viscosity_green_kubo_extend.template')
+    while runs < maxruns and gk['viscosity_stderr'] > plateau_rtol * abs(gk['viscosity']):
+        lammps_variables['pressurefile'] = f'pressure_tensor-{runs}.txt'
+        lammps_script = f'viscosity_green_kubo_extend-{runs}.in'
+        with open(lammps_script, 'w') as f:
+            f.write(filltemplate(template, lammps_variables, '<', '>'))
+        lmp.run(lammps_command, script_name=lammps_script,
+                mpi_command=mpi_command, screen=False,
+                logfile=f'extend-{runs}.log.lammps')
+        pressurefiles.append(lammps_variables['pressurefile'])
+        gk = green_kubo_fft(pressurefiles, factor, dt, correlationlength,
+                            nblocks, nbootstrap, rng)
+        runs += 1
+
+    # Get mean and stderr of mean for temp
+    measured_temp = gk['temperature']
+    measured_temp_stderr = gk['temperature_stderr']
 
     # Extract viscosity and pressure values from thermo
     viscosity_unit = f"{lammps_units['pressure']}*{lammps_units['time']}"
     pressure_unit = lammps_units['pressure']
 
-    viscosities = uc.set_in_units(thermo["v_v"].values, viscosity_unit)
-
     pressures_xy = uc.set_in_units(thermo['v_pxy'].values, pressure_unit)
     pressures_xz = uc.set_in_units(thermo['v_pxz'].values, pressure_unit)
     pressures_yz = uc.set_in_units(thermo['v_pyz'].values, pressure_unit)
 
-    viscosities_x = uc.set_in_units(thermo['v_v11'].values, viscosity_unit)
-    viscosities_y = uc.set_in_units(thermo['v_v22'].values, viscosity_unit)
-    viscosities_z = uc.set_in_units(thermo['v_v33'].values, viscosity_unit)
-
-    # Viscosity measurement is the final value of the integral
-    viscosity = viscosities[-1] 
+    # Viscosity measurement is the FFT Green-Kubo integral at the cutoff
+    viscosity = uc.set_in_units(gk['viscosity'], viscosity_unit)
     
     # Initialize the return dictionary
     results = {}
 
     # Data of interest
     results['viscosity'] = viscosity
-    results['viscosity_stderr'] = 0.0   # There is no notion of error for the Green-Kubo Calculation Method
+    results['viscosity_stderr'] = uc.set_in_units(gk['viscosity_stderr'], viscosity_unit)
+    results['viscosity_cutoff'] = uc.set_in_units(gk['cutoff_time'], lammps_units['time'])
+    results['runs'] = runs
     
     results['measured_temperature'] = measured_temp
     results['measured_temperature_stderr'] = measured_temp_stderr
@@ -198,9 +247,124 @@ def viscosity_green_kubo(lammps_command:str,
     results['pxz_values'] = pressures_xz
     results['pyz_values'] = pressures_yz
 
-    results['vx_value'] = np.average(viscosities_x[1:])
-    results['vy_value'] = np.average(viscosities_y[1:])
-    results['vz_value'] = np.average(viscosities_z[1:])
+    results['vx_value'] = uc.set_in_units(gk['components'][0], viscosity_unit)
+    results['vy_value'] = uc.set_in_units(gk['components'][1], viscosity_unit)
+    results['vz_value'] = uc.set_in_units(gk['components'][2], viscosity_unit)
 
     results['lammps_output'] = output
     return results
+
+def read_pressure_tensor(pressurefiles: list) -> np.ndarray:
+    """
+    Reads the fix ave/time pressure tensor files of a run and its extensions.
+    The first row of an extension repeats the last row of the run before it
+    and is skipped.
+
+    Parameters
+    ----------
+    pressurefiles : list
+        The files in the order that they were written.  Each row contains the
+        timestep, temperature, pxx, pyy, pzz, pxy, pxz and pyz.
+
+    Returns
+    -------
+    numpy.ndarray
+        The merged rows.
+    """
+    data = []
+    laststep = None
+    for pressurefile in pressurefiles:
+        values = np.loadtxt(pressurefile, ndmin=2)
+        if laststep is not None:
+            values = values[values[:, 0] > laststep]
+        if len(values) > 0:
+            data.append(values)
+            laststep = values[-1, 0]
+    return np.vstack(data)
+
+def green_kubo_fft(pressurefiles: list,
+                   factor: float,
+                   dt: float,
+                   nlags: int,
+                   nblocks: int,
+                   nbootstrap: int,
+                   rng: np.random.Generator) -> dict:
+    """
+    Evaluates the Green-Kubo viscosity from the stress autocorrelation of the
+    five independent shear components of the pressure tensor, pxy, pxz, pyz,
+    (pxx-pyy)/2 and (pyy-pzz)/2, computed from all time origins using FFTs.
+    The integral is cut off where the mean autocorrelation first reaches zero,
+    or at the end of the correlation window if it does not.  The standard
+    error is found by bootstrapping blocks of the series, with the cutoff
+    re-selected for each sample.
+
+    Parameters
+    ----------
+    pressurefiles : list
+        The fix ave/time pressure tensor files in the order written.
+    factor : float
+        V / (kB T) with the pressure conversion of the LAMMPS units such that
+        factor times the integral of the autocorrelation is the viscosity in
+        LAMMPS pressure*time units.
+    dt : float
+        The time between samples in LAMMPS time units.
+    nlags : int
+        The number of samples in the correlation window.
+    nblocks : int
+        The number of blocks to bootstrap.
+    nbootstrap : int
+        The number of bootstrap samples.
+    rng : numpy.random.Generator
+        The random number generator used for bootstrapping.
+
+    Returns
+    -------
+    dict
+        Contains 'viscosity', 'viscosity_stderr', 'cutoff_time', 'components'
+        (the pxy, pxz and pyz viscosities), 'acf', 'integral', 'temperature'
+        and 'temperature_stderr'.
+    """
+    data = read_pressure_tensor(pressurefiles)
+    temps = data[:, 1]
+    pxx, pyy, pzz, pxy, pxz, pyz = data[:, 2:8].T
+    shear = np.column_stack([pxy, pxz, pyz, (pxx - pyy) / 2, (pyy - pzz) / 2])
+    shear -= shear.mean(axis=0)
+
+    def integrate(acf):
+        # Running trapezoidal integral along the lag axis
+        integral = np.zeros_like(acf)
+        integral[..., 1:] = np.cumsum(acf[..., 1:] + acf[..., :-1], axis=-1) * dt / 2
+        return factor * integral
+
+    def cutoff_index(acf):
+        # First lag where the mean autocorrelation is not positive
+        negative = acf <= 0
+        return np.where(negative.any(axis=-1), negative.argmax(axis=-1), acf.shape[-1] - 1)
+
+    results = {}
+
+    # Full series values
+    acfs = autocorrelation(shear, nlags)
+    acf = acfs.mean(axis=1)
+    integral = integrate(acf)
+    cutoff = int(cutoff_index(acf))
+    results['acf'] = acf
+    results['integral'] = integral
+    results['viscosity'] = integral[cutoff]
+    results['cutoff_time'] = cutoff * dt
+    results['components'] = integrate(acfs.T)[:3, cutoff]
+
+    # Bootstrap blocks of the series
+    blocks = block_split(len(shear), nblocks, nlags)
+    blockacfs = np.array([autocorrelation(shear[block], nlags).mean(axis=1)
+                          for block in blocks])
+    samples = blockacfs[rng.integers(nblocks, size=(nbootstrap, nblocks))].mean(axis=1)
+    cutoffs = cutoff_index(samples)
+    viscosities = integrate(samples)[np.arange(nbootstrap), cutoffs]
+    results['viscosity_stderr'] = viscosities.std(ddof=1)
+
+    T = [temps[block].mean() for block in blocks]
+    results['temperature'] = temps.mean()
+    results['temperature_stderr'] = block_stderr(T)[1]
+
+    return results
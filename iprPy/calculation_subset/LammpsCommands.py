@@ -15,7 +15,7 @@ from yabadaba import load_query
 
 # iprPy imports
 from . import CalculationSubset
-from ..tools import dict_insert
+from ..tools import checkversion, dict_insert
 
 class LammpsCommands(CalculationSubset):
     """Handles calculation terms for LAMMPS executable commands"""
@@ -83,7 +83,7 @@ class LammpsCommands(CalculationSubset):
     def lammps_version(self) -> str:
         """str: The LAMMPS version str"""
         if self.__lammps_version is None and self.lammps_command is not None:
-            lammps_version = lmp.checkversion(self.lammps_command)
+            lammps_version = checkversion(self.lammps_command)
             self.__lammps_version = lammps_version['version']
             self.__lammps_date = lammps_version['date']
         return self.__lammps_version
@@ -92,7 +92,7 @@ class LammpsCommands(CalculationSubset):
     def lammps_date(self) -> datetime.date:
         """datetime.date: The LAMMPS version date"""
         if self.__lammps_version is None and self.lammps_command is not None:
-            lammps_version = lmp.checkversion(self.lammps_command)
+            lammps_version = checkversion(self.lammps_command)
             self.__lammps_version = lammps_version['version']
             self.__lammps_date = lammps_version['date']
         return self.__lammps_date
@@ -239,6 +239,11 @@ class LammpsNEB(CalculationSubset):
         return  {
             'numreplicas': ' '.join([
                 "The number of NEB replicas to use.  Default value is 11."]),
+            'partition': ' '.join([
+                "The LAMMPS -partition command line option value of the form",
+                "'MxN' where M is numreplicas and N is the number of cores per",
+                "replica.  If not given, the MPI processes given by",
+                "mpi_command are divided evenly between the replicas."]),
             'springconst': ' '.join([
                 "The NEB force spring constant.  This value is in force per",
                 "length units.  Default value is '5.0 eV/angstrom^2'"]),
@@ -307,6 +312,7 @@ class LammpsNEB(CalculationSubset):
         
         # Extract input values and assign default values
         self.numreplicas = input_dict.get(keymap['numreplicas'], 11)
+        self.partition = input_dict.get(keymap['partition'], None)
         self.springconst = value(input_dict, keymap['springconst'],
                                  default_unit=force_per_length_unit,
                                  default_term='5.0 eV/angstrom^2')
@@ -426,6 +432,7 @@ class LammpsNEB(CalculationSubset):
 
         # Get ftol, dmax in LAMMPS units?
         input_dict['numreplicas'] = self.numreplicas
+        input_dict['partition'] = self.partition
         input_dict['springconst'] = self.springconst
         input_dict['etol'] = self.energytolerance
         input_dict['ftol'] = self.forcetolerance
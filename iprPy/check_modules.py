@@ -2,16 +2,33 @@
 
 # iprPy imports
 from . import recordmanager, calculationmanager, databasemanager
+from .calculation import load_all_calculations, import_times as get_import_times
 
 __all__ = ['check_modules']
 
-def check_modules():
+def check_modules(import_times: bool = False):
     """
     Prints lists of the calculation, record, and database styles that were
-    successfully and unsuccessfully loaded when iprPy was initialized.
+    successfully and unsuccessfully loaded.  All calculation styles are
+    imported first as they are otherwise only imported when used.
+
+    Parameters
+    ----------
+    import_times : bool, optional
+        If True, the time spent importing each calculation style will also
+        be printed, slowest first.  Default value is False.
     """
+    load_all_calculations()
+
     databasemanager.check_styles()
     print()
     calculationmanager.check_styles()
     print()
     recordmanager.check_styles()
+
+    if import_times:
+        print()
+        print('Calculation style import times:')
+        times = get_import_times()
+        for style in sorted(times, key=times.get, reverse=True):
+            print(f'- {style}: {times[style]:.3f} s')
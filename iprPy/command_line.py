@@ -11,9 +11,8 @@ import atomman as am
 from . import (load_database, load_run_directory, load_calculation,
                check_modules, settings)
 from .calculation import run_calculation
-from .database import reset_orphans
+from .database import reset_orphans, inspect_leases
 from .tools import filltemplate
-from .quickcheck.QuickCheck import QuickCheck
 
 def command_line():
     """
@@ -33,7 +32,7 @@ def command_line_actions(args):
 
     # Actions for subcommand check_modules
     elif args.action == 'check_modules':
-        check_modules()
+        check_modules(import_times=args.import_times)
 
     # Actions for subcommand clean_files
     elif args.action == 'clean_files':
@@ -74,6 +73,16 @@ def command_line_actions(args):
         run_directory = load_run_directory(args.run_directory)
         database.finish_calculations(run_directory, verbose=args.verbose)
 
+    # Actions for subcommand inspect_leases
+    elif args.action == 'inspect_leases':
+        leases = inspect_leases(args.run_directory, lease_time=args.lease_time,
+                                reclaim=args.reclaim)
+        for status in ['live', 'stale', 'expired']:
+            print(f'{status}:', (leases.status == status).sum())
+        if len(leases) > 0:
+            print()
+            print(leases.sort_values('age', ascending=False).to_string(index=False))
+
     # Actions for subcommand reset_orphans
     elif args.action == 'reset_orphans':
         run_directory = load_run_directory(args.run_directory)
@@ -169,15 +178,25 @@ def command_line_actions(args):
     elif args.action == 'runner':
         database = load_database(args.database)
         run_directory = load_run_directory(args.run_directory)
+        calc_name = args.calc_name
+        if args.array_file is not None:
+            from .workflow.slurm_arrays import array_calc_name
+            calc_name = array_calc_name(args.array_file)
         database.runner(run_directory,
-                        calc_name=args.calc_name,
+                        calc_name=calc_name,
                         temp=args.temp,
                         log=args.log,
                         bidtries=args.bidtries,
                         bidverbose=args.bidverbose,
-                        free=args.free)
+                        free=args.free,
+                        scratch_directory=args.scratch,
+                        scratch_size=args.scratch_size,
+                        lease_time=args.lease_time,
+                        telemetry=args.telemetry,
+                        prometheus_file=args.prometheus_file)
 
     elif args.action == 'quick_check':
+        from .quickcheck.QuickCheck import QuickCheck
         input_file = args.input_file
         qc = QuickCheck.run_from_input(input_file)
 
@@ -229,6 +248,18 @@ def command_line_actions(args):
     elif args.action == 'unset_directory':
         settings.unset_directory()
 
+    # Actions for subcommand runner_telemetry
+    elif args.action == 'runner_telemetry':
+        from .database.telemetry import summarize_telemetry
+        jsonl_files = args.jsonl_files
+        if len(jsonl_files) == 0:
+            jsonl_files = sorted(settings.runner_log_directory.glob('*.jsonl'))
+        summary = summarize_telemetry(jsonl_files)
+        if len(summary) == 0:
+            print('No runner telemetry found')
+        else:
+            print(summary.set_index('run_directory').T.to_string())
+
     # Actions for runner_log_directory
     elif args.action == 'runner_log_directory':
         print(settings.runner_log_directory)
@@ -262,6 +293,8 @@ def command_line_parser():
     # Define subparser for check_modules
     subparser = subparsers.add_parser('check_modules',
                         help='prints load status of all modules in iprPy')
+    subparser.add_argument('-t', '--import_times', action='store_true',
+                        help='print the time spent importing each calculation style')
 
     # Define subparser for clean_files
     subparser = subparsers.add_parser('clean_files',
@@ -331,6 +364,16 @@ def command_line_parser():
     subparser.add_argument('orphan_directory', nargs='?', default=None,
                         help='orphan_directory path')
 
+    # Define subparser for inspect_leases
+    subparser = subparsers.add_parser('inspect_leases',
+                        help='lists live, stale and expired runner leases in a run directory')
+    subparser.add_argument('run_directory', nargs='?', default=None,
+                        help='run_directory name')
+    subparser.add_argument('-l', '--lease_time', default=600.0, type=float,
+                        help='lease time in seconds for bid files that do not specify one')
+    subparser.add_argument('-r', '--reclaim', action='store_true',
+                        help='delete expired bid files')
+
     # Define subparser for prepare
     subparser = subparsers.add_parser('prepare',
                         help='prepare calculations')
@@ -412,6 +455,8 @@ def command_line_parser():
                         help='run_directory name')
     subparser.add_argument('-c', '--calc_name', default=None,
                         help='specifies a single calculation in run_directory to run')
+    subparser.add_argument('-a', '--array_file', default=None,
+                        help='file of calculation names to select from by SLURM_ARRAY_TASK_ID')
     subparser.add_argument('-t', '--temp', action='store_true',
                         help='indicates that the calculations are to run in a temporary directory')
     subparser.add_argument('-l', '--log', action='store_true',
@@ -422,6 +467,22 @@ def command_line_parser():
                         help='bid action info will be printed')
     subparser.add_argument('-f', '--free', action='store_true',
                         help='run free from the database')
+    subparser.add_argument('-s', '--scratch', default=None,
+                        help='node-local scratch location used with --temp')
+    subparser.add_argument('--scratch_size', default=None, type=lambda x: int(float(x) * 1e9),
+                        help='maximum GB of calculation copies to keep in scratch')
+    subparser.add_argument('--lease_time', default=600.0, type=float,
+                        help='seconds that calculation claims stay valid without a heartbeat')
+    subparser.add_argument('-m', '--telemetry', action='store_true',
+                        help='save per-phase run timings as JSON lines (in the runner log directory)')
+    subparser.add_argument('--prometheus_file', default=None,
+                        help='Prometheus textfile to keep runner totals in; {pid} is replaced by the pid')
+
+    # Define subparser for runner_telemetry
+    subparser = subparsers.add_parser('runner_telemetry',
+                        help='summarizes runner phase timings by run directory')
+    subparser.add_argument('jsonl_files', nargs='*',
+                        help='telemetry files to read (default is all in the runner log directory)')
 
     # Define subparser for quick_check
     subparser = subparsers.add_parser('quick_check',
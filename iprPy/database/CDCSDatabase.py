@@ -1,7 +1,8 @@
 from yabadaba import databasemanager
 
 from .IprPyDatabase import IprPyDatabase
+from .parent_index import ParentIndexUpdates
 
 # Extend the yabadaba CDCSDatabase to include IprPyDatabase operations
-class CDCSDatabase(databasemanager.get_class('cdcs'), IprPyDatabase):
+class CDCSDatabase(ParentIndexUpdates, databasemanager.get_class('cdcs'), IprPyDatabase):
     pass
\ No newline at end of file
@@ -5,6 +5,7 @@ import shutil
 
 from tqdm import tqdm
 
+import numpy as np
 import pandas as pd
 
 import atomman as am
@@ -14,8 +15,9 @@ from .prepare import prepare
 from .runner import runner, RunManager
 from .master_prepare import master_prepare
 from .reset_orphans import reset_orphans
+from .parent_index import ParentIndex, record_parent_names
 from .. import load_run_directory
-from ..tools import iaslist
+from ..tools import iaslist, record_digest
 
 class IprPyDatabase():
     """
@@ -382,9 +384,9 @@ class IprPyDatabase():
             If False, only the records will be copied. (Default is True).
         overwrite : bool, optional
             If False (default) only new records and tars will be copied.
-            If True, the content of all records will be compared to identify
-            those that have been changed, and those will be updated in dest
-            to match the content in the current database.
+            If True, the content digests of all records will be compared to
+            identify those that have been changed, and those will be updated
+            in dest to match the content in the current database.
         dryrun : bool, optional
             If True, the identified records to add/update to dest will be
             returned as a list rather than sending them to dest. copy_records()
@@ -393,8 +395,8 @@ class IprPyDatabase():
             the list not returned.
         **kwargs : any, optional
             Any query keyword options to use when building the lists of existing
-            calculations to compare. NOTE these are only applied to get_records
-            calls at the moment and so should not be combined with includetar!!!
+            calculations to compare.  Missing tars are only checked for the
+            records matching the query.
             
         Returns
         -------
@@ -404,58 +406,49 @@ class IprPyDatabase():
         """
         
         # Get records in source database
-        self_records, self_df = self.get_records(record_style, return_df=True, **kwargs)
+        self_records = self.get_records(record_style, **kwargs)
         print(len(self_records), 'records in source')
         
         # Get records in destination database
-        dest_records, dest_df = dest.get_records(record_style, return_df=True, **kwargs)
+        dest_records = dest.get_records(record_style, **kwargs)
         print(len(dest_records), 'records in destination')
         
+        # Index records by name
+        self_records = {record.name: record for record in self_records}
+        dest_records = {record.name: record for record in dest_records}
+
         # Identify records missing from destination
-        if len(dest_records) > 0:
-            missing = set(self_df.name[~self_df.name.isin(dest_df.name.tolist())])
-        else:
-            missing = set(self_df.name)
+        missing = set(self_records).difference(dest_records)
         print(len(missing), 'records missing from destination')
         
         if overwrite is True:
             print('comparing content of records')
             # Identify records that have changed
-            changed = []
-            for name in tqdm(self_df.name[~self_df.name.isin(missing)], desc="Comparing records", ascii=True):
-                self_record = self_records[self_df.name == name][0].model.json(ensure_ascii=False)
-                dest_record = dest_records[dest_df.name == name][0].model.json(ensure_ascii=False)
-                if self_record != dest_record:
-                    changed.append(name)
+            self_digests = self.get_record_digests(self_records.values())
+            dest_digests = dest.get_record_digests(dest_records.values())
+            changed = [name for name in self_records
+                       if name in dest_digests
+                       and self_digests[name] != dest_digests[name]]
             print(len(changed), 'records in destination different in source')
             missing = missing.union(changed)
         
         if includetar is True:
             
-            # Get metadata for tars in source database
-            self_tar = []
-            for frecord in self.mongodb[f'{record_style}.files'].find():
-                self_tar.append(frecord)
-            self_tar = pd.DataFrame(self_tar)
+            # Get names of tars in source and destination databases
+            self_tar = self.get_tar_names(record_style)
             print(len(self_tar), 'tars in source')
-            
-            # Get metadata for tars in destination database
-            dest_tar = []
-            for frecord in dest.mongodb[f'{record_style}.files'].find():
-                dest_tar.append(frecord)
-            dest_tar = pd.DataFrame(dest_tar)
+            dest_tar = dest.get_tar_names(record_style)
             print(len(dest_tar), 'tars in destination')   
             
-            # Identify records missing from destination
-            if len(dest_records) > 0:
-                missingtar = set(self_tar.recordname[~self_tar.recordname.isin(dest_tar.recordname.tolist())])
-            else:
-                missingtar = set(self_tar.recordname)
+            # Identify tars missing from destination
+            missingtar = self_tar.difference(dest_tar).intersection(self_records)
             print(len(missingtar), 'tars missing from destination')
             missing = missing.union(missingtar)
         
         if len(missing) > 0:
-            records = self_records[self_df.name.isin(missing)]
+            records = np.empty(len(missing), dtype=object)
+            records[:] = [record for name, record in self_records.items()
+                          if name in missing]
             if dryrun:
                 print(len(records), 'to copy')
             else:
@@ -464,6 +457,63 @@ class IprPyDatabase():
         else:
             print('No records to copy')
             return []
+
+    def get_record_digests(self, records):
+        """
+        Computes content digests for records.  Digests are recomputed on each
+        call so that records whose models were modified in place are never
+        compared using stale values.
+
+        Parameters
+        ----------
+        records : list
+            The records to get digests for.
+
+        Returns
+        -------
+        dict
+            The content digests keyed by record name.
+        """
+        digests = {}
+        for record in records:
+            digests[record.name] = record_digest(model=record.model)
+
+        return digests
+
+    def get_tar_names(self, record_style):
+        """
+        Gets the names of all records of a given style that have tar archives
+        in the database.  Only the tar file listings are retrieved, not the
+        archives themselves.
+
+        Parameters
+        ----------
+        record_style : str
+            The record style to list tars for.
+
+        Returns
+        -------
+        set
+            The names of the records with tars.
+        """
+        if self.style == 'mongo':
+            files = self.mongodb[f'{record_style}.files']
+            return set(files.distinct('recordname'))
+        
+        elif self.style == 'local':
+            return set(tarpath.name[:-len('.tar.gz')] 
+                       for tarpath in Path(self.host, record_style).glob('*.tar.gz'))
+        
+        elif self.style == 'cdcs':
+            blobs = self.cdcs.get_blobs()
+            if len(blobs) == 0:
+                return set()
+            filenames = pd.Series(blobs.filename)
+            filenames = filenames[filenames.str.endswith('.tar.gz')]
+            return set(filenames.str[:-len('.tar.gz')])
+        
+        else:
+            raise ValueError(f'tar listing not supported for database style {self.style}')
         
     def copy_references(self, dest, includetar=True, overwrite=False):
         """
@@ -496,6 +546,134 @@ class IprPyDatabase():
             print(style)
             self.copy_records(dest, record_style=style, includetar=includetar, overwrite=overwrite)
 
+    @property
+    def parent_index(self):
+        """iprPy.database.parent_index.ParentIndex : The index of parent edges between records"""
+        try:
+            return self.__parent_index
+        except AttributeError:
+            self.__parent_index = ParentIndex(self)
+            return self.__parent_index
+
+    def build_parent_index(self, styles=None, verbose=False):
+        """
+        (Re)builds the parent index by scanning all records in the database.
+        This is done automatically the first time that the index is needed,
+        but can be called again to account for records that were changed
+        outside of the database's add/update/delete methods.
+
+        Parameters
+        ----------
+        styles : list, optional
+            The record styles to scan.  Default value is all loaded record
+            styles.
+        verbose : bool, optional
+            If True, the number of records indexed for each style is printed.
+        """
+        self.parent_index.build(styles=styles, verbose=verbose)
+
+    def get_records_by_name(self, names):
+        """
+        Retrieves records by name using the styles stored in the parent index
+        so that only one query is needed for each record style.
+
+        Parameters
+        ----------
+        names : list
+            The record names.
+
+        Returns
+        -------
+        dict
+            The found records keyed by name.
+        """
+        names = list(dict.fromkeys(names))
+        entries = self.parent_index.entries(names)
+
+        # Group names by style
+        bystyle = {}
+        for name in names:
+            if name in entries:
+                bystyle.setdefault(entries[name][0], []).append(name)
+
+        records = {}
+        for style, stylenames in bystyle.items():
+            for record in self.get_records(style=style, name=stylenames):
+                records[record.name] = record
+
+        # Fall back on unindexed searches for any missing
+        for name in names:
+            if name not in records:
+                try:
+                    records[name] = self.get_record(name=name)
+                except:
+                    pass
+        
+        return records
+
+    def get_lineage(self, names, direction='ancestors', records=True):
+        """
+        Finds the related records for multiple records at once using the
+        parent index.
+
+        Parameters
+        ----------
+        names : list
+            The names of the records to find relatives for.
+        direction : str, optional
+            'parents', 'children', 'ancestors' (default) or 'descendants'.
+            The ancestors and descendants are full closures.
+        records : bool, optional
+            If True (default), the related records are returned.  If False,
+            only their names are returned.
+
+        Returns
+        -------
+        dict
+            Maps each given name to the list of related records or names.
+        """
+        names = list(names)
+        if direction == 'parents':
+            lineage = self.parent_index.parents(names)
+        elif direction == 'children':
+            lineage = self.parent_index.children(names)
+        elif direction in ['ancestors', 'descendants']:
+            lineage = self.parent_index.closure(names, direction=direction)
+        else:
+            raise ValueError(f'Unknown direction {direction}')
+
+        if records is False:
+            return lineage
+
+        # Retrieve all related records together
+        allrecords = self.get_records_by_name(
+            [n for related in lineage.values() for n in related])
+        return {name: [allrecords[n] for n in related if n in allrecords]
+                for name, related in lineage.items()}
+
+    def get_records_parents(self, records):
+        """
+        Finds the direct parents of multiple loaded records at once.  The
+        parent names are taken from each record's own content, so the result
+        does not depend on the parent index being current.  The index is only
+        used to retrieve the parents with one query per record style.
+
+        Parameters
+        ----------
+        records : list of iprPy.Record
+            The records to find parents for.
+
+        Returns
+        -------
+        dict
+            Maps each record's name to the list of its parent records.
+        """
+        parentnames = {record.name: record_parent_names(record) for record in records}
+        found = self.get_records_by_name(
+            [n for names in parentnames.values() for n in names])
+        return {name: [found[n] for n in names if n in found]
+                for name, names in parentnames.items()}
+
     def get_parent_records(self, record=None, name=None, style=None,
                            ancestors=False):
         """
@@ -521,49 +699,75 @@ class IprPyDatabase():
         list of iprPy.Record
             All the parent records 
         """
-        # Get child record if needed
-        if record is None:
-            record = self.get_record(name=name, style=style) 
-        elif name is not None or style is not None:
-            raise ValueError('record cannot be given with name/style')
-        
-        parents = []
-        try:
-            # Check if record has system-info
-            model = record.build_model().find('system-info')
-        except:
-            pass
+        if record is not None:
+            if name is not None or style is not None:
+                raise ValueError('record cannot be given with name/style')
+            name = record.name
+            
+            # Use the record's content for its own parents
+            parentnames = record_parent_names(record)
         else:
-            # Loop over all file values in system-info
-            for load_file in model.finds('file'):
-                
-                # See if load file is in a directory
-                directory = Path(load_file).parent.stem
-                if directory != '':
-                    # Set parentname as load_file's directory
-                    parentname = directory
-                else:
-                    # Set parentname as loadfile's name
-                    parentname = Path(load_file).stem
+            entries = self.parent_index.entries([name])
+            if name in entries:
+                parentnames = list(entries[name][1])
+            else:
+                # Fall back on the record's content if it is not indexed
+                record = self.get_record(name=name, style=style)
+                parentnames = record_parent_names(record)
+
+        if ancestors is True:
+            # Each parent is followed by its own ancestors as found depth-first
+            ancestornames = self.parent_index.closure(parentnames)
+            names = []
+            for parentname in parentnames:
+                for n in [parentname] + ancestornames[parentname]:
+                    if n not in names:
+                        names.append(n)
+        else:
+            names = parentnames
 
-                try:
-                    # Get parent record
-                    parent = self.get_record(name=parentname) 
-                except:
-                    pass
-                else:
-                    parents.append(parent)
+        parents = self.get_records_by_name(names)
+        return [parents[n] for n in names if n in parents]
 
-                    # Recursively check for ancestors
-                    if ancestors is True:
-                        grandparents = self.get_parent_records(record=parent)
-                        parents.extend(grandparents)
-        
-        return parents
+    def get_child_records(self, record=None, name=None, style=None,
+                          descendants=False):
+        """
+        Returns all records that are children of the given one.
+
+        Parameters
+        ----------
+        record : iprPy.Record, optional
+            The record whose children are to be found.
+        name : str, optional
+            Record name of the record to find children for.  Cannot be given
+            with record. 
+        style : str, optional
+            Record style associated with the record identified by name.
+            Not needed as children are found by name only.
+        descendants : bool, optional
+            If True, then all descendants of the record are returned.  Default
+            value is False, meaning that only direct children are returned.
+
+        Returns
+        -------
+        list of iprPy.Record
+            All the child records 
+        """
+        if record is not None:
+            if name is not None or style is not None:
+                raise ValueError('record cannot be given with name/style')
+            name = record.name
+
+        if descendants is True:
+            direction = 'descendants'
+        else:
+            direction = 'children'
+        return self.get_lineage([name], direction=direction)[name]
 
     def prepare(self, run_directory, calculation, input_script=None, debug=False,
                 content_dict = None,
                 calc_df = None,
+                lammps_command_selector = None,
                 **kwargs):
         """
         Function for preparing any iprPy calculation for high-throughput execution.
@@ -583,6 +787,10 @@ class IprPyDatabase():
         debug : bool
             If set to True, will throw errors associated with failed/invalid
             calculation builds.  Default is False.
+        lammps_command_selector : iprPy.fix_lammps_versions.LammpsCommandSelector, optional
+            Selects the LAMMPS command for each calculation based on its
+            potential.  If not given, one is built from the lammps_command
+            terms in kwargs.
         **kwargs : str or list
             Allows for input parameters for preparing the calculation to be
             directly specified.  Any kwargs parameters that have names matching
@@ -593,7 +801,8 @@ class IprPyDatabase():
         
         # Call prepare with self as database
         return prepare(self, run_directory, calculation, input_script=input_script,
-                       debug=debug, content_dict=content_dict, calc_df=calc_df, **kwargs)
+                       debug=debug, content_dict=content_dict, calc_df=calc_df,
+                       lammps_command_selector=lammps_command_selector, **kwargs)
     
     def master_prepare(self, input_script=None, debug=False, **kwargs):
         """
@@ -619,7 +828,9 @@ class IprPyDatabase():
 
     def runner(self, run_directory, calc_name=None, orphan_directory=None,
                hold_directory=None, log=False, bidtries=10, bidverbose=False,
-               temp=False, temp_directory=None, free=False, kwargs_calc={}):
+               temp=False, temp_directory=None, free=False, kwargs_calc={},
+               scratch_directory=None, scratch_size=None, lease_time=600.0,
+               telemetry=False, prometheus_file=None):
         """
         High-throughput calculation runner.
         
@@ -650,8 +861,9 @@ class IprPyDatabase():
             If True, info about the calculation bidding process will be printed.
             Default value is False.
         temp : bool, optional
-            If True, a temporary directory will be automatically created and used
-            for this run.
+            If True, the calculations will be copied to and executed in
+            node-local scratch space, with the next calculation staged and
+            finished calculations uploaded in the background.
         temp_directory : path-like object, optional
             The path to an existing temporary directory where the calculations
             are to be copied to and executed there instead of in the run_directory.
@@ -663,17 +875,37 @@ class IprPyDatabase():
         kwargs_calc : dict, optional
             Keyword arguments for :meth:`iprPy.calculation.Calculation.Calculation.run`.
             Default is ``{"results_json": True}``
-        
+        scratch_directory : path-like object, optional
+            The scratch location used when temp is True.  Default value is
+            taken from the IPRPY_SCRATCH environment variable, or the system
+            temporary directory if not set.
+        scratch_size : int, optional
+            The maximum number of bytes of calculation copies to keep in
+            scratch.  If None (default), no cap is applied.
+        lease_time : float, optional
+            The number of seconds that claims on calculations stay valid
+            without a heartbeat.  Expired claims left by dead runners are
+            reclaimed.  Default value is 600.
+        telemetry : bool, optional
+            If True, the wall times of the phases of each run are saved as
+            JSON lines in the runner log directory.  Default value is False.
+        prometheus_file : path-like object, optional
+            If given, running totals of the calculation counts and phase
+            times are kept in this Prometheus textfile.
         """
         # Call runner with self as database
         runner(self, run_directory, calc_name=calc_name,
                orphan_directory=orphan_directory, hold_directory=hold_directory,
                log=log, bidtries=bidtries, bidverbose=bidverbose,
                temp=temp, temp_directory=temp_directory, free=free,
-               kwargs_calc=kwargs_calc)
+               kwargs_calc=kwargs_calc, scratch_directory=scratch_directory,
+               scratch_size=scratch_size, lease_time=lease_time,
+               telemetry=telemetry, prometheus_file=prometheus_file)
 
     def runmanager(self, run_directory, orphan_directory=None,
-                    hold_directory=None, log=False):
+                    hold_directory=None, log=False, scratch_directory=None,
+                    scratch_size=None, lease_time=600.0, telemetry=False,
+                    prometheus_file=None):
         """
         Creates a RunManager object linked to the database.  This allows users
         more control on how to perform calculations by being able to directly
@@ -695,6 +927,25 @@ class IprPyDatabase():
         log : bool, optional
             If True, the runner will create and save a log file detailing the
             status of each calculation that it runs.
+        scratch_directory : path-like object, optional
+            The scratch location used for runs with temp=True.  Default value
+            is taken from the IPRPY_SCRATCH environment variable, or the
+            system temporary directory if not set.
+        scratch_size : int, optional
+            The maximum number of bytes of calculation copies to keep in
+            scratch.  If None (default), no cap is applied.
+        lease_time : float, optional
+            The number of seconds that claims on calculations stay valid
+            without a heartbeat.  Default value is 600.
+        telemetry : bool, optional
+            If True, the wall times of the phases of each run are saved as
+            JSON lines in the runner log directory.  Default value is False.
+        prometheus_file : path-like object, optional
+            If given, running totals of the calculation counts and phase
+            times are kept in this Prometheus textfile.
         """
         return RunManager(self, run_directory, orphan_directory=orphan_directory,
-                          hold_directory=hold_directory, log=log)
\ No newline at end of file
+                          hold_directory=hold_directory, log=log,
+                          scratch_directory=scratch_directory,
+                          scratch_size=scratch_size, lease_time=lease_time,
+                          telemetry=telemetry, prometheus_file=prometheus_file)
\ No newline at end of file
@@ -1,7 +1,8 @@
 from yabadaba import databasemanager
 
 from .IprPyDatabase import IprPyDatabase
+from .parent_index import ParentIndexUpdates
 
 # Extend the yabadaba LocalDatabase to include IprPyDatabase operations
-class LocalDatabase(databasemanager.get_class('local'), IprPyDatabase):
+class LocalDatabase(ParentIndexUpdates, databasemanager.get_class('local'), IprPyDatabase):
     pass
\ No newline at end of file
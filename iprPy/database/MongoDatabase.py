@@ -1,9 +1,10 @@
 from yabadaba import databasemanager
 
 from .IprPyDatabase import IprPyDatabase
+from .parent_index import ParentIndexUpdates
 
 # Extend the yabadaba MongoDatabase to include IprPyDatabase operations
-class MongoDatabase(databasemanager.get_class('mongo'), IprPyDatabase):
+class MongoDatabase(ParentIndexUpdates, databasemanager.get_class('mongo'), IprPyDatabase):
     
     
     def check_records(self, record_style=None):
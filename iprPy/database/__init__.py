@@ -9,13 +9,16 @@ databasemanager = ModuleManager('Database')
 from .reset_orphans import reset_orphans
 from .prepare import prepare
 from .master_prepare import master_prepare
+from .scratch import ScratchManager
+from .lease import inspect_leases
 from .runner import runner, RunManager
 from .IprPyDatabase import IprPyDatabase
 from .load_database import load_database
 from .BaseEmperorPrepare import BaseEmperorPrepare
 
 __all__ = sorted(['Database', 'databasemanager', 'load_database', 'runner',
-                  'RunManager', 'reset_orphans', 'prepare', 'master_prepare',
+                  'RunManager', 'ScratchManager', 'inspect_leases',
+                  'reset_orphans', 'prepare', 'master_prepare',
                   'BaseEmperorPrepare'])
 
 databasemanager.import_style('local', '.LocalDatabase', __name__)
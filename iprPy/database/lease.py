@@ -0,0 +1,270 @@
+# coding: utf-8
+# Standard Python libraries
+import datetime
+import json
+import os
+from pathlib import Path
+import socket
+import threading
+import time
+from typing import Optional, Union
+
+# https://pandas.pydata.org/
+import pandas as pd
+
+from .. import load_run_directory
+
+default_lease_time = 600.0
+
+def write_lease(bidfile: Union[str, Path],
+                lease_time: float = default_lease_time):
+    """
+    Writes a bid file that holds a lease on a calculation.  The lease is
+    kept alive by updating the file's modification time, see Heartbeat.
+
+    Parameters
+    ----------
+    bidfile : str or Path
+        The bid file to write, named <pid>.bid.
+    lease_time : float, optional
+        The number of seconds after the last heartbeat when the lease expires.
+        Default value is 600.
+    """
+    lease = {
+        'pid': os.getpid(),
+        'host': socket.gethostname(),
+        'claimed': f'{datetime.datetime.now():%Y-%m-%d %H:%M:%S}',
+        'lease_time': lease_time,
+    }
+    with open(bidfile, 'w', encoding='UTF-8') as f:
+        json.dump(lease, f)
+
+def read_lease(bidfile: Union[str, Path]) -> dict:
+    """
+    Reads the lease info from a bid file.  Bid files made by older runners
+    do not contain lease info, so only the pid is returned for them.
+
+    Parameters
+    ----------
+    bidfile : str or Path
+        The bid file to read.
+
+    Returns
+    -------
+    dict
+        The lease info, with keys pid, host, claimed and lease_time.  Values
+        that are not known are None.
+    """
+    bidfile = Path(bidfile)
+    lease = {'pid': int(bidfile.stem), 'host': None, 'claimed': None,
+             'lease_time': None}
+    try:
+        with open(bidfile, encoding='UTF-8') as f:
+            lease.update(json.load(f))
+    except (ValueError, UnicodeDecodeError):
+        pass
+    return lease
+
+def pid_alive(pid: int) -> bool:
+    """Checks if a process with the given pid exists on this host."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def lease_status(bidfile: Union[str, Path],
+                 lease_time: float = default_lease_time,
+                 now: Optional[float] = None) -> tuple:
+    """
+    Determines the state of the lease held by a bid file.
+
+    - 'live' leases have had a heartbeat within half of the lease time.
+    - 'stale' leases have missed heartbeats but have not yet expired.
+    - 'expired' leases have had no heartbeat for the full lease time, or
+      belong to a process on this host that no longer exists.  These can be
+      reclaimed by other runners.
+
+    Parameters
+    ----------
+    bidfile : str or Path
+        The bid file to check.
+    lease_time : float, optional
+        The lease time to use if the bid file does not specify one.  Default
+        value is 600.
+    now : float, optional
+        The current time as given by time.time().  Allows for checking many
+        bid files against the same time.
+
+    Returns
+    -------
+    status : str
+        'live', 'stale' or 'expired'.
+    age : float
+        The number of seconds since the last heartbeat.
+    lease : dict
+        The lease info given by read_lease().
+
+    Raises
+    ------
+    FileNotFoundError
+        If the bid file no longer exists.
+    """
+    if now is None:
+        now = time.time()
+    lease = read_lease(bidfile)
+    age = now - Path(bidfile).stat().st_mtime
+    if lease['lease_time'] is not None:
+        lease_time = lease['lease_time']
+
+    if age >= lease_time:
+        status = 'expired'
+    elif lease['host'] == socket.gethostname() and not pid_alive(lease['pid']):
+        status = 'expired'
+    elif age >= lease_time / 2:
+        status = 'stale'
+    else:
+        status = 'live'
+
+    return status, age, lease
+
+def reclaim_expired(calc_directory: Union[str, Path],
+                    lease_time: float = default_lease_time) -> int:
+    """
+    Deletes the bid files in a calculation folder whose leases have expired.
+
+    Parameters
+    ----------
+    calc_directory : str or Path
+        The calculation folder to check.
+    lease_time : float, optional
+        The lease time to use for bid files that do not specify one.  Default
+        value is 600.
+
+    Returns
+    -------
+    int
+        The number of expired bid files deleted.
+    """
+    count = 0
+    now = time.time()
+    for bidfile in Path(calc_directory).glob('*.bid'):
+        try:
+            status = lease_status(bidfile, lease_time, now)[0]
+            if status == 'expired':
+                bidfile.unlink()
+                count += 1
+        except FileNotFoundError:
+            pass
+    return count
+
+def inspect_leases(run_directory: Union[str, Path],
+                   lease_time: float = default_lease_time,
+                   reclaim: bool = False) -> pd.DataFrame:
+    """
+    Lists the state of all leases held on calculations in a run directory.
+
+    Parameters
+    ----------
+    run_directory : str or Path
+        The run_directory name or path to check.
+    lease_time : float, optional
+        The lease time to use for bid files that do not specify one.  Default
+        value is 600.
+    reclaim : bool, optional
+        If True, expired bid files are deleted so that the calculations are
+        free to be run again.  Default value is False.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per bid file giving calc_name, pid, host, claimed, age and
+        status.
+    """
+    # Check for run_directory first by name then by path
+    try:
+        run_directory = load_run_directory(run_directory)
+    except:
+        run_directory = Path(run_directory).resolve()
+        if not run_directory.is_dir():
+            raise ValueError('run_directory not found/set')
+
+    data = []
+    now = time.time()
+    for bidfile in run_directory.glob('*/*.bid'):
+        try:
+            status, age, lease = lease_status(bidfile, lease_time, now)
+            if reclaim and status == 'expired':
+                bidfile.unlink()
+        except FileNotFoundError:
+            continue
+
+        data.append({'calc_name': bidfile.parent.name,
+                     'pid': lease['pid'],
+                     'host': lease['host'],
+                     'claimed': lease['claimed'],
+                     'age': age,
+                     'status': status})
+
+    return pd.DataFrame(data, columns=['calc_name', 'pid', 'host', 'claimed',
+                                       'age', 'status'])
+
+class Heartbeat():
+    """
+    Background thread that keeps the leases held by a runner alive by
+    periodically updating the modification times of its bid files.
+    """
+
+    def __init__(self, interval: float):
+        """
+        Class initializer
+
+        Parameters
+        ----------
+        interval : float
+            The number of seconds between heartbeats.
+        """
+        self.__interval = interval
+        self.__bidfiles = set()
+        self.__lock = threading.Lock()
+        self.__stop = threading.Event()
+        self.__thread = threading.Thread(target=self.__beat, daemon=True)
+        self.__thread.start()
+
+    @property
+    def interval(self) -> float:
+        """float : The number of seconds between heartbeats."""
+        return self.__interval
+
+    @property
+    def bidfiles(self) -> list:
+        """list : The bid files currently being kept alive."""
+        with self.__lock:
+            return list(self.__bidfiles)
+
+    def add(self, bidfile: Union[str, Path]):
+        """Starts keeping a bid file alive."""
+        with self.__lock:
+            self.__bidfiles.add(Path(bidfile))
+
+    def remove(self, bidfile: Union[str, Path]):
+        """Stops keeping a bid file alive."""
+        with self.__lock:
+            self.__bidfiles.discard(Path(bidfile))
+
+    def __beat(self):
+        """Updates the bid files every interval until stopped."""
+        while not self.__stop.wait(self.interval):
+            for bidfile in self.bidfiles:
+                try:
+                    os.utime(bidfile)
+                except FileNotFoundError:
+                    # Calculation was finished and removed
+                    self.remove(bidfile)
+
+    def stop(self):
+        """Stops the heartbeat thread."""
+        self.__stop.set()
+        self.__thread.join()
@@ -4,7 +4,8 @@ import numpy as np
 
 # iprPy imports
 from ..tools import aslist
-from .. import load_calculation, fix_lammps_versions
+from .. import load_calculation
+from ..fix_lammps_versions import LammpsCommandSelector
 from ..input import parse
 
 def master_prepare(database, input_script=None, debug=False, **kwargs):
@@ -106,6 +107,9 @@ def prepare_pool(database, styles, np_per_runner, run_directory,
     if database.style == 'local':
         dbwargs['refresh_cache'] = True
 
+    # Build the potential id to LAMMPS command map once for the pool
+    lammps_command_selector = LammpsCommandSelector(**kwargs)
+
     # Loop over styles
     new_calc_keys = []
     for style in styles.strip().split():
@@ -138,13 +142,12 @@ def prepare_pool(database, styles, np_per_runner, run_directory,
 
             # Prepare the calculation
             keys = database.prepare(run_directory, calculation, debug=debug,
-                                    calc_df=calc_df, tar_dict={}, **params)
+                                    calc_df=calc_df, tar_dict={},
+                                    lammps_command_selector=lammps_command_selector,
+                                    **params)
             new_calc_keys.extend(keys)
             print()
 
-    # Update lammps_commands as needed
-    fix_lammps_versions(run_directory, calc_names=new_calc_keys, **kwargs)
-    
     return new_calc_keys
 
 def yield_lmppot_ids(all_lmppot_ids, delta=100):
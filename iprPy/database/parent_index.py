@@ -0,0 +1,487 @@
+# coding: utf-8
+# Standard Python libraries
+import json
+import os
+from pathlib import Path
+import tempfile
+from typing import Optional
+
+# https://github.com/usnistgov/yabadaba
+from yabadaba import recordmanager
+
+def record_parent_names(record) -> list:
+    """
+    Identifies the names of a record's parents from the file values listed in
+    its system-info.  A load file in a directory is associated with the
+    directory's name, otherwise with the file's name.
+
+    Parameters
+    ----------
+    record : iprPy.Record
+        The record to find parent names for.
+
+    Returns
+    -------
+    list
+        The parent record names.
+    """
+    try:
+        model = record.model
+        assert model is not None
+    except:
+        try:
+            model = record.build_model()
+        except:
+            return []
+
+    try:
+        model = model.find('system-info')
+    except:
+        return []
+
+    names = []
+    for load_file in model.finds('file'):
+        directory = Path(load_file).parent.stem
+        if directory != '':
+            name = directory
+        else:
+            name = Path(load_file).stem
+        if name not in names:
+            names.append(name)
+    return names
+
+class ParentIndex():
+    """
+    Persistent index of the parent edges between the records in a database.
+    Each entry maps a record's name to its style and the names of its parent
+    records.  Local databases store the index as a JSON lines log in the
+    database directory, mongo databases as a collection, and other database
+    styles keep it in memory only.  A stored index is marked as complete when
+    built, and is (re)built by scanning all records the first time that it is
+    needed or updated if no complete index exists.  It is then updated as
+    records are added, updated and deleted through the database, with the
+    local log being compacted once it is mostly superseded entries.  For
+    in-memory indices, parent lookups are resolved from the records
+    themselves as needed and a full scan is only done to find children.
+    """
+
+    filename = 'parent_index.jsonl'
+    collection = 'parent_index'
+    header = {'parent_index': 'complete'}
+    complete_id = '#complete'
+
+    # Compact the local log when it holds this many more lines than entries
+    compact_lines = 1000
+
+    def __init__(self, database):
+        """
+        Class initializer
+
+        Parameters
+        ----------
+        database : iprPy.database.IprPyDatabase
+            The database that the index is for.
+        """
+        self.__database = database
+        self.__entries = None
+        self.__children = None
+        self.__offset = 0
+        self.__nlines = 0
+        self.__fileid = None
+        self.__complete = False
+
+    @property
+    def database(self):
+        """iprPy.database.IprPyDatabase: The database that the index is for"""
+        return self.__database
+
+    @property
+    def path(self) -> Optional[Path]:
+        """Path or None: The index file for local databases"""
+        if self.database.style == 'local':
+            return Path(self.database.host, self.filename)
+        return None
+
+    @property
+    def mongo(self) -> bool:
+        """bool: Indicates if the index is stored as a mongo collection"""
+        return self.database.style == 'mongo'
+
+    @property
+    def persistent(self) -> bool:
+        """bool: Indicates if the index is stored with the database"""
+        return self.path is not None or self.mongo
+
+############################### Index updates #################################
+
+    def build(self, styles: Optional[list] = None,
+              verbose: bool = False):
+        """
+        (Re)builds the index by scanning all records in the database.
+
+        Parameters
+        ----------
+        styles : list, optional
+            The record styles to scan.  Default value is all loaded record
+            styles.
+        verbose : bool, optional
+            If True, the number of records indexed for each style is printed.
+        """
+        if styles is None:
+            styles = recordmanager.loaded_style_names
+
+        entries = {}
+        for style in styles:
+            try:
+                records = self.database.get_records(style=style)
+            except Exception:
+                continue
+            for record in records:
+                entries[record.name] = (style, record_parent_names(record))
+            if verbose and len(records) > 0:
+                print(f'{len(records)} {style} records indexed', flush=True)
+
+        # Save the full index
+        if self.path is not None:
+            self.__save(entries)
+        elif self.mongo:
+            coll = self.database.mongodb[self.collection]
+            coll.delete_many({})
+            if len(entries) > 0:
+                coll.insert_many([{'_id': name, 'style': style, 'parents': parents}
+                                  for name, (style, parents) in entries.items()])
+            coll.create_index('parents')
+            coll.insert_one({'_id': self.complete_id})
+
+        self.__entries = entries
+        self.__children = None
+        self.__complete = True
+
+    def __save(self, entries: dict):
+        """Replaces the local index file with a complete, compact index"""
+        fd, tmpname = tempfile.mkstemp(dir=self.path.parent,
+                                       prefix='.parent_index')
+        with os.fdopen(fd, 'w', encoding='UTF-8') as f:
+            f.write(json.dumps(self.header) + '\n')
+            for name, (style, parents) in entries.items():
+                f.write(json.dumps({'name': name, 'style': style,
+                                    'parents': parents}) + '\n')
+        os.replace(tmpname, self.path)
+        stat = self.path.stat()
+        self.__offset = stat.st_size
+        self.__nlines = len(entries) + 1
+        self.__fileid = (stat.st_dev, stat.st_ino)
+
+    def __stored(self) -> bool:
+        """Checks if a complete index is stored with the database"""
+        if self.__complete:
+            return True
+        if self.path is not None:
+            return self.path.is_file()
+        if self.mongo:
+            coll = self.database.mongodb[self.collection]
+            return coll.find_one({'_id': self.complete_id}) is not None
+        return False
+
+    def update(self, record):
+        """
+        Adds or updates the index entry for a record.
+
+        Parameters
+        ----------
+        record : iprPy.Record
+            The added or updated record.
+        """
+        if self.persistent and not self.__stored():
+            # Build the full index rather than start a partial one
+            self.build()
+            return
+
+        style = record.style
+        parents = record_parent_names(record)
+
+        if self.path is not None:
+            with open(self.path, 'a', encoding='UTF-8') as f:
+                f.write(json.dumps({'name': record.name, 'style': style,
+                                    'parents': parents}) + '\n')
+        elif self.mongo:
+            self.database.mongodb[self.collection].replace_one(
+                {'_id': record.name},
+                {'_id': record.name, 'style': style, 'parents': parents},
+                upsert=True)
+
+        if self.__entries is not None:
+            self.__entries[record.name] = (style, parents)
+            self.__children = None
+
+    def remove(self, name: str):
+        """
+        Removes the index entry for a deleted record.
+
+        Parameters
+        ----------
+        name : str
+            The name of the deleted record.
+        """
+        if self.persistent and not self.__stored():
+            # Build the full index rather than start a partial one
+            self.build()
+            return
+
+        if self.path is not None:
+            with open(self.path, 'a', encoding='UTF-8') as f:
+                f.write(json.dumps({'name': name, 'deleted': True}) + '\n')
+        elif self.mongo:
+            self.database.mongodb[self.collection].delete_one({'_id': name})
+
+        if self.__entries is not None:
+            self.__entries.pop(name, None)
+            self.__children = None
+
+################################ Index access #################################
+
+    def __load(self):
+        """Loads or refreshes the in-memory entries for local and other styles"""
+        if self.__entries is None:
+            if self.path is not None and not self.path.is_file():
+                self.build()
+                return
+            self.__entries = {}
+            self.__offset = 0
+            self.__nlines = 0
+            self.__fileid = None
+
+        if self.path is None or not self.path.is_file():
+            return
+
+        # Reread the whole file if it was replaced or truncated, e.g. rebuilt
+        # by another process, as the saved offset is then meaningless
+        stat = self.path.stat()
+        fileid = (stat.st_dev, stat.st_ino)
+        if fileid != self.__fileid or stat.st_size < self.__offset:
+            self.__entries = {}
+            self.__offset = 0
+            self.__nlines = 0
+            self.__fileid = fileid
+            self.__children = None
+
+        # Read entries appended since the last read, e.g. by other processes
+        start = self.__offset
+        with open(self.path, 'rb') as f:
+            f.seek(start)
+            lines = f.readlines()
+        for line in lines:
+            if not line.endswith(b'\n'):
+                # Entry still being written
+                break
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                if start > 0:
+                    # Offset does not match the file: start over
+                    self.__entries = None
+                    self.__load()
+                    return
+                entry = None
+            if self.__offset == 0 and entry != self.header:
+                # Not written by build(), so the index may be partial
+                self.build()
+                return
+            self.__offset += len(line)
+            self.__nlines += 1
+            if entry is None or entry == self.header:
+                # Skip the header and corrupted lines
+                continue
+            if entry.get('deleted', False):
+                self.__entries.pop(entry['name'], None)
+            else:
+                self.__entries[entry['name']] = (entry['style'], entry['parents'])
+            self.__children = None
+        self.__complete = True
+
+        # Compact the log if it is mostly superseded entries and no other
+        # process has appended to it since it was read
+        if (self.__nlines > len(self.__entries) + self.compact_lines
+            and self.path.stat().st_size == self.__offset):
+            self.__save(self.__entries)
+
+    def __resolve(self, names: list):
+        """Adds in-memory entries for records not yet seen by reading them"""
+        for name in names:
+            if name in self.__entries:
+                continue
+            try:
+                record = self.database.get_record(name=name)
+            except Exception:
+                continue
+            self.__entries[name] = (record.style, record_parent_names(record))
+            self.__children = None
+
+    def entries(self, names: list) -> dict:
+        """
+        Retrieves the index entries for a set of records.
+
+        Parameters
+        ----------
+        names : list
+            The record names.
+
+        Returns
+        -------
+        dict
+            Maps each indexed name to a tuple of its style and list of parent
+            names.  Names not in the index are not included.
+        """
+        names = list(names)
+        if self.mongo:
+            coll = self.database.mongodb[self.collection]
+            if not self.__stored():
+                self.build()
+            self.__complete = True
+            return {doc['_id']: (doc['style'], doc['parents'])
+                    for doc in coll.find({'_id': {'$in': names}})
+                    if doc['_id'] != self.complete_id}
+
+        self.__load()
+        if not self.persistent and not self.__complete:
+            self.__resolve(names)
+        return {name: self.__entries[name] for name in names
+                if name in self.__entries}
+
+    def children(self, names: list) -> dict:
+        """
+        Retrieves the names of the records that list the given records as
+        parents.
+
+        Parameters
+        ----------
+        names : list
+            The parent record names.
+
+        Returns
+        -------
+        dict
+            Maps each given name to the list of its children's names.
+        """
+        names = list(names)
+        children = {name: [] for name in names}
+        if self.mongo:
+            coll = self.database.mongodb[self.collection]
+            if not self.__stored():
+                self.build()
+            self.__complete = True
+            for doc in coll.find({'parents': {'$in': names}}, {'parents': 1}):
+                for parent in doc['parents']:
+                    if parent in children:
+                        children[parent].append(doc['_id'])
+            return children
+
+        self.__load()
+        if not self.persistent and not self.__complete:
+            # Finding children requires all records to be scanned once
+            self.build()
+        if self.__children is None:
+            self.__children = {}
+            for name, (style, parents) in self.__entries.items():
+                for parent in parents:
+                    self.__children.setdefault(parent, []).append(name)
+        for name in names:
+            children[name] = list(self.__children.get(name, []))
+        return children
+
+    def parents(self, names: list) -> dict:
+        """
+        Retrieves the names of the parents of the given records.
+
+        Parameters
+        ----------
+        names : list
+            The child record names.
+
+        Returns
+        -------
+        dict
+            Maps each given name to the list of its parents' names.
+        """
+        names = list(names)
+        entries = self.entries(names)
+        return {name: list(entries[name][1]) if name in entries else []
+                for name in names}
+
+    def closure(self, names: list,
+                direction: str = 'ancestors') -> dict:
+        """
+        Finds all ancestors or descendants of the given records.  Only one
+        index query is made for each generation regardless of how many names
+        are given.
+
+        Parameters
+        ----------
+        names : list
+            The record names to start from.
+        direction : str, optional
+            'ancestors' (default) or 'descendants'.
+
+        Returns
+        -------
+        dict
+            Maps each given name to the list of its ancestor or descendant
+            names in depth-first order, i.e. each relative is followed by its
+            own relatives before the next relative of the same generation.
+        """
+        if direction == 'ancestors':
+            step = self.parents
+        elif direction == 'descendants':
+            step = self.children
+        else:
+            raise ValueError("direction must be 'ancestors' or 'descendants'")
+
+        names = list(names)
+
+        # Find the edges of all generations
+        edges = {}
+        frontier = list(dict.fromkeys(names))
+        while len(frontier) > 0:
+            found = step(frontier)
+            edges.update(found)
+            frontier = list(dict.fromkeys(n for related in found.values()
+                                          for n in related if n not in edges))
+
+        # Walk the edges depth-first for each starting name
+        results = {}
+        for name in names:
+            related = []
+            seen = {name}
+            stack = list(reversed(edges.get(name, [])))
+            while len(stack) > 0:
+                n = stack.pop()
+                if n in seen:
+                    continue
+                seen.add(n)
+                related.append(n)
+                stack.extend(reversed(edges.get(n, [])))
+            results[name] = related
+        return results
+
+class ParentIndexUpdates():
+    """
+    Database mixin that keeps the parent index current as records are added,
+    updated and deleted.  Needs to be listed before the yabadaba Database
+    class in the bases so that its methods wrap the database's methods.
+    """
+
+    def add_record(self, *args, **kwargs):
+        record = super().add_record(*args, **kwargs)
+        self.parent_index.update(record)
+        return record
+
+    def update_record(self, *args, **kwargs):
+        record = super().update_record(*args, **kwargs)
+        self.parent_index.update(record)
+        return record
+
+    def delete_record(self, record=None, style=None, name=None, **kwargs):
+        super().delete_record(record=record, style=style, name=name, **kwargs)
+        if record is not None:
+            name = record.name
+        self.parent_index.remove(name)
@@ -14,8 +14,9 @@ import numpy as np
 import pandas as pd
 
 # iprPy imports
-from ..tools import aslist, filltemplate
+from ..tools import aslist, compile_template
 from .. import load_calculation, load_run_directory
+from ..fix_lammps_versions import LammpsCommandSelector
 from ..input import buildcombos, parse
 
 def prepare(database,
@@ -26,6 +27,7 @@ def prepare(database,
             content_dict: Optional[dict] = None,
             tar_dict: Optional[dict] = None,
             calc_df: Optional[pd.DataFrame] = None,
+            lammps_command_selector: Optional[LammpsCommandSelector] = None,
             **kwargs):
     """
     Function for preparing any iprPy calculation for high-throughput execution.
@@ -75,6 +77,10 @@ def prepare(database,
         records returned by get_records_df.  CAUTION: Extra care is required
         with using calc_df as it makes it easier to accidentally prepare
         duplicate calculations!
+    lammps_command_selector : iprPy.fix_lammps_versions.LammpsCommandSelector, optional
+        Selects the LAMMPS command for each calculation based on its
+        potential.  If not given, one is built from the lammps_command terms
+        in kwargs.
     **kwargs : str or list
         Allows for input parameters for preparing the calculation to be
         directly specified.  Any kwargs parameters that have names matching
@@ -121,8 +127,14 @@ def prepare(database,
     # Complete kwargs with default values and buildcombos actions
     kwargs, content_dict = fill_kwargs(database, calculation, content_dict, **kwargs)
 
+    # Build the LAMMPS command selector once
+    if lammps_command_selector is None:
+        lammps_command_selector = LammpsCommandSelector(**kwargs)
+
     # Build all combinations
-    test_calcs, test_calcs_df, test_inputfiles, test_contents, content_dict = build_test_calcs(database, calculation, content_dict, debug=debug, **kwargs)
+    test_calcs, test_calcs_df, test_inputfiles, test_contents, content_dict = build_test_calcs(
+        database, calculation, content_dict, debug=debug,
+        lammps_command_selector=lammps_command_selector, **kwargs)
     print(len(test_calcs_df), 'calculation combinations to check', flush=True)
     if len(test_calcs_df) == 0:
         return []
@@ -293,7 +305,7 @@ def fill_kwargs(database, calculation, content_dict, **kwargs):
     return kwargs, content_dict        
 
 def build_test_calcs(database, calculation, content_dict, debug=False, 
-                     **kwargs):
+                     lammps_command_selector=None, **kwargs):
     """
     Builds calculations based on iterating over the sets of kwargs values.
     
@@ -309,6 +321,9 @@ def build_test_calcs(database, calculation, content_dict, debug=False,
     debug : bool
         If set to True, will throw errors associated with failed/invalid
         calculation builds.  Default is False.
+    lammps_command_selector : iprPy.fix_lammps_versions.LammpsCommandSelector, optional
+        If given, the lammps_command of each calculation is set based on the
+        potential ids found in its input file.
     **kwargs : dict
         The full input parameters to use for preparing the calculations.
         
@@ -343,11 +358,32 @@ def build_test_calcs(database, calculation, content_dict, debug=False,
     for subdict in itermultidict(calculation.multikeys, **kwargs):
         numcalcs += 1
 
+    # Build and compile the calculation's template once
+    template = compile_template(calculation.template, '<', '>')
+
+    # Check if the LAMMPS command may need to change for some potentials
+    select_command = (lammps_command_selector is not None
+                      and lammps_command_selector.active
+                      and calculation_dict.get('lammps_command', '') != '')
+    if select_command:
+        default_command = calculation_dict['lammps_command']
+
     for subdict in tqdm(itermultidict(calculation.multikeys, **kwargs), total=numcalcs):
         calculation_dict.update(subdict)
-        
+
+        # Reset any alternate LAMMPS command selected for a previous combo
+        if select_command:
+            calculation_dict['lammps_command'] = default_command
+
         # Generate inputfile
-        test_inputfile = filltemplate(calculation.template, calculation_dict, '<', '>')
+        test_inputfile = template.render(calculation_dict)
+
+        # Switch to an alternate LAMMPS command if required by the potential
+        if select_command:
+            command = lammps_command_selector.select(test_inputfile)
+            if command != calculation_dict['lammps_command']:
+                calculation_dict['lammps_command'] = command
+                test_inputfile = template.render(calculation_dict)
         
         # Build input_dict from calculation_dict
         input_dict = {}
@@ -1,14 +1,18 @@
 # coding: utf-8
 # Standard Python libraries
+import io
 import os
 import sys
 from pathlib import Path
 import subprocess
 import random
 import shutil
+import tarfile
 import time
 import tempfile
 import datetime
+from concurrent.futures import ThreadPoolExecutor
+import threading
 import requests
 
 # https://github.com/usnistgov/DataModelDict
@@ -16,11 +20,38 @@ from DataModelDict import DataModelDict as DM
 
 # iprPy imports
 from .. import settings, load_run_directory, load_calculation
+from .scratch import ScratchManager
+from .lease import default_lease_time, write_lease, lease_status, reclaim_expired, Heartbeat
+from .telemetry import PhaseTimer, Telemetry
+
+def archive_calc(root_dir, calc_name):
+    """
+    Archives the calculation folder root_dir/calc_name as tar.gz content.
+    Unlike shutil.make_archive, this does not change the working directory,
+    so it is safe to use from background threads.
+
+    Parameters
+    ----------
+    root_dir : path-like object
+        The directory containing the calculation folder.
+    calc_name : str
+        The name of the calculation folder.
+
+    Returns
+    -------
+    bytes
+        The tar.gz content with the folder's files under calc_name.
+    """
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode='w:gz') as tar:
+        tar.add(Path(root_dir, calc_name), arcname=calc_name)
+    return buffer.getvalue()
 
 def runner(database, run_directory, calc_name=None, orphan_directory=None,
            hold_directory=None, log=False, bidtries=10, bidverbose=False,
            temp=False, temp_directory=None, free=False,
-           kwargs_calc={}):
+           kwargs_calc={}, scratch_directory=None, scratch_size=None,
+           lease_time=600.0, telemetry=False, prometheus_file=None):
     """
     High-throughput calculation runner.
     
@@ -53,8 +84,10 @@ def runner(database, run_directory, calc_name=None, orphan_directory=None,
         If True, info about the calculation bidding process will be printed.
         Default value is False.
     temp : bool, optional
-        If True, a temporary directory will be automatically created and used
-        for this run.
+        If True, the calculations will be copied to and executed in node-local
+        scratch space.  When running all calculations, the next calculation is
+        claimed and staged while the current one runs, and results are
+        uploaded in the background.
     temp_directory : path-like object, optional
         The path to an existing temporary directory where the calculations
         are to be copied to and executed there instead of in the run_directory.
@@ -66,12 +99,31 @@ def runner(database, run_directory, calc_name=None, orphan_directory=None,
     kwargs_calc : dict, optional
         Keyword arguments for :meth:`iprPy.calculation.Calculation.Calculation.run`.
         Default is ``{"results_json": True}``
-            
+    scratch_directory : path-like object, optional
+        The scratch location used when temp is True.  Default value is taken
+        from the IPRPY_SCRATCH environment variable, or the system temporary
+        directory if not set.
+    scratch_size : int, optional
+        The maximum number of bytes of calculation copies to keep in scratch.
+        If None (default), no cap is applied.
+    lease_time : float, optional
+        The number of seconds that claims on calculations stay valid without
+        a heartbeat.  Expired claims left by dead runners are reclaimed.
+        Default value is 600.
+    telemetry : bool, optional
+        If True, the wall times of the phases of each run are saved as JSON
+        lines in the runner log directory.  Default value is False.
+    prometheus_file : path-like object, optional
+        If given, running totals of the calculation counts and phase times
+        are kept in this Prometheus textfile.
     """
     # Initialize a RunManager
     runmanager = RunManager(database, run_directory,
                             orphan_directory=orphan_directory, 
-                            hold_directory=hold_directory, log=log)
+                            hold_directory=hold_directory, log=log,
+                            scratch_directory=scratch_directory,
+                            scratch_size=scratch_size, lease_time=lease_time,
+                            telemetry=telemetry, prometheus_file=prometheus_file)
     
     # Run all calculations
     if calc_name is None:
@@ -89,6 +141,8 @@ def runner(database, run_directory, calc_name=None, orphan_directory=None,
                                 temp_directory=temp_directory,
                                 bidverbose=bidverbose, free=free, 
                                 kwargs_calc=tmp_kwargs_calc)
+    
+    runmanager.close()
 
 class RunManager():
     """
@@ -96,7 +150,9 @@ class RunManager():
     """
     
     def __init__(self, database, run_directory, orphan_directory=None,
-                 hold_directory=None, log=False):
+                 hold_directory=None, log=False, scratch_directory=None,
+                 scratch_size=None, lease_time=default_lease_time,
+                 telemetry=False, prometheus_file=None, reference_cache=None):
         """
         Class initializer
         
@@ -118,6 +174,34 @@ class RunManager():
         log : bool, optional
             If True, the runner will create and save a log file detailing the
             status of each calculation that it runs.
+        scratch_directory : path-like object, optional
+            The scratch location used for runs with temp=True.  Default value
+            is taken from the IPRPY_SCRATCH environment variable, or the
+            system temporary directory if not set.
+        scratch_size : int, optional
+            The maximum number of bytes of calculation copies to keep in
+            scratch.  If None (default), no cap is applied.
+        lease_time : float, optional
+            The number of seconds that claims on calculations stay valid
+            without a heartbeat.  Heartbeats are sent every quarter of this
+            time, and claims by other runners that have expired are
+            reclaimed.  Default value is 600.
+        telemetry : bool, optional
+            If True, the runner will save the wall times of the bid, file
+            check, parent check, staging, calculation, record update, tar
+            upload and cleanup phases of each run as JSON lines in a .jsonl
+            file in the runner log directory.  Default value is False.
+        prometheus_file : path-like object, optional
+            If given, running totals of the calculation counts and phase
+            times are kept in this Prometheus textfile.  Any "{pid}" in the
+            name is replaced by the runner's pid.
+        reference_cache : path-like object, optional
+            The directory where calculations share reference results, such
+            as relaxed perfect crystals, so that each is only computed once.
+            This is passed to the calculations' run() methods.  If None
+            (default), the IPRPY_REFERENCE_CACHE environment variable is used
+            if set, otherwise 'reference_cache' at the same level as the
+            run_directory.  Give an empty string to disable.
         """
         
         # Set database
@@ -131,18 +215,54 @@ class RunManager():
         
         # Set hold_directory
         self.hold_directory = hold_directory
+
+        # Set the shared reference cache for the calculations
+        if reference_cache is None:
+            reference_cache = os.environ.get('IPRPY_REFERENCE_CACHE',
+                                             Path(self.run_directory.parent, 'reference_cache'))
+        if str(reference_cache) == '':
+            self.__reference_cache = ''
+        else:
+            self.__reference_cache = str(Path(reference_cache).absolute())
         
         # Get pid
         self.__pid = os.getpid()
         
         # Build log file name
-        if log is True:
+        logstem = f'{datetime.datetime.now():%Y-%m-%d-%H-%M-%S-%f}-{self.pid}'
+        if log is True or telemetry is True:
             log_directory = settings.runner_log_directory
             if not log_directory.is_dir():
                 log_directory.mkdir(parents=True)
-            self.__logfilename = Path(log_directory, f'{datetime.datetime.now():%Y-%m-%d-%H-%M-%S-%f}-{self.pid}.log')   
+        if log is True:
+            self.__logfilename = Path(log_directory, f'{logstem}.log')   
         else:
             self.__logfilename = None
+
+        # Set up telemetry
+        if telemetry is True or prometheus_file is not None:
+            if telemetry is True:
+                jsonl_file = Path(log_directory, f'{logstem}.jsonl')
+            else:
+                jsonl_file = None
+            self.__telemetry = Telemetry(self.run_directory, jsonl_file=jsonl_file,
+                                         prometheus_file=prometheus_file)
+        else:
+            self.__telemetry = None
+        self.__timers = {}
+
+        # Scratch space and staging threads are created when first needed
+        self.__scratch_directory = scratch_directory
+        self.__scratch_size = scratch_size
+        self.__scratch = None
+        self.__stager = None
+        self.__uploader = None
+        self.__uploads = {}
+        self.__dblock = threading.RLock()
+
+        # Leases are kept alive by a heartbeat thread started on the first bid
+        self.__lease_time = lease_time
+        self.__heartbeat = None
     
     def __str__(self):
         """Class string representation"""
@@ -217,14 +337,39 @@ class RunManager():
         """pathlib.Path : The name/path of the log file the runner saves info to."""
         return self.__logfilename
     
+    @property
+    def scratch(self):
+        """ScratchManager : Manages the node-local copies of calculations used by temp runs."""
+        if self.__scratch is None:
+            self.__scratch = ScratchManager(self.__scratch_directory,
+                                            max_size=self.__scratch_size)
+        return self.__scratch
+
+    @property
+    def telemetry(self):
+        """Telemetry or None : Writes the phase timings of each run."""
+        return self.__telemetry
+
+    @property
+    def reference_cache(self):
+        """str : The shared reference cache directory passed to the calculations, or an empty string if disabled."""
+        return self.__reference_cache
+
+    @property
+    def lease_time(self):
+        """float : The number of seconds that claims stay valid without a heartbeat."""
+        return self.__lease_time
+
     @property
     def calclist(self):
-        """list : The current list of calculation names in the run directory."""
+        """list : The current list of calculation names in the run directory that are unclaimed or have expired claims."""
         calcs = []
+        now = time.time()
         for calc in self.run_directory.iterdir():
             try:
                 # Test in try to avoid bug where calc is deleted by another runner
-                assert len([b for b in calc.glob('*.bid')]) == 0
+                for bidfile in calc.glob('*.bid'):
+                    assert lease_status(bidfile, self.lease_time, now)[0] == 'expired'
             except:
                 pass
             else:
@@ -258,6 +403,14 @@ class RunManager():
                 print(f'Bid fail - {calc_directory.name} no longer exists')
             return False
 
+        # Reclaim the calculation if previous claims have expired
+        try:
+            nexpired = reclaim_expired(calc_directory, self.lease_time)
+        except:
+            nexpired = 0
+        if nexpired > 0 and verbose:
+            print(f'Reclaimed {calc_directory.name} - {nexpired} expired lease(s) removed')
+
         # Check if bids have been made
         try:
             for filename in calc_directory.iterdir():
@@ -270,8 +423,7 @@ class RunManager():
         # Try to place a bid - may fail if calc_directory gets deleted
         bidfile = Path(calc_directory, f'{self.pid}.bid')
         try:
-            with open(bidfile, 'w') as f:
-                f.write(f'bid made using id: {self.pid}')
+            write_lease(bidfile, self.lease_time)
         except:
             if verbose:
                 print(f'Bid fail - {calc_directory.name} could not place bid')
@@ -298,6 +450,9 @@ class RunManager():
         
         # Competing bids go to the smallest pid
         if min(bids) == self.pid:
+            if self.__heartbeat is None:
+                self.__heartbeat = Heartbeat(self.lease_time / 4)
+            self.__heartbeat.add(bidfile)
             return True
         else:
             if verbose:
@@ -354,6 +509,13 @@ class RunManager():
         if tries == 10:
             print(f'failed to delete {calc_directory}', flush=True)
     
+    def __record(self, timer, status):
+        """Finishes a run's timings, writes them to telemetry and returns status."""
+        timer.finish(status)
+        if self.telemetry is not None:
+            self.telemetry.write(timer)
+        return status
+
     def __logwrite(self, content):
         print(content, end='', flush=True)
         if self.logfilename is not None:
@@ -406,7 +568,8 @@ class RunManager():
             
             else:
                 try:
-                    calculation = self.database.get_record(style=style, name=calc_name)
+                    with self.__dblock:
+                        calculation = self.database.get_record(style=style, name=calc_name)
                 
                 # Kill runner for ConnectionErrors
                 except requests.ConnectionError as e:
@@ -423,9 +586,8 @@ class RunManager():
         else:
             # If not complete, zip and move to the orphan directory
             self.__logwrite(message)
-            shutil.make_archive(Path(self.orphan_directory, calc_name), 'gztar',
-                                root_dir=self.run_directory,
-                                base_dir=calc_name)
+            with open(Path(self.orphan_directory, f'{calc_name}.tar.gz'), 'wb') as f:
+                f.write(archive_calc(self.run_directory, calc_name))
             self.__removecalc(Path(calc_directory))
             
             return None, None
@@ -470,7 +632,8 @@ class RunManager():
 
                 if parentstatus == 'not calculated' and free is False:
                     # Get status of remote copy
-                    parent = self.database.get_record(name=parent_name)
+                    with self.__dblock:
+                        parent = self.database.get_record(name=parent_name)
                     try:
                         parentstatus = parent.status
                     except:
@@ -498,13 +661,76 @@ class RunManager():
 
         return status, message
     
+    def prefetch(self,
+                 calc_name: str,
+                 bidverbose: bool = False) -> bool:
+        """
+        Claims a calculation by bidding on it and copies its folder to
+        scratch so that it is ready to run.  This is meant to be called in a
+        background thread while another calculation is running.  The copy is
+        skipped if it would not fit in the scratch size cap, in which case it
+        is made when the calculation is run.
+
+        Parameters
+        ----------
+        calc_name : str
+            The name of the calculation in run_directory to claim.
+        bidverbose : bool, optional
+            If True, info about the calculation bidding process will be printed.
+            Default value is False.
+
+        Returns
+        -------
+        bool
+            True if the calculation was claimed, False if bidding failed.
+        """
+        calc_directory = Path(self.run_directory, calc_name)
+        timer = PhaseTimer(calc_name)
+        with timer.phase('bid'):
+            bid = self.__bid(calc_directory, verbose=bidverbose)
+        if bid is False:
+            self.__record(timer, 'bidfail')
+            return False
+        timer.set_queue_wait(calc_directory)
+        
+        with timer.phase('stage'):
+            try:
+                self.scratch.fetch(calc_directory, required=False)
+            except Exception:
+                # Staging will be retried when the calculation is run
+                self.scratch.discard(calc_name)
+        self.__timers[calc_name] = timer
+        return True
+
+    def unclaim(self, calc_name: str):
+        """
+        Gives up a calculation claimed by prefetch() without running it.
+
+        Parameters
+        ----------
+        calc_name : str
+            The name of the claimed calculation.
+        """
+        if self.__scratch is not None:
+            self.scratch.discard(calc_name)
+        self.__timers.pop(calc_name, None)
+        bidfile = Path(self.run_directory, calc_name, f'{self.pid}.bid')
+        if self.__heartbeat is not None:
+            self.__heartbeat.remove(bidfile)
+        try:
+            bidfile.unlink()
+        except FileNotFoundError:
+            pass
+
     def run(self,
             calc_name: str,
             temp: bool = False,
             temp_directory = None,
             bidverbose: bool = False,
             free: bool = False,
-            kwargs_calc = {}):
+            kwargs_calc = {},
+            claimed: bool = False,
+            asynchronous: bool = False):
         """
         Runs one calculation from the run_directory.
         
@@ -513,8 +739,8 @@ class RunManager():
         calc_name :str
             The name of the calculation in run_directory to run.
         temp : bool, optional
-            If True, a new temporary directory will be created and used for this
-            run.  
+            If True, the calculation will be copied to and performed in the
+            node-local scratch space managed by scratch.
         temp_directory : path-like object, optional
             The path to an existing temporary directory where the calculations
             are to be performed.
@@ -529,6 +755,14 @@ class RunManager():
         kwargs_calc : dict, optional
             Keyword arguments for :meth:`iprPy.calculation.Calculation.Calculation.run`.
             Default is ``{"results_json": True}``
+        claimed : bool, optional
+            Set to True if the calculation was already claimed by prefetch(),
+            in which case bidding is skipped.  Default value is False.
+        asynchronous : bool, optional
+            If True, the record and archive uploads are done in a background
+            thread and this returns as soon as the calculation finishes.  The
+            final statuses, including any upload failures, are collected with
+            wait().  Default value is False.
 
         Returns
         -------
@@ -544,29 +778,42 @@ class RunManager():
         calc_directory = Path(self.run_directory, calc_name)
         
         # Try bidding for the calc_directory
-        if self.__bid(calc_directory, verbose=bidverbose) is False:
-            return 'bidfail'
+        if claimed:
+            timer = self.__timers.pop(calc_name, PhaseTimer(calc_name))
+        else:
+            timer = PhaseTimer(calc_name)
+            with timer.phase('bid'):
+                bid = self.__bid(calc_directory, verbose=bidverbose)
+            if bid is False:
+                return self.__record(timer, 'bidfail')
+            timer.set_queue_wait(calc_directory)
         
         # Write calc_name to log file
         self.__logwrite(f'{calc_name}\n')
 
         # Find calculation and calc script
-        calculation, calc_in = self.__filecheck(calc_directory, free=free)
+        with timer.phase('filecheck'):
+            calculation, calc_in = self.__filecheck(calc_directory, free=free)
         if calculation is None:
-            return 'orphan'
+            self.__discard_scratch(calc_name)
+            return self.__record(timer, 'orphan')
         
         # Check on the status of the parent calculations
-        status, message = self.__parentcheck(calc_directory, free=free)
+        with timer.phase('parentcheck'):
+            status, message = self.__parentcheck(calc_directory, free=free)
+        staged = False
 
         # Remove bidfile and move to another calc if parents are not ready
         if status == 'not ready':
+            self.__discard_scratch(calc_name)
             if free is False:
                 for bidfile in calc_directory.glob('*.bid'):
                     bidfile.unlink()
-            return 'need to run ' + message
+            return self.__record(timer, 'need to run ' + message)
         
         # Change calculation's status to error if parents issued errors
         elif status == 'error':
+            self.__discard_scratch(calc_name)
             calculation.status = 'error'
             calculation.error = message
             exe_directory = calc_directory
@@ -577,16 +824,23 @@ class RunManager():
         elif status == 'ready':
             
             if temp:
-                # Create new temp directory
-                td = tempfile.TemporaryDirectory()
-                temp_directory = td.name
-                self.__logwrite(f'using temporary directory {temp_directory}\n')
+                # Wait for pending uploads if staged copies fill the scratch cap
+                if not self.scratch.fits(0):
+                    self.wait()
+
+                # Stage files in scratch, syncing any prefetched copy
+                with timer.phase('stage'):
+                    exe_directory = self.scratch.stage(calc_directory)
+                zip_directory = self.scratch.directory
+                staged = True
+                self.__logwrite(f'using scratch directory {exe_directory}\n')
             
-            if temp_directory is not None and status != 'error':
+            elif temp_directory is not None:
                 # Copy files to temp directory
                 exe_directory = Path(temp_directory, calc_name)
                 zip_directory = temp_directory
-                shutil.copytree(calc_directory, exe_directory)
+                with timer.phase('stage'):
+                    shutil.copytree(calc_directory, exe_directory)
             
             else:
                 # Default locations
@@ -595,11 +849,13 @@ class RunManager():
 
             # Run calc
             os.chdir(exe_directory)
-            #calculation.load_parameters(calc_in)
-            calculation = load_calculation(calculation.calc_style, params=calc_in, key=calc_name)
-            tmp_kwargs_calc = {"results_json": True}
-            tmp_kwargs_calc.update(kwargs_calc)
-            calculation.run(**tmp_kwargs_calc)
+            with timer.phase('calculation'):
+                #calculation.load_parameters(calc_in)
+                calculation = load_calculation(calculation.calc_style, params=calc_in, key=calc_name)
+                tmp_kwargs_calc = {"results_json": True,
+                                   "reference_cache": self.reference_cache}
+                tmp_kwargs_calc.update(kwargs_calc)
+                calculation.run(**tmp_kwargs_calc)
             os.chdir(self.run_directory)
 
             # Check status
@@ -617,39 +873,140 @@ class RunManager():
 
         # Update record
         if free is False:
-            tries = 0
+            if asynchronous:
+                if self.__uploader is None:
+                    self.__uploader = ThreadPoolExecutor(max_workers=1)
+                self.__uploads[calc_name] = self.__uploader.submit(
+                    self.__upload, calculation, calc_directory, exe_directory,
+                    zip_directory, status, staged, timer)
+            else:
+                status = self.__upload(calculation, calc_directory,
+                                       exe_directory, zip_directory, status,
+                                       staged, timer)
+        
+        else:
+            if staged:
+                with timer.phase('cleanup'):
+                    self.scratch.discard(calc_name)
+            self.__record(timer, status)
+            
+        self.__logwrite('\n')
+        return status
+
+    def __upload(self, calculation, calc_directory, exe_directory,
+                 zip_directory, status, staged, timer):
+        """
+        Updates the calculation's record, adds its archive to the database
+        and removes it from the run_directory.
+
+        Parameters
+        ----------
+        calculation : iprPy.Calculation
+            The calculation record object.
+        calc_directory : path-like object
+            The calculation's folder in the run_directory.
+        exe_directory : path-like object
+            The folder where the calculation was executed.
+        zip_directory : path-like object
+            The parent folder of exe_directory that the archive is made from.
+        status : str
+            The status of the calculation.
+        staged : bool
+            Indicates if exe_directory is a scratch copy to delete afterwards.
+        timer : PhaseTimer
+            The run's timings, which are finished and recorded here.
+
+        Returns
+        -------
+        status : str
+            The status of the calculation with any upload failures appended.
+        """
+        calc_name = calc_directory.name
+        
+        tries = 0
+        with timer.phase('record'):
             while tries < 10:
                 try:
-                    self.database.update_record(record=calculation)
+                    with self.__dblock:
+                        self.database.update_record(record=calculation)
                     break
                 except:
                     tries += 1
-            if tries == 10:
-                self.__logwrite('failed to update record\n')
-                status += ' - record upload failed'
+        if tries == 10:
+            self.__logwrite(f'{calc_name} failed to update record\n')
+            status += ' - record upload failed'
+        else:
+            if True:
+            #try:
+                # tar.gz calculation and add to database
+                with timer.phase('tar'):
+                    tar = archive_calc(zip_directory, calc_name)
+                    with self.__dblock:
+                        self.database.add_tar(name=calc_name, tar=tar)
             else:
-                if True:
-                #try:
-                    # tar.gz calculation and add to database
-                    self.database.add_tar(root_dir=zip_directory, name=calc_name)
-                else:
-                #except:
-                    status += ' - tar upload failed'
-                    self.__logwrite('failed to upload archive\n')
-                    
-                    # Move tar file to hold if it was created 
-                    tarname = Path(exe_directory, f'{calc_name}.tar.gz')
-                    if tarname.is_file():
-                        shutil.move(tarname, self.hold_directory)
+            #except:
+                status += ' - tar upload failed'
+                self.__logwrite(f'{calc_name} failed to upload archive\n')
+                
+                # Move tar file to hold if it was created 
+                tarname = Path(exe_directory, f'{calc_name}.tar.gz')
+                if tarname.is_file():
+                    shutil.move(tarname, self.hold_directory)
 
+            with timer.phase('cleanup'):
                 self.__removecalc(calc_directory)
 
-        # Clean temp_directory if needed
-        if temp:
-            td.cleanup()
-            
-        self.__logwrite('\n')
-        return status
+        # Clean scratch copy if needed
+        if staged:
+            with timer.phase('cleanup'):
+                self.scratch.discard(calc_name)
+        
+        return self.__record(timer, status)
+
+    def __discard_scratch(self, calc_name):
+        """Deletes any scratch copy of a calculation that will not be run."""
+        if self.__scratch is not None:
+            self.scratch.discard(calc_name)
+
+    def wait(self) -> dict:
+        """
+        Waits for all background uploads started by asynchronous runs to
+        finish.
+
+        Returns
+        -------
+        dict
+            The final status of each calculation whose upload finished,
+            keyed by calculation name.
+        """
+        statuses = {}
+        for calc_name, future in list(self.__uploads.items()):
+            try:
+                statuses[calc_name] = future.result()
+            except Exception as e:
+                self.__logwrite(f'{calc_name} upload failed: {e}\n')
+                statuses[calc_name] = 'error - upload failed'
+            del self.__uploads[calc_name]
+        return statuses
+
+    def close(self):
+        """
+        Waits for background uploads, stops the staging and heartbeat threads
+        and deletes the runner's scratch directory.
+        """
+        self.wait()
+        if self.__heartbeat is not None:
+            self.__heartbeat.stop()
+            self.__heartbeat = None
+        if self.__stager is not None:
+            self.__stager.shutdown()
+            self.__stager = None
+        if self.__uploader is not None:
+            self.__uploader.shutdown()
+            self.__uploader = None
+        if self.__scratch is not None:
+            self.__scratch.cleanup()
+            self.__scratch = None
     
     def runall(self,
                bidtries: int = 10,
@@ -669,8 +1026,10 @@ class RunManager():
             row.  This allows for the cleanup of excess competing runners.
             Default value is 10.
         temp : bool, optional
-            If True, a new temporary directory will be created and used for this
-            run.  
+            If True, the calculations are performed in node-local scratch
+            space.  While each calculation runs, the next one is claimed and
+            copied to scratch in the background, and finished calculations are
+            uploaded in the background.
         temp_directory : path-like object, optional
             The path to an existing temporary directory where the calculations
             are to be performed.
@@ -689,24 +1048,50 @@ class RunManager():
         if free:
             assert temp is False and temp_directory is None
 
-        # Create temp_directory if needed
+        # Prefetching is only done when running in scratch
         if temp:
-            td = tempfile.TemporaryDirectory()
-            temp_directory = td.name
-            print(f'using temporary directory {temp_directory}', flush=True)
+            print(f'using scratch directory {self.scratch.directory}', flush=True)
+            if self.__stager is None:
+                self.__stager = ThreadPoolExecutor(max_workers=1)
 
         bidcount = 0
+        prefetched = None
+        parent_first = False
 
         calclist = self.calclist
-        while len(calclist) > 0:
+        while len(calclist) > 0 or prefetched is not None:
             
-            # Select a calculation at ramdon
-            calc_name = calclist[random.randint(0, len(calclist)-1)]
+            # Use the prefetched calculation unless a different parent is to run first
+            if prefetched is not None and (not parent_first
+                                           or prefetched[0] == calclist[0]):
+                calc_name, claim = prefetched
+                prefetched = None
+                claimed = claim.result()
+            
+            # Select a calculation at random
+            else:
+                calc_name = calclist[random.randint(0, len(calclist)-1)]
+                claimed = None
+            parent_first = False
+
+            # Claim and stage another calculation while this one runs
+            if temp and prefetched is None:
+                candidates = [c for c in calclist if c != calc_name]
+                if len(candidates) > 0:
+                    next_name = candidates[random.randint(0, len(candidates)-1)]
+                    prefetched = (next_name, self.__stager.submit(
+                        self.prefetch, next_name, bidverbose))
 
             # Run the calculation
-            status = self.run(calc_name, temp_directory=temp_directory,
-                              bidverbose=bidverbose, free=free,
-                              **kwargs_calc)
+            if claimed is False:
+                status = 'bidfail'
+            else:
+                status = self.run(calc_name, temp=temp,
+                                  temp_directory=temp_directory,
+                                  bidverbose=bidverbose, free=free,
+                                  kwargs_calc=kwargs_calc,
+                                  claimed=claimed is True,
+                                  asynchronous=temp)
 
             if status == 'bidfail':
                 bidcount += 1
@@ -723,14 +1108,20 @@ class RunManager():
             # Try parent next if not calculated
             elif 'need to run' in status:
                 calclist = [status.split()[-1]]
+                parent_first = True
             
             # Reset bidcount and reload calclist
             else:
                 bidcount = 0
                 calclist = self.calclist
 
+        # Give up any calculation claimed but not run
+        if prefetched is not None:
+            calc_name, claim = prefetched
+            if claim.result():
+                self.unclaim(calc_name)
+
         print('No simulations left to run', flush=True)
         
-        # Clean temp_directory if needed
-        if temp:
-            td.cleanup()
\ No newline at end of file
+        # Finish uploads, stop heartbeats and clean scratch
+        self.close()
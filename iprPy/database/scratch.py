@@ -0,0 +1,245 @@
+# coding: utf-8
+# Standard Python libraries
+import os
+from pathlib import Path
+import shutil
+import tempfile
+import threading
+from typing import Optional, Union
+import weakref
+
+def default_scratch_directory() -> Path:
+    """
+    Returns the default node-local scratch location.  This is taken from the
+    IPRPY_SCRATCH environment variable if set, otherwise the system temporary
+    directory is used.
+    """
+    return Path(os.environ.get('IPRPY_SCRATCH', tempfile.gettempdir()))
+
+def tree_manifest(directory: Union[str, Path]) -> dict:
+    """
+    Lists the files in a directory tree along with their sizes and
+    modification times.
+
+    Parameters
+    ----------
+    directory : str or Path
+        The directory to scan.
+
+    Returns
+    -------
+    dict
+        Keys are the file paths relative to directory, values are
+        (size, mtime_ns) tuples.
+    """
+    manifest = {}
+    stack = [Path(directory)]
+    while len(stack) > 0:
+        path = stack.pop()
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(Path(entry.path))
+                else:
+                    stat = entry.stat()
+                    relpath = Path(entry.path).relative_to(directory).as_posix()
+                    manifest[relpath] = (stat.st_size, stat.st_mtime_ns)
+    return manifest
+
+class ScratchManager():
+    """
+    Manages copies of calculation folders on node-local scratch space.  The
+    sizes of the staged copies are tracked so that prefetching can be skipped
+    when it would exceed a size cap.  Copies are kept until they are
+    discarded after being run and uploaded.  All methods are thread safe,
+    allowing for staging to be done in background threads.
+    """
+
+    def __init__(self,
+                 scratch_directory: Union[str, Path, None] = None,
+                 max_size: Optional[int] = None):
+        """
+        Class initializer
+
+        Parameters
+        ----------
+        scratch_directory : str or Path, optional
+            The scratch location to use.  A directory unique to the current
+            process is created inside it.  Default value is given by
+            default_scratch_directory().
+        max_size : int, optional
+            The maximum number of bytes to keep staged.  If None (default),
+            no cap is applied.
+        """
+        if scratch_directory is None:
+            scratch_directory = default_scratch_directory()
+        scratch_directory = Path(scratch_directory)
+        scratch_directory.mkdir(parents=True, exist_ok=True)
+
+        self.__directory = Path(tempfile.mkdtemp(prefix=f'iprPy-{os.getpid()}-',
+                                                 dir=scratch_directory))
+        self.__max_size = max_size
+        self.__lock = threading.RLock()
+        self.__staged = {}
+        self.__manifests = {}
+        self.__finalizer = weakref.finalize(self, shutil.rmtree,
+                                            self.__directory, True)
+
+    def __str__(self):
+        """Class string representation"""
+        return f'ScratchManager using {self.directory} ({self.size} bytes staged)'
+
+    @property
+    def directory(self) -> Path:
+        """pathlib.Path : The process-specific scratch directory."""
+        return self.__directory
+
+    @property
+    def max_size(self) -> Optional[int]:
+        """int or None : The maximum number of bytes to keep staged."""
+        return self.__max_size
+
+    @property
+    def size(self) -> int:
+        """int : The total number of bytes currently staged."""
+        with self.__lock:
+            return sum(self.__staged.values())
+
+    @property
+    def staged(self) -> list:
+        """list : The names of the staged calculations."""
+        with self.__lock:
+            return list(self.__staged.keys())
+
+    def path(self, calc_name: str) -> Path:
+        """
+        Returns the scratch path for a calculation.
+
+        Parameters
+        ----------
+        calc_name : str
+            The calculation name.
+
+        Returns
+        -------
+        pathlib.Path
+            The location of the calculation's staged copy.
+        """
+        return Path(self.directory, calc_name)
+
+    def fits(self, nbytes: int) -> bool:
+        """
+        Checks if nbytes more can be staged.
+
+        Parameters
+        ----------
+        nbytes : int
+            The number of bytes to be staged.
+
+        Returns
+        -------
+        bool
+            False if staging nbytes would exceed max_size.
+        """
+        if self.max_size is None:
+            return True
+        return self.size + nbytes <= self.max_size
+
+    def fetch(self,
+              calc_directory: Union[str, Path],
+              required: bool = True) -> Optional[Path]:
+        """
+        Copies a calculation folder to scratch, replacing any existing copy.
+
+        Parameters
+        ----------
+        calc_directory : str or Path
+            The calculation folder to copy.
+        required : bool, optional
+            If False, the copy is skipped when it would not fit under max_size.
+            If True (default), the copy is always made.
+
+        Returns
+        -------
+        pathlib.Path or None
+            The location of the staged copy, or None if it was skipped.
+        """
+        calc_directory = Path(calc_directory)
+        calc_name = calc_directory.name
+        manifest = tree_manifest(calc_directory)
+        nbytes = sum(size for size, mtime in manifest.values())
+
+        with self.__lock:
+            self.discard(calc_name)
+            if not required and not self.fits(nbytes):
+                return None
+
+        target = self.path(calc_name)
+        shutil.copytree(calc_directory, target)
+
+        with self.__lock:
+            self.__staged[calc_name] = nbytes
+            self.__manifests[calc_name] = manifest
+
+        return target
+
+    def stage(self, calc_directory: Union[str, Path]) -> Path:
+        """
+        Returns an up to date scratch copy of a calculation folder.
+        If the folder was already fetched, only the files that were added,
+        changed or removed since are synced.
+
+        Parameters
+        ----------
+        calc_directory : str or Path
+            The calculation folder to stage.
+
+        Returns
+        -------
+        pathlib.Path
+            The location of the staged copy.
+        """
+        calc_directory = Path(calc_directory)
+        calc_name = calc_directory.name
+
+        with self.__lock:
+            old = self.__manifests.get(calc_name, None)
+        if old is None:
+            return self.fetch(calc_directory)
+
+        target = self.path(calc_name)
+        new = tree_manifest(calc_directory)
+        for relpath in old.keys() - new.keys():
+            Path(target, relpath).unlink(missing_ok=True)
+        for relpath, info in new.items():
+            if old.get(relpath) != info:
+                dest = Path(target, relpath)
+                dest.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy2(Path(calc_directory, relpath), dest)
+
+        with self.__lock:
+            self.__staged[calc_name] = sum(size for size, mtime in new.values())
+            self.__manifests[calc_name] = new
+
+        return target
+
+    def discard(self, calc_name: str):
+        """
+        Deletes a staged copy.
+
+        Parameters
+        ----------
+        calc_name : str
+            The calculation name.
+        """
+        with self.__lock:
+            self.__staged.pop(calc_name, None)
+            self.__manifests.pop(calc_name, None)
+            shutil.rmtree(self.path(calc_name), ignore_errors=True)
+
+    def cleanup(self):
+        """Deletes the process-specific scratch directory and all staged copies."""
+        with self.__lock:
+            self.__staged.clear()
+            self.__manifests.clear()
+            self.__finalizer()
@@ -0,0 +1,281 @@
+# coding: utf-8
+# Standard Python libraries
+from contextlib import contextmanager
+import json
+import os
+from pathlib import Path
+import socket
+import threading
+import time
+from typing import Optional, Union
+
+# https://pandas.pydata.org/
+import pandas as pd
+
+phases = ['bid', 'filecheck', 'parentcheck', 'stage', 'calculation',
+          'record', 'tar', 'cleanup']
+
+def status_label(status: str) -> str:
+    """
+    Reduces a RunManager.run status to a short label for grouping.
+
+    Parameters
+    ----------
+    status : str
+        The status returned by RunManager.run.
+
+    Returns
+    -------
+    str
+        'not ready' for 'need to run ...' statuses, 'upload failed' for
+        statuses with upload failures, otherwise the status itself.
+    """
+    if status.startswith('need to run'):
+        return 'not ready'
+    elif ' - ' in status:
+        return 'upload failed'
+    else:
+        return status
+
+class PhaseTimer():
+    """
+    Collects the wall times of the phases of one RunManager.run call.
+    """
+
+    def __init__(self, calc_name: str):
+        """
+        Class initializer
+
+        Parameters
+        ----------
+        calc_name : str
+            The name of the calculation being run.
+        """
+        self.calc_name = calc_name
+        self.start = time.time()
+        self.end = None
+        self.queue_wait = None
+        self.status = None
+        self.phases = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        """
+        Context manager that adds the time spent inside it to a phase.
+
+        Parameters
+        ----------
+        name : str
+            The phase name.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def set_queue_wait(self, calc_directory: Union[str, Path]):
+        """
+        Sets the time the calculation spent waiting in the run directory,
+        measured from the modification time of its calc_*.in file.
+
+        Parameters
+        ----------
+        calc_directory : str or Path
+            The calculation folder.
+        """
+        for calc_in in Path(calc_directory).glob('calc_*.in'):
+            self.queue_wait = self.start - calc_in.stat().st_mtime
+            break
+
+    def finish(self, status: str):
+        """
+        Marks the run as finished.
+
+        Parameters
+        ----------
+        status : str
+            The final status of the calculation.
+        """
+        self.end = time.time()
+        self.status = status
+
+    def asdict(self) -> dict:
+        """dict : The timings as a JSON-compatible dict."""
+        return {'calc_name': self.calc_name,
+                'status': self.status,
+                'start': self.start,
+                'end': self.end,
+                'queue_wait': self.queue_wait,
+                'phases': dict(self.phases)}
+
+class Telemetry():
+    """
+    Writes the phase timings of a runner's calculations as JSON lines and
+    optionally keeps a Prometheus textfile of running totals up to date.
+    """
+
+    def __init__(self,
+                 run_directory: Union[str, Path],
+                 jsonl_file: Union[str, Path, None] = None,
+                 prometheus_file: Union[str, Path, None] = None):
+        """
+        Class initializer
+
+        Parameters
+        ----------
+        run_directory : str or Path
+            The run_directory that the runner is working on.
+        jsonl_file : str or Path, optional
+            The JSON lines file to append a timing record to for each run.
+        prometheus_file : str or Path, optional
+            A textfile for the node_exporter textfile collector.  Any "{pid}"
+            in the name is replaced with the runner's pid so that concurrent
+            runners do not overwrite each other.  The file is replaced after
+            each run.
+        """
+        self.run_directory = Path(run_directory)
+        self.pid = os.getpid()
+        self.host = socket.gethostname()
+        self.jsonl_file = None if jsonl_file is None else Path(jsonl_file)
+        if prometheus_file is None:
+            self.prometheus_file = None
+        else:
+            self.prometheus_file = Path(str(prometheus_file).format(pid=self.pid))
+        self.__lock = threading.Lock()
+        self.__counts = {}
+        self.__seconds = {}
+
+    def write(self, timer: PhaseTimer):
+        """
+        Records the timings of a finished run.
+
+        Parameters
+        ----------
+        timer : PhaseTimer
+            The timings to record.
+        """
+        record = timer.asdict()
+        record['run_directory'] = self.run_directory.name
+        record['pid'] = self.pid
+        record['host'] = self.host
+
+        with self.__lock:
+            if self.jsonl_file is not None:
+                with open(self.jsonl_file, 'a', encoding='UTF-8') as f:
+                    f.write(json.dumps(record) + '\n')
+
+            if self.prometheus_file is not None:
+                label = status_label(timer.status)
+                self.__counts[label] = self.__counts.get(label, 0) + 1
+                for name, seconds in timer.phases.items():
+                    self.__seconds[name] = self.__seconds.get(name, 0.0) + seconds
+                self.__write_prometheus(timer.end)
+
+    def __write_prometheus(self, timestamp: float):
+        """Atomically replaces the Prometheus textfile with the current totals."""
+        labels = f'run_directory="{self.run_directory.name}",pid="{self.pid}"'
+        lines = [
+            '# HELP iprpy_runner_calculations_total Calculations processed by the runner.',
+            '# TYPE iprpy_runner_calculations_total counter']
+        for status, count in sorted(self.__counts.items()):
+            lines.append(f'iprpy_runner_calculations_total{{{labels},status="{status}"}} {count}')
+        lines += [
+            '# HELP iprpy_runner_phase_seconds_total Wall time spent by the runner in each phase.',
+            '# TYPE iprpy_runner_phase_seconds_total counter']
+        for name, seconds in sorted(self.__seconds.items()):
+            lines.append(f'iprpy_runner_phase_seconds_total{{{labels},phase="{name}"}} {seconds:.6f}')
+        lines += [
+            '# HELP iprpy_runner_last_run_timestamp_seconds Time the last run finished.',
+            '# TYPE iprpy_runner_last_run_timestamp_seconds gauge',
+            f'iprpy_runner_last_run_timestamp_seconds{{{labels}}} {timestamp:.3f}']
+
+        tmpfile = Path(f'{self.prometheus_file}.{self.pid}.tmp')
+        with open(tmpfile, 'w', encoding='UTF-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        os.replace(tmpfile, self.prometheus_file)
+
+def load_telemetry(paths: list) -> pd.DataFrame:
+    """
+    Reads runner telemetry JSON lines files.
+
+    Parameters
+    ----------
+    paths : list
+        The JSON lines files to read.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per run with the phase times as columns named after the
+        phases.
+    """
+    records = []
+    for path in paths:
+        with open(path, encoding='UTF-8') as f:
+            for line in f:
+                if line.strip() == '':
+                    continue
+                record = json.loads(line)
+                for name, seconds in record.pop('phases').items():
+                    record[name] = seconds
+                records.append(record)
+
+    df = pd.DataFrame(records)
+    for name in phases:
+        if name not in df:
+            df[name] = 0.0
+    df[phases] = df[phases].fillna(0.0)
+    return df
+
+def summarize_telemetry(paths: list) -> pd.DataFrame:
+    """
+    Aggregates runner telemetry by run directory.
+
+    Parameters
+    ----------
+    paths : list
+        The JSON lines files to read.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Per run_directory: the number of runners, the counts of finished,
+        errored, not ready and bidfail runs, the throughput in finished
+        calculations per hour of runner time, the mean queue wait, the total
+        hours in each phase, and the fraction of runner time lost to bidding
+        and uploads.
+    """
+    df = load_telemetry(paths)
+    if len(df) == 0:
+        return pd.DataFrame()
+    df['label'] = df.status.fillna('unknown').apply(status_label)
+    df['runner'] = df.host.astype(str) + ':' + df.pid.astype(str)
+
+    summary = []
+    for run_directory, group in df.groupby('run_directory'):
+        total = group[phases].to_numpy().sum()
+        counts = group.label.value_counts()
+        data = {'run_directory': run_directory,
+                'runners': group.runner.nunique(),
+                'success': counts.get('success', 0),
+                'error': counts.get('error', 0),
+                'not ready': counts.get('not ready', 0),
+                'bidfail': counts.get('bidfail', 0),
+                'upload failed': counts.get('upload failed', 0)}
+        if total > 0:
+            data['calcs/hour'] = 3600 * data['success'] / total
+        else:
+            data['calcs/hour'] = 0.0
+        data['queue wait (h)'] = group.queue_wait.mean() / 3600
+        for name in phases:
+            data[f'{name} (h)'] = group[name].sum() / 3600
+        if total > 0:
+            data['bid fraction'] = group.bid.sum() / total
+            data['upload fraction'] = (group.record.sum() + group.tar.sum()) / total
+        else:
+            data['bid fraction'] = 0.0
+            data['upload fraction'] = 0.0
+        summary.append(data)
+
+    return pd.DataFrame(summary)
@@ -1,28 +1,174 @@
 # coding: utf-8
 
 # Standard Python libraries
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+import re
 from typing import Optional
 
 # iprPy imports
 from . import load_run_directory
+from .tools import lammps_capabilities
+
+# Key line in calc_*.in files that sets the LAMMPS command
+command_key = 'lammps_command                  '
+
+class LammpsCommandSelector():
+    """
+    Selects the LAMMPS command to use for a calculation based on the
+    potential ids that appear in its input.  The id to command map and a
+    single combined search pattern are built once when initialized.
+    """
+
+    def __init__(self,
+                 lammps_command: Optional[str] = None,
+                 **kwargs):
+        """
+        Builds the id to command map.
+
+        Parameters
+        ----------
+        lammps_command : str, optional
+            The default LAMMPS command.
+        kwargs : any
+            Keyword parameters including any alternate LAMMPS commands, i.e.
+            lammps_command_snap_1, lammps_command_snap_2, lammps_command_old,
+            lammps_command_aenet, lammps_command_pinn, lammps_command_kim.
+            All other kwargs are ignored.
+        """
+        self.default = lammps_command
+
+        # Map the alternate command keys to their potential id lists
+        pot_lists = {
+            'lammps_command_snap_1': snap1_pots,
+            'lammps_command_snap_2': snap2_pots,
+            'lammps_command_old': old_pots,
+            'lammps_command_aenet': aenet_pots,
+            'lammps_command_pinn': pinn_pots,
+            'lammps_command_kim': kim_pots,
+        }
+
+        self.commands = {}
+        for command_name, pots in pot_lists.items():
+            if command_name in kwargs:
+                for pot_id in pots():
+                    self.commands[pot_id] = kwargs[command_name]
+
+        if len(self.commands) > 0:
+            self.pattern = re.compile('|'.join([re.escape(pot_id) for pot_id in self.commands]))
+        else:
+            self.pattern = None
+
+    @property
+    def active(self) -> bool:
+        """bool: True if any alternate commands are defined."""
+        return self.pattern is not None and self.default is not None
+
+    def select(self, content: str) -> str:
+        """
+        Selects the LAMMPS command for a calculation.
+
+        Parameters
+        ----------
+        content : str
+            The calculation's input content to search for potential ids.
+
+        Returns
+        -------
+        str
+            The alternate command if a matching potential id is found, or the
+            default command otherwise.
+        """
+        if self.pattern is not None:
+            match = self.pattern.search(content)
+            if match is not None:
+                return self.commands[match[0]]
+        return self.default
+
+    def capabilities(self) -> dict:
+        """
+        Retrieves the capabilities of the default and all alternate LAMMPS
+        commands from the LAMMPS capabilities cache.  Commands whose
+        executables are new or have changed since last cached are run once to
+        detect their version, packages and styles.
+
+        Returns
+        -------
+        dict
+            The lammps_capabilities() results for each unique command.
+        """
+        commands = set(self.commands.values())
+        if self.default is not None:
+            commands.add(self.default)
+        return {command: lammps_capabilities(command) for command in sorted(commands)}
+
+    def fix_script(self, inscript: Path) -> bool:
+        """
+        Updates the lammps_command line of a calc_*.in script if needed.
+
+        Parameters
+        ----------
+        inscript : Path
+            The calculation input script.
+
+        Returns
+        -------
+        bool
+            True if the script was changed.
+        """
+        with open(inscript, encoding='UTF-8') as f:
+            content = f.read()
+
+        command = self.select(content)
+        if command == self.default:
+            return False
+
+        newcontent = content.replace(f'{command_key}{self.default}',
+                                     f'{command_key}{command}')
+        if newcontent == content:
+            return False
+
+        with open(inscript, 'w', encoding='UTF-8') as f:
+            f.write(newcontent)
+        return True
 
 def fix_lammps_versions(run_directory: str,
                         calc_names: Optional[list] = None,
-                        **kwargs):
+                        max_workers: int = 8,
+                        check: bool = True,
+                        **kwargs) -> int:
     """
     Iterates over all prepared calculations in a run_directory and updates
-    the LAMMPS version to use.
+    the LAMMPS version to use.  Note that prepare already selects the LAMMPS
+    version so this is only needed for calculations prepared otherwise or
+    when the LAMMPS commands change.  Each script is read once and searched
+    with a single combined pattern, and scripts are handled in parallel.
     
     Parameters
     ----------
     run_directory_name : str
         The name of the run directory containing the prepared calculations
         to update.
+    calc_names : list, optional
+        The calculations to update.  If None (default), all calculations in
+        the run directory are updated.
+    max_workers : int, optional
+        The number of threads used to read and update the scripts.  Default
+        value is 8.
+    check : bool, optional
+        If True (default), the capabilities of all LAMMPS commands are
+        retrieved through the LAMMPS capabilities cache, which refreshes the
+        cached values of any executables that have changed before the
+        calculations are run.
     kwargs : any
         Keyword parameters including the current and old LAMMPS commands.
         The current will be replaced by the old for the potentials where it
         is required. All other kwargs are ignored.
+
+    Returns
+    -------
+    int
+        The number of scripts that were updated.
     """
     # Handle run_directory
     try:
@@ -30,63 +176,21 @@ def fix_lammps_versions(run_directory: str,
     except:
         run_directory = Path(run_directory)
 
-    # Construct default lammps_command line to change
-    key = 'lammps_command                  '
-    oldlammps = f"{key}{kwargs['lammps_command']}"
-
-    replacementdict = {}
-
-    # Fix for SNAP version 1
-    if 'lammps_command_snap_1' in kwargs:
-        for pot_id in snap1_pots():
-            replacementdict[pot_id] = f"{key}{kwargs['lammps_command_snap_1']}"
-
-    # Fix for SNAP version 2
-    if 'lammps_command_snap_2' in kwargs:
-        for pot_id in snap2_pots():
-            replacementdict[pot_id] = f"{key}{kwargs['lammps_command_snap_2']}"
-
-    # Fix for old potentials
-    if 'lammps_command_old' in kwargs:
-        for pot_id in old_pots():
-            replacementdict[pot_id] = f"{key}{kwargs['lammps_command_old']}"
-
-    # Fix for aenet potentials
-    if 'lammps_command_aenet' in kwargs:
-        for pot_id in aenet_pots():
-            replacementdict[pot_id] = f"{key}{kwargs['lammps_command_aenet']}"
-
-    # Fix for pinn potentials
-    if 'lammps_command_pinn' in kwargs:
-        for pot_id in pinn_pots():
-            replacementdict[pot_id] = f"{key}{kwargs['lammps_command_pinn']}"
-
-    # Fix for kim potentials
-    if 'lammps_command_kim' in kwargs:
-        for pot_id in kim_pots():
-            replacementdict[pot_id] = f"{key}{kwargs['lammps_command_kim']}"
+    selector = LammpsCommandSelector(**kwargs)
 
     # Check if any replacement lammps_commands are defined
-    if len(replacementdict) > 0:
-
-        # Iterate over the calculation scripts
-        for inscript in iter_calc_scripts(run_directory, calc_names):
-            
-            # Read the input script contents
-            with open(inscript, encoding='UTF-8') as f:
-                content = f.read()
-            original_content = content
-
-            # Update the lammps command if a match is found
-            for pot_id, lammps in replacementdict.items():
-                if pot_id in content:
-                    content = content.replace(oldlammps, lammps)
-                    break
-
-            # Update the script if it changed
-            if content != original_content:
-                with open(inscript, 'w', encoding='UTF-8') as f:
-                    f.write(content)
+    if not selector.active:
+        return 0
+
+    # Refresh the cached capabilities of the commands
+    if check:
+        selector.capabilities()
+
+    # Update the calculation scripts in parallel
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        changed = executor.map(selector.fix_script,
+                               iter_calc_scripts(run_directory, calc_names))
+        return sum(changed)
 
 def iter_calc_scripts(run_directory: Path, calc_names: Optional[list]):
     """Iterate over calc scripts in a run directory: either all or a selection"""
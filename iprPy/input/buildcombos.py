@@ -34,7 +34,8 @@ def buildcombos(style: str,
     Returns
     -------
     inputs : dict
-        Contains the values generated for each key
+        Contains the values generated for each key as lists or other
+        iterables
     content_dict : dict
         Contains loaded file content
     """
@@ -85,6 +85,11 @@ def atomicparent(database,
     if len(parent_df) == 0:
         return inputs, content_dict
 
+    # Fetch all grandparents at once if potential info is not in the parents
+    if include_potentials and ('potential_LAMMPS_key' not in parent_df
+                               or 'potential_key' not in parent_df):
+        grandparents = database.get_records_parents(parents)
+
     # Loop over all parents
     for i in parent_df.index:
         parent = parents[i]
@@ -100,7 +105,7 @@ def atomicparent(database,
                 # Search grandparents for name of potential
                 potential_LAMMPS_key = None
                 potential_key = None
-                for grandparent in database.get_parent_records(record=parent):
+                for grandparent in grandparents[parent.name]:
                     try:
                         grandmeta = grandparent.metadata()
                         potential_LAMMPS_key = grandmeta['potential_LAMMPS_key']
@@ -1,48 +1,100 @@
-# https://github.com/usnistgov/DataModelDict 
-from DataModelDict import DataModelDict as DM
+# coding: utf-8
+
+# Standard Python libraries
+from itertools import chain, permutations, repeat
+from typing import Optional, Tuple
+
+# http://www.numpy.org/
+import numpy as np
 
 # iprPy imports
 from ...analysis import assign_currentIPR
-
-from itertools import permutations
+from ...tools import aslist
 
 __all__ = ['defectmobility']
 
-def defectmobility(database, keys, record=None, content_dict=None, query=None, **kwargs):
-    
-    load_key='atomic-system'
-    load_style = 'relaxed_crystal'
-    if 'allowable_impurity_numbers' in kwargs.keys():
-        allowable_impurity_numbers = kwargs['allowable_impurity_numbers'] #Put something here that will take a kwarg defined in the beginning script which will define the types of impurity simulations that you want to run
-        del kwargs['allowable_impurity_numbers']
-    else:
+def defectmobility(database,
+                   keys: list,
+                   content_dict: Optional[dict] = None,
+                   record: Optional[str] = None,
+                   query: Optional[str] = None,
+                   load_key: str = 'atomic-system',
+                   allowable_impurity_numbers: Optional[list] = None,
+                   impurity_list: Optional[list] = None,
+                   impurity_blacklist: Optional[list] = None,
+                   **kwargs) -> Tuple[dict, dict]:
+    """
+    Build parameter sets that pair relaxed_crystal parents with point defect
+    mobility records, and with all permutations of impurity elements
+    supported by each parent's potential.
+
+    Parameters
+    ----------
+    database : iprPy.database.Database
+        The database to use in building combos
+    keys : list
+        The calculation multikey set to build combos for
+    content_dict : dict, optional
+        Contains loaded file content.  If not given, an empty
+        dict will be created
+    record : str, optional
+        The point defect mobility record style to search
+    query : str, optional
+        A query to limit the parent and defect records by
+    load_key : str, optional
+        The key of the parent record where the system info is listed
+    allowable_impurity_numbers : list, optional
+        The numbers of impurity elements that defect mobility records can
+        add to the system.  Default value is [0, 1].
+    impurity_list : list, optional
+        If given, only these elements will be used as impurities.  Cannot be
+        given with impurity_blacklist.
+    impurity_blacklist : list, optional
+        If given, these elements will not be used as impurities.  Cannot be
+        given with impurity_list.
+    kwargs : any
+        Additional keyword arguments will be used to limit which records from
+        the database are used in building combos values.
+
+    Returns
+    -------
+    inputs : dict
+        Contains iterables of the values generated for each key
+    content_dict : dict
+        Contains loaded file content
+    """
+    if allowable_impurity_numbers is None:
         allowable_impurity_numbers = [0, 1]
-    
-    #Check to see if there is a list of impurities defined of forbidden to be simulated 
-    
-    if 'impurity_list' in kwargs.keys() and 'impurity_blacklist' in kwargs.keys():
-        raise Exception('Cannot define both impurity_list and impurity_blacklist')
-    elif 'impurity_list' in kwargs.keys():
-        impurity_list = kwargs['impurity_list']
-        del kwargs['impurity_list']
-        impurity_blacklist = None
-    elif 'impurity_blacklist' in kwargs.keys():
-        impurity_blacklist = kwargs['impurity_blacklist']
-        del kwargs['impurity_blacklist']
-        impurity_list = None
-    else:
-        impurity_list = None
-        impurity_blacklist = None
-    
-    
+    elif isinstance(allowable_impurity_numbers, str):
+        allowable_impurity_numbers = allowable_impurity_numbers.split()
+    allowable_impurity_numbers = [int(n) for n in allowable_impurity_numbers]
+    if isinstance(impurity_list, str):
+        impurity_list = impurity_list.split()
+    if isinstance(impurity_blacklist, str):
+        impurity_blacklist = impurity_blacklist.split()
+    if impurity_list is not None and impurity_blacklist is not None:
+        raise ValueError('Cannot define both impurity_list and impurity_blacklist')
+
     if content_dict is None:
         content_dict = {}
-   
-    
-    #Determine the number and specific of the total number of elements that can be in the system
+
+    # Identify the defect mobility keys
+    mobility_file_key = 'pointdefect_mobility_file'
+    mobility_content_key = 'pointdefect_mobility_content'
+    mobility_family_key = 'pointdefect_mobility_family'
+    for key in [mobility_file_key, mobility_content_key, mobility_family_key]:
+        if key not in keys:
+            raise KeyError(f'No {key} key found')
+
+    # Build lists of the column blocks for each key
+    blocks = {}
+    for key in keys:
+        blocks[key] = []
+
+    # Fetch potential records
     if 'potential_file' in keys or 'potential_content' in keys or 'potential_dir' in keys:
         include_potentials = True
-        
+
         # Extract kwargs starting with "potential"
         potential_kwargs = {}
         for key in list(kwargs.keys()):
@@ -53,8 +105,7 @@ def defectmobility(database, keys, record=None, content_dict=None, query=None, *
         potential_record = potential_kwargs.pop('record', 'potential_LAMMPS')
         potential_query = potential_kwargs.pop('query', None)
         currentIPR = potential_kwargs.pop('currentIPR', potential_record=='potential_LAMMPS')
-        
-        # Fetch potential records 
+
         potentials, potential_df = database.get_records(style=potential_record, return_df=True,
                                                         query=potential_query, **potential_kwargs)
 
@@ -63,299 +114,169 @@ def defectmobility(database, keys, record=None, content_dict=None, query=None, *
             assign_currentIPR(pot_df=potential_df)
             potential_df = potential_df[potential_df.currentIPR == True]
 
+        # Index potentials by id
+        potential_index = dict(zip(potential_df.id, potential_df.index))
     else:
         include_potentials = False
-    
-    # Fetch reference records
-    parents, parent_df = database.get_records(style=load_style, return_df=True,
+
+    # Fetch parent and defect records
+    parents, parent_df = database.get_records(style='relaxed_crystal', return_df=True,
                                               query=query, **kwargs)
-    
-                                               
-    #Deterime the number and specific of the original symbols in the systems
-    
     defectmobilities, defectmobility_df = database.get_records(style=record, return_df=True,
-                                           query=query, **kwargs)
-
-    
-    
-    structureList = []
-    strucSymb = {}
-    structPotential = {}
-    potSymb = {}
-
-    
-    # Search for potential keys
-    potential_file_key = None
-    potential_content_key = None
-    potential_family_key = None
-    inputs = {}
-    
-   
-    # Search for defect keys
-    mobility_file_key = None
-    mobility_content_key = None
-    mobility_family_key = None
+                                                               query=query, **kwargs)
+    if len(parent_df) == 0 or len(defectmobility_df) == 0:
+        return {key: blocks[key] for key in keys}, content_dict
 
-    for key in keys:
-        inputs[key] = []
-        if key == 'pointdefect_mobility_file':
-            if mobility_file_key is None:
-                mobility_file_key = key
-            else:
-                raise KeyError('Multiple <defect>_file keys found')
-        elif key == 'pointdefect_mobility_content':
-            if mobility_content_key is None:
-                mobility_content_key = key
-            else:
-                raise KeyError('Multiple <defect>_content keys found')
-        elif key == 'pointdefect_mobility_family':
-            if mobility_family_key is None:
-                mobility_family_key = key
-            else:
-                raise KeyError('Multiple <defect>_family keys found')
-    
-    
-    if mobility_file_key is None:
-        raise KeyError('No <defect>_file key found')
-    if mobility_content_key is None:
-        raise KeyError('No <defect>_content key found')
-    if mobility_family_key is None:
-        raise KeyError('No <defect>_family key found')
-    
-    # Gather all the information about the parent structures and point defects for use in defining simulations
-    
-    for i, parent_series in parent_df.iterrows():
-        parent = parents[i]
-        content_dict[parent.name] = parent.content
-        
-    for j, defectmobility_series in defectmobility_df.iterrows():    
-        defectmobility = defectmobilities[j]
-        content_dict[defectmobility.name] = defectmobility.content
-    
-    # need to figure out how to get infromation on the impurity number here
-    
-    inputs = {}
-    for key in keys:
-        inputs[key] = []
-    
-    # Beginning the process to generate all possible combinations of the defect_mobility calculation
-    
-    for i, parent_series in parent_df.iterrows():
-        
-        parent = parents[i]
-        
-        if include_potentials:
-            try:
-                potential_id = parent_series.potential_LAMMPS_id
-            except:
-                # Search grandparents for name of potential
+    # Index the defect records: the number of atom types that each uses
+    defect_names = np.array([defect.name for defect in defectmobilities], dtype=object)
+    defect_families = defectmobility_df.family.values.astype(object)
+    defect_natypes = np.empty(len(defectmobilities), dtype=int)
+    for k, defect in enumerate(defectmobilities):
+        content_dict[defect.name] = defect.model
+        atypes = [int(atype) for atype in defect.model.finds('atype')]
+        defect_natypes[k] = max(atypes, default=0)
+
+    # Resolve the potential of each parent in one pass
+    parent_potentials = [None] * len(parents)
+    if include_potentials:
+        if 'potential_LAMMPS_id' in parent_df:
+            potential_ids = parent_df.potential_LAMMPS_id.values
+        else:
+            potential_ids = [None] * len(parents)
+
+        # Fetch the grandparents of all parents missing potential info at once
+        missing = [parent for i, parent in enumerate(parents)
+                   if not isinstance(potential_ids[i], str)]
+        if len(missing) > 0:
+            grandparents = database.get_records_parents(missing)
+
+        for i, parent in enumerate(parents):
+            potential_id = potential_ids[i]
+            if not isinstance(potential_id, str):
+                # Search grandparents for the potential
                 potential_id = None
-                for grandparent in database.get_parent_records(record=parent):
+                for grandparent in grandparents[parent.name]:
                     try:
-                        potential_id = grandparent.todict(full=False, flat=True)['potential_LAMMPS_id']
+                        potential_id = grandparent.metadata()['potential_LAMMPS_id']
                     except:
                         pass
                     else:
                         break
                 if potential_id is None:
                     raise ValueError('potential info not found')
-            try:
-                potential_series = potential_df[potential_df.id == potential_id].iloc[0]
-            except:
-                continue
-            
-            potential = potentials[potential_series.name]
-            content_dict[potential.name] = potential.content
+            if potential_id in potential_index:
+                parent_potentials[i] = potentials[potential_index[potential_id]]
+
+    # Cache the elements of each potential
+    potential_elements = {}
+
+    for i, parent in enumerate(parents):
+        parent_series = parent_df.iloc[i]
+        potential = parent_potentials[i]
+        if include_potentials and potential is None:
+            continue
 
         # Determine number of systems in parent to iterate over
-        if parent_series.status == 'not calculated':
-            nparents = 1
-        elif parent_series.status == 'error':
-            nparents = 0
-        elif parent_series.status == 'finished':
+        if 'status' not in parent_series or parent_series.status == 'finished':
             if 'load_options' in keys:
-                nparents = len(parent.content.finds(load_key))
+                nparents = len(parent.model.finds(load_key))
             else:
                 nparents = 1
+        elif parent_series.status == 'not calculated':
+            nparents = 1
+        elif parent_series.status == 'error':
+            nparents = 0
         else:
             raise ValueError('Unsupported record status')
-        
-        #Going through the structure and gathering all the symbol information to be used for defining allSymbols for defect mobility
-        
-        pureStructureElements = []
-        
-        #Getting the information on the elements used in the base structure for the simulation 
-        
-        if isinstance(content_dict[parent.name]['relaxed-crystal']['atomic-system']['atom-type-symbol'],str):
-            pureStructureElements = [content_dict[parent.name]['relaxed-crystal']['atomic-system']['atom-type-symbol']]
+        if nparents == 0:
+            continue
+        content_dict[parent.name] = parent.model
+
+        # Get the elements of the pure structure and the potential
+        pure_elements = aslist(parent.model.find(load_key)['atom-type-symbol'])
+        if include_potentials:
+            content_dict[potential.name] = potential.model
+            if potential.name not in potential_elements:
+                potential_elements[potential.name] = [atom['element'] for atom in
+                    aslist(potential.model['potential-LAMMPS']['atom'])]
+            elements = potential_elements[potential.name]
         else:
-            pureStructureElements = content_dict[parent.name]['relaxed-crystal']['atomic-system']['atom-type-symbol']
-        
-        #Determining the number of elements used in the base element structure
-        
-        numberPureElements = len(pureStructureElements)
-        
-        #Defining all the elements defined in the potential and that could be used in the system
-        
-        potentialElementList = []
-        
-        for elements in content_dict[potential.name]['potential-LAMMPS']['atom']:
-            potentialElementList.append(elements['element'])
-        
-        #Finding the number of elements which can be used
-        
-        totalPotentialElementNum = len(potentialElementList)
-        
-        # Generating the beginning of the allSymbols string which will be added to the input file
-        
-        allSymbolsBase = ''
-        
-        for elements in pureStructureElements:
-            if allSymbolsBase == '':
-                allSymbolsBase = allSymbolsBase + elements 
-            else: 
-                allSymbolsBase = allSymbolsBase +' '+ elements
-        
-        # Generating a list of possible impurity elements for the structure, removing any elements in the pure structure, any elements
-        # not in impurity_list, or any elements in impurity_blacklist
-        
-        potentialImpurityElements = potentialElementList
-        
-        for elements in pureStructureElements:
-            potentialImpurityElements.remove(elements)
-        
+            elements = list(pure_elements)
+
+        # Filter the available impurity elements
+        impurity_elements = [e for e in elements if e not in pure_elements]
         if impurity_list is not None:
-            for elements in potentialImpurityElements:
-                if elements not in impurity_list:
-                    potentialImpurityElements.remove(elements)
-        
+            impurity_elements = [e for e in impurity_elements if e in impurity_list]
         if impurity_blacklist is not None:
-            for elements in potentialImpurityElements:
-                if elements in impurity_blacklist:
-                    potentialImpurityElements.remove(elements)
-        
-        # Determining the number of possible ImpurityElements which can be used, and generating a list of indexes
-        # which can be used to generate all the possible permutations for each defect mobility calculation
-        
-        potentialImpurityNumber = len(potentialImpurityElements)
-        impIndexes = []
-        for number in range(potentialImpurityNumber):
-            impIndexes.append(number)
-        
-        
+            impurity_elements = [e for e in impurity_elements if e not in impurity_blacklist]
+
+        # Select the defects that the potential supports
+        nimpurities = np.maximum(defect_natypes - len(pure_elements), 0)
+        valid = (np.isin(nimpurities, allowable_impurity_numbers)
+                 & (np.maximum(defect_natypes, len(pure_elements)) <= len(elements)))
+        if not np.any(valid):
+            continue
+
+        # Build the allSymbols values for each number of impurities once
+        symbols_base = ' '.join(pure_elements)
+        all_symbols = {}
+        for n in np.unique(nimpurities[valid]):
+            all_symbols[n] = [' '.join((symbols_base,) + perm) if n > 0 else symbols_base
+                              for perm in permutations(impurity_elements, int(n))]
+        counts = np.array([len(all_symbols[n]) for n in nimpurities[valid]])
+        ncombos = counts.sum()
+        if ncombos == 0:
+            continue
+
+        # Defect columns are the same for each parent system
+        defect_columns = {
+            mobility_file_key: [f'{name}.json' for name in np.repeat(defect_names[valid], counts)],
+            mobility_content_key: [f'record {name}' for name in np.repeat(defect_names[valid], counts)],
+            mobility_family_key: list(np.repeat(defect_families[valid], counts)),
+            'allSymbols': list(chain.from_iterable(all_symbols[n] for n in nimpurities[valid])),
+        }
+
+        # Add blocks for each parent system
         for j in range(nparents):
-            
-            # Iterating over all the possible point defects for the structure
-            
-            for k, defectmobility_series in defectmobility_df.iterrows():
-                
-                defectmobility = defectmobilities[k]
-                
-                numberTotalElements = numberPureElements
-                
-                # identifying the number of impurities used in the defect calculation
-                
-                for tag in content_dict[defectmobility.name]['point-defect-mobility']:
-                    if tag[-22:] == 'calculation-parameters':
-                        for tag2 in content_dict[defectmobility.name]['point-defect-mobility'][tag]:
-                            if isinstance(tag2,str):
-                                if tag2 == 'atype':
-                                    if content_dict[defectmobility.name]['point-defect-mobility'][tag][tag2] > numberTotalElements:
-                                        numberTotalElements = content_dict[defectmobility.name]['point-defect-mobility'][tag][tag2]
-
-                            else:
-                                for tag3 in tag2:
-                                    if tag3 == 'atype':
-                                        if tag2[tag3] > numberTotalElements:
-                                            numberTotalElements = tag2[tag3]
-                
-                numberImpurities = numberTotalElements - numberPureElements
-                
-                #Going through the process of actually generating the possible element combinations used for defect_mobility simulations
-                
-                if totalPotentialElementNum >= numberTotalElements: #Determining if the potential has enough elements to run the selected
-                                                                    #defect mobility simulation
-                    if numberImpurities in allowable_impurity_numbers: #Determining if the number if impurities is on the list of allowed impurities
-                        if numberImpurities > 0: #Determining if there are actually any impurities in the simulation - if yes, the script generates all possible permutations of the allowed symbols for the simulation, otherwise it moves onto giving the pure simulation 
-                            indexPerm = permutations(impIndexes, numberImpurities) #Generates all possible permutations of the impurityindexes, which are used to call the actual impurities, given the selection of the correct number of impurities
-                            for perm in indexPerm:
-                                allSymbols = allSymbolsBase
-                                for indexThing in perm:
-                                    allSymbols = allSymbols +' '+ potentialImpurityElements[indexThing]
-                                for key in keys:
-                                    if key == 'potential_file':
-                                        inputs['potential_file'].append(f'{potential.name}.json')
-                                    elif key == 'potential_content':
-                                        inputs['potential_content'].append(f'record {potential.name}')
-                                    elif key == 'potential_dir':
-                                        inputs['potential_dir'].append(potential.name)
-                                    elif key == 'potential_dir_content':
-                                        inputs['potential_dir_content'].append(f'tar {potential.name}')
-                                    elif key == 'load_file':
-                                        inputs['load_file'].append(f'{parent.name}.json')
-                                    elif key == 'load_content':
-                                        inputs['load_content'].append(f'record {parent.name}')
-                                    elif key == 'load_style':
-                                        inputs['load_style'].append('system_model')
-                                    elif key == 'load_options':
-                                        if j == 0:
-                                            inputs['load_options'].append(f'key {load_key}')
-                                        else:
-                                            inputs['load_options'].append(f'key {load_key} index {j}')
-                                    elif key == 'family':
-                                        inputs['family'].append(parent_series.family)
-                                    elif key == 'elasticconstants_file':
-                                        inputs['elasticconstants_file'].append(f'{parent.name}.json')
-                                    elif key == 'elasticconstants_content':
-                                        inputs['elasticconstants_content'].append(f'record {parent.name}')
-                                    elif key == 'allSymbols':
-                                        inputs['allSymbols'].append(allSymbols)
-                                    elif key == mobility_file_key:
-                                        inputs[key].append(f'{defectmobility.name}.json')
-                                    elif key == mobility_content_key:
-                                        inputs[key].append(f'record {defectmobility.name}')
-                                    elif key == mobility_family_key:
-                                        inputs[key].append(defectmobility_series.family)
-                                    else:
-                                        inputs[key].append('')
-                                
-                        else:
-                            allSymbols = allSymbolsBase
-                            for key in keys:
-                                if key == 'potential_file':
-                                    inputs['potential_file'].append(f'{potential.name}.json')
-                                elif key == 'potential_content':
-                                    inputs['potential_content'].append(f'record {potential.name}')
-                                elif key == 'potential_dir':
-                                    inputs['potential_dir'].append(potential.name)
-                                elif key == 'potential_dir_content':
-                                    inputs['potential_dir_content'].append(f'tar {potential.name}')
-                                elif key == 'load_file':
-                                    inputs['load_file'].append(f'{parent.name}.json')
-                                elif key == 'load_content':
-                                    inputs['load_content'].append(f'record {parent.name}')
-                                elif key == 'load_style':
-                                    inputs['load_style'].append('system_model')
-                                elif key == 'load_options':
-                                    if j == 0:
-                                        inputs['load_options'].append(f'key {load_key}')
-                                    else:
-                                        inputs['load_options'].append(f'key {load_key} index {j}')
-                                elif key == 'family':
-                                    inputs['family'].append(parent_series.family)
-                                elif key == 'elasticconstants_file':
-                                    inputs['elasticconstants_file'].append(f'{parent.name}.json')
-                                elif key == 'elasticconstants_content':
-                                    inputs['elasticconstants_content'].append(f'record {parent.name}')
-                                elif key == 'allSymbols':
-                                    inputs['allSymbols'].append(allSymbols)
-                                elif key == mobility_file_key:
-                                    inputs[key].append(f'{defectmobility.name}.json')
-                                elif key == mobility_content_key:
-                                    inputs[key].append(f'record {defectmobility.name}')
-                                elif key == mobility_family_key:
-                                    inputs[key].append(defectmobility_series.family)
-                                else:
-                                    inputs[key].append('')
-                                    
-    return inputs, content_dict
\ No newline at end of file
+            if j == 0:
+                load_options = f'key {load_key}'
+            else:
+                load_options = f'key {load_key} index {j}'
+
+            for key in keys:
+                if key in defect_columns:
+                    blocks[key].append(defect_columns[key])
+                    continue
+
+                if include_potentials and key == 'potential_file':
+                    val = f'{potential.name}.json'
+                elif include_potentials and key == 'potential_content':
+                    val = f'record {potential.name}'
+                elif include_potentials and key == 'potential_dir':
+                    val = potential.name
+                elif include_potentials and key == 'potential_dir_content':
+                    val = f'tar {potential.name}'
+                elif key == 'load_file':
+                    val = f'{parent.name}.json'
+                elif key == 'load_content':
+                    val = f'record {parent.name}'
+                elif key == 'load_style':
+                    val = 'system_model'
+                elif key == 'load_options':
+                    val = load_options
+                elif key == 'family':
+                    val = parent_series.family
+                elif key == 'elasticconstants_file':
+                    val = f'{parent.name}.json'
+                elif key == 'elasticconstants_content':
+                    val = f'record {parent.name}'
+                else:
+                    val = ''
+                blocks[key].append(repeat(val, ncombos))
+
+    # Stream the column blocks rather than building the full lists here
+    inputs = {}
+    for key in keys:
+        inputs[key] = chain.from_iterable(blocks[key])
+
+    return inputs, content_dict
@@ -3,16 +3,25 @@
 # https://github.com/usnistgov/yabadaba
 from yabadaba.tools import aslist, iaslist, screen_input
 
-# https://github.com/usnistgov/atomman
-from atomman.tools import filltemplate
-
 # local imports
 from .dynamic_import import dynamic_import
 from .read_calc_file import read_calc_file
 from .dict_insert import dict_insert
 from .num_deriv_3_point import num_deriv_3_point
+from .record_digest import record_digest
+from .compiled_template import CompiledTemplate, compile_template, filltemplate
+from .reference_cache import (ReferenceCache, load_reference_cache,
+                              reference_key, system_digest)
+from .lammps_capabilities import checkversion, lammps_capabilities
+from .time_correlation import (autocorrelation, mean_squared_displacement,
+                               block_split, block_stderr, read_dump_series)
 
 __all__ = ['aslist', 'iaslist', 'filltemplate', 'screen_input',
            'dynamic_import', 'dict_insert', 'read_calc_file',
-           'num_deriv_3_point']
+           'num_deriv_3_point', 'record_digest', 'CompiledTemplate',
+           'compile_template', 'ReferenceCache', 'load_reference_cache',
+           'reference_key', 'system_digest', 'checkversion',
+           'lammps_capabilities', 'autocorrelation',
+           'mean_squared_displacement', 'block_split', 'block_stderr',
+           'read_dump_series']
 __all__.sort()
@@ -0,0 +1,165 @@
+# coding: utf-8
+
+# Standard Python libraries
+from functools import lru_cache
+import io
+from typing import Union
+
+__all__ = ['CompiledTemplate', 'compile_template', 'filltemplate']
+
+class CompiledTemplate():
+    """
+    A template that has been pre-split into literal text and delimited
+    variable slots so that it can be filled in repeatedly with a single join.
+    """
+
+    def __init__(self,
+                 template: str,
+                 s_delimiter: str = '<',
+                 e_delimiter: str = '>'):
+        """
+        Parses a template.
+
+        Parameters
+        ----------
+        template : str
+            The template content.
+        s_delimiter : str, optional
+            The leading delimiter for identifying the template variable terms.
+            Default value is '<'.
+        e_delimiter : str, optional
+            The trailing delimiter for identifying the template variable terms.
+            Default value is '>'.
+
+        Raises
+        ------
+        ValueError
+            If parsing of s_delimiter, e_delimiter pairs fails.
+        """
+        segments = []
+        keys = []
+        pos = 0
+        while True:
+            s = template.find(s_delimiter, pos)
+            e = template.find(e_delimiter, pos)
+
+            if s == -1 and e == -1:
+                segments.append(template[pos:])
+                break
+            elif s == -1:
+                raise ValueError('ending delimiter found without starting delimiter')
+            elif e == -1:
+                raise ValueError('starting delimiter found without ending delimiter')
+            elif e <= s + len(s_delimiter):
+                raise ValueError('ending delimiter found before starting delimiter')
+
+            segments.append(template[pos:s])
+            keys.append(template[s + len(s_delimiter):e])
+            segments.append(None)
+            pos = e + len(e_delimiter)
+
+        self.__segments = segments
+        self.__keys = keys
+        self.__slots = [i for i, segment in enumerate(segments) if segment is None]
+
+    @property
+    def keys(self) -> list:
+        """list: The variable names of the template slots in order."""
+        return list(self.__keys)
+
+    def render(self, variable: dict) -> str:
+        """
+        Fills in the template.
+
+        Parameters
+        ----------
+        variable : dict
+            Dictionary with keys defining the delimited template variable terms,
+            and values the values to replace the variable terms with.
+
+        Returns
+        -------
+        str
+            The filled in template.
+
+        Raises
+        ------
+        KeyError
+            If delimited term found in template that has no value in variable.
+        """
+        segments = self.__segments[:]
+        for i, name in zip(self.__slots, self.__keys):
+            try:
+                segments[i] = str(variable[name])
+            except KeyError as err:
+                raise KeyError(name + ' not found in variable dictionary') from err
+        return ''.join(segments)
+
+@lru_cache(maxsize=256)
+def compile_template(template: str,
+                     s_delimiter: str = '<',
+                     e_delimiter: str = '>') -> CompiledTemplate:
+    """
+    Returns a CompiledTemplate for the template content.  Results are cached
+    so that each distinct template is only parsed once per process.
+
+    Parameters
+    ----------
+    template : str
+        The template content.
+    s_delimiter : str, optional
+        The leading delimiter for identifying the template variable terms.
+        Default value is '<'.
+    e_delimiter : str, optional
+        The trailing delimiter for identifying the template variable terms.
+        Default value is '>'.
+
+    Returns
+    -------
+    CompiledTemplate
+        The parsed template.
+    """
+    return CompiledTemplate(template, s_delimiter, e_delimiter)
+
+def filltemplate(template: Union[str, io.IOBase],
+                 variable: dict,
+                 s_delimiter: str,
+                 e_delimiter: str) -> str:
+    """
+    Takes a template and fills in values for delimited template variables.
+    Drop-in replacement for atomman.tools.filltemplate that uses cached
+    compiled templates.  Unlike the atomman version, the template is only
+    scanned once, so delimiters appearing in the values are not interpreted.
+
+    Parameters
+    ----------
+    template : string or file-like object
+        The template file or file content to fill in.
+    variable : dict
+        Dictionary with keys defining the delimited template variable terms,
+        and values the values to replace the variable terms with.
+    s_delimiter : str
+        The leading delimiter for identifying the template variable terms.
+    e_delimiter : str
+        The trailing delimiter for identifying the template variable terms.
+
+    Returns
+    -------
+    str
+        The template with all delimited variable terms replaced with their
+        corresponding defined values from variable.
+
+    Raises
+    ------
+    KeyError
+        If delimited term found in template that has no value in variable.
+    ValueError
+        If parsing of s_delimiter, e_delimiter pairs fails.
+    """
+    # Convert to string if a file-like object
+    try:
+        template = template.read()
+    except AttributeError:
+        pass
+
+    return compile_template(template, s_delimiter, e_delimiter).render(variable)
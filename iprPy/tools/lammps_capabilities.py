@@ -0,0 +1,239 @@
+# coding: utf-8
+
+# Standard Python libraries
+import datetime
+import json
+import os
+from pathlib import Path
+import re
+import shlex
+import shutil
+import subprocess
+import tempfile
+import threading
+from typing import Optional
+
+# https://github.com/usnistgov/atomman
+import atomman.lammps as lmp
+
+# Process-level cache of capabilities by executable key
+__cache = {}
+__lock = threading.Lock()
+
+def capabilities_file() -> Path:
+    """
+    Returns the path to the disk-level cache of LAMMPS capabilities.  This is
+    taken from the IPRPY_LAMMPS_CACHE environment variable if set, otherwise
+    it is lammps_capabilities.json in the iprPy settings directory.
+    """
+    if 'IPRPY_LAMMPS_CACHE' in os.environ:
+        return Path(os.environ['IPRPY_LAMMPS_CACHE'])
+    from .. import settings
+    return Path(settings.directory, 'lammps_capabilities.json')
+
+def executable_key(lammps_command: str) -> Optional[str]:
+    """
+    Builds the cache key for a LAMMPS command from the full command and the
+    resolved path, modification time and size of its LAMMPS executable.
+    Replacing or rebuilding the executable changes the key.  For commands
+    that start with a launcher, such as "mpirun -np 4 lmp", the LAMMPS
+    executable is the first program named like lmp or lammps.
+
+    Parameters
+    ----------
+    lammps_command : str
+        A LAMMPS executable, optionally with command line arguments.
+
+    Returns
+    -------
+    str or None
+        The key, or None if the executable cannot be found.
+    """
+    try:
+        terms = shlex.split(lammps_command)
+        exe = terms[0]
+    except (ValueError, IndexError):
+        return None
+    for term in terms:
+        if (not term.startswith('-')
+            and re.match(r'(lmp|lammps)', Path(term).name, flags=re.IGNORECASE)
+            and shutil.which(term) is not None):
+            exe = term
+            break
+    path = shutil.which(exe)
+    if path is None:
+        return None
+    path = os.path.realpath(path)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return f'{lammps_command}|{path}|{stat.st_mtime_ns}|{stat.st_size}'
+
+def parse_help(output: str) -> dict:
+    """
+    Parses the output of running LAMMPS with the -h option.
+
+    Parameters
+    ----------
+    output : str
+        The text printed by LAMMPS.
+
+    Returns
+    -------
+    dict
+        Contains 'version', the version str (None if not found), 'packages',
+        a list of the installed packages, and 'styles', a dict of the lists of
+        available styles by category, e.g. 'pair', 'fix', 'compute'.
+    """
+    results = {'version': None, 'packages': [], 'styles': {}}
+
+    # Keep the full version str, e.g. '2 Aug 2023 - Update 1', as atomman does
+    match = re.search(r'Simulator\s*-\s*(\d{1,2} \w{3} \d{4}.*)$', output,
+                      flags=re.MULTILINE)
+    if match is not None:
+        results['version'] = match[1].strip()
+
+    section = None
+    for line in output.splitlines():
+        stripped = line.strip()
+        if stripped.startswith('Installed packages'):
+            section = 'packages'
+            continue
+        match = re.match(r'\* ([\w/ ]+?) styles', stripped)
+        if match is not None:
+            section = match[1].lower().replace(' ', '_')
+            results['styles'][section] = []
+            continue
+        if stripped == '' or stripped.startswith('*') or stripped.startswith('List of'):
+            if section == 'packages' and stripped == '' and len(results['packages']) > 0:
+                section = None
+            continue
+        if section == 'packages':
+            results['packages'].extend(stripped.split())
+        elif section is not None:
+            results['styles'][section].extend(stripped.split())
+    return results
+
+def detect_capabilities(lammps_command: str) -> dict:
+    """
+    Runs LAMMPS to determine its version, packages and styles.
+
+    Parameters
+    ----------
+    lammps_command : str
+        A LAMMPS executable, optionally with command line arguments.
+
+    Returns
+    -------
+    dict
+        Contains 'version', 'date' (as an ISO str), 'packages' and 'styles'.
+    """
+    try:
+        output = subprocess.run(shlex.split(lammps_command) + ['-h'],
+                                capture_output=True, text=True, timeout=120,
+                                check=False, stdin=subprocess.DEVNULL).stdout
+    except (OSError, subprocess.SubprocessError):
+        output = ''
+    results = parse_help(output)
+
+    try:
+        date = datetime.datetime.strptime(results['version'].split('-')[0].strip(),
+                                          '%d %b %Y').date()
+    except (TypeError, ValueError):
+        # Fall back on running an empty script
+        version_info = lmp.checkversion(lammps_command)
+        results['version'] = version_info['version']
+        date = version_info['date']
+    results['date'] = date.isoformat()
+
+    return results
+
+def lammps_capabilities(lammps_command: str,
+                        refresh: bool = False) -> dict:
+    """
+    Returns the version, date, packages and styles of a LAMMPS executable.
+    Values are cached both for the current process and on disk, and are
+    keyed on the executable's resolved path, modification time and size so
+    that they are redetected automatically when the executable changes.
+
+    Parameters
+    ----------
+    lammps_command : str
+        A LAMMPS executable, optionally with command line arguments.
+    refresh : bool, optional
+        If True, the cached values are ignored and redetected.  Default value
+        is False.
+
+    Returns
+    -------
+    dict
+        Contains 'version', the LAMMPS version str, 'date', the corresponding
+        datetime.date, 'packages', the list of installed packages, and
+        'styles', the lists of available styles by category.
+    """
+    key = executable_key(lammps_command)
+    if key is None:
+        key = lammps_command
+        ondisk = False
+    else:
+        ondisk = True
+
+    with __lock:
+        if not refresh and key in __cache:
+            return __cache[key]
+
+    # Check the disk cache
+    results = None
+    cachefile = capabilities_file()
+    stored = {}
+    if ondisk:
+        try:
+            with open(cachefile, encoding='UTF-8') as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            stored = {}
+        if not refresh:
+            results = stored.get(key, None)
+
+    # Detect and save to the disk cache
+    if results is None:
+        results = detect_capabilities(lammps_command)
+        if ondisk:
+            # Drop stale entries for the same command
+            stored = {k: v for k, v in stored.items()
+                      if k.split('|')[0] != lammps_command}
+            stored[key] = results
+            try:
+                cachefile.parent.mkdir(parents=True, exist_ok=True)
+                fd, tmpname = tempfile.mkstemp(dir=cachefile.parent,
+                                               prefix='.lammps_capabilities')
+                with os.fdopen(fd, 'w', encoding='UTF-8') as f:
+                    json.dump(stored, f, indent=1)
+                os.replace(tmpname, cachefile)
+            except OSError:
+                pass
+
+    results = dict(results)
+    results['date'] = datetime.date.fromisoformat(str(results['date']))
+    with __lock:
+        __cache[key] = results
+    return results
+
+def checkversion(lammps_command: str) -> dict:
+    """
+    Cached drop-in replacement for atomman.lammps.checkversion.
+
+    Parameters
+    ----------
+    lammps_command : str
+        A LAMMPS executable.
+
+    Returns
+    -------
+    dict
+        Dictionary containing 'version', the str LAMMPS version, and
+        'date', the corresponding datetime.date for the LAMMPS version.
+    """
+    results = lammps_capabilities(lammps_command)
+    return {'version': results['version'], 'date': results['date']}
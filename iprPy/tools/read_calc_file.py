@@ -1,6 +1,7 @@
 # coding: utf-8
 
 # Standard Python libraries
+from functools import lru_cache
 from pathlib import Path
 from importlib import resources
 
@@ -8,7 +9,8 @@ def read_calc_file(parent_module: str,
                    filename: str) -> str:
     """
     Loads a file from the working directory if it is there, or from within
-    iprPy if not.  Allows for quick modifications.
+    iprPy if not.  Allows for quick modifications.  Content loaded from
+    within iprPy is cached so each file is only read once per process.
     
     Parameters
     ----------
@@ -20,7 +22,23 @@ def read_calc_file(parent_module: str,
     if Path(filename).is_file():
         with open(filename, encoding='UTF-8') as f:
             return f.read()
-    elif hasattr(resources, 'files'):
+    else:
+        return read_resource_file(parent_module, filename)
+
+@lru_cache(maxsize=None)
+def read_resource_file(parent_module: str,
+                       filename: str) -> str:
+    """
+    Loads and caches a file from within iprPy.
+    
+    Parameters
+    ----------
+    parent_module : str
+        The name of the parent module where the file resource should be located.
+    filename : str
+        The name of the file to read/get content for.
+    """
+    if hasattr(resources, 'files'):
         return resources.files(parent_module).joinpath(filename).read_text(encoding='UTF-8')
     else:
         return resources.read_text(parent_module, filename, encoding='UTF-8')
@@ -0,0 +1,41 @@
+# coding: utf-8
+
+# Standard Python libraries
+import hashlib
+from typing import Union
+
+# https://github.com/usnistgov/DataModelDict
+from DataModelDict import DataModelDict as DM
+
+def record_digest(record=None,
+                  model: Union[DM, dict, str, None] = None) -> str:
+    """
+    Computes a content digest for a record.  Records with identical model
+    contents have identical digests, allowing for content comparisons between
+    databases without comparing the full serialized records.
+    
+    Parameters
+    ----------
+    record : Record, optional
+        The record to compute the digest for.  Cannot be given with model.
+    model : DataModelDict, dict or str, optional
+        The record model contents to compute the digest for.  Cannot be given
+        with record.
+
+    Returns
+    -------
+    str
+        The hex SHA-256 digest of the record's JSON content.
+    """
+    if record is not None:
+        if model is not None:
+            raise ValueError('record and model cannot both be given')
+        model = record.model
+    elif model is None:
+        raise ValueError('record or model must be given')
+    
+    if not isinstance(model, DM):
+        model = DM(model)
+    content = model.json(ensure_ascii=False)
+
+    return hashlib.sha256(content.encode('UTF-8')).hexdigest()
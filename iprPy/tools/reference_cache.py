@@ -0,0 +1,257 @@
+# coding: utf-8
+
+# Standard Python libraries
+from contextlib import contextmanager
+import hashlib
+import json
+import os
+from pathlib import Path
+import shutil
+import tempfile
+import threading
+import time
+from typing import Optional, Union
+
+# http://www.numpy.org/
+import numpy as np
+
+def system_digest(system,
+                  canonical: bool = False) -> str:
+    """
+    Computes a content digest for an atomic system.
+
+    Parameters
+    ----------
+    system : atomman.System
+        The system to compute the digest for.
+    canonical : bool, optional
+        If False (default), the digest is of the exact box, atom types and
+        positions.  If True, the digest is invariant to rigid translations of
+        fully periodic systems, i.e. ones that differ only by where the
+        crystal's origin is placed.  The translation is taken relative to the
+        first atom, so the digest is only invariant for systems that list the
+        atoms in the same order.  Only use canonical digests to key values
+        that do not depend on the atom positions, not files.
+
+    Returns
+    -------
+    str
+        The hex SHA-256 digest.
+    """
+    vects = np.asarray(system.box.vects, dtype=float)
+    atype = np.asarray(system.atoms.atype, dtype=int)
+    pos = np.asarray(system.atoms.pos, dtype=float)
+
+    if canonical:
+        # Fractional coordinates relative to the first atom, wrapped into the box
+        frac = np.linalg.solve(vects.T, (pos - pos[0]).T).T
+        frac = np.round(frac % 1.0, 6) % 1.0
+        order = np.lexsort((frac[:, 2], frac[:, 1], frac[:, 0], atype))
+        atype = atype[order]
+        pos = frac[order]
+        vects = np.round(vects, 8)
+
+    h = hashlib.sha256()
+    h.update(json.dumps([list(system.symbols), [bool(p) for p in system.pbc]]).encode('UTF-8'))
+    h.update(np.ascontiguousarray(vects).tobytes())
+    h.update(np.ascontiguousarray(atype).tobytes())
+    h.update(np.ascontiguousarray(pos).tobytes())
+    return h.hexdigest()
+
+def reference_key(**terms) -> str:
+    """
+    Builds a reference cache key from the terms that determine a reference
+    calculation, such as the LAMMPS command and version, the potential key, a
+    system digest and the minimizer settings.
+
+    Parameters
+    ----------
+    **terms : any
+        JSON-serializable values.  numpy arrays and scalars are converted.
+
+    Returns
+    -------
+    str
+        The hex SHA-256 digest of the sorted terms.
+    """
+    def default(value):
+        if isinstance(value, np.ndarray):
+            return value.tolist()
+        elif isinstance(value, np.generic):
+            return value.item()
+        return str(value)
+
+    content = json.dumps(terms, sort_keys=True, default=default)
+    return hashlib.sha256(content.encode('UTF-8')).hexdigest()
+
+class ReferenceCache():
+    """
+    A content-addressed store of reference calculation results shared by the
+    calculations in a run directory.  Each entry is a folder named by its key
+    holding a values.json file and any associated files, such as relaxed dump
+    files.  Entries are written atomically, and lock() allows for runners to
+    wait on a reference being computed by another runner rather than
+    repeating it.
+    """
+
+    def __init__(self, directory: Union[str, Path]):
+        """
+        Class initializer
+
+        Parameters
+        ----------
+        directory : str or Path
+            The cache directory.  Will be created if needed.
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def get(self,
+            key: str,
+            files: Optional[dict] = None) -> Optional[dict]:
+        """
+        Retrieves a cached reference.
+
+        Parameters
+        ----------
+        key : str
+            The reference key.
+        files : dict, optional
+            Maps names of files stored with the entry to the paths to copy
+            them to.
+
+        Returns
+        -------
+        dict or None
+            The stored values, or None if the key is not in the cache.
+        """
+        entry = Path(self.directory, key)
+        try:
+            with open(Path(entry, 'values.json'), encoding='UTF-8') as f:
+                values = json.load(f)
+        except FileNotFoundError:
+            return None
+
+        if files is not None:
+            for name, dest in files.items():
+                shutil.copyfile(Path(entry, name), dest)
+        return values
+
+    def put(self,
+            key: str,
+            values: dict,
+            files: Optional[dict] = None):
+        """
+        Adds a reference to the cache.  If the key already exists, the
+        existing entry is kept.
+
+        Parameters
+        ----------
+        key : str
+            The reference key.
+        values : dict
+            JSON-serializable values.  numpy arrays are converted to lists.
+        files : dict, optional
+            Maps names to store files as to the paths of the files.
+        """
+        entry = Path(self.directory, key)
+        if entry.exists():
+            return
+
+        tmp = Path(tempfile.mkdtemp(prefix=f'.{key}-', dir=self.directory))
+        try:
+            with open(Path(tmp, 'values.json'), 'w', encoding='UTF-8') as f:
+                json.dump({k: np.asarray(v).tolist() if isinstance(v, np.ndarray) else v
+                           for k, v in values.items()}, f)
+            if files is not None:
+                for name, src in files.items():
+                    shutil.copyfile(src, Path(tmp, name))
+            os.rename(tmp, entry)
+        except OSError:
+            # Another runner added the entry first
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    @contextmanager
+    def lock(self,
+             key: str,
+             timeout: float = 3600.0,
+             poll: float = 5.0):
+        """
+        Context manager that holds an exclusive lock on a key so that only
+        one runner computes a missing reference.  The holder refreshes the
+        lock every quarter of timeout while it works, so locks not refreshed
+        within timeout are assumed to belong to dead runners and are taken
+        over.
+
+        Parameters
+        ----------
+        key : str
+            The reference key.
+        timeout : float, optional
+            Seconds without a refresh after which an existing lock is
+            considered stale.  Default value is 3600.
+        poll : float, optional
+            Seconds between checks of a held lock.  Default value is 5.
+        """
+        lockfile = Path(self.directory, f'{key}.lock')
+        owned = False
+        while True:
+            try:
+                fd = os.open(lockfile, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                os.close(fd)
+                owned = True
+                break
+            except FileExistsError:
+                try:
+                    if time.time() - lockfile.stat().st_mtime > timeout:
+                        lockfile.unlink()
+                        continue
+                except FileNotFoundError:
+                    continue
+                if Path(self.directory, key).exists():
+                    # Entry finished while waiting
+                    break
+                time.sleep(poll)
+
+        # Keep the lock fresh while the reference is computed
+        stop = threading.Event()
+        if owned:
+            def refresh():
+                while not stop.wait(timeout / 4):
+                    try:
+                        os.utime(lockfile)
+                    except FileNotFoundError:
+                        break
+            threading.Thread(target=refresh, daemon=True).start()
+        try:
+            yield
+        finally:
+            stop.set()
+            if owned:
+                try:
+                    lockfile.unlink()
+                except FileNotFoundError:
+                    pass
+
+def load_reference_cache(directory: Union[str, Path, None] = None
+                         ) -> Optional[ReferenceCache]:
+    """
+    Returns the reference cache for the current run, if any.
+
+    Parameters
+    ----------
+    directory : str or Path, optional
+        The cache directory, which runners pass to the calculations that they
+        run.  If None (default), the IPRPY_REFERENCE_CACHE environment
+        variable is used if set.
+
+    Returns
+    -------
+    ReferenceCache or None
+        The cache, or None if no directory is given or it is empty.
+    """
+    if directory is None:
+        directory = os.environ.get('IPRPY_REFERENCE_CACHE', '')
+    if str(directory) == '':
+        return None
+    return ReferenceCache(directory)
@@ -0,0 +1,183 @@
+# coding: utf-8
+
+# Standard Python libraries
+from typing import Optional, Tuple
+
+# http://www.numpy.org/
+import numpy as np
+import numpy.typing as npt
+
+def autocorrelation(values: npt.ArrayLike,
+                    nlags: Optional[int] = None) -> np.ndarray:
+    """
+    Computes the autocorrelation of a time series averaged over all available
+    time origins using fast Fourier transforms.  The value for lag m is the
+    mean of values[t] * values[t+m] over all t, i.e. each lag is normalized by
+    the number of origins that contribute to it.
+
+    Parameters
+    ----------
+    values : array-like object
+        The time series with time along the first axis.  Any trailing axes,
+        such as atoms and Cartesian components, are correlated independently.
+    nlags : int, optional
+        The number of lags (including lag 0) to return.  Default value is the
+        full series length.
+
+    Returns
+    -------
+    numpy.ndarray
+        The autocorrelation values with shape (nlags,) + values.shape[1:].
+    """
+    values = np.asarray(values, dtype=float)
+    nframes = values.shape[0]
+    if nlags is None:
+        nlags = nframes
+    if nlags < 1 or nlags > nframes:
+        raise ValueError('nlags must be between 1 and the number of frames')
+
+    # Zero pad to avoid circular correlation
+    nfft = 1 << int(2 * nframes - 1).bit_length()
+    transform = np.fft.rfft(values, n=nfft, axis=0)
+    corr = np.fft.irfft(transform * transform.conj(), n=nfft, axis=0)[:nlags]
+
+    counts = np.arange(nframes, nframes - nlags, -1, dtype=float)
+    return corr / counts.reshape((nlags,) + (1,) * (values.ndim - 1))
+
+def mean_squared_displacement(positions: npt.ArrayLike,
+                              nlags: Optional[int] = None) -> np.ndarray:
+    """
+    Computes the mean squared displacement of unwrapped positions averaged over
+    all available time origins using the FFT algorithm of Kneller et al.,
+    Comput. Phys. Commun. 91 (1995) 191.
+
+    Parameters
+    ----------
+    positions : array-like object
+        The unwrapped positions with time along the first axis.  Any trailing
+        axes, such as atoms and Cartesian components, are handled independently.
+    nlags : int, optional
+        The number of lags (including lag 0) to return.  Default value is the
+        full series length.
+
+    Returns
+    -------
+    numpy.ndarray
+        The squared displacement values with shape (nlags,) + positions.shape[1:].
+    """
+    positions = np.asarray(positions, dtype=float)
+    nframes = positions.shape[0]
+    if nlags is None:
+        nlags = nframes
+    if nlags < 1 or nlags > nframes:
+        raise ValueError('nlags must be between 1 and the number of frames')
+
+    # S2: mean of x(t) * x(t+m) over origins
+    s2 = autocorrelation(positions, nlags)
+
+    # S1: mean of x(t)^2 + x(t+m)^2 over origins, built recursively
+    sq = positions ** 2
+    s1 = np.empty_like(s2)
+    total = 2 * sq.sum(axis=0)
+    for m in range(nlags):
+        if m > 0:
+            total = total - sq[m - 1] - sq[nframes - m]
+        s1[m] = total / (nframes - m)
+
+    return s1 - 2 * s2
+
+def block_split(nframes: int,
+                nblocks: int,
+                minframes: int = 1) -> list:
+    """
+    Divides a time series into contiguous, equal length blocks for block
+    averaging.  Any frames left over are dropped from the end of the series.
+
+    Parameters
+    ----------
+    nframes : int
+        The number of frames in the time series.
+    nblocks : int
+        The number of blocks to divide the series into.
+    minframes : int, optional
+        The minimum number of frames each block must have.
+
+    Returns
+    -------
+    list of slice
+        The slices of the series for each block.
+    """
+    if nblocks < 1:
+        raise ValueError('nblocks must be at least 1')
+    blocksize = nframes // nblocks
+    if blocksize < minframes:
+        raise ValueError(f'{nframes} frames is too few for {nblocks} blocks of at least {minframes} frames')
+    return [slice(i * blocksize, (i + 1) * blocksize)
+            for i in range(nblocks)]
+
+def block_stderr(values: npt.ArrayLike) -> Tuple[float, float]:
+    """
+    Computes the mean and standard error of values measured from independent
+    blocks of a time series.
+
+    Parameters
+    ----------
+    values : array-like object
+        The value measured from each block.
+
+    Returns
+    -------
+    mean : float
+        The mean of the block values.
+    stderr : float
+        The standard error of the mean.  Zero if only one block is given.
+    """
+    values = np.asarray(values, dtype=float)
+    if len(values) < 2:
+        return float(values.mean()), 0.0
+    return float(values.mean()), float(values.std(ddof=1) / len(values) ** 0.5)
+
+def read_dump_series(dumpfile: str,
+                     columns: list) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Reads per-atom values from all frames of a LAMMPS text dump file.  Atoms
+    are sorted by id in each frame so that the dump does not need to be
+    written sorted.
+
+    Parameters
+    ----------
+    dumpfile : str
+        The LAMMPS dump file.  Must include the id column.
+    columns : list
+        The names of the per-atom columns to read, e.g. ['vx', 'vy', 'vz'].
+
+    Returns
+    -------
+    timesteps : numpy.ndarray
+        The timestep of each frame.
+    values : numpy.ndarray
+        The values with shape (nframes, natoms, len(columns)).
+    """
+    timesteps = []
+    frames = []
+    with open(dumpfile, encoding='UTF-8') as f:
+        while True:
+            line = f.readline()
+            if line == '':
+                break
+            if line.startswith('ITEM: TIMESTEP'):
+                timestep = int(f.readline().split()[0])
+            elif line.startswith('ITEM: NUMBER OF ATOMS'):
+                natoms = int(f.readline())
+            elif line.startswith('ITEM: ATOMS'):
+                header = line.split()[2:]
+                indices = [header.index('id')] + [header.index(c) for c in columns]
+                lines = [f.readline() for i in range(natoms)]
+                data = np.loadtxt(lines, ndmin=2, usecols=indices)
+                data = data[np.argsort(data[:, 0])]
+                timesteps.append(timestep)
+                frames.append(data[:, 1:])
+
+    if len(frames) == 0:
+        raise ValueError(f'no frames found in {dumpfile}')
+    return np.array(timesteps), np.array(frames)
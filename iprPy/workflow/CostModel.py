@@ -0,0 +1,459 @@
+# coding: utf-8
+
+# Standard Python libraries
+from math import ceil
+from pathlib import Path
+import re
+from typing import Optional, Union
+
+# https://numpy.org/
+import numpy as np
+
+# https://pandas.pydata.org/
+import pandas as pd
+
+# Matches the LAMMPS log summary lines for each run/minimize command
+loop_re = re.compile(r'Loop time of ([0-9.eE+-]+) on (\d+) procs for (\d+) steps with (\d+) atoms')
+wall_re = re.compile(r'Total wall time: (\d+):(\d+):(\d+)')
+
+class CostModel():
+    """
+    Simple performance model for LAMMPS-based calculations.  Measured run
+    times are collected from the LAMMPS logs stored in the archives of
+    finished calculations and expressed as a throughput cost in core-seconds
+    per atom per MD/minimization step for each calculation style and
+    potential pair_style.  The model is used to predict the run time of new
+    calculations and to select system sizes and cores per job.
+    """
+
+    sample_columns = ['key', 'calc_style', 'branch', 'pair_style', 'natoms',
+                      'ncores', 'nsteps', 'walltime']
+
+    def __init__(self,
+                 samples: Optional[pd.DataFrame] = None):
+        """
+        Initializes a cost model.
+
+        Parameters
+        ----------
+        samples : pandas.DataFrame, optional
+            Measured samples with columns matching sample_columns.  If not
+            given, the model starts empty.
+        """
+        if samples is None:
+            samples = pd.DataFrame(columns=self.sample_columns)
+        self.samples = samples
+
+    @property
+    def samples(self) -> pd.DataFrame:
+        """pandas.DataFrame: The measured run times used by the model."""
+        return self.__samples
+
+    @samples.setter
+    def samples(self, val: pd.DataFrame):
+        self.__samples = val.reset_index(drop=True)
+        self.__fit()
+
+    def __fit(self):
+        """Computes the median costs for each style and pair_style."""
+        samples = self.samples
+        valid = (samples.walltime > 0) & (samples.natoms > 0) & (samples.nsteps > 0)
+        samples = samples[valid]
+        cost = (samples.walltime * samples.ncores
+                / (samples.natoms * samples.nsteps)).astype(float)
+
+        self.__costs = cost.groupby([samples.calc_style, samples.pair_style]).median().to_dict()
+        self.__style_costs = cost.groupby(samples.calc_style).median().to_dict()
+        if len(cost) > 0:
+            self.__default_cost = float(cost.median())
+        else:
+            self.__default_cost = None
+
+    @classmethod
+    def from_database(cls,
+                      database,
+                      calc_style: str,
+                      samples_csv: Union[str, Path, None] = None,
+                      refresh: bool = False,
+                      verbose: bool = False,
+                      **kwargs) -> 'CostModel':
+        """
+        Builds a cost model from the finished calculations of a given style
+        in a database.  Run times are parsed from the LAMMPS logs in the
+        calculation archives.
+
+        Parameters
+        ----------
+        database : iprPy.database.IprPyDatabase
+            The database to search for finished calculations.
+        calc_style : str
+            The calculation style to build the model for.
+        samples_csv : str, Path or None, optional
+            If given, previously measured samples are loaded from this csv
+            file and only calculations not already in it are parsed.  The
+            updated samples are saved back to the file.
+        refresh : bool, optional
+            If True, all samples are reparsed even if samples_csv exists.
+            Default value is False.
+        verbose : bool, optional
+            Setting this to True will print informative messages.
+        **kwargs : any, optional
+            Extra query terms to limit which calculation records are used.
+
+        Returns
+        -------
+        CostModel
+            The model built from the measured samples.
+        """
+        # Load cached samples
+        if samples_csv is not None and not refresh and Path(samples_csv).exists():
+            old_df = pd.read_csv(samples_csv)
+        else:
+            old_df = pd.DataFrame(columns=cls.sample_columns)
+
+        records_df = database.get_records_df(f'calculation_{calc_style}',
+                                             status='finished', **kwargs)
+        if len(records_df) > 0:
+            records_df = records_df[~records_df.key.isin(old_df.key)]
+        if verbose:
+            print(len(records_df), 'new finished calculations to parse')
+
+        # Map LAMMPS potential keys to pair_styles
+        pair_styles = {}
+        if len(records_df) > 0 and 'potential_LAMMPS_key' in records_df:
+            database.build_potdb(remote=False)
+            lmppots_df = database.potdb.get_lammps_potentials(return_df=True)[1]
+            pair_styles = dict(zip(lmppots_df.key, lmppots_df.pair_style))
+
+        new_samples = []
+        for series in records_df.itertuples():
+            try:
+                tar = database.get_tar(style=f'calculation_{calc_style}',
+                                       name=series.name)
+            except Exception:
+                continue
+            natoms, ncores, nsteps, walltime = parse_lammps_logs(tar)
+            tar.close()
+            if walltime == 0:
+                continue
+            new_samples.append({
+                'key': series.key,
+                'calc_style': calc_style,
+                'branch': series.branch,
+                'pair_style': pair_styles.get(getattr(series, 'potential_LAMMPS_key', None), ''),
+                'natoms': natoms,
+                'ncores': ncores,
+                'nsteps': nsteps,
+                'walltime': walltime,
+            })
+
+        samples = pd.concat([old_df, pd.DataFrame(new_samples, columns=cls.sample_columns)],
+                            ignore_index=True)
+
+        # Save cached samples
+        if samples_csv is not None:
+            samples.to_csv(samples_csv, index=False)
+
+        return cls(samples)
+
+    def cost(self,
+             calc_style: str,
+             pair_style: Optional[str] = None) -> Optional[float]:
+        """
+        Returns the fitted cost in core-seconds per atom per step.  Falls back
+        to the style-wide and then the overall median when there are no
+        samples for the style and pair_style combination.
+
+        Parameters
+        ----------
+        calc_style : str
+            The calculation style.
+        pair_style : str, optional
+            The LAMMPS pair_style of the potential.
+
+        Returns
+        -------
+        float or None
+            The cost, or None if the model has no samples.
+        """
+        if (calc_style, pair_style) in self.__costs:
+            return self.__costs[(calc_style, pair_style)]
+        if calc_style in self.__style_costs:
+            return self.__style_costs[calc_style]
+        return self.__default_cost
+
+    def predict(self,
+                calc_style: str,
+                natoms: Union[int, np.ndarray],
+                nsteps: int,
+                ncores: Union[int, np.ndarray] = 1,
+                pair_style: Optional[str] = None) -> Union[float, np.ndarray]:
+        """
+        Predicts the wall time in seconds of calculations.
+
+        Parameters
+        ----------
+        calc_style : str
+            The calculation style.
+        natoms : int or array-like
+            The number of atoms in the simulated systems.
+        nsteps : int
+            The number of steps performed.
+        ncores : int or array-like, optional
+            The number of cores used by each calculation.  Default value is 1.
+        pair_style : str, optional
+            The LAMMPS pair_style of the potential.
+
+        Returns
+        -------
+        float or numpy.ndarray
+            The predicted wall times.  NaN if the model has no samples.
+        """
+        cost = self.cost(calc_style, pair_style)
+        if cost is None:
+            cost = np.nan
+        return cost * np.asarray(natoms) * nsteps / np.asarray(ncores)
+
+    @staticmethod
+    def sizemult(natoms: int,
+                 min_atoms: int = 4000) -> int:
+        """
+        Returns the smallest uniform sizemult that gives a system with at
+        least min_atoms atoms.
+
+        Parameters
+        ----------
+        natoms : int
+            The number of atoms in the unit cell.
+        min_atoms : int, optional
+            The minimum number of atoms in the scaled system.  Default value
+            is 4000.
+
+        Returns
+        -------
+        int
+            The sizemult to use along each box vector.
+        """
+        s = max(int(ceil((min_atoms / natoms) ** (1/3))) - 1, 1)
+        while natoms * s**3 < min_atoms:
+            s += 1
+        return s
+
+    def choose_ncores(self,
+                      calc_style: str,
+                      natoms: int,
+                      nsteps: int,
+                      pair_style: Optional[str] = None,
+                      target_walltime: float = 86400,
+                      core_options: tuple = (1, 2, 4, 8, 16, 32),
+                      min_atoms_per_core: int = 250,
+                      default_ncores: Optional[int] = None) -> int:
+        """
+        Selects the cores per job as the fewest cores from core_options
+        that are predicted to finish within target_walltime without dropping
+        below min_atoms_per_core.
+
+        Parameters
+        ----------
+        calc_style : str
+            The calculation style.
+        natoms : int
+            The number of atoms in the simulated system.
+        nsteps : int
+            The number of steps performed.
+        pair_style : str, optional
+            The LAMMPS pair_style of the potential.
+        target_walltime : float, optional
+            The desired maximum wall time in seconds.  Default value is
+            86400 (one day).
+        core_options : tuple, optional
+            The allowed numbers of cores per job, in increasing order.
+        min_atoms_per_core : int, optional
+            Parallel runs are not used with fewer atoms per core than this
+            as communication costs dominate.  Default value is 250.
+        default_ncores : int, optional
+            The number of cores to use if the model has no samples to make
+            a prediction with.  If None (default), the first of core_options
+            is used.
+
+        Returns
+        -------
+        int
+            The selected number of cores.
+        """
+        if self.cost(calc_style, pair_style) is None and default_ncores is not None:
+            return int(default_ncores)
+
+        chosen = core_options[0]
+        for ncores in core_options:
+            if ncores > core_options[0] and natoms / ncores < min_atoms_per_core:
+                break
+            chosen = ncores
+            walltime = self.predict(calc_style, natoms, nsteps, ncores, pair_style)
+            if np.isnan(walltime) or walltime <= target_walltime:
+                break
+        return chosen
+
+    def plan(self,
+             calc_style: str,
+             parents_df: pd.DataFrame,
+             nsteps: int,
+             min_atoms: int = 4000,
+             max_natoms: Optional[int] = None,
+             pair_style: Optional[str] = None,
+             **kwargs) -> pd.DataFrame:
+        """
+        Assigns sizemults and cores per job to parent records and predicts
+        the wall time of the resulting calculations.
+
+        Parameters
+        ----------
+        calc_style : str
+            The calculation style being prepared.
+        parents_df : pandas.DataFrame
+            The parent records with key and natoms columns.  If a pair_style
+            column is included it is used for the per-parent costs.
+        nsteps : int
+            The number of steps each calculation will perform.
+        min_atoms : int, optional
+            The minimum number of atoms in the scaled systems.  Default value
+            is 4000.
+        max_natoms : int, optional
+            Parents with more atoms than this are excluded.
+        pair_style : str, optional
+            The pair_style to use if parents_df has no pair_style column.
+        **kwargs : any, optional
+            Extra parameters passed to choose_ncores().
+
+        Returns
+        -------
+        pandas.DataFrame
+            The parent key, natoms, sizemult, scaled natoms, ncores and
+            predicted_walltime for each parent.
+        """
+        if max_natoms is not None:
+            parents_df = parents_df[parents_df.natoms <= max_natoms]
+
+        plan = []
+        for parent in parents_df.itertuples():
+            natoms = int(parent.natoms)
+            pstyle = getattr(parent, 'pair_style', pair_style)
+            s = self.sizemult(natoms, min_atoms)
+            total_natoms = natoms * s**3
+            ncores = self.choose_ncores(calc_style, total_natoms, nsteps,
+                                        pair_style=pstyle, **kwargs)
+            plan.append({
+                'parent_key': parent.key,
+                'natoms': natoms,
+                'sizemult': s,
+                'total_natoms': total_natoms,
+                'ncores': ncores,
+                'predicted_walltime': float(self.predict(calc_style, total_natoms,
+                                                         nsteps, ncores, pstyle)),
+            })
+
+        return pd.DataFrame(plan, columns=['parent_key', 'natoms', 'sizemult',
+                                           'total_natoms', 'ncores',
+                                           'predicted_walltime'])
+
+    @staticmethod
+    def packing(plan_df: pd.DataFrame,
+                maxcores: int) -> pd.DataFrame:
+        """
+        Summarizes how the planned jobs pack onto the available cores.
+
+        Parameters
+        ----------
+        plan_df : pandas.DataFrame
+            A plan generated by plan().
+        maxcores : int
+            The total number of cores available to run the jobs.
+
+        Returns
+        -------
+        pandas.DataFrame
+            For each ncores value: the number of jobs, the concurrent job
+            slots, the total core-hours and the ideal makespan in hours.
+        """
+        summary = []
+        for ncores, group_df in plan_df.groupby('ncores'):
+            coreseconds = (group_df.predicted_walltime * ncores).sum()
+            slots = max(int(maxcores) // int(ncores), 1)
+            makespan = max(coreseconds / (slots * ncores),
+                           group_df.predicted_walltime.max())
+            summary.append({
+                'ncores': ncores,
+                'njobs': len(group_df),
+                'slots': slots,
+                'core_hours': coreseconds / 3600,
+                'makespan_hours': makespan / 3600,
+            })
+        return pd.DataFrame(summary, columns=['ncores', 'njobs', 'slots',
+                                              'core_hours', 'makespan_hours'])
+
+    def report(self,
+               predictions_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Compares predicted wall times to the measured samples.
+
+        Parameters
+        ----------
+        predictions_df : pandas.DataFrame
+            Table with key and predicted_walltime columns for calculations.
+
+        Returns
+        -------
+        pandas.DataFrame
+            The key, predicted and actual wall times, and their ratio for
+            each calculation that has been measured.
+        """
+        report_df = pd.merge(predictions_df[['key', 'predicted_walltime']],
+                             self.samples[['key', 'walltime']], on='key')
+        report_df = report_df.rename(columns={'walltime': 'actual_walltime'})
+        report_df['ratio'] = report_df.actual_walltime / report_df.predicted_walltime
+        return report_df
+
+def parse_lammps_logs(tar) -> tuple:
+    """
+    Extracts the run size and timing from all LAMMPS log files in a
+    calculation archive.
+
+    Parameters
+    ----------
+    tar : tarfile.TarFile
+        The calculation archive.
+
+    Returns
+    -------
+    natoms : int
+        The largest number of atoms in any run.
+    ncores : int
+        The largest number of processors used by any run.
+    nsteps : int
+        The total number of steps across all runs.
+    walltime : float
+        The total wall time in seconds of all logs.  Uses the summed loop
+        times for logs without a total wall time line.
+    """
+    natoms = ncores = nsteps = 0
+    walltime = 0.0
+    for member in tar.getmembers():
+        name = Path(member.name).name
+        if not member.isfile() or 'log' not in name or not name.endswith('.lammps'):
+            continue
+        text = tar.extractfile(member).read().decode('UTF-8', errors='replace')
+
+        looptime = 0.0
+        for match in loop_re.finditer(text):
+            looptime += float(match[1])
+            ncores = max(ncores, int(match[2]))
+            nsteps += int(match[3])
+            natoms = max(natoms, int(match[4]))
+
+        match = wall_re.search(text)
+        if match is not None:
+            walltime += int(match[1]) * 3600 + int(match[2]) * 60 + int(match[3])
+        else:
+            walltime += looptime
+
+    return natoms, ncores, nsteps, walltime
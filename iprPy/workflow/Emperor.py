@@ -4,9 +4,15 @@ import subprocess
 import shlex
 import time
 
+# https://pandas.pydata.org/
+import pandas as pd
+
 from .. import load_run_directory, load_database
 from ..input import parse, boolean
 from ..database import IprPyDatabase
+from .multiprocessing_runners import runrun_parallel, LocalPool
+from .CostModel import CostModel
+from .slurm_arrays import queue_index, size_runner_array, submit_array, submit_calc_array
 
 class Emperor():
     """
@@ -189,18 +195,63 @@ class Emperor():
 
 
 
+    def runner_local_pool(self,
+                          run_directory_name: str,
+                          calc_names: Optional[list] = None,
+                          run_all: bool = False,
+                          temp: bool = False,
+                          ncores: int = 1,
+                          maxcores: Optional[int] = None,
+                          **kwargs):
+        """
+        Runs prepared calculations using a pool of local worker processes.
+        This is best suited for large single nodes where no job scheduler is
+        needed.  Each worker loads the database once and runs calculations
+        one at a time.  The number of workers is limited so that the total
+        cores used by the calculations does not exceed maxcores.
+
+        Parameters
+        ----------
+        run_directory_name : str
+            The run_directory containing the calculations to run.
+        calc_names : list, optional
+            The list of calculations to run.  If None (default) then any
+            free calculations currently in the run_directory will be ran.
+        run_all : bool, optional
+            Setting this to True will run all calculations currently
+            in the run_directory regardless of if calc_names is given.
+        temp : bool, optional
+            Flag indicating if the calculations are to be performed in a
+            temporary directory.  Default value is False.
+        ncores : int, optional
+            The number of cores used by each calculation, i.e. the pool's
+            np_per_runner value.
+        maxcores : int, optional
+            The total number of cores that the workers can use.  Default
+            value is the number of cores on the machine.
+        **kwargs : any, optional
+            Catch-all for extra keywords ignored by this style.
+        """
+        if run_all is True:
+            calc_names = None
+
+        runrun_parallel(self.database_name, run_directory_name,
+                        calc_names=calc_names, ncores=ncores,
+                        maxcores=maxcores, temp=temp)
+
     def runner_slurm_all(self,
                          run_directory_name: str,
                          calc_names: Optional[list] = None,
                          run_all: bool = False,
                          temp: bool = False,
                          ncores: int = 1,
+                         throttle: Optional[int] = None,
                          wait: Union[bool, int] = False,
                          **kwargs):
         """
-        Submits separate slurm jobs to each individually run a single prepared
-        calculation.  This is best suited for large calculations or short
-        wall times on clusters.
+        Submits a slurm job array where each task individually runs a single
+        prepared calculation.  This is best suited for large calculations or
+        short wall times on clusters.
 
         Parameters
         ----------
@@ -219,6 +270,9 @@ class Emperor():
         ncores : int, optional
             The number of cores to assign to each slurm job.  This dictates
             which slurm script to call.
+        throttle : int, optional
+            The maximum number of array tasks that slurm will run at the same
+            time.  Default value of None sets no limit.
         wait : bool, optional
             If False (default), the function will return immediately after
             submitting the jobs.  If True or an int, the function will wait to
@@ -230,22 +284,22 @@ class Emperor():
         **kwargs : any, optional
             Catch-all for extra keywords ignored by this style.
         """
-        
-        database_name = self.database_name
-
         # Find all free calcs in the run_directory
-        runner = self.database.runmanager(run_directory_name)
-        all_calc_names = runner.calclist
+        run_directory = load_run_directory(run_directory_name)
+        free_calc_names = queue_index(run_directory)[0]
 
         if calc_names is None or run_all is True:
             # Prepare for all calcs
-            calc_names = all_calc_names
+            calc_names = free_calc_names
         else:
             # Prepare only free calcs from the given list
-            calc_names = list(set(calc_names).union(all_calc_names))
+            free_calc_names = set(free_calc_names)
+            calc_names = [name for name in calc_names if name in free_calc_names]
+        if len(calc_names) == 0:
+            return
 
         # Set slurm script based on ncores
-        if ncores == 1:
+        if int(ncores) == 1:
             script = 'iprPy_slurm'
         else:
             script = f'iprPy_slurm_{ncores}'
@@ -256,25 +310,18 @@ class Emperor():
         else:
             temp_flag = ''
 
-        # Build slurm command and submit the job
-        for calc_name in calc_names:
-            cmd = f'sbatch {script} {database_name} {run_directory_name}{temp_flag} -c {calc_name}'
-            subprocess.run(shlex.split(cmd))
+        # Submit one array with a task for each calculation
+        args = f'runner {self.database_name} {run_directory_name}{temp_flag}'
+        submit_calc_array(script, args, run_directory, calc_names,
+                          f'{time.time_ns()}', throttle=throttle)
         
         if wait is False:
             return
         
         # Wait until all finished if requested
-        run_directory = load_run_directory(run_directory_name)
         if wait is True:
             wait = 300
-        while True:
-            count = len([calc for calc in run_directory.glob('*')])
-            if count == 0:
-                break
-            else:
-                time.sleep(wait)
-
+        self.wait_until_done(run_directory, wait)
 
     def runner_slurm(self,
                      run_directory_name: str,
@@ -283,13 +330,17 @@ class Emperor():
                      njobs: Optional[int] = None,
                      maxjobs: int = 50,
                      percentjobs: int = 10,
+                     runtime: Optional[float] = None,
+                     walltime: Optional[float] = None,
+                     cost_csv: Optional[str] = None,
+                     throttle: Optional[int] = None,
                      wait: Union[bool, int] = False,
                      **kwargs):
         """
-        Submits slurm jobs for calculation runners such that a certain number
-        of runners are active in the run directory.  Note that this method
-        has no calc_names parameter as each runner will actively search for
-        any free calculations in the run_directory.
+        Submits a slurm job array of calculation runners such that a certain
+        number of runners are active in the run directory.  Note that this
+        method has no calc_names parameter as each runner will actively search
+        for any free calculations in the run_directory.
 
         Parameters
         ----------
@@ -306,15 +357,28 @@ class Emperor():
             run_directory.  If there are currently any calculations with .bid
             files, then those calculations are assumed to have active runners
             working on them and the number of new jobs submitted will be
-            reduced accordingly.  If None (default), then the percentjobs and
-            maxjobs parameters will be used to estimate a njobs value.
+            reduced accordingly.  If None (default), then the number is
+            estimated from runtime and walltime if given, or percentjobs
+            otherwise, and limited by maxjobs.
         percentjobs : int, optional
-            If njobs is None, then a value for njobs is computed to be this
-            percentage of the prepared jobs (barring number is greater than
-            maxjobs).  Default value is 10 (for 10%).
+            If njobs is None and no runtime is known, then a value for njobs
+            is computed to be this percentage of the prepared jobs (barring
+            number is greater than maxjobs).  Default value is 10 (for 10%).
         maxjobs : int, optional
             If njobs is None, this indicates the maximum njobs value allowed
-            by the percentjobs calculation.  Default value is 50.
+            by the estimate.  Default value is 50.
+        runtime : float, optional
+            The typical run time in seconds of one calculation.  With walltime,
+            enough runners are submitted for the free calculations to finish
+            within one job wall time.
+        walltime : float, optional
+            The wall time limit in seconds of the runner jobs.
+        cost_csv : str, optional
+            If runtime is not given, it is taken as the median of the
+            historical run times in this CostModel samples csv file.
+        throttle : int, optional
+            The maximum number of array tasks that slurm will run at the same
+            time.  Default value of None sets no limit.
         wait : bool, optional
             If False (default), the function will return immediately after
             submitting the jobs.  If True or an int, the function will wait to
@@ -327,7 +391,7 @@ class Emperor():
             Catch-all for extra keywords ignored by this style.
         """
         # Set slurm script based on ncores
-        if ncores == 1:
+        if int(ncores) == 1:
             script = 'iprPy_slurm'
         else:
             script = f'iprPy_slurm_{ncores}'
@@ -338,23 +402,27 @@ class Emperor():
         else:
             temp_flag = ''
 
-        # Build the slurm job submission command
-        cmd = f'sbatch {script} {self.database_name} {run_directory_name}{temp_flag}'
+        # Get historical run time
+        if runtime is None and cost_csv is not None and Path(cost_csv).exists():
+            runtime = pd.read_csv(cost_csv).walltime.median()
+        if walltime is not None:
+            walltime = float(walltime)
+        if runtime is not None:
+            runtime = float(runtime)
 
-        # Count number of calcs and figure out how many jobs to submit
+        # Count calcs and active runners with a single directory scan
         run_directory = load_run_directory(run_directory_name)
-        count = len([calc for calc in run_directory.glob('*')])
-        bidcount = len([bid for bid in run_directory.glob('*/*.bid')])
-
-        # Decide on njobs based on percentjobs, minjobs and maxjobs
-        if njobs is None:
-            njobs = round(count * percentjobs / 100)
-            if njobs > maxjobs:
-                njobs = maxjobs
-        
-        # Submit runner jobs so njobs total are active
-        for i in range(njobs - bidcount):
-            subprocess.run(shlex.split(cmd))
+        free, active = queue_index(run_directory)
+        if njobs is not None:
+            njobs = int(njobs)
+        ntasks = size_runner_array(len(free), len(active), runtime=runtime,
+                                   walltime=walltime, njobs=njobs,
+                                   maxjobs=int(maxjobs),
+                                   percentjobs=int(percentjobs))
+
+        # Submit all runners as a single job array
+        args = f'runner {self.database_name} {run_directory_name}{temp_flag}'
+        submit_array(script, args, ntasks, throttle=throttle)
         
         if wait is False:
             return
@@ -362,12 +430,28 @@ class Emperor():
         # Wait until all finished if requested
         if wait is True:
             wait = 300
+        self.wait_until_done(run_directory, wait)
+
+    def wait_until_done(self,
+                        run_directory: Union[str, Path],
+                        wait: int = 300):
+        """
+        Waits until no calculations remain in a run_directory.
+
+        Parameters
+        ----------
+        run_directory : str or Path
+            The run_directory to check.
+        wait : int, optional
+            The number of seconds to wait between checks.  Default value is
+            300.
+        """
         while True:
-            count = len([calc for calc in run_directory.glob('*')])
-            if count == 0:
+            free, active = queue_index(run_directory)
+            if len(free) + len(active) == 0:
                 break
             else:
-                time.sleep(wait)
+                time.sleep(int(wait))
 
     def runner(self,
                run_directory_name: str,
@@ -385,10 +469,12 @@ class Emperor():
             'no' (default) will start no runners and only prepare.  'serial'
             will start a single runner to serially run through the prepared
             calculations in the current pool before moving on to preparing the
-            next pool.  'slurm' will submit a number of runner jobs to a slurm
-            schedular for the pool, with each job capable of running multiple
-            calculations. 'slurm_all' will submit separate jobs for each
-            prepared calculation in the pool.
+            next pool.  'local_pool' will run the prepared calculations in
+            parallel using local worker processes.  'slurm' will submit a
+            job array of runners to a slurm schedular for the pool, with each
+            task capable of running multiple calculations. 'slurm_all' will
+            submit a job array with a separate task for each prepared
+            calculation in the pool.
         **kwargs : any, optional
             Any kwargs settings to pass to the runner method.  The
             specific kwargs depend on the runner_style, and are documented
@@ -396,6 +482,8 @@ class Emperor():
         """
         if style == 'serial':
             self.runner_serial(run_directory_name, **kwargs)
+        elif style == 'local_pool':
+            self.runner_local_pool(run_directory_name, **kwargs)
         elif style == 'slurm':
             self.runner_slurm(run_directory_name, **kwargs)
         elif style == 'slurm_all':
@@ -546,6 +634,100 @@ class Emperor():
 
 
 
+    def temperature_ladder(self,
+                           prepare_params: dict,
+                           runner_params: dict,
+                           rungs: list,
+                           chained: bool = False,
+                           sequential_runners: bool = False,
+                           debug: bool = False):
+        """
+        Prepares and runs a pool of calculations over a series of
+        temperatures.
+
+        With the 'local_pool' runner style the ladder is event-driven: the
+        calculations for all rungs are prepared and queued while the workers
+        are already running.  For chained ladders, where each rung loads the
+        final system from the previous rung's calculation, every calculation
+        that finishes immediately prepares and queues the next rung for that
+        same calculation (by limiting archive_key).  Each crystal therefore
+        advances up the ladder independently and the workers stay busy.
+
+        For the other runner styles, the rungs are prepared one at a time and
+        the runners are started after each rung if sequential_runners is True
+        or once after all rungs otherwise.
+
+        Parameters
+        ----------
+        prepare_params : dict
+            The master_prepare parameters for the pool.
+        runner_params : dict
+            The runner parameters for the pool.
+        rungs : list of dict
+            The prepare parameters, e.g. temperature, that change for each
+            rung of the ladder given in ladder order.
+        chained : bool, optional
+            Indicates if each rung uses the finished calculations from the
+            previous rung as its archive.  Default value is False.
+        sequential_runners : bool, optional
+            For runner styles other than 'local_pool', True starts the runners
+            after preparing each rung while False (default) only starts the
+            runners after all rungs are prepared.
+        debug : bool, optional
+            If set to True, will throw errors associated with failed/invalid
+            calculation builds.  Default is False.
+        """
+        def prepare_rung(i, **kwargs):
+            params = dict(prepare_params, **rungs[i], **kwargs)
+            print('Starting to prepare for', ', '.join([f'{k}={v}' for k, v in rungs[i].items()]))
+            return self.database.master_prepare(debug=debug, **params)
+
+        if runner_params.get('style', 'no') != 'local_pool':
+            all_calc_names = []
+            for i in range(len(rungs)):
+                calc_names = prepare_rung(i)
+
+                if sequential_runners is True:
+                    # Run prepared calcs at the current rung
+                    self.runner(run_directory_name=prepare_params['run_directory'],
+                                ncores=prepare_params['np_per_runner'],
+                                calc_names=calc_names, **runner_params)
+                else:
+                    # Save calc names for running later
+                    all_calc_names.extend(calc_names)
+
+            if sequential_runners is False:
+                # Run all prepared calcs
+                self.runner(run_directory_name=prepare_params['run_directory'],
+                            ncores=prepare_params['np_per_runner'],
+                            calc_names=all_calc_names, **runner_params)
+            return
+
+        pool = LocalPool(self.database_name, prepare_params['run_directory'],
+                         ncores=prepare_params['np_per_runner'],
+                         maxcores=runner_params.get('maxcores', None),
+                         temp=boolean(runner_params.get('temp', False)))
+        with pool:
+
+            # Queue all currently preparable calculations at every rung
+            for i in range(len(rungs)):
+                pool.submit(prepare_rung(i), tag=i)
+
+            while pool.npending > 0:
+                completed = pool.wait()
+                if not chained:
+                    continue
+
+                # Advance finished calculations to the next rung
+                finished = {}
+                for calc_name, status, i in completed:
+                    if status == 'success' and i + 1 < len(rungs):
+                        finished.setdefault(i + 1, []).append(calc_name)
+                for i, archive_keys in finished.items():
+                    pool.submit(prepare_rung(i, archive_key=archive_keys), tag=i)
+
+
+
     # ----------------------------------------------------------------------- #
 
 
@@ -809,7 +991,24 @@ class Emperor():
     def prepare_pool_11(self,
                         debug: bool = False,
                         **kwargs):
-        """Dynamic relax at 50K"""
+        """Dynamic relax at 50K
+        
+        Pool-specific kwargs
+        ------------------------
+        cost_csv : str, optional
+            Path to a csv file where the measured run times used by the cost
+            model are cached.
+        predictions_csv : str, optional
+            Path to a csv file where the predicted run times of the prepared
+            calculations are appended.  Use with cost_report() to compare
+            against the actual run times.
+        target_walltime : float, optional
+            The desired maximum run time in seconds for each calculation used
+            in selecting the cores per job.  Default value is 86400.
+        maxcores : int, optional
+            The total number of cores used for the job packing summary.
+            Default value is 64.
+        """
         # Specify master_prepare pool settings
         pool_params = {
             'styles': 'relax_dynamic:at_temp_50K',
@@ -817,6 +1016,12 @@ class Emperor():
             'np_per_runner': '16',
             'num_pots': '50',
         }
+
+        # Pull out pool-specific settings if present
+        cost_csv = kwargs.pop('cost_csv', None)
+        predictions_csv = kwargs.pop('predictions_csv', None)
+        target_walltime = float(kwargs.pop('target_walltime', 86400))
+        maxcores = int(kwargs.pop('maxcores', 64))
         
         # Compile parameters
         prepare_params, runner_params = self.compile_params(pool_params, **kwargs)
@@ -825,43 +1030,95 @@ class Emperor():
         if 'sizemults' in kwargs:
             calc_names = self.database.master_prepare(debug=debug, **prepare_params)
 
-        # Otherwise dynamically change sizemults based on natoms
-        else:
-            sdict = {}
-            sdict[16] = [1, 1]
-            sdict[13] = [2, 2]
-            sdict[12] = [3, 3]
-            sdict[10] = [4, 5]
-            sdict[9] = [6, 7]
-            sdict[8] = [8, 11]
-            sdict[7] = [12, 18]
-            sdict[6] = [19, 31]
-            sdict[5] = [32, 62]
-            sdict[4] = [63, 148]
-            sdict[3] = [149, 499]
-            sdict[2] = [500, 1000]
-
-            calc_names = []
-
-            # Loop over dynamic sizemult sets
-            for s in sdict:
-                nmin, nmax = sdict[s]
-                print(f'Preparing for natoms between {nmin} and {nmax}')
-
-                prepare_params['sizemults'] = f'{s} {s} {s}'
-                natoms = list(range(nmin, nmax+1))
-
-                # Find all parents within the sizemults range
-                parent_natoms_df = self.database.get_records_df('relaxed_crystal', method='dynamic',
-                                                                standing='good', natoms=natoms)
-                prepare_params['parent_key'] = parent_natoms_df.key.tolist()
-
-                calc_names.extend(self.database.master_prepare(debug=debug, **prepare_params))
+            # Run prepared calculations
+            self.runner(run_directory_name=prepare_params['run_directory'],
+                        ncores=prepare_params['np_per_runner'],
+                        calc_names=calc_names, **runner_params)
+            return
+
+        # Otherwise use the cost model to select sizemults and cores by natoms
+        costmodel = CostModel.from_database(self.database, 'relax_dynamic',
+                                            samples_csv=cost_csv,
+                                            branch='at_temp_50K')
+        nsteps = (int(prepare_params.get('runsteps', 1000000))
+                  + int(prepare_params.get('equilsteps', 0)))
+
+        # Find all parents and their pair_styles in a single query
+        parents_df = self.database.get_records_df('relaxed_crystal', method='dynamic',
+                                                  standing='good')
+        if len(parents_df) == 0:
+            return
+        self.database.build_potdb(remote=False)
+        lmppots_df = self.database.potdb.get_lammps_potentials(return_df=True)[1]
+        pair_styles = dict(zip(lmppots_df.key, lmppots_df.pair_style))
+        parents_df['pair_style'] = parents_df.potential_LAMMPS_key.map(pair_styles)
+
+        plan_df = costmodel.plan('relax_dynamic', parents_df, nsteps,
+                                 min_atoms=4000, max_natoms=1000,
+                                 target_walltime=target_walltime,
+                                 default_ncores=int(prepare_params['np_per_runner']))
+        print('Planned job packing:')
+        print(costmodel.packing(plan_df, maxcores).to_string(index=False))
+
+        # Prepare each set of parents with the same sizemults and cores
+        calc_names = {}
+        for (s, ncores), group_df in plan_df.groupby(['sizemult', 'ncores']):
+            print(f'Preparing for natoms between {group_df.natoms.min()} and {group_df.natoms.max()} on {ncores} cores')
+            prepare_params['sizemults'] = f'{s} {s} {s}'
+            prepare_params['np_per_runner'] = str(ncores)
+            prepare_params['parent_key'] = group_df.parent_key.tolist()
+            calc_names.setdefault(ncores, []).extend(
+                self.database.master_prepare(debug=debug, **prepare_params))
+
+        # Save the predicted run times of the prepared calculations
+        new_names = [name for names in calc_names.values() for name in names]
+        if predictions_csv is not None and len(new_names) > 0:
+            calcs_df = self.database.get_records_df('calculation_relax_dynamic',
+                                                    key=new_names)
+            predictions_df = pd.merge(calcs_df[['key', 'parent_key']],
+                                      plan_df[['parent_key', 'ncores', 'predicted_walltime']],
+                                      on='parent_key')
+            predictions_df.to_csv(predictions_csv, index=False, mode='a',
+                                  header=not Path(predictions_csv).exists())
 
         # Run prepared calculations
-        self.runner(run_directory_name=prepare_params['run_directory'],
-                    ncores=prepare_params['np_per_runner'],
-                    calc_names=calc_names, **runner_params)
+        for ncores, names in calc_names.items():
+            self.runner(run_directory_name=prepare_params['run_directory'],
+                        ncores=ncores, calc_names=names, **runner_params)
+
+    def cost_report(self,
+                    calc_style: str,
+                    predictions_csv: Union[str, Path],
+                    cost_csv: Union[str, Path, None] = None,
+                    **kwargs) -> pd.DataFrame:
+        """
+        Compares the predicted run times saved by a prepare pool with the
+        actual run times of the finished calculations.
+
+        Parameters
+        ----------
+        calc_style : str
+            The calculation style of the predicted calculations.
+        predictions_csv : str or Path
+            The csv file of predicted run times saved by the prepare pool.
+        cost_csv : str or Path, optional
+            The csv file where the measured run times are cached.
+        **kwargs : any, optional
+            Extra query terms to limit which calculation records are measured.
+
+        Returns
+        -------
+        pandas.DataFrame
+            The predicted and actual run times and their ratio for each
+            finished calculation.
+        """
+        costmodel = CostModel.from_database(self.database, calc_style,
+                                            samples_csv=cost_csv, **kwargs)
+        report_df = costmodel.report(pd.read_csv(predictions_csv))
+        if len(report_df) > 0:
+            print(f'{len(report_df)} calculations compared')
+            print(f'median actual/predicted ratio: {report_df.ratio.median():.3f}')
+        return report_df
 
 
 
@@ -883,7 +1140,8 @@ class Emperor():
             subsequent temperature based on finished results from the previous
             temperature, False means the prepare will have to be repeatedly
             called whereas True can run all temperatures (assuming no timeouts,
-            etc.)
+            etc.)  Ignored by the 'local_pool' runner style, which prepares
+            the next temperature for each calculation as soon as it finishes.
         """
         # Specify master_prepare pool settings
         pool_params = {
@@ -895,39 +1153,21 @@ class Emperor():
 
         # Pull out pool-specific settings if present
         max_temperature = int(kwargs.pop('max_temperature', 3000))
-        sequential_runners = bool(kwargs.pop('sequential_runners', False))
+        sequential_runners = boolean(kwargs.pop('sequential_runners', False))
 
         # Compile parameters
         prepare_params, runner_params = self.compile_params(pool_params, **kwargs)
 
-        all_calc_names = []
-        if runner_kwargs is None:
-            runner_kwargs = {}
-
-        # Loop from max temperature down to 50
+        # Loop from 100 up to max temperature
+        rungs = []
         for temperature in range(100, max_temperature+50, 50):
+            rungs.append({'temperature': str(temperature)})
 
-            # Set melt and run temperatures
-            prepare_params['temperature'] = str(temperature)
-
-            # Call master prepare
-            print('Starting to prepare for T=', prepare_params['temperature'])
-            calc_names = self.database.master_prepare(debug=debug, **prepare_params)
-
-            if sequential_runners is True:
-                # Run prepared calcs at the current temperature
-                self.runner(run_directory_name=prepare_params['run_directory'],
-                            ncores=prepare_params['np_per_runner'],
-                            calc_names=calc_names, **runner_params)
-            else:
-                # Save calc names for running later
-                all_calc_names.extend(calc_names)
-
-        if sequential_runners is False:
-            # Run all prepared calcs
-            self.runner(run_directory_name=prepare_params['run_directory'],
-                        ncores=prepare_params['np_per_runner'],
-                        calc_names=all_calc_names, **runner_params)
+        # Prepare and run the temperature ladder
+        self.temperature_ladder(prepare_params, runner_params, rungs,
+                                chained=True,
+                                sequential_runners=sequential_runners,
+                                debug=debug)
 
 
 
@@ -955,22 +1195,14 @@ class Emperor():
         # Compile parameters
         prepare_params, runner_params = self.compile_params(pool_params, **kwargs)
 
-        calc_names = []
-
         # Loop from 50 up to max temperature
+        rungs = []
         for temperature in range(50, max_temperature+50, 50):
+            rungs.append({'temperature': str(temperature)})
 
-            # Set melt and run temperatures
-            prepare_params['temperature'] = str(temperature)
-
-            # Call master prepare
-            print('Starting to prepare for T=', prepare_params['temperature'])
-            calc_names.extend(self.database.master_prepare(debug=debug, **prepare_params))
-
-        # Run prepared calculations
-        self.runner(run_directory_name=prepare_params['run_directory'],
-                    ncores=prepare_params['np_per_runner'],
-                    calc_names=calc_names, **runner_params)
+        # Prepare and run the temperature ladder
+        self.temperature_ladder(prepare_params, runner_params, rungs,
+                                debug=debug)
 
 
 
@@ -1015,7 +1247,8 @@ class Emperor():
             subsequent temperature based on finished results from the previous
             temperature, False means the prepare will have to be repeatedly
             called whereas True can run all temperatures (assuming no timeouts,
-            etc.)
+            etc.)  Ignored by the 'local_pool' runner style, which prepares
+            the next temperature for each calculation as soon as it finishes.
         """
         # Specify master_prepare pool settings
         pool_params = {
@@ -1027,40 +1260,22 @@ class Emperor():
 
         # Pull out pool-specific settings if present
         max_temperature = int(kwargs.pop('max_temperature', 6100))
-        sequential_runners = bool(kwargs.pop('sequential_runners', False))
+        sequential_runners = boolean(kwargs.pop('sequential_runners', False))
 
         # Compile parameters
         prepare_params, runner_params = self.compile_params(pool_params, **kwargs)
 
-        all_calc_names = []
-        if runner_kwargs is None:
-            runner_kwargs = {}
-
         # Loop from max temperature down to 50
+        rungs = []
         for temperature in range(max_temperature, 0, -50):
+            rungs.append({'temperature': str(temperature),
+                  'temperature_melt': str(temperature + 50)})
 
-            # Set melt and run temperatures
-            prepare_params['temperature'] = str(temperature)
-            prepare_params['temperature_melt'] = str(temperature + 50)
-
-            # Call master prepare
-            print('Starting to prepare for T=', prepare_params['temperature'])
-            calc_names = self.database.master_prepare(debug=debug, **prepare_params)
-
-            if sequential_runners is True:
-                # Run prepared calcs at the current temperature
-                self.runner(run_directory_name=prepare_params['run_directory'],
-                            ncores=prepare_params['np_per_runner'],
-                            calc_names=calc_names, **runner_params)
-            else:
-                # Save calc names for running later
-                all_calc_names.extend(calc_names)
-
-        if sequential_runners is False:
-            # Run all prepared calcs
-            self.runner(run_directory_name=prepare_params['run_directory'],
-                        ncores=prepare_params['np_per_runner'],
-                        calc_names=all_calc_names, **runner_params)
+        # Prepare and run the temperature ladder
+        self.temperature_ladder(prepare_params, runner_params, rungs,
+                                chained=True,
+                                sequential_runners=sequential_runners,
+                                debug=debug)
 
 
 
@@ -1088,22 +1303,14 @@ class Emperor():
         # Compile parameters
         prepare_params, runner_params = self.compile_params(pool_params, **kwargs)
 
-        calc_names = []
-
         # Loop from max temperature down to 50
+        rungs = []
         for temperature in range(max_temperature, 0, -50):
+            rungs.append({'temperature': str(temperature)})
 
-            # Set melt and run temperatures
-            prepare_params['temperature'] = str(temperature)
-
-            # Call master prepare
-            print('Starting to prepare for T=', prepare_params['temperature'])
-            calc_names.extend(self.database.master_prepare(debug=debug, **prepare_params))
-
-        # Run prepared calculations
-        self.runner(run_directory_name=prepare_params['run_directory'],
-                    ncores=prepare_params['np_per_runner'],
-                    calc_names=calc_names, **runner_params)
+        # Prepare and run the temperature ladder
+        self.temperature_ladder(prepare_params, runner_params, rungs,
+                                debug=debug)
 
 
 
@@ -1131,22 +1338,14 @@ class Emperor():
         # Compile parameters
         prepare_params, runner_params = self.compile_params(pool_params, **kwargs)
 
-        calc_names = []
-
         # Loop from max temperature down to 50
+        rungs = []
         for temperature in range(max_temperature, 0, -50):
+            rungs.append({'temperature': str(temperature)})
 
-            # Set melt and run temperatures
-            prepare_params['temperature'] = str(temperature)
-
-            # Call master prepare
-            print('Starting to prepare for T=', prepare_params['temperature'])
-            calc_names.extend(self.database.master_prepare(debug=debug, **prepare_params))
-
-        # Run prepared calculations
-        self.runner(run_directory_name=prepare_params['run_directory'],
-                    ncores=prepare_params['np_per_runner'],
-                    calc_names=calc_names, **runner_params)
+        # Prepare and run the temperature ladder
+        self.temperature_ladder(prepare_params, runner_params, rungs,
+                                debug=debug)
 
 
 
@@ -1174,22 +1373,14 @@ class Emperor():
         # Compile parameters
         prepare_params, runner_params = self.compile_params(pool_params, **kwargs)
 
-        calc_names = []
-
         # Loop from max temperature down to 50
+        rungs = []
         for temperature in range(max_temperature, 0, -50):
+            rungs.append({'temperature': str(temperature)})
 
-            # Set melt and run temperatures
-            prepare_params['temperature'] = str(temperature)
-
-            # Call master prepare
-            print('Starting to prepare for T=', prepare_params['temperature'])
-            calc_names.extend(self.database.master_prepare(debug=debug, **prepare_params))
-
-        # Run prepared calculations
-        self.runner(run_directory_name=prepare_params['run_directory'],
-                    ncores=prepare_params['np_per_runner'],
-                    calc_names=calc_names, **runner_params)
+        # Prepare and run the temperature ladder
+        self.temperature_ladder(prepare_params, runner_params, rungs,
+                                debug=debug)
 
 
 
@@ -1217,21 +1408,13 @@ class Emperor():
         # Compile parameters
         prepare_params, runner_params = self.compile_params(pool_params, **kwargs)
 
-        calc_names = []
-
-        # Loop from 50 to max temperature
+        # Loop from 50 up to max temperature
+        rungs = []
         for temperature in range(50, max_temperature+50, 50):
+            rungs.append({'temperature': str(temperature)})
 
-            # Set melt and run temperatures
-            prepare_params['temperature'] = str(temperature)
-
-            # Call master prepare
-            print('Starting to prepare for T=', prepare_params['temperature'])
-            calc_names.extend(self.database.master_prepare(debug=debug, **prepare_params))
-
-        # Run prepared calculations
-        self.runner(run_directory_name=prepare_params['run_directory'],
-                    ncores=prepare_params['np_per_runner'],
-                    calc_names=calc_names, **runner_params)
+        # Prepare and run the temperature ladder
+        self.temperature_ladder(prepare_params, runner_params, rungs,
+                                debug=debug)
 
 
@@ -1,3 +1,4 @@
 from .Emperor import Emperor
+from .CostModel import CostModel
 
-__all__ = ['Emperor']
\ No newline at end of file
+__all__ = ['Emperor', 'CostModel']
\ No newline at end of file
@@ -4,11 +4,12 @@
 # Standard Python libraries
 
 from pathlib import Path
-import shlex
-import subprocess
 import argparse
+import time
 
 import iprPy
+from iprPy.workflow.slurm_arrays import (queue_index, size_runner_array,
+                                         submit_array, submit_calc_array)
 
 def multi_runner_slurm(database_name,
                        run_directory_name,
@@ -19,59 +20,48 @@ def multi_runner_slurm(database_name,
                        maxjobs = 50,
                        percentjobs = 10,
                        individualjobs = False,
+                       throttle = None,
+                       runtime = None,
+                       walltime = None,
                        dryrun = False
                        ):
 
-
     # Set slurm script based on ncores
     if ncores == 1:
-        cmd = 'sbatch iprPy_slurm'
+        script = 'iprPy_slurm'
     else:
-        cmd = f'sbatch iprPy_slurm_{ncores}'
+        script = f'iprPy_slurm_{ncores}'
     
     # Add database and run directory fields
-    cmd += f' runner {database_name} {run_directory_name}'
+    args = f'runner {database_name} {run_directory_name}'
 
     # Add temp option
     if temp is True:
-        cmd += ' -t'
+        args += ' -t'
 
     run_directory = iprPy.load_run_directory(run_directory_name)
+    free, active = queue_index(run_directory)
+
+    if len(free) == 0:
+        print('No calcs to run')
+        return
     
     if individualjobs is False:
-        # Count number of calcs and figure out how many jobs to submit
-        count = len([calc for calc in run_directory.glob('*')])
-        bidcount = len([bid for bid in run_directory.glob('*/*.bid')])
-
-        if count == 0:
-            print('No calcs to run')
-            return
-            
-        if njobs is None:
-            njobs = round(count * percentjobs / 100)
-            if njobs < minjobs:
-                njobs = minjobs
-            elif njobs > maxjobs:
-                njobs = maxjobs
-            
-        for i in range(njobs - bidcount):
-            if dryrun:
-                print(cmd)
-            else:
-                subprocess.run(shlex.split(cmd))
+        # Submit an array of runners so njobs total are active
+        ntasks = size_runner_array(len(free), len(active), runtime=runtime,
+                                   walltime=walltime, njobs=njobs,
+                                   minjobs=minjobs, maxjobs=maxjobs,
+                                   percentjobs=percentjobs)
+        submit_array(script, args, ntasks, throttle=throttle, dryrun=dryrun)
     
     elif individualjobs is True:
-        # Submit a separate job for each calc
-        for i, calc in enumerate(run_directory.glob('*')):
-            calc_name = calc.name
-            cmd_calc = f'{cmd} -c {calc_name}'
-            if dryrun:
-                print(cmd_calc)
-            else:
-                subprocess.run(shlex.split(cmd_calc))
-            
-            if njobs is not None and i == njobs:
-                break
+        # Submit an array with a separate task for each calc
+        calc_names = free
+        if njobs is not None:
+            calc_names = calc_names[:njobs]
+        submit_calc_array(script, args, run_directory, calc_names,
+                          f'individual_{time.time_ns()}', throttle=throttle,
+                          dryrun=dryrun)
     
     else:
         raise TypeError('individualjobs must be a bool')
@@ -97,6 +87,12 @@ if __name__ == '__main__':
                         help='number of jobs to submit')
     parser.add_argument('--percentjobs', default=10, type=int,
                         help='number of jobs to submit')
+    parser.add_argument('--throttle', default=None, type=int,
+                        help='max number of array tasks to run at the same time')
+    parser.add_argument('--runtime', default=None, type=float,
+                        help='typical calculation run time in seconds')
+    parser.add_argument('--walltime', default=None, type=float,
+                        help='runner job wall time limit in seconds')
 
     args = parser.parse_args()
 
@@ -109,5 +105,8 @@ if __name__ == '__main__':
                        maxjobs = args.maxjobs,
                        percentjobs = args.percentjobs,
                        individualjobs = args.individualjobs,
+                       throttle = args.throttle,
+                       runtime = args.runtime,
+                       walltime = args.walltime,
                        #dryrun = True,
                        )
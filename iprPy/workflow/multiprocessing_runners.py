@@ -1,22 +1,318 @@
-import iprPy
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from multiprocessing.util import Finalize
+from typing import Any, Optional
 
+from .. import load_database
 
-def runner_parallel_job(database_name,
-                        run_directory_name,
-                        calc_name,
-                        temp):
-    database = iprPy.load_database(database_name)
-    database.runner(run_directory_name, calc_name=calc_name, temp=temp)
+# Per-process runner built once by the pool initializer
+worker_runmanager = None
 
+def init_worker(database_name: str,
+                run_directory_name: str,
+                threads_per_worker: int = 1):
+    """
+    Initializes a pool worker process by loading the database and creating
+    a RunManager that is reused for all calculations the worker performs.
 
-def runrun_parallel(database_name,
-                    run_directory_name,
-                    mp_pool,
-                    calc_names=None,
-                    temp = True):
+    Parameters
+    ----------
+    database_name : str
+        The name of the database to load.
+    run_directory_name : str
+        The name of the run_directory containing the calculations.
+    threads_per_worker : int, optional
+        Used to set OMP_NUM_THREADS for the worker if not already set so that
+        threaded libraries do not oversubscribe the cores.  Default value is 1.
+    """
+    global worker_runmanager
+    os.environ.setdefault('OMP_NUM_THREADS', str(threads_per_worker))
+    database = load_database(database_name)
+    worker_runmanager = database.runmanager(run_directory_name)
+
+    # Close the runner when the worker process exits to clean up its scratch
+    Finalize(worker_runmanager, worker_runmanager.close, exitpriority=10)
+
+def runner_parallel_job(calc_name: str,
+                        temp: bool = False) -> str:
+    """
+    Runs a single calculation using the worker's RunManager.
+
+    Parameters
+    ----------
+    calc_name : str
+        The name of the calculation to run.
+    temp : bool, optional
+        Flag indicating if the calculation is to be performed in a temporary
+        directory.
+
+    Returns
+    -------
+    str
+        The status returned by RunManager.run().
+    """
+    return worker_runmanager.run(calc_name, temp=temp)
+
+class LocalPool():
+    """
+    Manages a local pool of worker processes that run calculations from a
+    run_directory.  Calculations can be submitted at any time, allowing new
+    calculations to be prepared and queued while others are still running.
+    """
+
+    def __init__(self,
+                 database_name: str,
+                 run_directory_name: str,
+                 ncores: int = 1,
+                 maxcores: Optional[int] = None,
+                 temp: bool = False,
+                 maxretries: int = 10,
+                 retrydelay: float = 2.0,
+                 verbose: bool = True):
+        """
+        Starts the worker pool.
+
+        Parameters
+        ----------
+        database_name : str
+            The name of the database to use.
+        run_directory_name : str
+            The name of the run_directory containing the calculations.
+        ncores : int, optional
+            The number of cores used by each calculation, i.e. np_per_runner.
+            Default value is 1.
+        maxcores : int, optional
+            The total number of cores to use.  Default value is the number of
+            cores on the machine.
+        temp : bool, optional
+            Flag indicating if the calculations are to be performed in
+            temporary directories.  Default value is False.
+        maxretries : int, optional
+            The number of times that a calculation whose parents are not yet
+            finished is resubmitted while no other calculations are pending.
+            While other calculations are pending, such calculations are held
+            back and resubmitted after the next calculation finishes without
+            using up retries.  Default value is 10.
+        retrydelay : float, optional
+            The number of seconds to wait before the first retry.  The delay
+            doubles with each retry up to 300 seconds.  Default value is 2.0.
+        verbose : bool, optional
+            If True (default), a summary of the running, finished and failed
+            calculations is printed each time calculations complete.
+        """
+        ncores = int(ncores)
+        if maxcores is None:
+            maxcores = os.cpu_count()
+        self.nworkers = max(int(maxcores) // ncores, 1)
+        self.temp = temp
+        self.maxretries = maxretries
+        self.retrydelay = retrydelay
+        self.verbose = verbose
+
+        self.results = {}
+        self.counts = {'finished': 0, 'failed': 0, 'skipped': 0}
+        self.__pending = {}
+        self.__tags = {}
+        self.__retries = {}
+        self.__deferred = {}
+        self.__executor = ProcessPoolExecutor(
+            max_workers=self.nworkers, initializer=init_worker,
+            initargs=(database_name, run_directory_name, ncores))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
+
+    def shutdown(self):
+        """Waits for submitted calculations to finish and stops the workers."""
+        self.__executor.shutdown(wait=True)
+
+    @property
+    def npending(self) -> int:
+        """int: The number of submitted calculations not yet completed."""
+        return len(self.__pending) + len(self.__deferred)
+
+    def submit(self,
+               calc_names: list,
+               tag: Any = None):
+        """
+        Queues calculations to be ran by the workers.
+
+        Parameters
+        ----------
+        calc_names : list
+            The names of the calculations to run.
+        tag : any, optional
+            A value associated with the calculations that is returned with
+            them by wait().
+        """
+        for calc_name in calc_names:
+            if calc_name in self.__tags:
+                continue
+            self.__tags[calc_name] = tag
+            self.__submit(calc_name)
+
+    def __submit(self, calc_name: str):
+        future = self.__executor.submit(runner_parallel_job, calc_name, self.temp)
+        self.__pending[future] = calc_name
+
+    def __defer(self, calc_name: str) -> bool:
+        """
+        Holds back a calculation whose parents are not yet finished.  Returns
+        False if the calculation has used up its retries.
+        """
+        if len(self.__pending) > 0:
+            # Retry once other work finishes without using up a retry
+            self.__deferred[calc_name] = None
+            return True
+
+        retries = self.__retries.get(calc_name, 0) + 1
+        self.__retries[calc_name] = retries
+        if retries > self.maxretries:
+            return False
+        delay = min(self.retrydelay * 2 ** (retries - 1), 300.0)
+        self.__deferred[calc_name] = time.monotonic() + delay
+        return True
+
+    def __resubmit_deferred(self, force: bool = False):
+        """
+        Resubmits held back calculations that are due.  Calculations waiting
+        on other work are due if force is True or nothing else is pending.
+        """
+        now = time.monotonic()
+        idle = len(self.__pending) == 0
+        for calc_name, due in list(self.__deferred.items()):
+            if (due is None and (force or idle)) or (due is not None and due <= now):
+                del self.__deferred[calc_name]
+                self.__submit(calc_name)
+
+    def wait(self) -> list:
+        """
+        Waits for at least one submitted calculation to complete.
+
+        Returns
+        -------
+        list of tuple
+            The (calc_name, status, tag) of each completed calculation.
+            Calculations that are resubmitted because their parents are not
+            yet finished are not included.
+        """
+        completed = []
+        while len(completed) == 0 and self.npending > 0:
+            self.__resubmit_deferred()
+
+            # Wait for a calculation to finish or the next retry to be due
+            timeout = None
+            dues = [due for due in self.__deferred.values() if due is not None]
+            if len(dues) > 0:
+                timeout = max(min(dues) - time.monotonic(), 0.0)
+            if len(self.__pending) == 0:
+                time.sleep(timeout)
+                continue
+            done, _ = wait(self.__pending, timeout=timeout,
+                           return_when=FIRST_COMPLETED)
+
+            for future in done:
+                calc_name = self.__pending.pop(future)
+                try:
+                    status = future.result()
+                except Exception as e:
+                    status = f'error: {e}'
+
+                # Hold back calculations waiting on parents
+                if status.startswith('need to run') and self.__defer(calc_name):
+                    continue
+
+                self.results[calc_name] = status
+                if status == 'success':
+                    self.counts['finished'] += 1
+                elif status == 'bidfail':
+                    self.counts['skipped'] += 1
+                else:
+                    self.counts['failed'] += 1
+                completed.append((calc_name, status, self.__tags[calc_name]))
+
+            # Finished calculations may be the parents of held back ones
+            if len(completed) > 0:
+                self.__resubmit_deferred(force=True)
+
+        if self.verbose:
+            self.print_summary()
+
+        return completed
+
+    def print_summary(self):
+        """Prints the current number of calculations in each state."""
+        running = sum(1 for future in self.__pending if future.running())
+        print(f"{running} running, {len(self.__pending) - running} queued, "
+              f"{len(self.__deferred)} waiting on parents, "
+              f"{self.counts['finished']} finished, {self.counts['failed']} failed, "
+              f"{self.counts['skipped']} claimed by other runners", flush=True)
+
+def runrun_parallel(database_name: str,
+                    run_directory_name: str,
+                    calc_names: Optional[list] = None,
+                    ncores: int = 1,
+                    maxcores: Optional[int] = None,
+                    temp: bool = False,
+                    maxretries: int = 10,
+                    retrydelay: float = 2.0,
+                    verbose: bool = True) -> dict:
+    """
+    Runs calculations in a run_directory using a local pool of worker
+    processes.  The number of workers is chosen so that the workers together
+    use no more than maxcores cores given that each calculation uses ncores.
+
+    Parameters
+    ----------
+    database_name : str
+        The name of the database to use.
+    run_directory_name : str
+        The name of the run_directory containing the calculations.
+    calc_names : list, optional
+        The calculations to run.  If None (default), all free calculations
+        currently in the run_directory will be ran.
+    ncores : int, optional
+        The number of cores used by each calculation, i.e. np_per_runner.
+        Default value is 1.
+    maxcores : int, optional
+        The total number of cores to use.  Default value is the number of
+        cores on the machine.
+    temp : bool, optional
+        Flag indicating if the calculations are to be performed in temporary
+        directories.  Default value is False.
+    maxretries : int, optional
+        The number of times that a calculation whose parents are not yet
+        finished is resubmitted while no other calculations are pending.
+        Default value is 10.
+    retrydelay : float, optional
+        The number of seconds to wait before the first retry.  The delay
+        doubles with each retry up to 300 seconds.  Default value is 2.0.
+    verbose : bool, optional
+        If True (default), a summary of the running, finished and failed
+        calculations is printed each time a calculation completes.
+
+    Returns
+    -------
+    dict
+        The final status of each calculation that was attempted.
+    """
     if calc_names is None:
-        database = iprPy.load_database(database_name)
-        runner = database.runmanager(run_directory_name)
-        calc_names = runner.calclist
-    params = [(database_name, run_directory_name, calc_name, temp) for calc_name in calc_names]
-    results = [mp_pool.apply_async(runner_parallel_job, p) for p in params]
\ No newline at end of file
+        database = load_database(database_name)
+        calc_names = database.runmanager(run_directory_name).calclist
+    calc_names = list(calc_names)
+
+    with LocalPool(database_name, run_directory_name, ncores=ncores,
+                   maxcores=maxcores, temp=temp, maxretries=maxretries,
+                   retrydelay=retrydelay, verbose=verbose) as pool:
+        if verbose:
+            print(f'Running {len(calc_names)} calculations with {pool.nworkers} workers of {ncores} cores', flush=True)
+
+        pool.submit(calc_names)
+        while pool.npending > 0:
+            pool.wait()
+
+    return pool.results
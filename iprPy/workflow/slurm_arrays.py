@@ -0,0 +1,289 @@
+# coding: utf-8
+
+# Standard Python libraries
+from math import ceil
+import os
+from pathlib import Path
+import shlex
+import subprocess
+import time
+from typing import Optional, Tuple, Union
+
+from ..database.lease import default_lease_time, lease_status
+
+def sbatch_command() -> str:
+    """
+    Returns the sbatch executable to use.  This is taken from the
+    IPRPY_SBATCH environment variable if set, which allows for the fake_sbatch
+    shim in bin to be used for testing submissions without a cluster.
+    """
+    return os.environ.get('IPRPY_SBATCH', 'sbatch')
+
+def queue_index(run_directory: Union[str, Path],
+                lease_time: float = default_lease_time) -> Tuple[list, list]:
+    """
+    Scans a run_directory once to identify which calculations are free and
+    which currently have runners bidding on or running them.
+
+    Parameters
+    ----------
+    run_directory : str or Path
+        The run_directory to scan.
+    lease_time : float, optional
+        The lease time to use for bid files that do not specify one.
+        Default value is 600.
+
+    Returns
+    -------
+    free : list
+        The names of the calculations with no bid files or only expired ones.
+    active : list
+        The names of the calculations with live or stale bid files.
+    """
+    free = []
+    active = []
+    now = time.time()
+    with os.scandir(run_directory) as calcs:
+        for calc in calcs:
+            if not calc.is_dir():
+                continue
+            claimed = False
+            with os.scandir(calc.path) as files:
+                for f in files:
+                    if not f.name.endswith('.bid'):
+                        continue
+                    try:
+                        if lease_status(f.path, lease_time, now)[0] != 'expired':
+                            claimed = True
+                    except FileNotFoundError:
+                        pass
+            if claimed:
+                active.append(calc.name)
+            else:
+                free.append(calc.name)
+    return free, active
+
+def size_runner_array(nfree: int,
+                      nactive: int = 0,
+                      runtime: Optional[float] = None,
+                      walltime: Optional[float] = None,
+                      njobs: Optional[int] = None,
+                      minjobs: int = 1,
+                      maxjobs: int = 50,
+                      percentjobs: int = 10) -> int:
+    """
+    Determines how many new runner tasks to submit for a run_directory.
+
+    Parameters
+    ----------
+    nfree : int
+        The number of free calculations in the run_directory.
+    nactive : int, optional
+        The number of calculations that runners are currently working on.
+        Each is assumed to have an active runner.
+    runtime : float, optional
+        The typical run time in seconds of a single calculation, such as the
+        median of historical run times.  If given with walltime, the number
+        of runners is chosen so that the free calculations are expected to
+        finish within one job wall time.
+    walltime : float, optional
+        The wall time limit in seconds of the runner jobs.
+    njobs : int, optional
+        The target number of active runners.  If given, runtime, walltime and
+        percentjobs are ignored.
+    minjobs : int, optional
+        The minimum target number of active runners.  Default value is 1.
+    maxjobs : int, optional
+        The maximum target number of active runners.  Default value is 50.
+    percentjobs : int, optional
+        If njobs is None and runtime or walltime are not given, the target
+        is this percentage of the free calculations.  Default value is 10.
+
+    Returns
+    -------
+    int
+        The number of new runner tasks to submit.
+    """
+    if nfree == 0:
+        return 0
+
+    if njobs is None:
+        if runtime is not None and walltime is not None:
+            calcs_per_runner = max(int(walltime // runtime), 1)
+            njobs = ceil(nfree / calcs_per_runner)
+        else:
+            njobs = round(nfree * percentjobs / 100)
+        njobs = min(max(njobs, minjobs), maxjobs)
+
+    return max(min(njobs - nactive, nfree), 0)
+
+def submit_array(script: str,
+                 args: str,
+                 ntasks: int,
+                 throttle: Optional[int] = None,
+                 dryrun: bool = False) -> Optional[str]:
+    """
+    Submits a single slurm job array.
+
+    Parameters
+    ----------
+    script : str
+        The slurm submission script.
+    args : str
+        The arguments to pass to the script.
+    ntasks : int
+        The number of array tasks.
+    throttle : int, optional
+        The maximum number of array tasks allowed to run at the same time.
+    dryrun : bool, optional
+        If True, the command is printed rather than called.
+
+    Returns
+    -------
+    str or None
+        The job id of the array, or None if nothing was submitted.
+    """
+    if ntasks <= 0:
+        return None
+
+    array = f'0-{ntasks - 1}'
+    if throttle is not None:
+        array += f'%{throttle}'
+    cmd = f'{sbatch_command()} --parsable --array={array} {script} {args}'
+
+    if dryrun:
+        print(cmd)
+        return None
+
+    result = subprocess.run(shlex.split(cmd), capture_output=True, text=True,
+                            check=True)
+    return result.stdout.strip().split(';')[0]
+
+def submit_cleanup(jobid: str,
+                   paths: list) -> str:
+    """
+    Submits a job that deletes files once a job has finished, whether or not
+    it succeeded.
+
+    Parameters
+    ----------
+    jobid : str
+        The id of the job to wait on.
+    paths : list
+        The files to delete.
+
+    Returns
+    -------
+    str
+        The job id of the cleanup job.
+    """
+    paths = ' '.join(shlex.quote(str(Path(path).resolve())) for path in paths)
+    cmd = shlex.split(sbatch_command()) + [
+        '--parsable', f'--dependency=afterany:{jobid}', '--job-name=iprPy_cleanup',
+        '--output=/dev/null', f'--wrap=rm -f {paths}']
+    result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+    return result.stdout.strip().split(';')[0]
+
+def submit_calc_array(script: str,
+                      args: str,
+                      run_directory: Union[str, Path],
+                      calc_names: list,
+                      jobname: str,
+                      throttle: Optional[int] = None,
+                      dryrun: bool = False) -> Optional[str]:
+    """
+    Submits a slurm job array with one task for each of a list of
+    calculations.  The calculation names are written to an array file that is
+    passed to the script with "-a", and a cleanup job is submitted that
+    deletes the file once the array has finished.
+
+    Parameters
+    ----------
+    script : str
+        The slurm submission script.
+    args : str
+        The arguments to pass to the script.
+    run_directory : str or Path
+        The run_directory containing the calculations.
+    calc_names : list
+        The calculation names, in task order.
+    jobname : str
+        Name used to make the array file name unique.
+    throttle : int, optional
+        The maximum number of array tasks allowed to run at the same time.
+    dryrun : bool, optional
+        If True, the command is printed rather than called and no array file
+        is left behind.
+
+    Returns
+    -------
+    str or None
+        The job id of the array, or None if nothing was submitted.
+    """
+    if len(calc_names) == 0:
+        return None
+
+    array_file = write_array_file(run_directory, calc_names, jobname)
+    try:
+        jobid = submit_array(script, f'{args} -a {array_file}', len(calc_names),
+                             throttle=throttle, dryrun=dryrun)
+    except BaseException:
+        array_file.unlink()
+        raise
+
+    if jobid is None:
+        array_file.unlink()
+    else:
+        submit_cleanup(jobid, [array_file])
+    return jobid
+
+def write_array_file(run_directory: Union[str, Path],
+                     calc_names: list,
+                     jobname: str) -> Path:
+    """
+    Writes the calculation names that array tasks select from by their
+    SLURM_ARRAY_TASK_ID.  The file is placed next to the run_directory.
+
+    Parameters
+    ----------
+    run_directory : str or Path
+        The run_directory containing the calculations.
+    calc_names : list
+        The calculation names, in task order.
+    jobname : str
+        Name used to make the file name unique.
+
+    Returns
+    -------
+    Path
+        The path to the written file.
+    """
+    run_directory = Path(run_directory)
+    array_file = Path(run_directory.parent, f'{run_directory.name}_{jobname}.array')
+    with open(array_file, 'w', encoding='UTF-8') as f:
+        f.write('\n'.join(calc_names) + '\n')
+    return array_file
+
+def array_calc_name(array_file: Union[str, Path],
+                    task_id: Optional[int] = None) -> str:
+    """
+    Selects the calculation for a slurm array task.
+
+    Parameters
+    ----------
+    array_file : str or Path
+        The file of calculation names written by write_array_file().
+    task_id : int, optional
+        The array task index.  Default value is taken from the
+        SLURM_ARRAY_TASK_ID environment variable.
+
+    Returns
+    -------
+    str
+        The name of the calculation for the task.
+    """
+    if task_id is None:
+        task_id = int(os.environ['SLURM_ARRAY_TASK_ID'])
+    with open(array_file, encoding='UTF-8') as f:
+        calc_names = f.read().split()
+    return calc_names[task_id]
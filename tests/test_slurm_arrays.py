@@ -0,0 +1,53 @@
+# coding: utf-8
+
+# Standard Python libraries
+from pathlib import Path
+import shlex
+import sys
+
+from iprPy.workflow.slurm_arrays import submit_calc_array
+
+fake_sbatch = Path(__file__).resolve().parents[1] / 'bin' / 'fake_sbatch'
+
+task_script = """\
+#!/bin/bash
+# Arguments are: runner -a <array_file>
+echo "$SLURM_ARRAY_TASK_ID $(sed -n "$((SLURM_ARRAY_TASK_ID + 1))p" "$3")" >> tasks.txt
+"""
+
+def setup_fake_sbatch(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('IPRPY_SBATCH', f'{shlex.quote(sys.executable)} {shlex.quote(str(fake_sbatch))}')
+    monkeypatch.setenv('FAKE_SBATCH_DIR', str(tmp_path / 'state'))
+    monkeypatch.delenv('FAKE_SBATCH_DRYRUN', raising=False)
+    (tmp_path / 'run').mkdir()
+    Path(tmp_path, 'task.sh').write_text(task_script)
+
+def test_submit_calc_array(tmp_path, monkeypatch):
+    setup_fake_sbatch(tmp_path, monkeypatch)
+    calc_names = ['calc_a', 'calc_b', 'calc_c']
+
+    jobid = submit_calc_array('task.sh', 'runner', tmp_path / 'run', calc_names,
+                              'test', throttle=2)
+    assert jobid == '1'
+
+    # Each task selected its own calculation from the array file
+    tasks = sorted(Path(tmp_path, 'tasks.txt').read_text().splitlines())
+    assert tasks == ['0 calc_a', '1 calc_b', '2 calc_c']
+
+    # The cleanup job ran after the array and removed the array file
+    submissions = Path(tmp_path, 'state', 'submissions.log').read_text().splitlines()
+    assert len(submissions) == 2
+    assert submissions[0].startswith('1 0-2%2 ')
+    assert 'rm -f' in submissions[1]
+    assert list(tmp_path.glob('*.array')) == []
+
+def test_submit_calc_array_dryrun(tmp_path, monkeypatch, capsys):
+    setup_fake_sbatch(tmp_path, monkeypatch)
+
+    jobid = submit_calc_array('task.sh', 'runner', tmp_path / 'run', ['calc_a'],
+                              'test', dryrun=True)
+    assert jobid is None
+    assert '--array=0-0' in capsys.readouterr().out
+    assert not Path(tmp_path, 'state').exists()
+    assert list(tmp_path.glob('*.array')) == []